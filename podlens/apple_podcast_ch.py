@@ -9,16 +9,26 @@ warnings.filterwarnings('ignore', category=FutureWarning, module='whisper')
 import requests
 import feedparser
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
 import os
 from pathlib import Path
 import re
 import time
+import shutil
+import contextlib
+import io
+from concurrent.futures import ThreadPoolExecutor
 import subprocess
-from tqdm import tqdm
 from dotenv import load_dotenv
-import google.generativeai as genai
-from . import get_model_name
+from .downloader import download_file
+from .concurrency import limits, throttle, GEMINI_API_HOST
+from .audio import probe_duration, candidate_bitrates, encode_mp3, split_audio, merge_chunk_texts, chunk_overlaps, GROQ_MAX_FILE_MB
+from .transcription import get_local_backend
+from .summarizer import map_reduce_summary, estimate_tokens, SINGLE_PASS_MAX_TOKENS
+from .gemini import get_gemini_client
+from .streaming import write_stream, timed_chunks
+from .catalog import record_output
+from .llm_cache import cached_generate, cached_stream, TEMPLATE_SUMMARY, TEMPLATE_SUMMARY_SECTIONS, TEMPLATE_TRANSLATE
 
 # Enhanced .env loading function
 def load_env_robust():
@@ -38,17 +48,9 @@ def load_env_robust():
 load_env_robust()
 
 # Whisper transcription support
-# Whisper 转录支持
-try:
-    import mlx_whisper
-    import mlx.core as mx
-    MLX_WHISPER_AVAILABLE = True
-    # 检查 MLX 设备可用性
-    MLX_DEVICE = mx.default_device()
-    # print(f"🎯 MLX Whisper 可用，使用设备: {MLX_DEVICE}")
-except ImportError:
-    MLX_WHISPER_AVAILABLE = False
-    # print("⚠️  MLX Whisper 不可用")
+# 本地 Whisper 转录后端（MLX、faster-whisper 或 openai-whisper），模型首次使用时加载一次
+LOCAL_BACKEND = get_local_backend()
+LOCAL_WHISPER_AVAILABLE = LOCAL_BACKEND is not None
 
 # Groq API 极速转录
 try:
@@ -70,7 +72,7 @@ except ImportError:
     GEMINI_AVAILABLE = False
 
 # 检查转录功能可用性
-TRANSCRIPTION_AVAILABLE = MLX_WHISPER_AVAILABLE or GROQ_AVAILABLE
+TRANSCRIPTION_AVAILABLE = LOCAL_WHISPER_AVAILABLE or GROQ_AVAILABLE
 
 
 class ApplePodcastExplorer:
@@ -94,9 +96,6 @@ class ApplePodcastExplorer:
         self.root_output_dir = Path("outputs")
         self.root_output_dir.mkdir(exist_ok=True)
         
-        # 初始化MLX Whisper模型 - 始终使用medium模型
-        self.whisper_model_name = 'mlx-community/whisper-medium'
-        
         # Groq客户端初始化
         if GROQ_AVAILABLE:
             self.groq_client = Groq(api_key=GROQ_API_KEY)
@@ -107,9 +106,8 @@ class ApplePodcastExplorer:
         self.api_key = os.getenv('GEMINI_API_KEY')
         if GEMINI_AVAILABLE and self.api_key:
             try:
-                genai.configure(api_key=self.api_key, transport='rest')
-                self.gemini_client = genai
-                self.model_name = get_model_name()  # 从 .env 获取模型名称
+                self.gemini_client = get_gemini_client()  # 进程内共享，模型名称来自 .env
+                self.model_name = self.gemini_client.model_name
             except Exception as e:
                 print(f"⚠️  Gemini客户端初始化失败: {e}")
                 self.gemini_client = None
@@ -118,19 +116,15 @@ class ApplePodcastExplorer:
     
     def load_whisper_model(self):
         """
-        设置MLX Whisper模型 - 始终使用medium模型
+        检查本地Whisper后端 - 模型在首次使用时加载一次并共享
         """
-        if not MLX_WHISPER_AVAILABLE:
-            print("❌ MLX Whisper不可用")
+        if not LOCAL_WHISPER_AVAILABLE:
+            print("❌ 本地Whisper不可用")
             return False
         
-        try:
-            print(f"📥 设置MLX Whisper模型: {self.whisper_model_name}")
-            print("ℹ️  首次使用会下载模型文件，请耐心等待...")
-            return True
-        except Exception as e:
-            print(f"❌ 设置MLX Whisper模型失败: {e}")
-            return False
+        print(f"📥 本地Whisper后端: {LOCAL_BACKEND.label}")
+        print("ℹ️  首次使用会下载模型文件，请耐心等待...")
+        return True
     
     def search_podcast_channel(self, podcast_name: str) -> List[Dict]:
         """
@@ -622,42 +616,18 @@ class ApplePodcastExplorer:
             # 下载文件，为播客托管服务添加额外的headers
             download_headers = {
                 'Referer': 'https://podcasts.apple.com/',
-                'Origin': 'https://podcasts.apple.com',
-                'Range': 'bytes=0-'  # 某些服务器需要Range header
+                'Origin': 'https://podcasts.apple.com'
             }
-            response = self.session.get(episode['audio_url'], stream=True, headers=download_headers, timeout=30)
-            response.raise_for_status()
-            
-            # 获取文件大小
-            total_size = int(response.headers.get('content-length', 0))
-            
-            # 带进度条下载
-            with open(filepath, 'wb') as f:
-                if total_size > 0:
-                    with tqdm(
-                        total=total_size, 
-                        unit='B', 
-                        unit_scale=True, 
-                        desc=f"第{episode_num}集"
-                    ) as pbar:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            if chunk:
-                                f.write(chunk)
-                                pbar.update(len(chunk))
-                else:
-                    # 没有文件大小信息时直接下载
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
+            # 通过 Range 请求从 audio.mp3.part 续传中断的下载
+            download_file(self.session, episode['audio_url'], filepath, headers=download_headers,
+                          desc=f"第{episode_num}集")
             
             print(f"✅ 下载完成")
             return True, episode_dir
             
         except Exception as e:
             print(f"❌ 下载第{episode_num}集失败: {e}")
-            # 下载失败时删除可能的不完整文件
-            if 'filepath' in locals() and filepath.exists():
-                filepath.unlink()
+            # 已下载的数据保留在 audio.mp3.part 中，下次尝试时续传
             return False, None
     
     def get_file_size_mb(self, filepath):
@@ -669,8 +639,8 @@ class ApplePodcastExplorer:
     
     def compress_audio_file(self, input_file: Path, output_file: Path, quiet: bool = False) -> bool:
         """
-        智能四级压缩音频文件至Groq API限制以下
-        压缩策略: 64k → 48k → 32k → 24k，每级检查是否满足25MB限制
+        单次 ffmpeg 编码将音频压缩至Groq API限制以下
+        先读取时长，直接使用能满足25MB限制的最高码率（不超过64k）
         
         Args:
             input_file: 输入文件路径
@@ -692,160 +662,27 @@ class ApplePodcastExplorer:
                 print("🔧 正在压缩...")
             else:
                 print(f"🔧 正在压缩音频文件: {input_file.name}")
-                
-                # 第一级压缩：64k (优先保证质量)
-                print("📊 第一级压缩: 16KHz单声道, 64kbps MP3")
             
-            # 生成安全的临时文件名，不超过255字符
-            original_name = output_file.stem  # 不含扩展名的文件名
-            prefix = "temp_64k_"
-            extension = output_file.suffix
-            
-            # 计算原文件名部分的最大长度
-            max_name_length = 255 - len(prefix) - len(extension)
-            
-            # 如果需要，截断原文件名
-            if len(original_name) > max_name_length:
-                safe_name = original_name[:max_name_length]
-            else:
-                safe_name = original_name
-            
-            temp_64k_file = output_file.parent / f"{prefix}{safe_name}{extension}"
-            
-            cmd_64k = [
-                'ffmpeg',
-                '-i', str(input_file.resolve()),  # 使用绝对路径避免特殊字符问题
-                '-ar', '16000',        # 降采样到16KHz
-                '-ac', '1',            # 单声道
-                '-b:a', '64k',         # 64kbps码率
-                '-y',                  # 覆盖输出文件
-                str(temp_64k_file.resolve())  # 使用绝对路径
-            ]
-            
-            # 运行第一级压缩（使用bytes模式避免编码问题）
-            result = subprocess.run(
-                cmd_64k,
-                capture_output=True,
-                text=False,  # 使用bytes模式避免UTF-8解码错误
-                check=True
-            )
-            
-            # 检查64k压缩后的文件大小
-            compressed_size_mb = self.get_file_size_mb(temp_64k_file)
+            # 根据时长预先确定码率，仅在 ffprobe 失败时逐级尝试
+            duration = probe_duration(input_file)
+            bitrates = candidate_bitrates(duration)
             if not quiet:
-                print(f"📊 64k压缩后大小: {compressed_size_mb:.1f}MB")
+                if duration:
+                    print(f"📊 时长 {duration / 60:.1f} 分钟 → 16KHz单声道, {bitrates[0]}kbps MP3")
+                else:
+                    print(f"⚠️  无法读取时长，先尝试 {bitrates[0]}kbps")
             
-            if compressed_size_mb <= 25:
-                # 64k压缩满足要求，使用64k结果
-                temp_64k_file.rename(output_file)
-                if not quiet:
-                    print(f"✅ 64k压缩完成: {output_file.name} ({compressed_size_mb:.1f}MB)")
-                return True
-            else:
-                # 64k压缩后仍>25MB，进行第二级48k压缩
-                if not quiet:
-                    print(f"⚠️  64k压缩后仍超25MB，进行第二级48k压缩...")
-                    print("📊 第二级压缩: 16KHz单声道, 48kbps MP3")
-                
-                cmd_48k = [
-                    'ffmpeg',
-                    '-i', str(input_file.resolve()),  # 使用绝对路径避免特殊字符问题
-                    '-ar', '16000',        # 降采样到16KHz
-                    '-ac', '1',            # 单声道
-                    '-b:a', '48k',         # 48kbps码率
-                    '-y',                  # 覆盖输出文件
-                    str(output_file.resolve())  # 使用绝对路径
-                ]
-                
-                # 运行第二级压缩（使用bytes模式避免编码问题）
-                result = subprocess.run(
-                    cmd_48k,
-                    capture_output=True,
-                    text=False,  # 使用bytes模式避免UTF-8解码错误
-                    check=True
-                )
-
+            for bitrate in bitrates:
+                encode_mp3(input_file, output_file, bitrate)
                 compressed_size_mb = self.get_file_size_mb(output_file)
-                if not quiet:
-                    print(f"📊 48k压缩后大小: {compressed_size_mb:.1f}MB")
-
-                if compressed_size_mb <= 25:
-                    # 48k压缩满足要求
-                    if not quiet:
-                        print(f"✅ 48k压缩完成: {output_file.name} ({compressed_size_mb:.1f}MB)")
-                    # 清理临时文件
-                    if temp_64k_file.exists():
-                        temp_64k_file.unlink()
-                    return True
-                else:
-                    # 48k压缩后仍>25MB，进行第三级32k压缩
-                    if not quiet:
-                        print(f"⚠️  48k压缩后仍超25MB，进行第三级32k压缩...")
-                        print("📊 第三级压缩: 16KHz单声道, 32kbps MP3")
-
-                    cmd_32k = [
-                        'ffmpeg',
-                        '-i', str(input_file.resolve()),  # 使用绝对路径避免特殊字符问题
-                        '-ar', '16000',        # 降采样到16KHz
-                        '-ac', '1',            # 单声道
-                        '-b:a', '32k',         # 32kbps码率
-                        '-y',                  # 覆盖输出文件
-                        str(output_file.resolve())  # 使用绝对路径
-                    ]
-
-                    # 运行第三级压缩（使用bytes模式避免编码问题）
-                    result = subprocess.run(
-                        cmd_32k,
-                        capture_output=True,
-                        text=False,  # 使用bytes模式避免UTF-8解码错误
-                        check=True
-                    )
-
-                    compressed_size_mb = self.get_file_size_mb(output_file)
-                    if not quiet:
-                        print(f"📊 32k压缩后大小: {compressed_size_mb:.1f}MB")
-
-                    if compressed_size_mb <= 25:
-                        # 32k压缩满足要求
-                        if not quiet:
-                            print(f"✅ 32k压缩完成: {output_file.name} ({compressed_size_mb:.1f}MB)")
-                        # 清理临时文件
-                        if temp_64k_file.exists():
-                            temp_64k_file.unlink()
-                        return True
-                    else:
-                        # 32k压缩后仍>25MB，进行第四级24k压缩
-                        if not quiet:
-                            print(f"⚠️  32k压缩后仍超25MB，进行第四级24k压缩...")
-                            print("📊 第四级压缩: 16KHz单声道, 24kbps MP3")
-
-                        cmd_24k = [
-                            'ffmpeg',
-                            '-i', str(input_file.resolve()),  # 使用绝对路径避免特殊字符问题
-                            '-ar', '16000',        # 降采样到16KHz
-                            '-ac', '1',            # 单声道
-                            '-b:a', '24k',         # 24kbps码率
-                            '-y',                  # 覆盖输出文件
-                            str(output_file.resolve())  # 使用绝对路径
-                        ]
-
-                        # 运行第四级压缩（使用bytes模式避免编码问题）
-                        result = subprocess.run(
-                            cmd_24k,
-                            capture_output=True,
-                            text=False,  # 使用bytes模式避免UTF-8解码错误
-                    check=True
-                )
-                
-                final_size_mb = self.get_file_size_mb(output_file)
-                if not quiet:
-                            print(f"✅ 24k压缩完成: {output_file.name} ({final_size_mb:.1f}MB)")
-                
-                # 清理临时文件
-                if temp_64k_file.exists():
-                    temp_64k_file.unlink()
-                
-                return True
+                if compressed_size_mb <= GROQ_MAX_FILE_MB:
+                    break
+                if not quiet and bitrate != bitrates[-1]:
+                    print(f"⚠️  {bitrate}k 压缩后仍超过{GROQ_MAX_FILE_MB}MB ({compressed_size_mb:.1f}MB)，降低码率重试...")
+            
+            if not quiet:
+                print(f"✅ {bitrate}k压缩完成: {output_file.name} ({compressed_size_mb:.1f}MB)")
+            return True
             
         except subprocess.CalledProcessError as e:
             # 尝试解码stderr以获取更详细的错误信息
@@ -860,17 +697,17 @@ class ApplePodcastExplorer:
             print(f"❌ 压缩失败: {error_msg}")
             print(f"   输入文件: {input_file}")
             print(f"   输出文件: {output_file}")
-            # 清理临时文件
-            if 'temp_64k_file' in locals() and temp_64k_file.exists():
-                temp_64k_file.unlink()
+            # 删除不完整的输出
+            if output_file.exists():
+                output_file.unlink()
             return False
         except Exception as e:
             print(f"❌ 压缩出错: {e}")
             print(f"   输入文件: {input_file}")
             print(f"   输出文件: {output_file}")
-            # 清理临时文件
-            if 'temp_64k_file' in locals() and temp_64k_file.exists():
-                temp_64k_file.unlink()
+            # 删除不完整的输出
+            if output_file.exists():
+                output_file.unlink()
             return False
     
     def transcribe_with_groq(self, audio_file: Path, quiet: bool = False) -> dict:
@@ -924,9 +761,9 @@ class ApplePodcastExplorer:
             # print(f"❌ Groq转录失败: {e}")
             return None
     
-    def transcribe_with_mlx(self, audio_file: Path, quiet: bool = False) -> dict:
+    def transcribe_locally(self, audio_file: Path, quiet: bool = False) -> dict:
         """
-        使用MLX Whisper转录音频文件
+        使用本地Whisper后端（MLX、faster-whisper 或 openai-whisper）转录音频文件
         
         Args:
             audio_file: 音频文件路径
@@ -936,25 +773,18 @@ class ApplePodcastExplorer:
         """
         try:
             if not quiet:
-                print(f"🎯 MLX Whisper转录: {audio_file.name}")
-                print("🧠 使用模型: mlx-community/whisper-medium")
+                print(f"🎯 本地转录: {audio_file.name}")
+                print(f"🧠 使用模型: {LOCAL_BACKEND.label}")
             
             start_time = time.time()
             
-            # 在静默模式下隐藏 MLX Whisper 的输出
-            if quiet:
-                import contextlib
-                import io
-                with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
-                    result = mlx_whisper.transcribe(
-                        str(audio_file),
-                        path_or_hf_repo=self.whisper_model_name
-                    )
-            else:
-                result = mlx_whisper.transcribe(
-                    str(audio_file),
-                    path_or_hf_repo=self.whisper_model_name
-                )
+            with limits.cpu:
+                # 在静默模式下隐藏后端的输出
+                if quiet:
+                    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                        result = LOCAL_BACKEND.transcribe(audio_file)
+                else:
+                    result = LOCAL_BACKEND.transcribe(audio_file)
             
             end_time = time.time()
             processing_time = end_time - start_time
@@ -963,20 +793,84 @@ class ApplePodcastExplorer:
             speed_ratio = file_size_mb / processing_time * 60 if processing_time > 0 else 0
             
             if not quiet:
-                print(f"✅ MLX转录完成! 用时: {processing_time:.1f}秒")
+                print(f"✅ 本地转录完成! 用时: {processing_time:.1f}秒")
             
             return {
                 'text': result['text'],
-                'language': result.get('language', 'en'),
+                'language': result['language'],
                 'processing_time': processing_time,
                 'speed_ratio': speed_ratio,
-                'method': 'MLX Whisper medium'
+                'method': LOCAL_BACKEND.label
             }
             
         except Exception as e:
-            print(f"❌ MLX转录失败: {e}")
+            print(f"❌ 本地转录失败: {e}")
             return None
     
+    def split_audio_for_groq(self, audio_file: Path, quiet: bool = False) -> List[Path]:
+        """
+        在静音处把音频切分为小于Groq限制的片段
+        
+        Args:
+            audio_file: 音频文件路径
+        
+        Returns:
+            List[Path]: 按顺序排列的片段文件，切分失败时为空
+        """
+        chunk_dir = audio_file.parent / f"chunks_{audio_file.stem}"
+        try:
+            with limits.cpu:
+                chunk_files = split_audio(audio_file, chunk_dir)
+            if not quiet:
+                print(f"✂️  已在静音处切分为 {len(chunk_files)} 个片段")
+            return chunk_files
+        except Exception as e:
+            if not quiet:
+                print(f"⚠️  切分音频失败: {e}")
+            shutil.rmtree(chunk_dir, ignore_errors=True)
+            return []
+    
+    def transcribe_with_groq_chunked(self, audio_file: Path, quiet: bool = False, chunk_files: Optional[List[Path]] = None) -> dict:
+        """
+        将长音频按静音切分的片段并行提交Groq转录，按顺序拼接并去除重叠（无需有损压缩）
+        
+        Args:
+            audio_file: 音频文件路径
+            chunk_files: 流水线已切分好的片段（未提供时在此切分）
+        
+        Returns:
+            dict: 转录结果，任一片段失败时为None
+        """
+        if not chunk_files:
+            chunk_files = self.split_audio_for_groq(audio_file, quiet=quiet)
+        if not chunk_files:
+            return None
+        
+        try:
+            start_time = time.time()
+            with ThreadPoolExecutor(max_workers=min(len(chunk_files), limits.network_workers)) as pool:
+                results = list(pool.map(lambda chunk: self.transcribe_with_groq(chunk, quiet=True), chunk_files))
+            if not all(results):
+                return None
+            
+            processing_time = time.time() - start_time
+            file_size_mb = self.get_file_size_mb(audio_file)
+            speed_ratio = file_size_mb / processing_time * 60 if processing_time > 0 else 0
+            
+            if not quiet:
+                print(f"✅ Groq分片转录完成! {len(chunk_files)} 个片段, 耗时: {processing_time:.1f}秒")
+            
+            return {
+                'text': merge_chunk_texts([result['text'] for result in results], chunk_overlaps(chunk_files)),
+                'language': results[0]['language'],
+                'processing_time': processing_time,
+                'speed_ratio': speed_ratio,
+                'method': f'Groq API whisper-large-v3 ({len(chunk_files)} chunks)'
+            }
+        finally:
+            # 无论转录是否成功都删除片段目录
+            shutil.rmtree(chunk_files[0].parent, ignore_errors=True)
+    
     def transcribe_audio_smart(self, audio_file: Path, episode_title: str, channel_name: str, episode_dir: Path, auto_transcribe: bool = False) -> bool:
         """
         智能音频转录：根据文件大小选择最佳转录方式
@@ -1024,81 +918,89 @@ class ApplePodcastExplorer:
             
             # 智能转录策略
             if file_size_mb <= groq_limit and GROQ_AVAILABLE:
-                # 情况1: 文件<25MB, 直接用Groq, 失败则MLX兜底
+                # 情况1: 文件<25MB, 直接用Groq, 失败则本地Whisper兜底
                 if not auto_transcribe:
                     print("✅ 文件大小在Groq限制内，使用极速转录")
                 transcript_result = self.transcribe_with_groq(audio_file, quiet=auto_transcribe)
                 
-                # Groq失败则MLX兜底
-                if not transcript_result and MLX_WHISPER_AVAILABLE:
+                # Groq失败则本地Whisper兜底
+                if not transcript_result and LOCAL_WHISPER_AVAILABLE:
                     if not auto_transcribe:
-                        print("🔄 Groq失败，切换本地MLX Whisper...")
-                    transcript_result = self.transcribe_with_mlx(audio_file, quiet=auto_transcribe)
+                        print("🔄 Groq失败，切换本地Whisper...")
+                    transcript_result = self.transcribe_locally(audio_file, quiet=auto_transcribe)
             
             elif file_size_mb > groq_limit:
                 # 情况2: 文件>25MB, 需压缩
-                if not auto_transcribe:
-                    print("⚠️  文件超出Groq限制，开始压缩...")
+                # 先尝试Groq分片转录，失败时才压缩
+                if GROQ_AVAILABLE:
+                    if not auto_transcribe:
+                        print("✂️  按静音切分并行分片转录...")
+                    transcript_result = self.transcribe_with_groq_chunked(audio_file, quiet=auto_transcribe)
                 
-                # 生成安全的压缩文件名
-                original_name = audio_file.stem
-                compressed_name = f"compressed_{original_name}"
-                extension = audio_file.suffix
+                # 回退到压缩
+                if not transcript_result:
+                    if not auto_transcribe:
+                        print("⚠️  文件超出Groq限制，开始压缩...")
                 
-                # 确保压缩文件名不超出限制
-                max_compressed_length = 255 - len(extension)
-                if len(compressed_name) > max_compressed_length:
-                    # 截断以适合
-                    truncated_name = compressed_name[:max_compressed_length]
-                    compressed_file = audio_file.parent / f"{truncated_name}{extension}"
-                else:
-                    compressed_file = audio_file.parent / f"{compressed_name}{extension}"
+                    # 生成安全的压缩文件名
+                    original_name = audio_file.stem
+                    compressed_name = f"compressed_{original_name}"
+                    extension = audio_file.suffix
                 
-                if self.compress_audio_file(audio_file, compressed_file, quiet=auto_transcribe):
-                    compressed_size = self.get_file_size_mb(compressed_file)
-                    final_size = compressed_size
-                    if not auto_transcribe:
-                        print(f"📊 压缩后大小: {compressed_size:.1f}MB")
-                    
-                    if compressed_size <= groq_limit and GROQ_AVAILABLE:
-                        # 情况2a: 压缩后在Groq限制内, 失败则MLX兜底
+                    # 确保压缩文件名不超出限制
+                    max_compressed_length = 255 - len(extension)
+                    if len(compressed_name) > max_compressed_length:
+                        # 截断以适合
+                        truncated_name = compressed_name[:max_compressed_length]
+                        compressed_file = audio_file.parent / f"{truncated_name}{extension}"
+                    else:
+                        compressed_file = audio_file.parent / f"{compressed_name}{extension}"
+                
+                    if self.compress_audio_file(audio_file, compressed_file, quiet=auto_transcribe):
+                        compressed_size = self.get_file_size_mb(compressed_file)
+                        final_size = compressed_size
                         if not auto_transcribe:
-                            print("✅ 压缩后在Groq限制内，使用极速转录")
-                        transcript_result = self.transcribe_with_groq(compressed_file, quiet=auto_transcribe)
+                            print(f"📊 压缩后大小: {compressed_size:.1f}MB")
+                    
+                        if compressed_size <= groq_limit and GROQ_AVAILABLE:
+                            # 情况2a: 压缩后在Groq限制内, 失败则本地Whisper兜底
+                            if not auto_transcribe:
+                                print("✅ 压缩后在Groq限制内，使用极速转录")
+                            transcript_result = self.transcribe_with_groq(compressed_file, quiet=auto_transcribe)
                         
-                        # Groq失败则MLX兜底
-                        if not transcript_result and MLX_WHISPER_AVAILABLE:
+                            # Groq失败则本地Whisper兜底
+                            if not transcript_result and LOCAL_WHISPER_AVAILABLE:
+                                if not auto_transcribe:
+                                    print("🔄 Groq失败，切换本地Whisper...")
+                                transcript_result = self.transcribe_locally(compressed_file, quiet=auto_transcribe)
+                        else:
+                            # 情况2b: 压缩后仍超限, 用本地Whisper
                             if not auto_transcribe:
-                                print("🔄 Groq失败，切换本地MLX Whisper...")
-                            transcript_result = self.transcribe_with_mlx(compressed_file, quiet=auto_transcribe)
+                                print("⚠️  压缩后仍超出限制，使用本地转录")
+                            if LOCAL_WHISPER_AVAILABLE:
+                                if auto_transcribe:
+                                    print("💻 本地转录...")
+                                transcript_result = self.transcribe_locally(compressed_file, quiet=auto_transcribe)
+                            else:
+                                if not auto_transcribe:
+                                    print("❌ 本地Whisper不可用，无法转录大文件")
+                                return False
                     else:
-                        # 情况2b: 压缩后仍超限, 用MLX
-                        if not auto_transcribe:
-                            print("⚠️  压缩后仍超出限制，使用MLX本地转录")
-                        if MLX_WHISPER_AVAILABLE:
-                            if auto_transcribe:
-                                print("💻 本地转录...")
-                            transcript_result = self.transcribe_with_mlx(compressed_file, quiet=auto_transcribe)
+                        # 压缩失败，尝试本地Whisper
+                        print("❌ 压缩失败，尝试本地转录")
+                        if LOCAL_WHISPER_AVAILABLE:
+                            transcript_result = self.transcribe_locally(audio_file)
                         else:
-                            if not auto_transcribe:
-                                print("❌ MLX Whisper不可用，无法转录大文件")
+                            print("❌ 本地Whisper不可用，转录失败")
                             return False
-                else:
-                    # 压缩失败，尝试MLX
-                    print("❌ 压缩失败，尝试本地MLX转录")
-                    if MLX_WHISPER_AVAILABLE:
-                        transcript_result = self.transcribe_with_mlx(audio_file)
-                    else:
-                        print("❌ MLX Whisper不可用，转录失败")
-                        return False
             
             else:
-                # 情况3: Groq不可用，用MLX
-                print("⚠️  Groq API不可用，使用本地MLX转录")
-                if MLX_WHISPER_AVAILABLE:
-                    transcript_result = self.transcribe_with_mlx(audio_file)
+                # 情况3: Groq不可用，用本地Whisper
+                print("⚠️  Groq API不可用，使用本地转录")
+                if LOCAL_WHISPER_AVAILABLE:
+                    transcript_result = self.transcribe_locally(audio_file)
                 else:
-                    print("❌ MLX Whisper不可用，转录失败")
+                    print("❌ 本地Whisper不可用，转录失败")
                     return False
             
             # 处理转录结果
@@ -1112,6 +1014,7 @@ class ApplePodcastExplorer:
                 f.write(f"**频道:** {channel_name}\n\n")
                 f.write("---\n\n")
                 f.write(transcript_result['text'])
+            record_output(transcript_filepath)
             
             if not auto_transcribe:
                 print(f"✅ 转录完成: {episode_dir.name}/{transcript_filename}")
@@ -1280,9 +1183,9 @@ class ApplePodcastExplorer:
         else:
             print(f"\n🚀 开始智能转录{total_count}个文件...")
             if GROQ_AVAILABLE:
-                print("💡 将自动选择最佳转录方式: Groq API（极速）或MLX Whisper（本地）")
+                print("💡 将自动选择最佳转录方式: Groq API（极速）或本地Whisper")
             else:
-                print("💡 使用MLX Whisper本地转录")
+                print("💡 使用本地Whisper转录")
         
         successful_transcripts = []  # 存储成功转录的信息 (episode_title, channel_name, episode_dir)
         
@@ -1354,35 +1257,15 @@ class ApplePodcastExplorer:
                             print("⚠️  转录内容过短，跳过摘要生成")
                         continue
                     
-                    # 生成摘要
-                    summary = self.generate_summary(transcript_text, episode_title)
-                    if not summary:
-                        if not auto_transcribe:
-                            print("❌ 摘要生成失败")
-                        continue
-                    
-                    # 翻译为中文
-                    final_summary = summary
-                    if language_choice == 'ch':
-                        translated_summary = self.translate_to_chinese(summary)
-                        if translated_summary:
-                            final_summary = translated_summary
-                            if not auto_transcribe:
-                                print("✅ 摘要已翻译为中文")
-                        else:
-                            if not auto_transcribe:
-                                print("⚠️  翻译失败，使用英文摘要")
-                            language_choice = 'en'  # 回退英文
-                    
-                    # 保存摘要
-                    summary_path = self.save_summary(final_summary, episode_title, channel_name, language_choice, episode_dir)
+                    # 生成摘要，边生成边写入摘要文件
+                    summary_path = self.stream_summary(transcript_text, episode_title, channel_name, language_choice, episode_dir, quiet=auto_transcribe)
                     if summary_path:
                         if not auto_transcribe:
                             print(f"✅ 摘要已保存: {episode_dir.name}/summary.md")
                         summary_success_count += 1
                     else:
                         if not auto_transcribe:
-                            print("❌ 摘要保存失败")
+                            print("❌ 摘要生成失败")
                         
                 except Exception as e:
                     if not auto_transcribe:
@@ -1468,25 +1351,54 @@ class ApplePodcastExplorer:
         
         print("✅ 可视化完成")
 
-    def generate_summary(self, transcript: str, title: str) -> str:
+    def generate_text(self, prompt: str, template: str) -> Optional[str]:
         """
-        使用Gemini API生成摘要
+        通过磁盘响应缓存调用Gemini
+        
+        Args:
+            prompt: 提示文本
+            template: 提示模板版本，属于缓存键的一部分
+        
+        Returns:
+            str: 响应文本，响应格式异常时返回None
+        """
+        def request(prompt):
+            throttle(GEMINI_API_HOST)
+            with limits.llm:
+                return self.gemini_client.generate(prompt)
+        
+        return cached_generate(self.model_name, template, prompt, request)
+    
+    def stream_text(self, prompt: str, template: str) -> Iterator[str]:
+        """
+        通过磁盘响应缓存流式调用Gemini
+        
+        Args:
+            prompt: 提示文本
+            template: 提示模板版本，属于缓存键的一部分
+        
+        Returns:
+            Iterator[str]: 按到达顺序产出的响应文本块
+        """
+        def request(prompt):
+            throttle(GEMINI_API_HOST)
+            with limits.llm:
+                yield from self.gemini_client.generate_stream(prompt)
+        
+        return cached_stream(self.model_name, template, prompt, request)
+    
+    def summary_prompt(self, transcript: str, title: str) -> str:
+        """
+        构建单次请求的摘要提示
         
         Args:
             transcript: 转录文本
             title: 剧集标题
         
         Returns:
-            str: 生成的摘要，失败返回None
+            str: 提示文本
         """
-        if not self.gemini_client:
-            print("❌ Gemini API不可用，无法生成摘要")
-            return None
-        
-        try:
-            # print("✨ 正在生成摘要...")  # 隐藏详细信息
-            
-            prompt = f"""
+        return f"""
             Please provide a comprehensive summary and analysis of this podcast episode transcript.
             
             Episode Title: {title}
@@ -1503,22 +1415,62 @@ class ApplePodcastExplorer:
             转录文本:
             {transcript}
             """
+    
+    def generate_summary(self, transcript: str, title: str) -> str:
+        """
+        使用Gemini API生成摘要
+        
+        Args:
+            transcript: 转录文本
+            title: 剧集标题
+        
+        Returns:
+            str: 生成的摘要，失败返回None
+        """
+        if not self.gemini_client:
+            print("❌ Gemini API不可用，无法生成摘要")
+            return None
+        
+        try:
+            # 超出单次请求长度的转录分段摘要
+            if estimate_tokens(transcript) > SINGLE_PASS_MAX_TOKENS:
+                return self.generate_summary_map_reduce(transcript, title)
             
-            response = self.gemini_client.GenerativeModel(self.model_name).generate_content(prompt)
+            # print("✨ 正在生成摘要...")  # 隐藏详细信息
             
-            # 处理响应
-            if hasattr(response, 'text'):
-                return response.text
-            elif hasattr(response, 'candidates') and response.candidates:
-                return response.candidates[0].content.parts[0].text
-            else:
-                print("❌ Gemini API响应格式异常")
-                return None
+            prompt = self.summary_prompt(transcript, title)
+            
+            result = self.generate_text(prompt, TEMPLATE_SUMMARY)
+            if result:
+                return result
+            print("❌ Gemini API响应格式异常")
+            return None
                 
         except Exception as e:
             print(f"❌ 摘要生成失败: {e}")
             return None
     
+    def generate_summary_map_reduce(self, transcript: str, title: str) -> Optional[str]:
+        """
+        对超出单次请求长度的转录分段并发摘要，再归并为完整摘要
+        
+        Args:
+            transcript: 转录文本
+            title: 剧集标题
+        
+        Returns:
+            str: 生成的摘要（部分分段失败时不完整），失败返回None
+        """
+        def generate(prompt):
+            return self.generate_text(prompt, TEMPLATE_SUMMARY_SECTIONS)
+        
+        result = map_reduce_summary(generate, transcript, title, workers=limits.llm_workers)
+        if result['failed']:
+            print(f"⚠️  {len(result['failed'])}/{result['sections']} 段转录未能生成摘要，摘要不完整")
+        if result['summary'] and not result['reduced']:
+            print("⚠️  合并分段摘要失败，改为保存各段笔记")
+        return result['summary']
+    
     def translate_to_chinese(self, text: str) -> str:
         """
         翻译文本为中文
@@ -1538,27 +1490,70 @@ class ApplePodcastExplorer:
             
             prompt = f"Translate everything to Chinese accurately without missing anything:\n\n{text}"
             
-            response = self.gemini_client.GenerativeModel(self.model_name).generate_content(prompt)
-            
-            # 处理响应
-            if hasattr(response, 'text'):
-                return response.text
-            elif hasattr(response, 'candidates') and response.candidates:
-                return response.candidates[0].content.parts[0].text
-            else:
-                print("❌ Gemini API响应格式异常")
-                return None
+            result = self.generate_text(prompt, TEMPLATE_TRANSLATE)
+            if result:
+                return result
+            print("❌ Gemini API响应格式异常")
+            return None
                 
         except Exception as e:
             print(f"❌ 翻译失败: {e}")
             return None
     
+    def stream_summary(self, transcript: str, title: str, channel_name: str, language: str = "en",
+                       episode_dir: Path = None, quiet: bool = False) -> Optional[str]:
+        """
+        使用Gemini流式API生成并保存摘要：响应块到达后即追加到.partial文件，完成后重命名为摘要文件
+        
+        Args:
+            transcript: 转录文本
+            title: 剧集标题
+            channel_name: 频道名称
+            language: 语言标识；为'ch'时流式输出中文翻译
+            episode_dir: 剧集文件夹路径
+            quiet: 不打印首个token延迟
+        
+        Returns:
+            Optional[str]: 保存的文件路径，失败返回None
+        """
+        if not self.gemini_client:
+            print("❌ Gemini API不可用，无法生成摘要")
+            return None
+        
+        summary = None
+        if language == 'ch' or estimate_tokens(transcript) > SINGLE_PASS_MAX_TOKENS:
+            # 长转录走分段摘要，没有可流式输出的内容
+            summary = self.generate_summary(transcript, title)
+            if not summary:
+                return None
+            if language != 'ch':
+                return self.save_summary(summary, title, channel_name, language, episode_dir)
+            if not quiet:
+                print("🔄 正在翻译为中文...")
+            prompt = f"Translate everything to Chinese accurately without missing anything:\n\n{summary}"
+            template = TEMPLATE_TRANSLATE
+        else:
+            prompt = self.summary_prompt(transcript, title)
+            template = TEMPLATE_SUMMARY
+        
+        def report(seconds):
+            if not quiet:
+                print(f"⏱️  首个token用时 {seconds:.1f}秒")
+        
+        chunks = timed_chunks(self.stream_text(prompt, template), report)
+        summary_path = self.save_summary(chunks, title, channel_name, language, episode_dir)
+        if summary_path is None and summary:
+            if not quiet:
+                print("⚠️  翻译失败，使用英文摘要")
+            summary_path = self.save_summary(summary, title, channel_name, 'en', episode_dir)
+        return summary_path
+
     def save_summary(self, summary: str, title: str, channel_name: str, language: str = "en", episode_dir: Path = None) -> str:
         """
         保存摘要到文件
         
         Args:
-            summary: 摘要内容
+            summary: 摘要内容，或逐块写入文件的文本块迭代器
             title: 剧集标题
             channel_name: 频道名称
             language: 语言标识
@@ -1582,14 +1577,16 @@ class ApplePodcastExplorer:
                 summary_filename = self.ensure_summary_filename_length(safe_channel, safe_title)
                 summary_filepath = self.root_output_dir / summary_filename
             
-            with open(summary_filepath, 'w', encoding='utf-8') as f:
-                f.write(f"# 摘要: {title}\n\n" if language == "ch" else f"# Summary: {title}\n\n")
-                f.write(f"**频道:** {channel_name}\n\n" if language == "ch" else f"**Channel:** {channel_name}\n\n")
-                f.write(f"**摘要生成时间:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n" if language == "ch" else f"**Summary Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-                f.write(f"**语言:** {'中文' if language == 'ch' else 'English'}\n\n")
-                f.write("---\n\n")
-                f.write("## 摘要内容\n\n" if language == "ch" else "## Summary Content\n\n")
-                f.write(summary)
+            # 正文可以是文本块流：写入.partial文件，完成后重命名
+            header = []
+            header.append(f"# 摘要: {title}\n\n" if language == "ch" else f"# Summary: {title}\n\n")
+            header.append(f"**频道:** {channel_name}\n\n" if language == "ch" else f"**Channel:** {channel_name}\n\n")
+            header.append(f"**摘要生成时间:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n" if language == "ch" else f"**Summary Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+            header.append(f"**语言:** {'中文' if language == 'ch' else 'English'}\n\n")
+            header.append("---\n\n")
+            header.append("## 摘要内容\n\n" if language == "ch" else "## Summary Content\n\n")
+            write_stream(summary_filepath, ''.join(header), summary)
+            record_output(summary_filepath)
             
             return str(summary_filepath)
             
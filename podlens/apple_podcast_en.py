@@ -9,16 +9,26 @@ warnings.filterwarnings('ignore', category=FutureWarning, module='whisper')
 import requests
 import feedparser
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
 import os
 from pathlib import Path
 import re
 import time
+import shutil
+import contextlib
+import io
+from concurrent.futures import ThreadPoolExecutor
 import subprocess
-from tqdm import tqdm
 from dotenv import load_dotenv
-import google.generativeai as genai
-from . import get_model_name
+from .downloader import download_file
+from .concurrency import limits, throttle, GEMINI_API_HOST
+from .audio import probe_duration, candidate_bitrates, encode_mp3, split_audio, merge_chunk_texts, chunk_overlaps, GROQ_MAX_FILE_MB
+from .transcription import get_local_backend
+from .summarizer import map_reduce_summary, estimate_tokens, SINGLE_PASS_MAX_TOKENS
+from .gemini import get_gemini_client
+from .streaming import write_stream, timed_chunks
+from .catalog import record_output
+from .llm_cache import cached_generate, cached_stream, TEMPLATE_SUMMARY, TEMPLATE_SUMMARY_SECTIONS, TEMPLATE_TRANSLATE
 
 # Enhanced .env loading function
 def load_env_robust():
@@ -37,17 +47,9 @@ def load_env_robust():
 # Load .env file with robust search
 load_env_robust()
 
-# Try to import MLX Whisper
-try:
-    import mlx_whisper
-    import mlx.core as mx
-    MLX_WHISPER_AVAILABLE = True
-    # Check MLX device availability
-    MLX_DEVICE = mx.default_device()
-    # print(f"🎯 MLX Whisper available, using device: {MLX_DEVICE}")
-except ImportError:
-    MLX_WHISPER_AVAILABLE = False
-    # print("⚠️  MLX Whisper not available")
+# Local Whisper transcription backend (MLX, faster-whisper or openai-whisper), model loaded once on first use
+LOCAL_BACKEND = get_local_backend()
+LOCAL_WHISPER_AVAILABLE = LOCAL_BACKEND is not None
 
 # Groq API ultra-fast transcription
 try:
@@ -69,7 +71,7 @@ except ImportError:
     GEMINI_AVAILABLE = False
 
 # Check transcription feature availability
-TRANSCRIPTION_AVAILABLE = MLX_WHISPER_AVAILABLE or GROQ_AVAILABLE
+TRANSCRIPTION_AVAILABLE = LOCAL_WHISPER_AVAILABLE or GROQ_AVAILABLE
 
 
 class ApplePodcastExplorer:
@@ -93,9 +95,6 @@ class ApplePodcastExplorer:
         self.root_output_dir = Path("outputs")
         self.root_output_dir.mkdir(exist_ok=True)
         
-        # Initialize MLX Whisper model - always use medium model
-        self.whisper_model_name = 'mlx-community/whisper-medium'
-        
         # Groq client initialization
         if GROQ_AVAILABLE:
             self.groq_client = Groq(api_key=GROQ_API_KEY)
@@ -106,9 +105,8 @@ class ApplePodcastExplorer:
         self.api_key = os.getenv('GEMINI_API_KEY')
         if GEMINI_AVAILABLE and self.api_key:
             try:
-                genai.configure(api_key=self.api_key, transport='rest')
-                self.gemini_client = genai
-                self.model_name = get_model_name()  # Get model name from .env
+                self.gemini_client = get_gemini_client()  # Shared per process, model name from .env
+                self.model_name = self.gemini_client.model_name
             except Exception as e:
                 print(f"⚠️  Gemini client initialization failed: {e}")
                 self.gemini_client = None
@@ -117,19 +115,15 @@ class ApplePodcastExplorer:
     
     def load_whisper_model(self):
         """
-        Set MLX Whisper model - always use medium model
+        Check the local Whisper backend - the model is loaded once on first use and shared
         """
-        if not MLX_WHISPER_AVAILABLE:
-            print("❌ MLX Whisper not available")
+        if not LOCAL_WHISPER_AVAILABLE:
+            print("❌ Local Whisper not available")
             return False
         
-        try:
-            print(f"📥 Setting MLX Whisper model: {self.whisper_model_name}")
-            print("ℹ️  The model file will be downloaded on first use, please wait patiently...")
-            return True
-        except Exception as e:
-            print(f"❌ Failed to set MLX Whisper model: {e}")
-            return False
+        print(f"📥 Local Whisper backend: {LOCAL_BACKEND.label}")
+        print("ℹ️  The model file will be downloaded on first use, please wait patiently...")
+        return True
     
     def search_podcast_channel(self, podcast_name: str) -> List[Dict]:
         """
@@ -689,42 +683,18 @@ class ApplePodcastExplorer:
             # Download file with additional headers for podcast hosting services
             download_headers = {
                 'Referer': 'https://podcasts.apple.com/',
-                'Origin': 'https://podcasts.apple.com',
-                'Range': 'bytes=0-'  # Some servers require Range header
+                'Origin': 'https://podcasts.apple.com'
             }
-            response = self.session.get(episode['audio_url'], stream=True, headers=download_headers, timeout=30)
-            response.raise_for_status()
-            
-            # Get file size
-            total_size = int(response.headers.get('content-length', 0))
-            
-            # Download with progress bar
-            with open(filepath, 'wb') as f:
-                if total_size > 0:
-                    with tqdm(
-                        total=total_size, 
-                        unit='B', 
-                        unit_scale=True, 
-                        desc=f"Episode {episode_num}"
-                    ) as pbar:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            if chunk:
-                                f.write(chunk)
-                                pbar.update(len(chunk))
-                else:
-                    # If no file size info, just download
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
+            # Range requests resume an interrupted download from audio.mp3.part
+            download_file(self.session, episode['audio_url'], filepath, headers=download_headers,
+                          desc=f"Episode {episode_num}")
             
             print(f"✅ Download complete")
             return True, episode_dir
             
         except Exception as e:
             print(f"❌ Failed to download episode {episode_num}: {e}")
-            # If download failed, delete possible incomplete file
-            if 'filepath' in locals() and filepath.exists():
-                filepath.unlink()
+            # Downloaded data stays in audio.mp3.part and is resumed on the next attempt
             return False, None
     
     def get_file_size_mb(self, filepath):
@@ -736,13 +706,13 @@ class ApplePodcastExplorer:
     
     def compress_audio_file(self, input_file: Path, output_file: Path, quiet: bool = False) -> bool:
         """
-        Smart four-level audio compression below Groq API limit
-        Compression strategy: 64k → 48k → 32k → 24k, checking 25MB limit at each level
-
+        Compress audio below the Groq API limit in a single ffmpeg pass
+        The duration is probed first and the highest bitrate (up to 64k) that fits 25MB is used directly
+        
         Args:
             input_file: Input file path
             output_file: Output file path
-
+        
         Returns:
             bool: Whether compression was successful
         """
@@ -759,160 +729,27 @@ class ApplePodcastExplorer:
                 print("🔧 Compressing...")
             else:
                 print(f"🔧 Compressing audio file: {input_file.name}")
-                
-                # Level 1 compression: 64k (priority on quality)
-                print("📊 Level 1 compression: 16KHz mono, 64kbps MP3")
-            
-            # Generate safe temporary filename, not exceeding 255 characters
-            original_name = output_file.stem  # Filename without extension
-            prefix = "temp_64k_"
-            extension = output_file.suffix
-            
-            # Calculate maximum length for original filename part
-            max_name_length = 255 - len(prefix) - len(extension)
             
-            # Truncate original filename if needed
-            if len(original_name) > max_name_length:
-                safe_name = original_name[:max_name_length]
-            else:
-                safe_name = original_name
-            
-            temp_64k_file = output_file.parent / f"{prefix}{safe_name}{extension}"
-            
-            cmd_64k = [
-                'ffmpeg',
-                '-i', str(input_file.resolve()),  # Use absolute path to avoid special character issues
-                '-ar', '16000',        # Downsample to 16KHz
-                '-ac', '1',            # Mono
-                '-b:a', '64k',         # 64kbps bitrate
-                '-y',                  # Overwrite output file
-                str(temp_64k_file.resolve())  # Use absolute path
-            ]
-            
-            # Run level 1 compression (use bytes mode to avoid encoding issues)
-            result = subprocess.run(
-                cmd_64k,
-                capture_output=True,
-                text=False,  # Use bytes mode to avoid UTF-8 decoding errors
-                check=True
-            )
-            
-            # Check file size after 64k compression
-            compressed_size_mb = self.get_file_size_mb(temp_64k_file)
+            # Pick the bitrate from the duration up front, the ladder is only used if ffprobe fails
+            duration = probe_duration(input_file)
+            bitrates = candidate_bitrates(duration)
             if not quiet:
-                print(f"📊 Size after 64k compression: {compressed_size_mb:.1f}MB")
+                if duration:
+                    print(f"📊 Duration {duration / 60:.1f} min → 16KHz mono, {bitrates[0]}kbps MP3")
+                else:
+                    print(f"⚠️  Could not read duration, trying {bitrates[0]}kbps first")
             
-            if compressed_size_mb <= 25:
-                # 64k compression meets requirements, use 64k result
-                temp_64k_file.rename(output_file)
-                if not quiet:
-                    print(f"✅ 64k compression complete: {output_file.name} ({compressed_size_mb:.1f}MB)")
-                return True
-            else:
-                # Still >25MB after 64k compression, proceed with level 2 48k compression
-                if not quiet:
-                    print(f"⚠️  Still exceeds 25MB after 64k, proceeding with level 2 48k compression...")
-                    print("📊 Level 2 compression: 16KHz mono, 48kbps MP3")
-                
-                cmd_48k = [
-                    'ffmpeg',
-                    '-i', str(input_file.resolve()),  # Use absolute path to avoid special character issues
-                    '-ar', '16000',        # Downsample to 16KHz
-                    '-ac', '1',            # Mono
-                    '-b:a', '48k',         # 48kbps bitrate
-                    '-y',                  # Overwrite output file
-                    str(output_file.resolve())  # Use absolute path
-                ]
-                
-                # Run level 2 compression (use bytes mode to avoid encoding issues)
-                result = subprocess.run(
-                    cmd_48k,
-                    capture_output=True,
-                    text=False,  # Use bytes mode to avoid UTF-8 decoding errors
-                    check=True
-                )
-
+            for bitrate in bitrates:
+                encode_mp3(input_file, output_file, bitrate)
                 compressed_size_mb = self.get_file_size_mb(output_file)
-                if not quiet:
-                    print(f"📊 Size after 48k compression: {compressed_size_mb:.1f}MB")
-
-                if compressed_size_mb <= 25:
-                    # 48k compression meets requirements
-                    if not quiet:
-                        print(f"✅ 48k compression complete: {output_file.name} ({compressed_size_mb:.1f}MB)")
-                    # Clean up temporary files
-                    if temp_64k_file.exists():
-                        temp_64k_file.unlink()
-                    return True
-                else:
-                    # Still >25MB after 48k compression, proceed with level 3 32k compression
-                    if not quiet:
-                        print(f"⚠️  Still exceeds 25MB after 48k, proceeding with level 3 32k compression...")
-                        print("📊 Level 3 compression: 16KHz mono, 32kbps MP3")
-
-                    cmd_32k = [
-                        'ffmpeg',
-                        '-i', str(input_file.resolve()),  # Use absolute path to avoid special character issues
-                        '-ar', '16000',        # Downsample to 16KHz
-                        '-ac', '1',            # Mono
-                        '-b:a', '32k',         # 32kbps bitrate
-                        '-y',                  # Overwrite output file
-                        str(output_file.resolve())  # Use absolute path
-                    ]
-
-                    # Run level 3 compression (use bytes mode to avoid encoding issues)
-                    result = subprocess.run(
-                        cmd_32k,
-                        capture_output=True,
-                        text=False,  # Use bytes mode to avoid UTF-8 decoding errors
-                        check=True
-                    )
-
-                    compressed_size_mb = self.get_file_size_mb(output_file)
-                    if not quiet:
-                        print(f"📊 Size after 32k compression: {compressed_size_mb:.1f}MB")
-
-                    if compressed_size_mb <= 25:
-                        # 32k compression meets requirements
-                        if not quiet:
-                            print(f"✅ 32k compression complete: {output_file.name} ({compressed_size_mb:.1f}MB)")
-                        # Clean up temporary files
-                        if temp_64k_file.exists():
-                            temp_64k_file.unlink()
-                        return True
-                    else:
-                        # Still >25MB after 32k compression, proceed with level 4 24k compression
-                        if not quiet:
-                            print(f"⚠️  Still exceeds 25MB after 32k, proceeding with level 4 24k compression...")
-                            print("📊 Level 4 compression: 16KHz mono, 24kbps MP3")
-
-                        cmd_24k = [
-                            'ffmpeg',
-                            '-i', str(input_file.resolve()),  # Use absolute path to avoid special character issues
-                            '-ar', '16000',        # Downsample to 16KHz
-                            '-ac', '1',            # Mono
-                            '-b:a', '24k',         # 24kbps bitrate
-                            '-y',                  # Overwrite output file
-                            str(output_file.resolve())  # Use absolute path
-                        ]
-
-                        # Run level 4 compression (use bytes mode to avoid encoding issues)
-                        result = subprocess.run(
-                            cmd_24k,
-                            capture_output=True,
-                            text=False,  # Use bytes mode to avoid UTF-8 decoding errors
-                            check=True
-                        )
-
-                        final_size_mb = self.get_file_size_mb(output_file)
-                        if not quiet:
-                            print(f"✅ 24k compression complete: {output_file.name} ({final_size_mb:.1f}MB)")
-
-                        # Clean up temporary files
-                        if temp_64k_file.exists():
-                            temp_64k_file.unlink()
-
-                        return True
+                if compressed_size_mb <= GROQ_MAX_FILE_MB:
+                    break
+                if not quiet and bitrate != bitrates[-1]:
+                    print(f"⚠️  Still exceeds {GROQ_MAX_FILE_MB}MB at {bitrate}k ({compressed_size_mb:.1f}MB), retrying at a lower bitrate...")
+            
+            if not quiet:
+                print(f"✅ {bitrate}k compression complete: {output_file.name} ({compressed_size_mb:.1f}MB)")
+            return True
             
         except subprocess.CalledProcessError as e:
             # Try to decode stderr for more detailed error information
@@ -927,17 +764,17 @@ class ApplePodcastExplorer:
             print(f"❌ Compression failed: {error_msg}")
             print(f"   Input file: {input_file}")
             print(f"   Output file: {output_file}")
-            # Clean up temporary files
-            if 'temp_64k_file' in locals() and temp_64k_file.exists():
-                temp_64k_file.unlink()
+            # Remove incomplete output
+            if output_file.exists():
+                output_file.unlink()
             return False
         except Exception as e:
             print(f"❌ Compression error: {e}")
             print(f"   Input file: {input_file}")
             print(f"   Output file: {output_file}")
-            # Clean up temporary files
-            if 'temp_64k_file' in locals() and temp_64k_file.exists():
-                temp_64k_file.unlink()
+            # Remove incomplete output
+            if output_file.exists():
+                output_file.unlink()
             return False
     
     def transcribe_with_groq(self, audio_file: Path, quiet: bool = False) -> dict:
@@ -991,9 +828,9 @@ class ApplePodcastExplorer:
             # print(f"❌ Groq transcription failed: {e}")
             return None
     
-    def transcribe_with_mlx(self, audio_file: Path, quiet: bool = False) -> dict:
+    def transcribe_locally(self, audio_file: Path, quiet: bool = False) -> dict:
         """
-        Transcribe audio file using MLX Whisper
+        Transcribe audio file with the local Whisper backend (MLX, faster-whisper or openai-whisper)
         
         Args:
             audio_file: Audio file path
@@ -1003,25 +840,18 @@ class ApplePodcastExplorer:
         """
         try:
             if not quiet:
-                print(f"🎯 MLX Whisper transcription: {audio_file.name}")
-                print("🧠 Using model: mlx-community/whisper-medium")
+                print(f"🎯 Local transcription: {audio_file.name}")
+                print(f"🧠 Using model: {LOCAL_BACKEND.label}")
             
             start_time = time.time()
             
-            # Hide MLX Whisper output in quiet mode
-            if quiet:
-                import contextlib
-                import io
-                with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
-                    result = mlx_whisper.transcribe(
-                        str(audio_file),
-                        path_or_hf_repo=self.whisper_model_name
-                    )
-            else:
-                result = mlx_whisper.transcribe(
-                    str(audio_file),
-                    path_or_hf_repo=self.whisper_model_name
-                )
+            with limits.cpu:
+                # Hide backend output in quiet mode
+                if quiet:
+                    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                        result = LOCAL_BACKEND.transcribe(audio_file)
+                else:
+                    result = LOCAL_BACKEND.transcribe(audio_file)
             
             end_time = time.time()
             processing_time = end_time - start_time
@@ -1030,19 +860,84 @@ class ApplePodcastExplorer:
             speed_ratio = file_size_mb / processing_time * 60 if processing_time > 0 else 0
             
             if not quiet:
-                print(f"✅ MLX transcription complete! Time: {processing_time:.1f}s")
+                print(f"✅ Local transcription complete! Time: {processing_time:.1f}s")
             
             return {
                 'text': result['text'],
-                'language': result.get('language', 'en'),
+                'language': result['language'],
                 'processing_time': processing_time,
                 'speed_ratio': speed_ratio,
-                'method': 'MLX Whisper medium'
+                'method': LOCAL_BACKEND.label
             }
             
         except Exception as e:
-            print(f"❌ MLX transcription failed: {e}")
+            print(f"❌ Local transcription failed: {e}")
+            return None
+    
+    def split_audio_for_groq(self, audio_file: Path, quiet: bool = False) -> List[Path]:
+        """
+        Split audio at silences into chunks below the Groq limit
+        
+        Args:
+            audio_file: Audio file path
+        
+        Returns:
+            List[Path]: Chunk files in order, empty if splitting failed
+        """
+        chunk_dir = audio_file.parent / f"chunks_{audio_file.stem}"
+        try:
+            with limits.cpu:
+                chunk_files = split_audio(audio_file, chunk_dir)
+            if not quiet:
+                print(f"✂️  Split at silences into {len(chunk_files)} chunks")
+            return chunk_files
+        except Exception as e:
+            if not quiet:
+                print(f"⚠️  Failed to split audio: {e}")
+            shutil.rmtree(chunk_dir, ignore_errors=True)
+            return []
+    
+    def transcribe_with_groq_chunked(self, audio_file: Path, quiet: bool = False, chunk_files: Optional[List[Path]] = None) -> dict:
+        """
+        Transcribe a long audio file as parallel Groq requests over silence-split chunks,
+        stitched back in order with the overlap removed (no lossy compression needed)
+        
+        Args:
+            audio_file: Audio file path
+            chunk_files: Chunks already split by the pipeline (split here if not given)
+        
+        Returns:
+            dict: Transcription result, None if any chunk failed
+        """
+        if not chunk_files:
+            chunk_files = self.split_audio_for_groq(audio_file, quiet=quiet)
+        if not chunk_files:
             return None
+        
+        try:
+            start_time = time.time()
+            with ThreadPoolExecutor(max_workers=min(len(chunk_files), limits.network_workers)) as pool:
+                results = list(pool.map(lambda chunk: self.transcribe_with_groq(chunk, quiet=True), chunk_files))
+            if not all(results):
+                return None
+            
+            processing_time = time.time() - start_time
+            file_size_mb = self.get_file_size_mb(audio_file)
+            speed_ratio = file_size_mb / processing_time * 60 if processing_time > 0 else 0
+            
+            if not quiet:
+                print(f"✅ Groq chunked transcription complete! {len(chunk_files)} chunks, time: {processing_time:.1f}s")
+            
+            return {
+                'text': merge_chunk_texts([result['text'] for result in results], chunk_overlaps(chunk_files)),
+                'language': results[0]['language'],
+                'processing_time': processing_time,
+                'speed_ratio': speed_ratio,
+                'method': f'Groq API whisper-large-v3 ({len(chunk_files)} chunks)'
+            }
+        finally:
+            # Remove the chunk directory whether or not transcription succeeded
+            shutil.rmtree(chunk_files[0].parent, ignore_errors=True)
     
     def transcribe_audio_smart(self, audio_file: Path, episode_title: str, channel_name: str, episode_dir: Path, auto_transcribe: bool = False) -> bool:
         """
@@ -1092,85 +987,93 @@ class ApplePodcastExplorer:
             
             # Smart transcription strategy
             if file_size_mb <= groq_limit and GROQ_AVAILABLE:
-                # Situation 1: File <25MB, directly use Groq, MLX as backup
+                # Situation 1: File <25MB, directly use Groq, local Whisper as backup
                 if not auto_transcribe:
                     print("✅ File size within Groq limit, using ultra-fast transcription")
                 transcript_result = self.transcribe_with_groq(audio_file, quiet=auto_transcribe)
                 
-                # MLX backup
-                if not transcript_result and MLX_WHISPER_AVAILABLE:
+                # local Whisper backup
+                if not transcript_result and LOCAL_WHISPER_AVAILABLE:
                     if not auto_transcribe:
-                        print("🔄 Groq failed, switching to local MLX Whisper...")
-                    transcript_result = self.transcribe_with_mlx(audio_file, quiet=auto_transcribe)
+                        print("🔄 Groq failed, switching to local Whisper...")
+                    transcript_result = self.transcribe_locally(audio_file, quiet=auto_transcribe)
             
             elif file_size_mb > groq_limit:
                 # Situation 2: File >25MB, needs compression
-                if not auto_transcribe:
-                    print("⚠️  File exceeds Groq limit, starting compression...")
+                # First try chunked Groq transcription, compress only if it fails
+                if GROQ_AVAILABLE:
+                    if not auto_transcribe:
+                        print("✂️  Transcribing in parallel chunks split at silences...")
+                    transcript_result = self.transcribe_with_groq_chunked(audio_file, quiet=auto_transcribe)
                 
-                # Generate safe compressed filename
-                original_name = audio_file.stem
-                compressed_name = f"compressed_{original_name}"
-                extension = audio_file.suffix
+                # Fall back to compression
+                if not transcript_result:
+                    if not auto_transcribe:
+                        print("⚠️  File exceeds Groq limit, starting compression...")
                 
-                # Ensure compressed filename doesn't exceed limit
-                max_compressed_length = 255 - len(extension)
-                if len(compressed_name) > max_compressed_length:
-                    # Truncate to fit
-                    truncated_name = compressed_name[:max_compressed_length]
-                    compressed_file = audio_file.parent / f"{truncated_name}{extension}"
-                else:
-                    compressed_file = audio_file.parent / f"{compressed_name}{extension}"
+                    # Generate safe compressed filename
+                    original_name = audio_file.stem
+                    compressed_name = f"compressed_{original_name}"
+                    extension = audio_file.suffix
                 
-                if self.compress_audio_file(audio_file, compressed_file, quiet=auto_transcribe):
-                    compressed_size = self.get_file_size_mb(compressed_file)
-                    final_size = compressed_size
-                    if not auto_transcribe:
-                        print(f"📊 Compressed size: {compressed_size:.1f}MB")
-                    
-                    if compressed_size <= groq_limit and GROQ_AVAILABLE:
-                        # Situation 2a: After compression within Groq limit, MLX as backup
+                    # Ensure compressed filename doesn't exceed limit
+                    max_compressed_length = 255 - len(extension)
+                    if len(compressed_name) > max_compressed_length:
+                        # Truncate to fit
+                        truncated_name = compressed_name[:max_compressed_length]
+                        compressed_file = audio_file.parent / f"{truncated_name}{extension}"
+                    else:
+                        compressed_file = audio_file.parent / f"{compressed_name}{extension}"
+                
+                    if self.compress_audio_file(audio_file, compressed_file, quiet=auto_transcribe):
+                        compressed_size = self.get_file_size_mb(compressed_file)
+                        final_size = compressed_size
                         if not auto_transcribe:
-                            print("✅ Compressed size within Groq limit, using ultra-fast transcription")
-                        transcript_result = self.transcribe_with_groq(compressed_file, quiet=auto_transcribe)
+                            print(f"📊 Compressed size: {compressed_size:.1f}MB")
+                    
+                        if compressed_size <= groq_limit and GROQ_AVAILABLE:
+                            # Situation 2a: After compression within Groq limit, local Whisper as backup
+                            if not auto_transcribe:
+                                print("✅ Compressed size within Groq limit, using ultra-fast transcription")
+                            transcript_result = self.transcribe_with_groq(compressed_file, quiet=auto_transcribe)
                         
-                        # Groq failed use MLX backup
-                        if not transcript_result and MLX_WHISPER_AVAILABLE:
+                            # Groq failed use local Whisper backup
+                            if not transcript_result and LOCAL_WHISPER_AVAILABLE:
+                                if not auto_transcribe:
+                                    print("🔄 Groq failed, switching to local Whisper...")
+                                transcript_result = self.transcribe_locally(compressed_file, quiet=auto_transcribe)
+                        else:
+                            # Situation 2b: Still exceeds limit after compression, use local Whisper
                             if not auto_transcribe:
-                                print("🔄 Groq failed, switching to local MLX Whisper...")
-                            transcript_result = self.transcribe_with_mlx(compressed_file, quiet=auto_transcribe)
+                                print("⚠️  Still exceeds limit after compression, using local transcription")
+                            if LOCAL_WHISPER_AVAILABLE:
+                                if auto_transcribe:
+                                    print("💻 Local transcription...")
+                                transcript_result = self.transcribe_locally(compressed_file, quiet=auto_transcribe)
+                            else:
+                                if not auto_transcribe:
+                                    print("❌ Local Whisper unavailable, cannot transcribe large file")
+                                return False
                     else:
-                        # Situation 2b: Still exceeds limit after compression, use MLX
+                        # Compression failed, try local Whisper
                         if not auto_transcribe:
-                            print("⚠️  Still exceeds limit after compression, using MLX local transcription")
-                        if MLX_WHISPER_AVAILABLE:
-                            if auto_transcribe:
-                                print("💻 Local transcription...")
-                            transcript_result = self.transcribe_with_mlx(compressed_file, quiet=auto_transcribe)
+                            print("❌ Compression failed, trying local transcription")
+                        if LOCAL_WHISPER_AVAILABLE:
+                            transcript_result = self.transcribe_locally(audio_file, quiet=auto_transcribe)
                         else:
                             if not auto_transcribe:
-                                print("❌ MLX Whisper unavailable, cannot transcribe large file")
+                                print("❌ Local Whisper unavailable, transcription failed")
                             return False
-                else:
-                    # Compression failed, try MLX
-                    if not auto_transcribe:
-                        print("❌ Compression failed, trying local MLX transcription")
-                    if MLX_WHISPER_AVAILABLE:
-                        transcript_result = self.transcribe_with_mlx(audio_file, quiet=auto_transcribe)
-                    else:
-                        if not auto_transcribe:
-                            print("❌ MLX Whisper unavailable, transcription failed")
-                        return False
             
             else:
-                # Situation 3: Groq unavailable, use MLX
+                # Situation 3: Groq unavailable, use local Whisper
                 if not auto_transcribe:
-                    print("⚠️  Groq API unavailable, using local MLX transcription")
-                if MLX_WHISPER_AVAILABLE:
-                    transcript_result = self.transcribe_with_mlx(audio_file, quiet=auto_transcribe)
+                    print("⚠️  Groq API unavailable, using local transcription")
+                if LOCAL_WHISPER_AVAILABLE:
+                    transcript_result = self.transcribe_locally(audio_file, quiet=auto_transcribe)
                 else:
                     if not auto_transcribe:
-                        print("❌ MLX Whisper unavailable, transcription failed")
+                        print("❌ Local Whisper unavailable, transcription failed")
                     return False
             
             # Process transcription result
@@ -1185,6 +1088,7 @@ class ApplePodcastExplorer:
                 f.write(f"**Channel:** {channel_name}\n\n")
                 f.write("---\n\n")
                 f.write(transcript_result['text'])
+            record_output(transcript_filepath)
             
             if not auto_transcribe:
                 print(f"✅ Transcription complete: {episode_dir.name}/{transcript_filename}")
@@ -1354,9 +1258,9 @@ class ApplePodcastExplorer:
         else:
             print(f"\n🚀 Starting smart transcription of {total_count} files...")
             if GROQ_AVAILABLE:
-                print("💡 Will automatically choose the best transcription method: Groq API (ultra-fast) or MLX Whisper (local)")
+                print("💡 Will automatically choose the best transcription method: Groq API (ultra-fast) or local Whisper")
             else:
-                print("💡 Using MLX Whisper local transcription")
+                print("💡 Using local Whisper transcription")
         
         successful_transcripts = []  # Store successful transcription info (episode_title, channel_name, episode_dir)
         
@@ -1428,25 +1332,15 @@ class ApplePodcastExplorer:
                             print("⚠️  Transcript content too short, skipping summary generation")
                         continue
                     
-                    # Generate summary
-                    summary = self.generate_summary(transcript_text, episode_title)
-                    if not summary:
-                        if not auto_transcribe:
-                            print("❌ Summary generation failed")
-                        continue
-                    
-                    # Use English summary (no translation needed)
-                    final_summary = summary
-                    
-                    # Save summary
-                    summary_path = self.save_summary(final_summary, episode_title, channel_name, language_choice, episode_dir)
+                    # Generate summary, streamed into the summary file as it arrives
+                    summary_path = self.stream_summary(transcript_text, episode_title, channel_name, language_choice, episode_dir, quiet=auto_transcribe)
                     if summary_path:
                         if not auto_transcribe:
                             print(f"✅ Summary saved: {episode_dir.name}/summary.md")
                         summary_success_count += 1
                     else:
                         if not auto_transcribe:
-                            print("❌ Summary save failed")
+                            print("❌ Summary generation failed")
                         
                 except Exception as e:
                     if not auto_transcribe:
@@ -1531,25 +1425,54 @@ class ApplePodcastExplorer:
         
         print("✅ Visualization complete")
 
-    def generate_summary(self, transcript: str, title: str) -> str:
+    def generate_text(self, prompt: str, template: str) -> Optional[str]:
         """
-        Generate summary using Gemini API
+        Call Gemini through the on-disk response cache
+        
+        Args:
+            prompt: Prompt text
+            template: Prompt template version, part of the cache key
+        
+        Returns:
+            str: Response text, None if the response format is abnormal
+        """
+        def request(prompt):
+            throttle(GEMINI_API_HOST)
+            with limits.llm:
+                return self.gemini_client.generate(prompt)
+        
+        return cached_generate(self.model_name, template, prompt, request)
+    
+    def stream_text(self, prompt: str, template: str) -> Iterator[str]:
+        """
+        Stream a Gemini response through the on-disk response cache
+        
+        Args:
+            prompt: Prompt text
+            template: Prompt template version, part of the cache key
+        
+        Returns:
+            Iterator[str]: Response text chunks as they arrive
+        """
+        def request(prompt):
+            throttle(GEMINI_API_HOST)
+            with limits.llm:
+                yield from self.gemini_client.generate_stream(prompt)
+        
+        return cached_stream(self.model_name, template, prompt, request)
+    
+    def summary_prompt(self, transcript: str, title: str) -> str:
+        """
+        Build the single-request summary prompt
         
         Args:
             transcript: Transcript text
             title: Episode title
         
         Returns:
-            str: Generated summary, None if failed
+            str: Prompt text
         """
-        if not self.gemini_client:
-            print("❌ Gemini API not available, cannot generate summary")
-            return None
-        
-        try:
-            # print("✨ Generating summary...")  # 隐藏详细信息
-            
-            prompt = f"""
+        return f"""
             Please provide a comprehensive summary and analysis of this podcast episode transcript.
             
             Episode Title: {title}
@@ -1566,22 +1489,62 @@ class ApplePodcastExplorer:
             Transcript:
             {transcript}
             """
+    
+    def generate_summary(self, transcript: str, title: str) -> str:
+        """
+        Generate summary using Gemini API
+        
+        Args:
+            transcript: Transcript text
+            title: Episode title
+        
+        Returns:
+            str: Generated summary, None if failed
+        """
+        if not self.gemini_client:
+            print("❌ Gemini API not available, cannot generate summary")
+            return None
+        
+        try:
+            # Transcripts too long for one request are summarized section by section
+            if estimate_tokens(transcript) > SINGLE_PASS_MAX_TOKENS:
+                return self.generate_summary_map_reduce(transcript, title)
             
-            response = self.gemini_client.GenerativeModel(self.model_name).generate_content(prompt)
+            # print("✨ Generating summary...")  # 隐藏详细信息
             
-            # Handle the response properly
-            if hasattr(response, 'text'):
-                return response.text
-            elif hasattr(response, 'candidates') and response.candidates:
-                return response.candidates[0].content.parts[0].text
-            else:
-                print("❌ Gemini API response format abnormal")
-                return None
+            prompt = self.summary_prompt(transcript, title)
+            
+            result = self.generate_text(prompt, TEMPLATE_SUMMARY)
+            if result:
+                return result
+            print("❌ Gemini API response format abnormal")
+            return None
                 
         except Exception as e:
             print(f"❌ Summary generation failed: {e}")
             return None
     
+    def generate_summary_map_reduce(self, transcript: str, title: str) -> Optional[str]:
+        """
+        Summarize a transcript too long for one request: sections concurrently, then a reduce step
+        
+        Args:
+            transcript: Transcript text
+            title: Episode title
+        
+        Returns:
+            str: Generated summary (partial if some sections failed), None if failed
+        """
+        def generate(prompt):
+            return self.generate_text(prompt, TEMPLATE_SUMMARY_SECTIONS)
+        
+        result = map_reduce_summary(generate, transcript, title, workers=limits.llm_workers)
+        if result['failed']:
+            print(f"⚠️  {len(result['failed'])}/{result['sections']} transcript sections could not be summarized, summary is partial")
+        if result['summary'] and not result['reduced']:
+            print("⚠️  Combining section summaries failed, saving the section notes instead")
+        return result['summary']
+    
     def translate_to_chinese(self, text: str) -> str:
         """
         Translate text to Chinese
@@ -1601,27 +1564,71 @@ class ApplePodcastExplorer:
             
             prompt = f"Translate everything to Chinese accurately without missing anything:\n\n{text}"
             
-            response = self.gemini_client.GenerativeModel(self.model_name).generate_content(prompt)
-            
-            # Handle the response properly
-            if hasattr(response, 'text'):
-                return response.text
-            elif hasattr(response, 'candidates') and response.candidates:
-                return response.candidates[0].content.parts[0].text
-            else:
-                print("❌ Gemini API response format abnormal")
-                return None
+            result = self.generate_text(prompt, TEMPLATE_TRANSLATE)
+            if result:
+                return result
+            print("❌ Gemini API response format abnormal")
+            return None
                 
         except Exception as e:
             print(f"❌ Translation failed: {e}")
             return None
 
+    def stream_summary(self, transcript: str, episode_title: str, channel_name: str, language: str,
+                       episode_dir: Path = None, quiet: bool = False) -> Optional[str]:
+        """
+        Generate and save the summary with Gemini's streaming API: chunks are appended to a
+        .partial file as they arrive and it is renamed to the summary file once complete
+        
+        Args:
+            transcript: Transcript text
+            episode_title: Episode title
+            channel_name: Channel name
+            language: Language preference; for 'ch' the Chinese translation is streamed
+            episode_dir: Episode folder path
+            quiet: Don't print the time to first token
+        
+        Returns:
+            Optional[str]: Path to saved summary file, None if failed
+        """
+        if not self.gemini_client:
+            print("❌ Gemini API not available, cannot generate summary")
+            return None
+        
+        summary = None
+        if language == 'ch' or estimate_tokens(transcript) > SINGLE_PASS_MAX_TOKENS:
+            # Long transcripts go through the map-reduce path, which has nothing to stream
+            summary = self.generate_summary(transcript, episode_title)
+            if not summary:
+                return None
+            if language != 'ch':
+                return self.save_summary(summary, episode_title, channel_name, language, episode_dir)
+            if not quiet:
+                print("🔄 Translating to Chinese...")
+            prompt = f"Translate everything to Chinese accurately without missing anything:\n\n{summary}"
+            template = TEMPLATE_TRANSLATE
+        else:
+            prompt = self.summary_prompt(transcript, episode_title)
+            template = TEMPLATE_SUMMARY
+        
+        def report(seconds):
+            if not quiet:
+                print(f"⏱️  First token after {seconds:.1f}s")
+        
+        chunks = timed_chunks(self.stream_text(prompt, template), report)
+        summary_path = self.save_summary(chunks, episode_title, channel_name, language, episode_dir)
+        if summary_path is None and summary:
+            if not quiet:
+                print("⚠️  Translation failed, using English summary")
+            summary_path = self.save_summary(summary, episode_title, channel_name, 'en', episode_dir)
+        return summary_path
+
     def save_summary(self, summary: str, episode_title: str, channel_name: str, language: str, episode_dir: Path = None) -> Optional[str]:
         """
         Save summary to file
         
         Args:
-            summary: Generated summary
+            summary: Generated summary, or an iterable of text chunks to stream into the file
             episode_title: Episode title
             channel_name: Channel name
             language: Language preference
@@ -1645,14 +1652,16 @@ class ApplePodcastExplorer:
                 summary_filename = self.ensure_summary_filename_length(safe_channel, safe_title)
                 summary_filepath = self.root_output_dir / summary_filename
             
-            with open(summary_filepath, 'w', encoding='utf-8') as f:
-                f.write(f"# Summary: {episode_title}\n\n" if language == "en" else f"# 摘要: {episode_title}\n\n")
-                f.write(f"**Channel:** {channel_name}\n\n" if language == "en" else f"**频道:** {channel_name}\n\n")
-                f.write(f"**Summary Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n" if language == "en" else f"**摘要生成时间:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-                f.write(f"**Language:** {'English' if language == 'en' else 'Chinese'}\n\n")
-                f.write("---\n\n")
-                f.write("## Summary Content\n\n" if language == "en" else "## 摘要内容\n\n")
-                f.write(summary)
+            # The body may be a stream of chunks: written to a .partial file, renamed once complete
+            header = []
+            header.append(f"# Summary: {episode_title}\n\n" if language == "en" else f"# 摘要: {episode_title}\n\n")
+            header.append(f"**Channel:** {channel_name}\n\n" if language == "en" else f"**频道:** {channel_name}\n\n")
+            header.append(f"**Summary Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n" if language == "en" else f"**摘要生成时间:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+            header.append(f"**Language:** {'English' if language == 'en' else 'Chinese'}\n\n")
+            header.append("---\n\n")
+            header.append("## Summary Content\n\n" if language == "en" else "## 摘要内容\n\n")
+            write_stream(summary_filepath, ''.join(header), summary)
+            record_output(summary_filepath)
             
             return str(summary_filepath)
             
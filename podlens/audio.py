@@ -0,0 +1,293 @@
+"""
+音频处理工具 / Audio processing helpers
+
+压缩前先用 ffprobe 读取时长，由“大小 = 时长 × 码率”直接算出能放进 Groq 上传限制的最高码率，
+只需一次 ffmpeg 编码，而不是逐级尝试 64k → 48k → 32k → 24k。
+The duration is probed with ffprobe before compressing, and since size =
+duration × bitrate the highest bitrate that fits the Groq upload limit is
+computed up front, so one ffmpeg pass replaces trying 64k → 48k → 32k → 24k.
+
+长音频也可以在静音处切分为若干小于上传限制的片段并行转录，再按顺序拼接；只在相邻片段
+有重叠的硬切处去除重复的词。
+Long audio can instead be split at silences into chunks below the upload
+limit, transcribed in parallel, and stitched back in order; repeated words are
+removed only at hard cuts, where neighbouring chunks overlap.
+
+YouTube 音频下载使用转录专用的 yt-dlp 配置，直接生成大小合适的 16KHz 单声道 MP3。
+YouTube audio downloads use a transcription-specific yt-dlp profile that
+produces a suitably sized 16KHz mono MP3 directly.
+"""
+
+import re
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+# Groq API 文件大小上限 (MB) / Groq API file size limit (MB)
+GROQ_MAX_FILE_MB = 25
+
+# 16KHz (MPEG-2 Layer III) 可用的 MP3 码率，从高到低 / MP3 bitrates valid at 16KHz, highest first
+MP3_BITRATES_KBPS = (64, 56, 48, 40, 32, 24, 16)
+
+# 无法获取时长时的逐级回退 / Step-down ladder when the duration is unknown
+FALLBACK_BITRATES_KBPS = (64, 48, 32, 24)
+
+# 为 MP3 帧头与标签预留的余量 / Headroom for MP3 frame headers and tags
+SIZE_HEADROOM = 0.97
+
+
+def probe_duration(audio_file: Path) -> Optional[float]:
+    """
+    用 ffprobe 读取音频时长（秒），失败时返回 None
+    Read the audio duration in seconds with ffprobe, None on failure
+    """
+    try:
+        result = subprocess.run(
+            [
+                'ffprobe', '-v', 'error',
+                '-show_entries', 'format=duration',
+                '-of', 'default=noprint_wrappers=1:nokey=1',
+                str(Path(audio_file).resolve()),
+            ],
+            capture_output=True,
+            text=False,  # 字节模式避免编码问题 / Bytes mode avoids decoding issues
+            check=True,
+        )
+        duration = float(result.stdout.decode('utf-8', errors='ignore').strip())
+        return duration if duration > 0 else None
+    except (subprocess.CalledProcessError, FileNotFoundError, ValueError):
+        return None
+
+
+def candidate_bitrates(duration: Optional[float], max_mb: float = GROQ_MAX_FILE_MB) -> List[int]:
+    """
+    按优先顺序返回要尝试的码率 (kbps)：第一个就是能放进 max_mb 的最高码率，后面的仅作保险
+    Bitrates (kbps) to try in order: the first is the highest that fits max_mb,
+    the rest are only a safety net
+    """
+    if not duration:
+        return list(FALLBACK_BITRATES_KBPS)
+    budget_kbps = max_mb * 1024 * 1024 * 8 * SIZE_HEADROOM / duration / 1000
+    fitting = [bitrate for bitrate in MP3_BITRATES_KBPS if bitrate <= budget_kbps]
+    return fitting or [MP3_BITRATES_KBPS[-1]]
+
+
+def encode_mp3(input_file: Path, output_file: Path, bitrate_kbps: int):
+    """
+    编码为 16KHz 单声道 MP3，失败时抛出 subprocess.CalledProcessError
+    Encode to 16KHz mono MP3, raises subprocess.CalledProcessError on failure
+    """
+    subprocess.run(
+        [
+            'ffmpeg',
+            '-i', str(Path(input_file).resolve()),  # 绝对路径避免特殊字符问题 / Absolute path avoids special character issues
+            '-ar', '16000',                          # 降采样到 16KHz / Downsample to 16KHz
+            '-ac', '1',                              # 单声道 / Mono
+            '-b:a', f'{bitrate_kbps}k',
+            '-y',                                    # 覆盖输出文件 / Overwrite output file
+            str(Path(output_file).resolve()),
+        ],
+        capture_output=True,
+        text=False,  # 字节模式避免编码问题 / Bytes mode avoids decoding issues
+        check=True,
+    )
+
+
+
+# yt-dlp 转录下载配置：取最小的可用纯音频格式（opus/m4a，码率未知的也接受），
+# 一次转换为 16KHz 单声道 MP3，不再经过 192k 中间 MP3
+# yt-dlp transcription profile: the smallest suitable audio-only format
+# (opus/m4a, formats with an unknown bitrate accepted), converted once to
+# 16KHz mono MP3 with no 192k intermediate MP3
+YTDLP_TRANSCRIPTION_FORMAT = (
+    'worstaudio[acodec=opus][abr>=?40]/worstaudio[ext=m4a][abr>=?40]/worstaudio[abr>=?40]/bestaudio/best'
+)
+
+
+def ytdlp_transcription_opts(outtmpl: str) -> Dict:
+    """
+    转录用的 yt-dlp 选项；提取音频的后处理器由 ytdlp_extract_audio_args 按时长配置
+    yt-dlp options for transcription; the audio extraction postprocessor is
+    configured from the duration with ytdlp_extract_audio_args
+    """
+    return {
+        'format': YTDLP_TRANSCRIPTION_FORMAT,
+        'outtmpl': outtmpl,
+        'postprocessor_args': {'extractaudio': ['-ar', '16000', '-ac', '1']},
+        'quiet': True,
+        'no_warnings': True,
+        'noprogress': True,
+    }
+
+
+def ytdlp_extract_audio_args(duration: Optional[float]) -> Dict:
+    """
+    FFmpegExtractAudioPP 的参数：能放进 Groq 上传限制的最高码率（时长未知时为 64k）
+    FFmpegExtractAudioPP arguments: the highest bitrate that fits the Groq
+    upload limit (64k when the duration is unknown)
+    """
+    return {'preferredcodec': 'mp3', 'preferredquality': str(candidate_bitrates(duration)[0])}
+
+
+# 分片转录参数 / Chunked transcription parameters
+CHUNK_SECONDS = 600                 # 每片最长时长，64kbps 下约 4.7MB / Max chunk length, ~4.7MB at 64kbps
+CHUNK_BITRATE_KBPS = 64
+CHUNK_OVERLAP_SECONDS = 2.0         # 找不到静音、硬切时的重叠 / Overlap when no silence is found and the cut is hard
+SILENCE_SEARCH_SECONDS = 60.0       # 在上限前多长范围内寻找静音 / How far before the limit to look for a silence
+SILENCE_NOISE_DB = -35
+SILENCE_MIN_SECONDS = 0.5
+
+# 与上一片段重叠的片段文件名后缀 / File name suffix of chunks that overlap the previous one
+OVERLAP_SUFFIX = '_overlap'
+
+# 拼接时比较的最大重叠长度（词或字符）/ Max overlap compared when stitching (words or characters)
+MAX_OVERLAP_TOKENS = 40
+
+_SILENCE_START = re.compile(r'silence_start:\s*(-?[\d.]+)')
+_SILENCE_END = re.compile(r'silence_end:\s*(-?[\d.]+)')
+
+
+def detect_silences(audio_file: Path, noise_db: int = SILENCE_NOISE_DB,
+                    min_seconds: float = SILENCE_MIN_SECONDS) -> List[Tuple[float, float]]:
+    """
+    用 ffmpeg silencedetect 找出静音区间（秒）
+    Find silent intervals (seconds) with ffmpeg silencedetect
+    """
+    result = subprocess.run(
+        [
+            'ffmpeg', '-hide_banner', '-nostats',
+            '-i', str(Path(audio_file).resolve()),
+            '-af', f'silencedetect=noise={noise_db}dB:d={min_seconds}',
+            '-f', 'null', '-',
+        ],
+        capture_output=True,
+        text=False,  # 字节模式避免编码问题 / Bytes mode avoids decoding issues
+        check=True,
+    )
+    silences = []
+    start = None
+    for line in result.stderr.decode('utf-8', errors='ignore').splitlines():
+        match = _SILENCE_START.search(line)
+        if match:
+            start = max(0.0, float(match.group(1)))
+            continue
+        match = _SILENCE_END.search(line)
+        if match and start is not None:
+            silences.append((start, float(match.group(1))))
+            start = None
+    return silences
+
+
+def plan_chunks(duration: float, silences: List[Tuple[float, float]], chunk_seconds: float = CHUNK_SECONDS,
+                overlap: float = CHUNK_OVERLAP_SECONDS) -> List[Tuple[float, float, bool]]:
+    """
+    规划 (起点, 终点, 是否与上一片段重叠) 片段：尽量在上限前最后一个静音的中点切分，
+    找不到静音时硬切并保留重叠
+    Plan (start, end, overlaps previous chunk) chunks: cut at the middle of the last
+    silence before the limit, or cut hard and keep an overlap when there is none
+    """
+    midpoints = [(start + end) / 2 for start, end in silences]
+    chunks = []
+    start = 0.0
+    overlapped = False
+    while duration - start > chunk_seconds:
+        limit = start + chunk_seconds
+        cuts = [m for m in midpoints if max(start, limit - SILENCE_SEARCH_SECONDS) < m <= limit]
+        chunks.append((start, cuts[-1] if cuts else limit, overlapped))
+        if cuts:
+            start = cuts[-1]
+            overlapped = False
+        else:
+            start = limit - overlap
+            overlapped = True
+    chunks.append((start, duration, overlapped))
+    return chunks
+
+
+def split_audio(audio_file: Path, chunk_dir: Path, chunk_seconds: float = CHUNK_SECONDS) -> List[Path]:
+    """
+    在静音处把音频切分为 16KHz 单声道 MP3 片段
+    Split audio at silences into 16KHz mono MP3 chunks
+
+    Returns:
+        List[Path]: 按顺序排列的片段文件；与上一片段重叠的片段以 _overlap 结尾，见 chunk_overlaps
+            Chunk files in order; chunks overlapping the previous one end in _overlap, see chunk_overlaps
+
+    Raises:
+        ValueError: 无法读取时长 / Duration could not be read
+        subprocess.CalledProcessError: ffmpeg 失败 / ffmpeg failed
+    """
+    duration = probe_duration(audio_file)
+    if not duration:
+        raise ValueError(f"could not read duration of {audio_file}")
+    chunks = plan_chunks(duration, detect_silences(audio_file), chunk_seconds)
+
+    chunk_dir.mkdir(parents=True, exist_ok=True)
+    chunk_files = []
+    for index, (start, end, overlapped) in enumerate(chunks):
+        chunk_file = chunk_dir / f"chunk_{index:03d}{OVERLAP_SUFFIX if overlapped else ''}.mp3"
+        subprocess.run(
+            [
+                'ffmpeg',
+                '-ss', f'{start:.3f}',
+                '-t', f'{end - start:.3f}',
+                '-i', str(Path(audio_file).resolve()),
+                '-ar', '16000',
+                '-ac', '1',
+                '-b:a', f'{CHUNK_BITRATE_KBPS}k',
+                '-y',
+                str(chunk_file.resolve()),
+            ],
+            capture_output=True,
+            text=False,
+            check=True,
+        )
+        chunk_files.append(chunk_file)
+    return chunk_files
+
+
+def chunk_overlaps(chunk_files: List[Path]) -> List[bool]:
+    """
+    split_audio 生成的各片段是否与上一片段重叠（硬切）；静音处切分的边界没有重叠
+    Whether each chunk from split_audio overlaps the previous one (hard cut); silence cuts do not overlap
+    """
+    return [Path(chunk_file).stem.endswith(OVERLAP_SUFFIX) for chunk_file in chunk_files]
+
+
+def _normalize_token(token: str) -> str:
+    return re.sub(r'[^\w]', '', token.lower())
+
+
+def _overlap_length(previous: List[str], tokens: List[str], min_tokens: int) -> int:
+    """previous 结尾与 tokens 开头相同的最长长度 / Longest run that ends previous and starts tokens"""
+    tail = [_normalize_token(t) for t in previous[-MAX_OVERLAP_TOKENS:]]
+    head = [_normalize_token(t) for t in tokens[:MAX_OVERLAP_TOKENS]]
+    for size in range(min(len(tail), len(head)), min_tokens - 1, -1):
+        if tail[-size:] == head[:size]:
+            return size
+    return 0
+
+
+def merge_chunk_texts(texts: List[str], overlaps: List[bool]) -> str:
+    """
+    按顺序拼接片段转录，只在与上一片段重叠的边界去掉重复的词（无空格的中文按字符比较）；
+    静音处的边界原样拼接，不会误删真实重复的词
+    Stitch chunk transcripts in order, dropping words repeated across the boundary only
+    where a chunk overlaps the previous one (text without spaces, such as Chinese, is
+    compared by character); silence cuts are joined as is, so genuinely repeated words stay
+
+    Args:
+        texts: 各片段的转录 / Transcript of each chunk
+        overlaps: 各片段是否与上一片段重叠，通常为 chunk_overlaps(chunk_files)
+            Whether each chunk overlaps the previous one, usually chunk_overlaps(chunk_files)
+    """
+    spaced = any(' ' in text.strip() for text in texts)
+    min_tokens = 2 if spaced else 4
+    merged = []
+    for text, overlapped in zip(texts, overlaps):
+        tokens = text.split() if spaced else list(text.strip())
+        if merged and overlapped:
+            tokens = tokens[_overlap_length(merged, tokens, min_tokens):]
+        merged.extend(tokens)
+    return (' ' if spaced else '').join(merged)
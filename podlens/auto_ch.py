@@ -9,12 +9,20 @@ import schedule
 import threading
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 import json
 import sys
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from . import get_model_name
+from .concurrency import configure_from_settings, DEFAULT_NETWORK_WORKERS, DEFAULT_CPU_WORKERS, DEFAULT_LLM_WORKERS
+from .pipeline import build_media_pipeline, DEFAULT_STAGE_WORKERS, DEFAULT_QUEUE_SIZE
+from .feed_cache import FeedCache, DEFAULT_LOOKUP_TTL_DAYS
+from .llm_cache import get_llm_cache, disable_llm_cache
+from .storage import ProcessedStore, migrate_status_file, KIND_PODCAST, KIND_YOUTUBE
+from .notion_manifest import NOTION_MANIFEST_FILE
+from .video_cache import get_video_cache
 
 # Enhanced .env loading function
 def load_env_robust():
@@ -57,7 +65,16 @@ class ConfigManager:
         self.default_settings = {
             'run_frequency': 1.0,  # 小时
             'monitor_podcast': True,
-            'monitor_youtube': True
+            'monitor_youtube': True,
+            'network_workers': DEFAULT_NETWORK_WORKERS,  # 并发检查订阅源 / 下载数
+            'cpu_workers': DEFAULT_CPU_WORKERS,          # 并发 ffmpeg / 本地转录任务数
+            'llm_workers': DEFAULT_LLM_WORKERS,          # 并发 Gemini 调用数
+            'download_workers': DEFAULT_STAGE_WORKERS['download'],  # 并行下载数
+            'compress_workers': DEFAULT_STAGE_WORKERS['compress'],  # 并行 ffmpeg 压缩数
+            'transcribe_workers': DEFAULT_STAGE_WORKERS['transcribe'],  # 并行转录数
+            'summarize_workers': DEFAULT_STAGE_WORKERS['summarize'],  # 并行摘要数
+            'pipeline_queue_size': DEFAULT_QUEUE_SIZE,  # 阶段之间缓冲的条目数
+            'lookup_ttl_days': DEFAULT_LOOKUP_TTL_DAYS  # iTunes 频道解析结果的有效天数
         }
     
     def load_settings(self) -> Dict:
@@ -79,10 +96,13 @@ class ConfigManager:
                         value = value.strip()
                         
                         # 类型转换
-                        if key == 'run_frequency':
+                        if key in ['run_frequency', 'lookup_ttl_days']:
                             settings[key] = float(value)
                         elif key in ['monitor_podcast', 'monitor_youtube']:
                             settings[key] = value.lower() in ('true', '1', 'yes')
+                        elif key in ['network_workers', 'cpu_workers', 'llm_workers', 'download_workers',
+                                     'compress_workers', 'transcribe_workers', 'summarize_workers', 'pipeline_queue_size']:
+                            settings[key] = max(1, int(value))
                         else:
                             settings[key] = value
             
@@ -106,6 +126,16 @@ class ConfigManager:
                 f.write(f"monitor_podcast = {str(settings['monitor_podcast']).lower()}\n\n")
                 f.write("# 是否监控YouTube (my_tube.md)\n")
                 f.write(f"monitor_youtube = {str(settings['monitor_youtube']).lower()}\n\n")
+                f.write("# 并发上限：网络 I/O、ffmpeg/CPU 任务和 Gemini 调用\n")
+                f.write(f"network_workers = {settings.get('network_workers', DEFAULT_NETWORK_WORKERS)}\n")
+                f.write(f"cpu_workers = {settings.get('cpu_workers', DEFAULT_CPU_WORKERS)}\n")
+                f.write(f"llm_workers = {settings.get('llm_workers', DEFAULT_LLM_WORKERS)}\n\n")
+                f.write("# 分阶段流水线：每个阶段的工作线程数以及阶段之间的队列大小\n")
+                for stage, workers in DEFAULT_STAGE_WORKERS.items():
+                    f.write(f"{stage}_workers = {settings.get(f'{stage}_workers', workers)}\n")
+                f.write(f"pipeline_queue_size = {settings.get('pipeline_queue_size', DEFAULT_QUEUE_SIZE)}\n\n")
+                f.write("# my_pod.md 条目重新通过 iTunes 搜索解析前的天数\n")
+                f.write(f"lookup_ttl_days = {settings.get('lookup_ttl_days', DEFAULT_LOOKUP_TTL_DAYS)}\n\n")
                 f.write("# 邮件通知设置\n")
                 f.write("email_function = false\n")
                 f.write("user_email = #user@example.com\n")
@@ -235,10 +265,22 @@ class ProgressTracker:
     
     def __init__(self):
         self.status_file = Path(".podlens/status.json")
+        self.lock = threading.RLock()  # 并发订阅任务共享
+        self.store = ProcessedStore()  # 已处理条目，带索引 (.podlens/processed.db)
+        self.migrate_legacy_status()
         self.load_status()
     
+    def migrate_legacy_status(self):
+        """一次性导入旧 status.json 中的已处理列表"""
+        try:
+            migrated = migrate_status_file(self.status_file, self.store)
+            if migrated:
+                print(f"✅ 已将 {migrated} 条已处理记录从 status.json 迁移到 {self.store.db_file}")
+        except Exception as e:
+            print(f"⚠️ 迁移状态文件失败: {e}")
+    
     def load_status(self):
-        """加载处理状态"""
+        """加载运行状态（已处理条目保存在存储中）"""
         try:
             # 确保目录存在
             self.status_file.parent.mkdir(exist_ok=True)
@@ -248,55 +290,42 @@ class ProgressTracker:
                     self.status = json.load(f)
             else:
                 self.status = {
-                    "podcasts": {},
-                    "youtube": {},
                     "last_run": None,
                     "total_runs": 0
                 }
         except Exception as e:
             print(f"⚠️ 加载状态文件失败: {e}")
             self.status = {
-                "podcasts": {},
-                "youtube": {},
                 "last_run": None,
                 "total_runs": 0
             }
     
     def save_status(self):
-        """保存处理状态"""
+        """保存运行状态"""
         try:
-            with open(self.status_file, 'w', encoding='utf-8') as f:
-                json.dump(self.status, f, ensure_ascii=False, indent=2)
+            with self.lock:
+                tmp_file = self.status_file.with_suffix('.json.tmp')
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.status, f, ensure_ascii=False, indent=2)
+                tmp_file.replace(self.status_file)
         except Exception as e:
             print(f"❌ 保存状态文件失败: {e}")
     
-    def is_episode_processed(self, podcast_name: str, episode_title: str) -> bool:
-        """检查剧集是否已处理"""
-        if podcast_name not in self.status["podcasts"]:
-            return False
-        return episode_title in self.status["podcasts"][podcast_name]
+    def is_episode_processed(self, podcast_name: str, episode_title: str, item_key: Optional[str] = None) -> bool:
+        """检查剧集是否已处理（以 GUID / 音频地址为键，标题仅用于匹配旧记录）"""
+        return self.store.contains(KIND_PODCAST, podcast_name, item_key or episode_title, legacy_title=episode_title)
     
-    def is_video_processed(self, channel_name: str, video_title: str) -> bool:
-        """检查视频是否已处理"""
-        if channel_name not in self.status["youtube"]:
-            return False
-        return video_title in self.status["youtube"][channel_name]
+    def is_video_processed(self, channel_name: str, video_title: str, video_id: Optional[str] = None) -> bool:
+        """检查视频是否已处理（以视频ID为键，标题仅用于匹配旧记录）"""
+        return self.store.contains(KIND_YOUTUBE, channel_name, video_id or video_title, legacy_title=video_title)
     
-    def mark_episode_processed(self, podcast_name: str, episode_title: str):
-        """标记剧集已处理"""
-        if podcast_name not in self.status["podcasts"]:
-            self.status["podcasts"][podcast_name] = []
-        if episode_title not in self.status["podcasts"][podcast_name]:
-            self.status["podcasts"][podcast_name].append(episode_title)
-        self.save_status()
+    def mark_episode_processed(self, podcast_name: str, episode_title: str, item_key: Optional[str] = None):
+        """标记剧集已处理，标题仅作为显示信息保存"""
+        self.store.add(KIND_PODCAST, podcast_name, item_key or episode_title, episode_title)
     
-    def mark_video_processed(self, channel_name: str, video_title: str):
-        """标记视频已处理"""
-        if channel_name not in self.status["youtube"]:
-            self.status["youtube"][channel_name] = []
-        if video_title not in self.status["youtube"][channel_name]:
-            self.status["youtube"][channel_name].append(video_title)
-        self.save_status()
+    def mark_video_processed(self, channel_name: str, video_title: str, video_id: Optional[str] = None):
+        """标记视频已处理，标题仅作为显示信息保存"""
+        self.store.add(KIND_YOUTUBE, channel_name, video_id or video_title, video_title)
 
 
 class AutoEngine:
@@ -309,21 +338,26 @@ class AutoEngine:
         
         # 加载设置
         self.settings = self.config_manager.load_settings()
+        configure_from_settings(self.settings)
         
         # 使用完善的探索器
         self.apple_explorer = ApplePodcastExplorer()
         self.podnet = Podnet()
+        self.apple_explorer.channel_lookup.ttl_days = self.settings['lookup_ttl_days']
     
-    def process_podcast(self, podcast_name: str) -> bool:
+    def process_podcast(self, podcast_name: str, pipeline=None) -> bool:
         """处理单个播客 - 使用自动化方法"""
         try:
             print(f"🔍 检查播客: {podcast_name}")
             
             # 使用自动化方法处理（现在传入progress_tracker来做重复检查）
-            success, episode_title = self.apple_explorer.auto_process_latest_episode(podcast_name, self.progress_tracker)
+            success, episode_title = self.apple_explorer.auto_process_latest_episode(podcast_name, self.progress_tracker, pipeline=pipeline)
             
             if success:
-                print(f"✅ {podcast_name} 处理完成")
+                if pipeline:
+                    print(f"📋 {podcast_name} 新剧集已加入处理队列")
+                else:
+                    print(f"✅ {podcast_name} 处理完成")
                 # 注意：已在core方法中标记为已处理，无需重复标记
                 return True
             else:
@@ -338,16 +372,19 @@ class AutoEngine:
             print(f"❌ 处理播客 {podcast_name} 异常: {e}")
             return False
     
-    def process_youtube(self, channel_name: str) -> bool:
+    def process_youtube(self, channel_name: str, pipeline=None) -> bool:
         """处理YouTube频道 - 使用自动化方法"""
         try:
             print(f"🔍 检查YouTube频道: @{channel_name}")
             
             # 使用自动化方法处理（现在传入progress_tracker来做重复检查）
-            success, video_title = self.podnet.auto_process_channel_latest_video(channel_name, self.progress_tracker)
+            success, video_title = self.podnet.auto_process_channel_latest_video(channel_name, self.progress_tracker, pipeline=pipeline)
             
             if success:
-                print(f"✅ @{channel_name} 处理完成")
+                if pipeline:
+                    print(f"📋 @{channel_name} 新视频已加入处理队列")
+                else:
+                    print(f"✅ @{channel_name} 处理完成")
                 # 注意：已在core方法中标记为已处理，无需重复标记
                 return True
             else:
@@ -370,31 +407,31 @@ class AutoEngine:
         self.progress_tracker.status["last_run"] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         self.progress_tracker.save_status()
         
-        # 处理播客（只有启用时）
-        if self.settings['monitor_podcast']:
-            podcasts = self.config_manager.load_podcast_list()
-            podcast_success = 0
-            for podcast in podcasts:
-                if self.process_podcast(podcast):
-                    podcast_success += 1
-                time.sleep(2)  # 避免API限制
-        else:
-            podcasts = []
-            podcast_success = 0
-        
-        # 处理YouTube（只有启用时）
-        if self.settings['monitor_youtube']:
-            channels = self.config_manager.load_youtube_list()
-            youtube_success = 0
-            for channel in channels:
-                if self.process_youtube(channel):
-                    youtube_success += 1
-                time.sleep(2)  # 避免API限制
-        else:
-            channels = []
-            youtube_success = 0
+        podcasts = self.config_manager.load_podcast_list() if self.settings['monitor_podcast'] else []
+        channels = self.config_manager.load_youtube_list() if self.settings['monitor_youtube'] else []
+        
+        # 并行检查所有订阅；新内容进入 下载 → 压缩 → 转录 → 摘要 分阶段流水线，并在下方等待处理完成
+        pipeline = build_media_pipeline(self.settings)
+        pipeline.start()
+        with ThreadPoolExecutor(max_workers=self.settings['network_workers']) as pool:
+            podcast_futures = [pool.submit(self.process_podcast, podcast, pipeline) for podcast in podcasts]
+            youtube_futures = [pool.submit(self.process_youtube, channel, pipeline) for channel in channels]
+            podcast_success = sum(1 for future in podcast_futures if future.result())
+            youtube_success = sum(1 for future in youtube_futures if future.result())
+        
+        # 等待已排队的内容流经所有阶段
+        pipeline.close()
+        # 写入本次检查收集的订阅源校验信息和视频元数据
+        self.apple_explorer.feed_cache.flush()
+        get_video_cache().flush()
+        episodes_done = sum(1 for job in pipeline.completed if job['processor'] is self.apple_explorer)
+        videos_done = len(pipeline.completed) - episodes_done
         
         print(f"✅ 检查完成 - 播客: {podcast_success}/{len(podcasts)}, YouTube: {youtube_success}/{len(channels)}")
+        print(f"📦 流水线处理完成 - 剧集: {episodes_done}, 视频: {videos_done}, 失败: {len(pipeline.failed)}")
+        for job in pipeline.failed:
+            if job.get('error'):
+                print(f"❌ {job['title'][:50]}... 失败于 {job['error']}")
         
         # 保存最终状态
         self.progress_tracker.save_status()
@@ -457,6 +494,18 @@ class AutoEngine:
         print(f"  运行频率: {self.settings['run_frequency']} 小时")
         print(f"  监控播客: {'启用' if self.settings['monitor_podcast'] else '禁用'}")
         print(f"  监控YouTube: {'启用' if self.settings['monitor_youtube'] else '禁用'}")
+        print(f"  已处理: 剧集 {self.progress_tracker.store.count(KIND_PODCAST)}, 视频 {self.progress_tracker.store.count(KIND_YOUTUBE)}")
+        print(f"  并发上限: 网络 {self.settings['network_workers']}, CPU {self.settings['cpu_workers']}, LLM {self.settings['llm_workers']}")
+        print(f"  流水线线程: 下载 {self.settings['download_workers']}, 压缩 {self.settings['compress_workers']}, 转录 {self.settings['transcribe_workers']}, 摘要 {self.settings['summarize_workers']} (队列大小 {self.settings['pipeline_queue_size']})")
+        
+        feed_stats = FeedCache().stats()
+        if feed_stats['requests']:
+            print(f"  订阅源缓存: 命中 {feed_stats['hits']}/{feed_stats['requests']} ({feed_stats['hit_rate']:.0%}), "
+                  f"节省 {feed_stats['bytes_saved'] / (1024 * 1024):.1f}MB, 已下载 {feed_stats['bytes_downloaded'] / (1024 * 1024):.1f}MB")
+        
+        llm_stats = get_llm_cache().stats()
+        if llm_stats['entries']:
+            print(f"  LLM 缓存: {llm_stats['entries']} 条响应, {llm_stats['size_mb']:.1f}MB")
         
         if self.settings['monitor_podcast']:
             podcasts = self.config_manager.load_podcast_list()
@@ -624,11 +673,13 @@ def run_notion_sync():
         print(f"❌ Notion同步失败: {e}")
 
 def clear_notion_cache():
-    """清理Notion缓存"""
-    cache_file = Path('.podlens/notion_cache.json')
+    """清理Notion缓存和同步清单"""
+    cache_files = [Path('.podlens/notion_cache.json'), NOTION_MANIFEST_FILE]
     try:
-        if cache_file.exists():
-            cache_file.unlink()
+        existing = [cache_file for cache_file in cache_files if cache_file.exists()]
+        if existing:
+            for cache_file in existing:
+                cache_file.unlink()
             print("✅ Notion缓存已清理")
             print("ℹ️  下次同步时将重新构建缓存")
         else:
@@ -636,6 +687,24 @@ def clear_notion_cache():
     except Exception as e:
         print(f"❌ 清理缓存失败: {e}")
 
+def refresh_podcast_lookups():
+    """重新通过 iTunes 搜索解析 my_pod.md 中的所有播客"""
+    config_manager = ConfigManager()
+    podcasts = config_manager.load_podcast_list()
+    if not podcasts:
+        print("ℹ️  my_pod.md 中没有播客")
+        return
+    
+    explorer = ApplePodcastExplorer()
+    print(f"🔄 正在刷新 {len(podcasts)} 个播客的解析结果...")
+    for podcast_name in podcasts:
+        channel = explorer.resolve_podcast_channel(podcast_name, refresh=True)
+        if channel:
+            print(f"✅ {podcast_name} → {channel['name']} ({channel['feed_url']})")
+        else:
+            explorer.channel_lookup.invalidate(podcast_name)
+            print(f"❌ 未找到 {podcast_name}")
+
 def main():
     """主函数用于命令行接口"""
     parser = argparse.ArgumentParser(description='PodLens 自动化服务')
@@ -649,9 +718,14 @@ def main():
     parser.add_argument('--notiontoken', metavar='TOKEN', help='配置Notion token')
     parser.add_argument('--notionpage', metavar='PAGE_ID', help='配置Notion页面ID')
     parser.add_argument('--notion-clear-cache', action='store_true', help='清理Notion缓存')
+    parser.add_argument('--refresh-lookups', action='store_true', help='重新通过 iTunes 搜索解析 my_pod.md 中的播客')
+    parser.add_argument('--no-cache', action='store_true', help='跳过 LLM 响应缓存')
     
     args = parser.parse_args()
     
+    if args.no_cache:
+        disable_llm_cache()
+    
     if args.status:
         show_status()
     elif args.email:
@@ -718,6 +792,8 @@ def main():
         update_notion_settings(page_id=args.notionpage)
     elif args.notion_clear_cache:
         clear_notion_cache()
+    elif args.refresh_lookups:
+        refresh_podcast_lookups()
     else:
         start_automation()
 
@@ -10,12 +10,20 @@ import schedule
 import threading
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 import json
 import sys
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from . import get_model_name
+from .concurrency import configure_from_settings, DEFAULT_NETWORK_WORKERS, DEFAULT_CPU_WORKERS, DEFAULT_LLM_WORKERS
+from .pipeline import build_media_pipeline, DEFAULT_STAGE_WORKERS, DEFAULT_QUEUE_SIZE
+from .feed_cache import FeedCache, DEFAULT_LOOKUP_TTL_DAYS
+from .llm_cache import get_llm_cache, disable_llm_cache
+from .storage import ProcessedStore, migrate_status_file, KIND_PODCAST, KIND_YOUTUBE
+from .notion_manifest import NOTION_MANIFEST_FILE
+from .video_cache import get_video_cache
 
 # Enhanced .env loading function
 def load_env_robust():
@@ -54,7 +62,16 @@ class ConfigManager:
         self.default_settings = {
             'run_frequency': 1.0,  # hours
             'monitor_podcast': True,
-            'monitor_youtube': True
+            'monitor_youtube': True,
+            'network_workers': DEFAULT_NETWORK_WORKERS,  # Concurrent feed checks / downloads
+            'cpu_workers': DEFAULT_CPU_WORKERS,          # Concurrent ffmpeg / local transcription jobs
+            'llm_workers': DEFAULT_LLM_WORKERS,          # Concurrent Gemini calls
+            'download_workers': DEFAULT_STAGE_WORKERS['download'],  # Parallel downloads
+            'compress_workers': DEFAULT_STAGE_WORKERS['compress'],  # Parallel ffmpeg compressions
+            'transcribe_workers': DEFAULT_STAGE_WORKERS['transcribe'],  # Parallel transcriptions
+            'summarize_workers': DEFAULT_STAGE_WORKERS['summarize'],  # Parallel summaries
+            'pipeline_queue_size': DEFAULT_QUEUE_SIZE,  # Items buffered between stages
+            'lookup_ttl_days': DEFAULT_LOOKUP_TTL_DAYS  # Days before a resolved iTunes channel is looked up again
         }
     
     def load_settings(self) -> Dict:
@@ -76,10 +93,13 @@ class ConfigManager:
                         value = value.strip()
                         
                         # Type conversion
-                        if key == 'run_frequency':
+                        if key in ['run_frequency', 'lookup_ttl_days']:
                             settings[key] = float(value)
                         elif key in ['monitor_podcast', 'monitor_youtube']:
                             settings[key] = value.lower() in ('true', '1', 'yes')
+                        elif key in ['network_workers', 'cpu_workers', 'llm_workers', 'download_workers',
+                                     'compress_workers', 'transcribe_workers', 'summarize_workers', 'pipeline_queue_size']:
+                            settings[key] = max(1, int(value))
                         else:
                             settings[key] = value
             
@@ -103,6 +123,16 @@ class ConfigManager:
                 f.write(f"monitor_podcast = {str(settings['monitor_podcast']).lower()}\n\n")
                 f.write("# Whether to monitor YouTube (my_tube.md)\n")
                 f.write(f"monitor_youtube = {str(settings['monitor_youtube']).lower()}\n\n")
+                f.write("# Concurrency limits: network I/O, ffmpeg/CPU work and Gemini calls\n")
+                f.write(f"network_workers = {settings.get('network_workers', DEFAULT_NETWORK_WORKERS)}\n")
+                f.write(f"cpu_workers = {settings.get('cpu_workers', DEFAULT_CPU_WORKERS)}\n")
+                f.write(f"llm_workers = {settings.get('llm_workers', DEFAULT_LLM_WORKERS)}\n\n")
+                f.write("# Staged pipeline: workers per stage and queue size between stages\n")
+                for stage, workers in DEFAULT_STAGE_WORKERS.items():
+                    f.write(f"{stage}_workers = {settings.get(f'{stage}_workers', workers)}\n")
+                f.write(f"pipeline_queue_size = {settings.get('pipeline_queue_size', DEFAULT_QUEUE_SIZE)}\n\n")
+                f.write("# Days before a my_pod.md entry is resolved against iTunes search again\n")
+                f.write(f"lookup_ttl_days = {settings.get('lookup_ttl_days', DEFAULT_LOOKUP_TTL_DAYS)}\n\n")
                 f.write("# Email notification settings\n")
                 f.write("email_function = false\n")
                 f.write("user_email = #user@example.com\n")
@@ -232,10 +262,22 @@ class ProgressTracker:
     
     def __init__(self):
         self.status_file = Path(".podlens/status.json")
+        self.lock = threading.RLock()  # Shared by concurrent subscription workers
+        self.store = ProcessedStore()  # Processed items, indexed (.podlens/processed.db)
+        self.migrate_legacy_status()
         self.load_status()
     
+    def migrate_legacy_status(self):
+        """One-time import of the processed lists from an old status.json"""
+        try:
+            migrated = migrate_status_file(self.status_file, self.store)
+            if migrated:
+                print(f"✅ Migrated {migrated} processed items from status.json to {self.store.db_file}")
+        except Exception as e:
+            print(f"⚠️ Failed to migrate status file: {e}")
+    
     def load_status(self):
-        """Load processing status"""
+        """Load run status (processed items live in the store)"""
         try:
             # Ensure directory exists
             self.status_file.parent.mkdir(exist_ok=True)
@@ -245,55 +287,42 @@ class ProgressTracker:
                     self.status = json.load(f)
             else:
                 self.status = {
-                    "podcasts": {},
-                    "youtube": {},
                     "last_run": None,
                     "total_runs": 0
                 }
         except Exception as e:
             print(f"⚠️ Failed to load status file: {e}")
             self.status = {
-                "podcasts": {},
-                "youtube": {},
                 "last_run": None,
                 "total_runs": 0
             }
     
     def save_status(self):
-        """Save processing status"""
+        """Save run status"""
         try:
-            with open(self.status_file, 'w', encoding='utf-8') as f:
-                json.dump(self.status, f, ensure_ascii=False, indent=2)
+            with self.lock:
+                tmp_file = self.status_file.with_suffix('.json.tmp')
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.status, f, ensure_ascii=False, indent=2)
+                tmp_file.replace(self.status_file)
         except Exception as e:
             print(f"❌ Failed to save status file: {e}")
     
-    def is_episode_processed(self, podcast_name: str, episode_title: str) -> bool:
-        """Check if episode has been processed"""
-        if podcast_name not in self.status["podcasts"]:
-            return False
-        return episode_title in self.status["podcasts"][podcast_name]
+    def is_episode_processed(self, podcast_name: str, episode_title: str, item_key: Optional[str] = None) -> bool:
+        """Check if episode has been processed (keyed by GUID / enclosure URL, title only matches legacy records)"""
+        return self.store.contains(KIND_PODCAST, podcast_name, item_key or episode_title, legacy_title=episode_title)
     
-    def is_video_processed(self, channel_name: str, video_title: str) -> bool:
-        """Check if video has been processed"""
-        if channel_name not in self.status["youtube"]:
-            return False
-        return video_title in self.status["youtube"][channel_name]
+    def is_video_processed(self, channel_name: str, video_title: str, video_id: Optional[str] = None) -> bool:
+        """Check if video has been processed (keyed by video ID, title only matches legacy records)"""
+        return self.store.contains(KIND_YOUTUBE, channel_name, video_id or video_title, legacy_title=video_title)
     
-    def mark_episode_processed(self, podcast_name: str, episode_title: str):
-        """Mark episode as processed"""
-        if podcast_name not in self.status["podcasts"]:
-            self.status["podcasts"][podcast_name] = []
-        if episode_title not in self.status["podcasts"][podcast_name]:
-            self.status["podcasts"][podcast_name].append(episode_title)
-        self.save_status()
+    def mark_episode_processed(self, podcast_name: str, episode_title: str, item_key: Optional[str] = None):
+        """Mark episode as processed, the title is kept for display only"""
+        self.store.add(KIND_PODCAST, podcast_name, item_key or episode_title, episode_title)
     
-    def mark_video_processed(self, channel_name: str, video_title: str):
-        """Mark video as processed"""
-        if channel_name not in self.status["youtube"]:
-            self.status["youtube"][channel_name] = []
-        if video_title not in self.status["youtube"][channel_name]:
-            self.status["youtube"][channel_name].append(video_title)
-        self.save_status()
+    def mark_video_processed(self, channel_name: str, video_title: str, video_id: Optional[str] = None):
+        """Mark video as processed, the title is kept for display only"""
+        self.store.add(KIND_YOUTUBE, channel_name, video_id or video_title, video_title)
 
 
 class AutoEngine:
@@ -306,21 +335,26 @@ class AutoEngine:
         
         # Load settings
         self.settings = self.config_manager.load_settings()
+        configure_from_settings(self.settings)
         
         # Use perfected explorers
         self.apple_explorer = ApplePodcastExplorer()
         self.podnet = Podnet()
+        self.apple_explorer.channel_lookup.ttl_days = self.settings['lookup_ttl_days']
     
-    def process_podcast(self, podcast_name: str) -> bool:
+    def process_podcast(self, podcast_name: str, pipeline=None) -> bool:
         """Process single podcast - using automation method"""
         try:
             print(f"🔍 Checking podcast: {podcast_name}")
             
             # Use automation method for processing (now pass progress_tracker for duplicate check)
-            success, episode_title = self.apple_explorer.auto_process_latest_episode(podcast_name, self.progress_tracker)
+            success, episode_title = self.apple_explorer.auto_process_latest_episode(podcast_name, self.progress_tracker, pipeline=pipeline)
             
             if success:
-                print(f"✅ {podcast_name} processing complete")
+                if pipeline:
+                    print(f"📋 {podcast_name} new episodes queued for processing")
+                else:
+                    print(f"✅ {podcast_name} processing complete")
                 # Note: Already marked as processed in core method, no need to duplicate
                 return True
             else:
@@ -335,16 +369,19 @@ class AutoEngine:
             print(f"❌ Exception processing podcast {podcast_name}: {e}")
             return False
     
-    def process_youtube(self, channel_name: str) -> bool:
+    def process_youtube(self, channel_name: str, pipeline=None) -> bool:
         """Process YouTube channel - using automation method"""
         try:
             print(f"🔍 Checking YouTube channel: @{channel_name}")
             
             # Use automation method for processing (now pass progress_tracker for duplicate check)
-            success, video_title = self.podnet.auto_process_channel_latest_video(channel_name, self.progress_tracker)
+            success, video_title = self.podnet.auto_process_channel_latest_video(channel_name, self.progress_tracker, pipeline=pipeline)
             
             if success:
-                print(f"✅ @{channel_name} processing complete")
+                if pipeline:
+                    print(f"📋 @{channel_name} new videos queued for processing")
+                else:
+                    print(f"✅ @{channel_name} processing complete")
                 # Note: Already marked as processed in core method, no need to duplicate
                 return True
             else:
@@ -368,31 +405,32 @@ class AutoEngine:
         self.progress_tracker.status["last_run"] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         self.progress_tracker.save_status()
         
-        # Process podcasts (only when enabled)
-        if self.settings['monitor_podcast']:
-            podcasts = self.config_manager.load_podcast_list()
-            podcast_success = 0
-            for podcast in podcasts:
-                if self.process_podcast(podcast):
-                    podcast_success += 1
-                time.sleep(2)  # Avoid API limits
-        else:
-            podcasts = []
-            podcast_success = 0
-        
-        # Process YouTube (only when enabled)
-        if self.settings['monitor_youtube']:
-            channels = self.config_manager.load_youtube_list()
-            youtube_success = 0
-            for channel in channels:
-                if self.process_youtube(channel):
-                    youtube_success += 1
-                time.sleep(2)  # Avoid API limits
-        else:
-            channels = []
-            youtube_success = 0
+        podcasts = self.config_manager.load_podcast_list() if self.settings['monitor_podcast'] else []
+        channels = self.config_manager.load_youtube_list() if self.settings['monitor_youtube'] else []
+        
+        # Check all subscriptions in parallel; new items are fed into the staged
+        # download → compress → transcribe → summarize pipeline and drained below
+        pipeline = build_media_pipeline(self.settings)
+        pipeline.start()
+        with ThreadPoolExecutor(max_workers=self.settings['network_workers']) as pool:
+            podcast_futures = [pool.submit(self.process_podcast, podcast, pipeline) for podcast in podcasts]
+            youtube_futures = [pool.submit(self.process_youtube, channel, pipeline) for channel in channels]
+            podcast_success = sum(1 for future in podcast_futures if future.result())
+            youtube_success = sum(1 for future in youtube_futures if future.result())
+        
+        # Wait for queued items to flow through every stage
+        pipeline.close()
+        # Write the feed validators and video metadata gathered during this check
+        self.apple_explorer.feed_cache.flush()
+        get_video_cache().flush()
+        episodes_done = sum(1 for job in pipeline.completed if job['processor'] is self.apple_explorer)
+        videos_done = len(pipeline.completed) - episodes_done
         
         print(f"✅ Check complete - Podcasts: {podcast_success}/{len(podcasts)}, YouTube: {youtube_success}/{len(channels)}")
+        print(f"📦 Pipeline processed - Episodes: {episodes_done}, Videos: {videos_done}, Failed: {len(pipeline.failed)}")
+        for job in pipeline.failed:
+            if job.get('error'):
+                print(f"❌ {job['title'][:50]}... failed at {job['error']}")
         
         # Save final status
         self.progress_tracker.save_status()
@@ -455,6 +493,18 @@ class AutoEngine:
         print(f"  Running frequency: {self.settings['run_frequency']} hours")
         print(f"  Monitor podcasts: {'Enabled' if self.settings['monitor_podcast'] else 'Disabled'}")
         print(f"  Monitor YouTube: {'Enabled' if self.settings['monitor_youtube'] else 'Disabled'}")
+        print(f"  Processed: {self.progress_tracker.store.count(KIND_PODCAST)} episodes, {self.progress_tracker.store.count(KIND_YOUTUBE)} videos")
+        print(f"  Concurrency: network {self.settings['network_workers']}, CPU {self.settings['cpu_workers']}, LLM {self.settings['llm_workers']}")
+        print(f"  Pipeline workers: download {self.settings['download_workers']}, compress {self.settings['compress_workers']}, transcribe {self.settings['transcribe_workers']}, summarize {self.settings['summarize_workers']} (queue size {self.settings['pipeline_queue_size']})")
+        
+        feed_stats = FeedCache().stats()
+        if feed_stats['requests']:
+            print(f"  Feed cache: {feed_stats['hits']}/{feed_stats['requests']} hits ({feed_stats['hit_rate']:.0%}), "
+                  f"{feed_stats['bytes_saved'] / (1024 * 1024):.1f}MB saved, {feed_stats['bytes_downloaded'] / (1024 * 1024):.1f}MB downloaded")
+        
+        llm_stats = get_llm_cache().stats()
+        if llm_stats['entries']:
+            print(f"  LLM cache: {llm_stats['entries']} responses, {llm_stats['size_mb']:.1f}MB")
         
         if self.settings['monitor_podcast']:
             podcasts = self.config_manager.load_podcast_list()
@@ -618,11 +668,13 @@ def run_notion_sync():
         print(f"❌ Notion sync failed: {e}")
 
 def clear_notion_cache():
-    """Clear Notion cache"""
-    cache_file = Path('.podlens/notion_cache.json')
+    """Clear Notion cache and sync manifest"""
+    cache_files = [Path('.podlens/notion_cache.json'), NOTION_MANIFEST_FILE]
     try:
-        if cache_file.exists():
-            cache_file.unlink()
+        existing = [cache_file for cache_file in cache_files if cache_file.exists()]
+        if existing:
+            for cache_file in existing:
+                cache_file.unlink()
             print("✅ Notion cache cleared")
             print("ℹ️  Cache will be rebuilt on next sync")
         else:
@@ -630,6 +682,24 @@ def clear_notion_cache():
     except Exception as e:
         print(f"❌ Failed to clear cache: {e}")
 
+def refresh_podcast_lookups():
+    """Resolve every my_pod.md entry against iTunes search again"""
+    config_manager = ConfigManager()
+    podcasts = config_manager.load_podcast_list()
+    if not podcasts:
+        print("ℹ️  No podcasts in my_pod.md")
+        return
+    
+    explorer = ApplePodcastExplorer()
+    print(f"🔄 Refreshing {len(podcasts)} podcast lookups...")
+    for podcast_name in podcasts:
+        channel = explorer.resolve_podcast_channel(podcast_name, refresh=True)
+        if channel:
+            print(f"✅ {podcast_name} → {channel['name']} ({channel['feed_url']})")
+        else:
+            explorer.channel_lookup.invalidate(podcast_name)
+            print(f"❌ {podcast_name} not found")
+
 def main():
     """Main function for command line interface"""
     parser = argparse.ArgumentParser(description='PodLens Automation Service')
@@ -643,9 +713,14 @@ def main():
     parser.add_argument('--notiontoken', metavar='TOKEN', help='Configure Notion token')
     parser.add_argument('--notionpage', metavar='PAGE_ID', help='Configure Notion page ID')
     parser.add_argument('--notion-clear-cache', action='store_true', help='Clear Notion cache')
+    parser.add_argument('--refresh-lookups', action='store_true', help='Re-resolve my_pod.md podcasts against iTunes search')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the LLM response cache')
     
     args = parser.parse_args()
     
+    if args.no_cache:
+        disable_llm_cache()
+    
     if args.status:
         show_status()
     elif args.email:
@@ -712,6 +787,8 @@ def main():
         update_notion_settings(page_id=args.notionpage)
     elif args.notion_clear_cache:
         clear_notion_cache()
+    elif args.refresh_lookups:
+        refresh_podcast_lookups()
     else:
         start_automation()
 
@@ -0,0 +1,164 @@
+"""
+YouTube 字幕获取 / YouTube caption fetching
+
+extract_youtube_transcript 原先最多循环 20 次、每次固定 sleep 2 秒，并且每次都重新
+调用 list_transcripts；没有字幕的视频可能要耗费约 40 秒才回退到音频下载。这里把错误
+分为临时错误（限流、请求失败、网络错误、XML 解析中断等，按带抖动的指数退避重试，
+并受总时间预算限制）和其余所有错误（字幕被禁用、视频不可用以及未知错误，立即放弃），
+字幕列表在各次尝试之间复用。
+extract_youtube_transcript used to loop up to 20 times with a fixed 2-second
+sleep and called list_transcripts again on every attempt, so a video without
+captions could burn around 40 seconds before falling back to audio download.
+Errors are now classified as transient (rate limiting, failed requests, network
+errors, truncated XML, ...: retried with jittered exponential backoff under a
+total time budget) or permanent (everything else, including captions disabled,
+video unavailable and unexpected errors: give up at once), and the transcript
+list is reused across attempts.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+from .concurrency import Backoff, throttle
+
+
+# 值得重试的 youtube_transcript_api 异常类名（按名称匹配，兼容不同版本）；网络错误另行判断
+# Retryable youtube_transcript_api exception class names (matched by name to work
+# across versions); network errors are checked separately
+TRANSIENT_ERRORS = {
+    'TooManyRequests', 'RequestBlocked', 'IpBlocked', 'YouTubeRequestFailed',
+    'YouTubeDataUnparsable', 'ParseError',
+}
+
+# 字幕重试参数 / Caption retry parameters
+CAPTION_MAX_ATTEMPTS = 5
+CAPTION_BASE_DELAY = 1.0
+CAPTION_MAX_DELAY = 8.0
+CAPTION_TIME_BUDGET = 20.0
+
+
+def is_permanent_error(error: Exception) -> bool:
+    """
+    判断字幕错误是否永久（重试无意义）；只有已知的临时错误和网络错误会重试，
+    其余错误（包括程序错误）一律视为永久，立即回退到音频
+    Whether a caption error is permanent (retrying cannot help); only the known
+    transient errors and network errors are retried, anything else (programming
+    errors included) is permanent so audio fallback starts at once
+    """
+    if isinstance(error, (requests.RequestException, OSError)):
+        return False
+    names = {cls.__name__ for cls in type(error).__mro__}
+    return not names & TRANSIENT_ERRORS
+
+
+def caption_backoff() -> Backoff:
+    """字幕重试使用的退避策略 / Backoff policy for caption retries"""
+    return Backoff(base=CAPTION_BASE_DELAY, max_delay=CAPTION_MAX_DELAY,
+                   max_attempts=CAPTION_MAX_ATTEMPTS, budget=CAPTION_TIME_BUDGET)
+
+
+def transcript_text(transcript_data) -> str:
+    """拼接各种格式的字幕片段文本 / Join the text of caption snippets in any of the known formats"""
+    text_parts = []
+    for entry in transcript_data:
+        if hasattr(entry, 'text'):
+            # FetchedTranscriptSnippet 对象 / FetchedTranscriptSnippet objects
+            text_parts.append(entry.text)
+        elif isinstance(entry, dict) and 'text' in entry:
+            text_parts.append(entry['text'])
+        elif hasattr(entry, '__dict__') and 'text' in entry.__dict__:
+            text_parts.append(entry.__dict__['text'])
+    return " ".join(text_parts).strip()
+
+
+def transcript_api(api):
+    """
+    把 YouTubeTranscriptApi 类转换为可用的接口：0.x 使用类方法，1.x 需要实例
+    Turn the YouTubeTranscriptApi class into something usable: 0.x has class methods, 1.x needs an instance
+    """
+    if isinstance(api, type) and not hasattr(api, 'list_transcripts'):
+        return api()
+    return api
+
+
+def _list_transcripts(api, video_id: str):
+    # 0.x: YouTubeTranscriptApi.list_transcripts(video_id); 1.x: YouTubeTranscriptApi().list(video_id)
+    if hasattr(api, 'list_transcripts'):
+        return api.list_transcripts(video_id)
+    return api.list(video_id)
+
+
+def list_available(api, video_id: str) -> List[Dict]:
+    """列出视频的所有字幕 / List every transcript of a video"""
+    throttle('www.youtube.com')
+    return [
+        {
+            'transcript': transcript,
+            'language_code': transcript.language_code,
+            'language_name': transcript.language,
+            'is_generated': transcript.is_generated,
+            'is_translatable': transcript.is_translatable,
+        }
+        for transcript in _list_transcripts(api, video_id)
+    ]
+
+
+def _fetch_text(selected, available: List[Dict]) -> str:
+    """
+    先取选中的字幕，失败或为空时依次尝试其余字幕；全部失败时抛出最后一个错误
+    Fetch the selected transcript, then the others if it fails or is empty;
+    raises the last error when every one of them failed
+    """
+    candidates = [selected] + [info['transcript'] for info in available if info['transcript'] is not selected]
+    last_error = None
+    for transcript in candidates:
+        try:
+            text = transcript_text(transcript.fetch() or [])
+        except Exception as e:
+            last_error = e
+            continue
+        if text:
+            return text
+    if last_error is not None:
+        raise last_error
+    return ''
+
+
+def fetch_captions(api, video_id: str, select: Callable[[List[Dict]], Any],
+                   backoff: Optional[Backoff] = None) -> Optional[str]:
+    """
+    获取视频字幕文本；永久错误、没有字幕或字幕为空时立即返回 None，临时错误按退避重试
+    Fetch a video's caption text; returns None at once on permanent errors or
+    when there are no captions or they are empty, and retries transient errors with backoff
+
+    Args:
+        api: YouTubeTranscriptApi 类或实例（0.x 和 1.x 均可）/ YouTubeTranscriptApi class or instance (0.x or 1.x)
+        video_id: 11 位视频 ID / 11-character video ID
+        select: 从字幕列表中选出要获取的字幕，没有合适的返回 None
+                Picks the transcript to fetch from the list, None when nothing fits
+        backoff: 重试策略，默认 caption_backoff() / Retry policy, caption_backoff() by default
+
+    Returns:
+        Optional[str]: 字幕文本，失败时为 None / Caption text, None on failure
+    """
+    backoff = backoff or caption_backoff()
+    api = transcript_api(api)
+    available = None
+    while True:
+        try:
+            if available is None:
+                available = list_available(api, video_id)
+            if not available:
+                return None
+            selected = select(available)
+            if selected is None:
+                return None
+            # 字幕请求成功但内容为空属于永久情况，重试无意义
+            # Captions that were fetched but are empty will not change on a retry
+            return _fetch_text(selected, available) or None
+        except Exception as e:
+            if is_permanent_error(e):
+                return None
+        if not backoff.wait():
+            return None
@@ -0,0 +1,223 @@
+"""
+输出文件目录索引 / Outputs catalog
+
+每日邮件摘要原先在每次 cron 调用时遍历 outputs/ 下所有频道、日期和剧集目录并比较
+st_ctime，Notion 同步统计文件数时又完整遍历一次。这里在 SQLite 中为写入的每个
+Transcript、Summary 和 Visual 文件记录一行（路径、类型、频道、日期目录、剧集目录、
+写入时间），按日期、频道和类型的查询走索引而不是扫描文件系统。未经 record_output
+写入的文件（旧版本、手动复制）由 backfill 补录；每次发送摘要和同步 Notion 前都会重新
+执行，它记住每个目录的修改时间，只检查修改时间变化过的目录中的文件。
+The daily digest used to walk every channel, date and episode directory under
+outputs/ and compare st_ctime on every cron invocation, and the Notion sync
+walked the whole tree again to count files. Every Transcript, Summary and Visual
+file written now gets a row in SQLite (path, kind, channel, date folder, episode
+folder, time written), so queries by date, channel and kind use an index instead
+of a filesystem scan. Files written without record_output (older versions,
+manual copies) are picked up by backfill, which is re-run before every digest
+and Notion sync: it remembers each directory's mtime and only stats the files of
+directories whose mtime changed since the last scan.
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+CATALOG_DB_FILE = Path('.podlens/outputs.db')
+OUTPUTS_DIR = Path('outputs')
+
+# 输出文件类型，由文件名前缀决定 / Output kinds, given by the file name prefix
+KIND_TRANSCRIPT = 'transcript'
+KIND_SUMMARY = 'summary'
+KIND_VISUAL = 'visual'
+KIND_PREFIXES = {
+    'transcript': KIND_TRANSCRIPT,
+    'summary': KIND_SUMMARY,
+    'visual': KIND_VISUAL,
+}
+OUTPUT_SUFFIXES = ('.md', '.html')
+
+
+def output_kind(path: Path) -> Optional[str]:
+    """按文件名前缀判断输出类型，非输出文件返回 None / Output kind from the file name prefix, None for other files"""
+    if path.suffix.lower() not in OUTPUT_SUFFIXES or path.name.endswith('.partial'):
+        return None
+    name = path.name.lower()
+    for prefix, kind in KIND_PREFIXES.items():
+        if name.startswith(prefix):
+            return kind
+    return None
+
+
+def _layout(path: Path) -> Dict[str, Optional[str]]:
+    """
+    从 outputs/<频道>/<日期>/<剧集>/<文件> 中取出各级目录名，旧的平铺布局为 None
+    Directory names from outputs/<channel>/<date>/<episode>/<file>; None for the legacy flat layout
+    """
+    parts = path.parts
+    if 'outputs' in parts:
+        last = len(parts) - 1 - parts[::-1].index('outputs')
+        parts = parts[last + 1:]
+    if len(parts) == 4:
+        return {'channel': parts[0], 'date_folder': parts[1], 'episode': parts[2]}
+    return {'channel': None, 'date_folder': None, 'episode': None}
+
+
+class OutputsCatalog:
+    """SQLite 输出文件索引 / SQLite-backed index of output files"""
+
+    def __init__(self, db_file: Path = CATALOG_DB_FILE):
+        self.db_file = db_file
+        self.db_file.parent.mkdir(exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_file), timeout=30, check_same_thread=False)
+        with self.lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS outputs ("
+                " path TEXT PRIMARY KEY,"
+                " kind TEXT NOT NULL,"
+                " channel TEXT,"
+                " date_folder TEXT,"
+                " episode TEXT,"
+                " written_day TEXT NOT NULL,"
+                " written_at TEXT NOT NULL)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS outputs_day ON outputs (written_day, kind)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS outputs_channel ON outputs (channel, kind)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS scanned_dirs (path TEXT PRIMARY KEY, mtime REAL NOT NULL)")
+            self.conn.commit()
+
+    def record(self, path: Path, written_at: Optional[datetime] = None) -> bool:
+        """
+        记录一个刚写入的输出文件（重复写入会更新时间）；非输出文件忽略
+        Record an output file that was just written (rewrites refresh the time); other files are ignored
+
+        Returns:
+            bool: 是否已记录 / Whether it was recorded
+        """
+        path = Path(path).resolve()
+        kind = output_kind(path)
+        if kind is None:
+            return False
+        written_at = written_at or datetime.now()
+        layout = _layout(path)
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO outputs (path, kind, channel, date_folder, episode, written_day, written_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (str(path), kind, layout['channel'], layout['date_folder'], layout['episode'],
+                 written_at.strftime('%Y-%m-%d'), written_at.isoformat()),
+            )
+            self.conn.commit()
+        return True
+
+    def query(self, kind: Optional[str] = None, day: Optional[str] = None, channel: Optional[str] = None,
+              under: Optional[Path] = None) -> List[Dict]:
+        """
+        按类型、写入日期（YYYY-MM-DD）、频道和所在目录查询，按写入时间排序
+        Query by kind, day written (YYYY-MM-DD), channel and containing folder, ordered by time written
+        """
+        clauses = []
+        params = []
+        for column, value in (('kind', kind), ('written_day', day), ('channel', channel)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if under is not None:
+            clauses.append("path LIKE ? ESCAPE '\\'")
+            prefix = str(Path(under).resolve()).replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            params.append(prefix + os.sep + '%')
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT path, kind, channel, date_folder, episode, written_at FROM outputs"
+                f"{where} ORDER BY written_at, path",
+                params,
+            ).fetchall()
+        return [
+            {'path': Path(row[0]), 'kind': row[1], 'channel': row[2], 'date_folder': row[3],
+             'episode': row[4], 'written_at': row[5]}
+            for row in rows
+        ]
+
+    def forget(self, path: Path):
+        """删除已不存在的文件的记录 / Drop the entry of a file that no longer exists"""
+        with self.lock:
+            self.conn.execute("DELETE FROM outputs WHERE path = ?", (str(Path(path).resolve()),))
+            self.conn.commit()
+
+    def backfill(self, outputs_dir: Path = OUTPUTS_DIR) -> int:
+        """
+        补录未经 record_output 写入的输出文件，写入时间取文件的修改时间；只检查自上次扫描后
+        修改时间有变化的目录，因此可以在每次查询前调用
+        Record output files that were not written through record_output, using each file's
+        mtime as its time written; only directories whose mtime changed since the last scan
+        are checked, so this is cheap enough to call before every query
+
+        Returns:
+            int: 新记录的文件数 / Number of files recorded
+        """
+        outputs_dir = Path(outputs_dir).resolve()
+        if not outputs_dir.is_dir():
+            return 0
+        with self.lock:
+            scanned = dict(self.conn.execute("SELECT path, mtime FROM scanned_dirs").fetchall())
+        changed = {}
+        for dirpath, _, filenames in os.walk(outputs_dir):
+            try:
+                mtime = os.stat(dirpath).st_mtime
+            except OSError:
+                continue
+            if scanned.get(dirpath) != mtime:
+                changed[dirpath] = (mtime, filenames)
+        if not changed:
+            return 0
+        with self.lock:
+            known = {row[0] for row in self.conn.execute("SELECT path FROM outputs")}
+        count = 0
+        for dirpath, (_, filenames) in changed.items():
+            for name in filenames:
+                path = Path(dirpath) / name
+                if str(path) in known or not output_kind(path):
+                    continue
+                try:
+                    written_at = datetime.fromtimestamp(path.stat().st_mtime)
+                except OSError:
+                    continue
+                if self.record(path, written_at):
+                    count += 1
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO scanned_dirs (path, mtime) VALUES (?, ?)",
+                [(dirpath, mtime) for dirpath, (mtime, _) in changed.items()],
+            )
+            self.conn.commit()
+        return count
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> OutputsCatalog:
+    """进程级共享的目录索引 / Process-wide catalog"""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = OutputsCatalog()
+        return _catalog
+
+
+def record_output(path) -> bool:
+    """
+    记录一个刚写入的输出文件；索引不可用时不影响写入本身
+    Record an output file that was just written; a catalog failure never fails the write itself
+    """
+    try:
+        return get_catalog().record(Path(path))
+    except Exception:
+        return False
@@ -8,7 +8,7 @@ import os
 import argparse
 from pathlib import Path
 from dotenv import load_dotenv
-from .apple_podcast_ch import ApplePodcastExplorer, MLX_WHISPER_AVAILABLE, MLX_DEVICE, GROQ_AVAILABLE
+from .apple_podcast_ch import ApplePodcastExplorer, LOCAL_WHISPER_AVAILABLE, LOCAL_BACKEND, GROQ_AVAILABLE
 from .youtube_ch import Podnet
 from . import get_model_name
 
@@ -55,10 +55,10 @@ def show_status():
     groq_available = bool(os.getenv('GROQ_API_KEY'))
     gemini_available = bool(os.getenv('GEMINI_API_KEY'))
     
-    if MLX_WHISPER_AVAILABLE:
-        print(f"🎯 MLX Whisper 可用，使用设备: {MLX_DEVICE}")
+    if LOCAL_WHISPER_AVAILABLE:
+        print(f"🎯 本地 Whisper 可用: {LOCAL_BACKEND.label}")
     else:
-        print("⚠️  MLX Whisper 不可用")
+        print("⚠️  本地 Whisper 不可用")
     
     if groq_available:
         print("🚀 Groq API 可用，已启用超快转录")
@@ -85,10 +85,15 @@ def main():
     parser = argparse.ArgumentParser(description="PodLens - 智能播客转录与摘要工具", add_help=False)
     parser.add_argument("--auto", action="store_true", help="启动24x7自动化服务")
     parser.add_argument("--status", action="store_true", help="显示自动化服务状态")
+    parser.add_argument("--no-cache", action="store_true", help="跳过 LLM 响应缓存")
     
     # 解析已知参数，忽略其他参数以保持兼容性
     args, unknown = parser.parse_known_args()
     
+    if args.no_cache:
+        from .llm_cache import disable_llm_cache
+        disable_llm_cache()
+    
     # 如果是自动化模式，启动自动化服务
     if args.auto:
         from .auto_ch import start_automation
@@ -8,7 +8,7 @@ import os
 import argparse
 from pathlib import Path
 from dotenv import load_dotenv
-from .apple_podcast_en import ApplePodcastExplorer, MLX_WHISPER_AVAILABLE, MLX_DEVICE, GROQ_AVAILABLE
+from .apple_podcast_en import ApplePodcastExplorer, LOCAL_WHISPER_AVAILABLE, LOCAL_BACKEND, GROQ_AVAILABLE
 from .youtube_en import Podnet
 from . import get_model_name
 
@@ -55,10 +55,10 @@ def show_status():
     groq_available = bool(os.getenv('GROQ_API_KEY'))
     gemini_available = bool(os.getenv('GEMINI_API_KEY'))
     
-    if MLX_WHISPER_AVAILABLE:
-        print(f"🎯 MLX Whisper available, using device: {MLX_DEVICE}")
+    if LOCAL_WHISPER_AVAILABLE:
+        print(f"🎯 Local Whisper available: {LOCAL_BACKEND.label}")
     else:
-        print("⚠️  MLX Whisper not available")
+        print("⚠️  Local Whisper not available")
     
     if groq_available:
         print("🚀 Groq API available, ultra-fast transcription enabled")
@@ -85,10 +85,15 @@ def main():
     parser = argparse.ArgumentParser(description="PodLens - Intelligent Podcast Transcription Tool", add_help=False)
     parser.add_argument("--auto", action="store_true", help="Start 24x7 automation service")
     parser.add_argument("--status", action="store_true", help="Show automation service status")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the LLM response cache")
     
     # Parse known arguments, ignore others for compatibility
     args, unknown = parser.parse_known_args()
     
+    if args.no_cache:
+        from .llm_cache import disable_llm_cache
+        disable_llm_cache()
+    
     # If automation mode, start automation service
     if args.auto:
         from .auto_en import start_automation
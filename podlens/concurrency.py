@@ -0,0 +1,197 @@
+"""
+并发控制工具 / Concurrency utilities
+
+为自动化引擎提供按资源类型划分的有界并发上限，以及按主机/API 的限速器
+Bounded concurrency caps per resource class and per-host/API rate limiting
+for the automation engine
+"""
+
+import random
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+# 默认并发上限 / Default concurrency caps
+DEFAULT_NETWORK_WORKERS = 8
+DEFAULT_CPU_WORKERS = 2
+DEFAULT_LLM_WORKERS = 2
+
+# 外部 API 的限速键 / Rate-limit keys for external APIs
+GROQ_API_HOST = 'api.groq.com'
+GEMINI_API_HOST = 'generativelanguage.googleapis.com'
+
+# 各主机/API 两次请求之间的最小间隔（秒）/ Minimum interval between requests per host/API (seconds)
+DEFAULT_HOST_INTERVALS = {
+    'itunes.apple.com': 3.0,                     # iTunes Search API 约 20 次/分钟 / ~20 req/min
+    'www.youtube.com': 1.0,
+    GROQ_API_HOST: 1.0,
+    GEMINI_API_HOST: 0.5,
+}
+DEFAULT_INTERVAL = 0.5
+
+
+def host_key(url_or_key: str) -> str:
+    """
+    将 URL 归一化为限速键（主机名），非 URL 原样返回
+    Normalize a URL to its rate-limit key (hostname); non-URLs are returned as-is
+    """
+    if '://' not in url_or_key:
+        return url_or_key.lower()
+    return (urlparse(url_or_key).hostname or url_or_key).lower()
+
+
+class RateLimiter:
+    """按键（主机/API）限速器 / Per-key (host/API) rate limiter"""
+
+    def __init__(self, default_interval: float = DEFAULT_INTERVAL, intervals: Optional[Dict[str, float]] = None):
+        self.default_interval = default_interval
+        self._intervals = dict(intervals or {})
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def set_interval(self, key: str, interval: float):
+        """设置某个键的最小请求间隔 / Set the minimum request interval for a key"""
+        with self._lock:
+            self._intervals[host_key(key)] = interval
+
+    def wait(self, url_or_key: str):
+        """
+        预约下一个请求槽位并在需要时等待，不同键之间互不阻塞
+        Reserve the next request slot for this key and sleep if needed; keys never block each other
+        """
+        key = host_key(url_or_key)
+        with self._lock:
+            interval = self._intervals.get(key, self.default_interval)
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(key, 0.0))
+            self._next_slot[key] = slot + interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class TokenBucket:
+    """
+    令牌桶限速器：平均 rate 次/秒，允许最多 capacity 次突发；可整体暂停（如收到 Retry-After）
+    Token bucket limiter: rate requests/second on average with bursts of up to
+    capacity; can be paused as a whole (e.g. on Retry-After)
+    """
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """取一个令牌，必要时等待 / Take one token, sleeping if needed"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                else:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+    def pause(self, seconds: float):
+        """
+        在 seconds 秒内不再发放令牌，之后从空桶开始补充
+        Hand out no tokens for the next seconds, then refill from an empty bucket
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._updated = self._paused_until
+            self._tokens = 0
+
+
+class Backoff:
+    """
+    带抖动的指数退避，受尝试次数和总时间预算限制；每个重试循环使用一个新实例
+    Exponential backoff with jitter, bounded by an attempt count and a total
+    time budget; use a fresh instance per retry loop
+
+    用法 Usage: ``while True: ...; if not backoff.wait(): break``
+    """
+
+    def __init__(self, base: float = 1.0, max_delay: float = 8.0, max_attempts: int = 5, budget: float = 20.0):
+        self.base = base
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self.attempts = 1
+        self.deadline = time.monotonic() + budget
+
+    def wait(self) -> bool:
+        """
+        在下一次尝试前等待；次数或时间预算用尽时立即返回 False
+        Sleep before the next attempt; returns False at once when attempts or the time budget are used up
+        """
+        if self.attempts >= self.max_attempts:
+            return False
+        ceiling = min(self.max_delay, self.base * 2 ** (self.attempts - 1))
+        # 一半固定、一半随机，避免并发重试同时到达 / Half fixed, half random, so concurrent retries spread out
+        delay = ceiling / 2 + random.uniform(0, ceiling / 2)
+        if time.monotonic() + delay > self.deadline:
+            return False
+        time.sleep(delay)
+        self.attempts += 1
+        return True
+
+
+class ResourceLimits:
+    """
+    网络 I/O、ffmpeg/CPU 与 LLM 调用三类资源的并发上限
+    Concurrency caps for network I/O, ffmpeg/CPU work and LLM calls
+
+    用法 Usage: ``with limits.cpu: subprocess.run(...)``
+    """
+
+    def __init__(self, network: int = DEFAULT_NETWORK_WORKERS, cpu: int = DEFAULT_CPU_WORKERS, llm: int = DEFAULT_LLM_WORKERS):
+        self.network_workers = self.cpu_workers = self.llm_workers = 0
+        self.configure(network=network, cpu=cpu, llm=llm)
+
+    def configure(self, network: Optional[int] = None, cpu: Optional[int] = None, llm: Optional[int] = None):
+        """
+        调整上限；已持有旧信号量的任务会在旧对象上正常释放
+        Adjust caps; tasks holding an old semaphore release it normally
+        """
+        if network:
+            self.network_workers = max(1, int(network))
+            self.network = threading.BoundedSemaphore(self.network_workers)
+        if cpu:
+            self.cpu_workers = max(1, int(cpu))
+            self.cpu = threading.BoundedSemaphore(self.cpu_workers)
+        if llm:
+            self.llm_workers = max(1, int(llm))
+            self.llm = threading.BoundedSemaphore(self.llm_workers)
+
+
+# 进程级共享实例 / Process-wide shared instances
+limits = ResourceLimits()
+rate_limiter = RateLimiter(intervals=DEFAULT_HOST_INTERVALS)
+
+
+def throttle(url_or_key: str):
+    """对给定主机/API 应用限速 / Apply the rate limit for the given host/API"""
+    rate_limiter.wait(url_or_key)
+
+
+def configure_from_settings(settings: Dict):
+    """
+    从 .podlens/setting 的设置中应用并发上限
+    Apply concurrency caps from .podlens/setting values
+    """
+    limits.configure(
+        network=settings.get('network_workers'),
+        cpu=settings.get('cpu_workers'),
+        llm=settings.get('llm_workers'),
+    )
@@ -12,6 +12,8 @@ import sys
 import re
 import json
 import time
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 import subprocess
 import contextlib
 import io
@@ -20,10 +22,20 @@ import feedparser
 import urllib.parse
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
 from dotenv import load_dotenv
-from tqdm import tqdm
-from . import get_model_name
+from .concurrency import limits, throttle, GROQ_API_HOST, GEMINI_API_HOST
+from .pipeline import run_inline
+from .feed_cache import FeedCache, ChannelLookupCache
+from .storage import episode_key
+from .downloader import download_file
+from .audio import probe_duration, candidate_bitrates, encode_mp3, split_audio, merge_chunk_texts, chunk_overlaps, GROQ_MAX_FILE_MB
+from .transcription import get_local_backend
+from .summarizer import map_reduce_summary, estimate_tokens, SINGLE_PASS_MAX_TOKENS
+from .gemini import get_gemini_client
+from .streaming import write_stream, timed_chunks
+from .catalog import record_output
+from .llm_cache import cached_generate, cached_stream, TEMPLATE_SUMMARY, TEMPLATE_SUMMARY_SECTIONS, TEMPLATE_TRANSLATE
 
 # Enhanced .env loading function
 def load_env_robust():
@@ -57,15 +69,9 @@ except ImportError:
     GEMINI_AVAILABLE = False
     genai = None
 
-# Check MLX Whisper availability
-try:
-    import mlx_whisper
-    import mlx.core as mx
-    MLX_WHISPER_AVAILABLE = True
-    MLX_DEVICE = mx.default_device()
-except ImportError:
-    MLX_WHISPER_AVAILABLE = False
-    MLX_DEVICE = "Not Available"
+# 本地 Whisper 转录后端（MLX、faster-whisper 或 openai-whisper），模型首次使用时加载一次
+LOCAL_BACKEND = get_local_backend()
+LOCAL_WHISPER_AVAILABLE = LOCAL_BACKEND is not None
 
 # YouTube transcript support
 try:
@@ -82,15 +88,8 @@ try:
 except ImportError:
     YT_DLP_AVAILABLE = False
 
-# Local Whisper for YouTube
-try:
-    import whisper
-    WHISPER_AVAILABLE = True
-except ImportError:
-    WHISPER_AVAILABLE = False
-
 # Check transcription functionality availability
-TRANSCRIPTION_AVAILABLE = MLX_WHISPER_AVAILABLE or GROQ_AVAILABLE
+TRANSCRIPTION_AVAILABLE = LOCAL_WHISPER_AVAILABLE or GROQ_AVAILABLE
 
 # Import YouTube components
 from .youtube_ch import YouTubeSearcher, TranscriptExtractor, SummaryGenerator
@@ -112,14 +111,13 @@ class ApplePodcastExplorer:
             'Sec-Fetch-Mode': 'no-cors',
             'Sec-Fetch-Site': 'cross-site'
         })
+        self.feed_cache = FeedCache()  # RSS订阅源条件请求缓存
+        self.channel_lookup = ChannelLookupCache()  # 订阅对应的 iTunes 频道解析结果
         
         # 创建根输出文件夹
         self.root_output_dir = Path("outputs")
         self.root_output_dir.mkdir(exist_ok=True)
         
-        # 初始化MLX Whisper模型 - 始终使用medium模型
-        self.whisper_model_name = 'mlx-community/whisper-medium'
-        
         # Groq客户端初始化
         if GROQ_AVAILABLE:
             self.groq_client = Groq(api_key=GROQ_API_KEY)
@@ -130,9 +128,8 @@ class ApplePodcastExplorer:
         self.api_key = os.getenv('GEMINI_API_KEY')
         if GEMINI_AVAILABLE and self.api_key:
             try:
-                genai.configure(api_key=self.api_key, transport='rest')
-                self.gemini_client = genai
-                self.model_name = get_model_name()  # 从 .env 获取模型名称
+                self.gemini_client = get_gemini_client()  # 进程内共享，模型名称来自 .env
+                self.model_name = self.gemini_client.model_name
             except Exception as e:
                 print(f"⚠️  Gemini客户端初始化失败: {e}")
                 self.gemini_client = None
@@ -141,19 +138,15 @@ class ApplePodcastExplorer:
     
     def load_whisper_model(self):
         """
-        设置MLX Whisper模型 - 始终使用medium模型
+        检查本地Whisper后端 - 模型在首次使用时加载一次并共享
         """
-        if not MLX_WHISPER_AVAILABLE:
-            print("❌ MLX Whisper不可用")
+        if not LOCAL_WHISPER_AVAILABLE:
+            print("❌ 本地Whisper不可用")
             return False
         
-        try:
-            print(f"📥 设置MLX Whisper模型: {self.whisper_model_name}")
-            print("ℹ️  首次使用会下载模型文件，请耐心等待...")
-            return True
-        except Exception as e:
-            print(f"❌ 设置MLX Whisper模型失败: {e}")
-            return False
+        print(f"📥 本地Whisper后端: {LOCAL_BACKEND.label}")
+        print("ℹ️  首次使用会下载模型文件，请耐心等待...")
+        return True
     
     def search_podcast_channel(self, podcast_name: str, quiet: bool = False) -> List[Dict]:
         """
@@ -178,6 +171,7 @@ class ApplePodcastExplorer:
                 'limit': 10  # 获取多个匹配的播客频道
             }
             
+            throttle(search_url)
             response = self.session.get(search_url, params=params)
             response.raise_for_status()
             data = response.json()
@@ -185,6 +179,7 @@ class ApplePodcastExplorer:
             channels = []
             for result in data.get('results', []):
                 channel = {
+                    'collection_id': result.get('collectionId'),
                     'name': result.get('collectionName', '未知频道'),
                     'artist': result.get('artistName', '未知作者'),
                     'feed_url': result.get('feedUrl', ''),
@@ -216,52 +211,67 @@ class ApplePodcastExplorer:
             if not quiet:
                 print("正在获取播客剧集...")
             
-            feed = feedparser.parse(feed_url)
-            episodes = []
-            
-            for entry in feed.entries[:limit]:
-                # 提取音频URL
-                audio_url = None
-                for link in entry.get('links', []):
-                    if link.get('type', '').startswith('audio/'):
-                        audio_url = link.get('href')
-                        break
-                
-                # 备用方法获取音频URL
-                if not audio_url and hasattr(entry, 'enclosures'):
-                    for enclosure in entry.enclosures:
-                        if enclosure.type.startswith('audio/'):
-                            audio_url = enclosure.href
-                            break
-                
-                # 格式化发布日期
-                published_date = '未知日期'
-                if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                    published_date = datetime(*entry.published_parsed[:6]).strftime('%Y-%m-%d')
-                elif hasattr(entry, 'published'):
-                    published_date = entry.published
-                
-                # 获取时长（如有）
-                duration = '未知时长'
-                if hasattr(entry, 'itunes_duration'):
-                    duration = entry.itunes_duration
-                
-                episode = {
-                    'title': entry.get('title', '未知标题'),
-                    'audio_url': audio_url,
-                    'published_date': published_date,
-                    'duration': duration,
-                    'description': entry.get('summary', '无描述')[:200] + '...' if len(entry.get('summary', '')) > 200 else entry.get('summary', '无描述')
-                }
-                episodes.append(episode)
-            
-            return episodes
+            throttle(feed_url)
+            return self.feed_cache.fetch_episodes(self.session, feed_url, self.parse_feed_episodes, limit)
             
         except Exception as e:
             if not quiet:
                 print(f"获取剧集出错: {e}")
             return []
     
+    def parse_feed_episodes(self, content: bytes, limit: int) -> List[Dict]:
+        """
+        从RSS内容解析剧集（仅在订阅源有变化时调用）
+        
+        Args:
+            content: RSS文档
+            limit: 返回剧集数量上限
+        
+        Returns:
+            List[Dict]: 剧集信息列表
+        """
+        feed = feedparser.parse(content)
+        episodes = []
+        
+        for entry in feed.entries[:limit]:
+            # 提取音频URL
+            audio_url = None
+            for link in entry.get('links', []):
+                if link.get('type', '').startswith('audio/'):
+                    audio_url = link.get('href')
+                    break
+        
+            # 备用方法获取音频URL
+            if not audio_url and hasattr(entry, 'enclosures'):
+                for enclosure in entry.enclosures:
+                    if enclosure.type.startswith('audio/'):
+                        audio_url = enclosure.href
+                        break
+        
+            # 格式化发布日期
+            published_date = '未知日期'
+            if hasattr(entry, 'published_parsed') and entry.published_parsed:
+                published_date = datetime(*entry.published_parsed[:6]).strftime('%Y-%m-%d')
+            elif hasattr(entry, 'published'):
+                published_date = entry.published
+        
+            # 获取时长（如有）
+            duration = '未知时长'
+            if hasattr(entry, 'itunes_duration'):
+                duration = entry.itunes_duration
+        
+            episode = {
+                'title': entry.get('title', '未知标题'),
+                'guid': entry.get('id'),
+                'audio_url': audio_url,
+                'published_date': published_date,
+                'duration': duration,
+                'description': entry.get('summary', '无描述')[:200] + '...' if len(entry.get('summary', '')) > 200 else entry.get('summary', '无描述')
+            }
+            episodes.append(episode)
+        
+        return episodes
+    
     def display_channels(self, channels: List[Dict]) -> int:
         """
         展示找到的频道并让用户选择
@@ -545,33 +555,13 @@ class ApplePodcastExplorer:
             # 下载文件，为播客托管服务添加额外的headers
             download_headers = {
                 'Referer': 'https://podcasts.apple.com/',
-                'Origin': 'https://podcasts.apple.com',
-                'Range': 'bytes=0-'  # 某些服务器需要Range header
+                'Origin': 'https://podcasts.apple.com'
             }
-            response = self.session.get(episode['audio_url'], stream=True, headers=download_headers, timeout=30)
-            response.raise_for_status()
-            
-            # 获取文件大小
-            total_size = int(response.headers.get('content-length', 0))
-            
-            # 带进度条下载
-            with open(filepath, 'wb') as f:
-                if total_size > 0 and not quiet:
-                    with tqdm(
-                        total=total_size, 
-                        unit='B', 
-                        unit_scale=True, 
-                        desc=f"第{episode_num}集"
-                    ) as pbar:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            if chunk:
-                                f.write(chunk)
-                                pbar.update(len(chunk))
-                else:
-                    # 没有文件大小信息时直接下载，或静默模式下直接下载
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
+            # 通过 Range 请求从 audio.mp3.part 续传中断的下载
+            throttle(episode['audio_url'])
+            with limits.network:
+                download_file(self.session, episode['audio_url'], filepath, headers=download_headers,
+                              desc=f"第{episode_num}集", quiet=quiet)
             
             if not quiet:
                 print(f"✅ 下载完成")
@@ -580,9 +570,7 @@ class ApplePodcastExplorer:
         except Exception as e:
             if not quiet:
                 print(f"❌ 下载第{episode_num}集失败: {e}")
-            # 下载失败时删除可能的不完整文件
-            if 'filepath' in locals() and filepath.exists():
-                filepath.unlink()
+            # 已下载的数据保留在 audio.mp3.part 中，下次尝试时续传
             return False, None
     
     def get_file_size_mb(self, filepath):
@@ -594,8 +582,8 @@ class ApplePodcastExplorer:
     
     def compress_audio_file(self, input_file: Path, output_file: Path, quiet: bool = False) -> bool:
         """
-        智能四级压缩音频文件至Groq API限制以下
-        压缩策略: 64k → 48k → 32k → 24k，每级检查是否满足25MB限制
+        单次 ffmpeg 编码将音频压缩至Groq API限制以下
+        先读取时长，直接使用能满足25MB限制的最高码率（不超过64k）
         
         Args:
             input_file: 输入文件路径
@@ -617,160 +605,27 @@ class ApplePodcastExplorer:
                 print("🔧 正在压缩...")
             else:
                 print(f"🔧 正在压缩音频文件: {input_file.name}")
-                
-                # 第一级压缩：64k (优先保证质量)
-                print("📊 第一级压缩: 16KHz单声道, 64kbps MP3")
-            
-            # 生成安全的临时文件名，不超过255字符
-            original_name = output_file.stem  # 不含扩展名的文件名
-            prefix = "temp_64k_"
-            extension = output_file.suffix
             
-            # 计算原文件名部分的最大长度
-            max_name_length = 255 - len(prefix) - len(extension)
-            
-            # 如果需要，截断原文件名
-            if len(original_name) > max_name_length:
-                safe_name = original_name[:max_name_length]
-            else:
-                safe_name = original_name
-            
-            temp_64k_file = output_file.parent / f"{prefix}{safe_name}{extension}"
-            
-            cmd_64k = [
-                'ffmpeg',
-                '-i', str(input_file.resolve()),  # 使用绝对路径避免特殊字符问题
-                '-ar', '16000',        # 降采样到16KHz
-                '-ac', '1',            # 单声道
-                '-b:a', '64k',         # 64kbps码率
-                '-y',                  # 覆盖输出文件
-                str(temp_64k_file.resolve())  # 使用绝对路径
-            ]
-            
-            # 运行第一级压缩（使用bytes模式避免编码问题）
-            result = subprocess.run(
-                cmd_64k,
-                capture_output=True,
-                text=False,  # 使用bytes模式避免UTF-8解码错误
-                check=True
-            )
-            
-            # 检查64k压缩后的文件大小
-            compressed_size_mb = self.get_file_size_mb(temp_64k_file)
+            # 根据时长预先确定码率，仅在 ffprobe 失败时逐级尝试
+            duration = probe_duration(input_file)
+            bitrates = candidate_bitrates(duration)
             if not quiet:
-                print(f"📊 64k压缩后大小: {compressed_size_mb:.1f}MB")
+                if duration:
+                    print(f"📊 时长 {duration / 60:.1f} 分钟 → 16KHz单声道, {bitrates[0]}kbps MP3")
+                else:
+                    print(f"⚠️  无法读取时长，先尝试 {bitrates[0]}kbps")
             
-            if compressed_size_mb <= 25:
-                # 64k压缩满足要求，使用64k结果
-                temp_64k_file.rename(output_file)
-                if not quiet:
-                    print(f"✅ 64k压缩完成: {output_file.name} ({compressed_size_mb:.1f}MB)")
-                return True
-            else:
-                # 64k压缩后仍>25MB，进行第二级48k压缩
-                if not quiet:
-                    print(f"⚠️  64k压缩后仍超25MB，进行第二级48k压缩...")
-                    print("📊 第二级压缩: 16KHz单声道, 48kbps MP3")
-                
-                cmd_48k = [
-                    'ffmpeg',
-                    '-i', str(input_file.resolve()),  # 使用绝对路径
-                    '-ar', '16000',        # 降采样到16KHz
-                    '-ac', '1',            # 单声道
-                    '-b:a', '48k',         # 48kbps码率
-                    '-y',                  # 覆盖输出文件
-                    str(output_file.resolve())  # 使用绝对路径
-                ]
-                
-                # 运行第二级压缩（使用bytes模式避免编码问题）
-                result = subprocess.run(
-                    cmd_48k,
-                    capture_output=True,
-                    text=False,  # 使用bytes模式避免UTF-8解码错误
-                    check=True
-                )
-
+            for bitrate in bitrates:
+                encode_mp3(input_file, output_file, bitrate)
                 compressed_size_mb = self.get_file_size_mb(output_file)
-                if not quiet:
-                    print(f"📊 48k压缩后大小: {compressed_size_mb:.1f}MB")
-
-                if compressed_size_mb <= 25:
-                    # 48k压缩满足要求
-                    if not quiet:
-                        print(f"✅ 48k压缩完成: {output_file.name} ({compressed_size_mb:.1f}MB)")
-                    # 清理临时文件
-                    if temp_64k_file.exists():
-                        temp_64k_file.unlink()
-                    return True
-                else:
-                    # 48k压缩后仍>25MB，进行第三级32k压缩
-                    if not quiet:
-                        print(f"⚠️  48k压缩后仍超25MB，进行第三级32k压缩...")
-                        print("📊 第三级压缩: 16KHz单声道, 32kbps MP3")
-
-                    cmd_32k = [
-                        'ffmpeg',
-                        '-i', str(input_file.resolve()),  # 使用绝对路径
-                        '-ar', '16000',        # 降采样到16KHz
-                        '-ac', '1',            # 单声道
-                        '-b:a', '32k',         # 32kbps码率
-                        '-y',                  # 覆盖输出文件
-                        str(output_file.resolve())  # 使用绝对路径
-                    ]
-
-                    # 运行第三级压缩（使用bytes模式避免编码问题）
-                    result = subprocess.run(
-                        cmd_32k,
-                        capture_output=True,
-                        text=False,  # 使用bytes模式避免UTF-8解码错误
-                        check=True
-                    )
-
-                    compressed_size_mb = self.get_file_size_mb(output_file)
-                    if not quiet:
-                        print(f"📊 32k压缩后大小: {compressed_size_mb:.1f}MB")
-
-                    if compressed_size_mb <= 25:
-                        # 32k压缩满足要求
-                        if not quiet:
-                            print(f"✅ 32k压缩完成: {output_file.name} ({compressed_size_mb:.1f}MB)")
-                        # 清理临时文件
-                        if temp_64k_file.exists():
-                            temp_64k_file.unlink()
-                        return True
-                    else:
-                        # 32k压缩后仍>25MB，进行第四级24k压缩
-                        if not quiet:
-                            print(f"⚠️  32k压缩后仍超25MB，进行第四级24k压缩...")
-                            print("📊 第四级压缩: 16KHz单声道, 24kbps MP3")
-
-                        cmd_24k = [
-                            'ffmpeg',
-                            '-i', str(input_file.resolve()),  # 使用绝对路径
-                            '-ar', '16000',        # 降采样到16KHz
-                            '-ac', '1',            # 单声道
-                            '-b:a', '24k',         # 24kbps码率
-                            '-y',                  # 覆盖输出文件
-                            str(output_file.resolve())  # 使用绝对路径
-                        ]
-
-                        # 运行第四级压缩（使用bytes模式避免编码问题）
-                        result = subprocess.run(
-                            cmd_24k,
-                            capture_output=True,
-                            text=False,  # 使用bytes模式避免UTF-8解码错误
-                    check=True
-                )
-                
-                final_size_mb = self.get_file_size_mb(output_file)
-                if not quiet:
-                            print(f"✅ 24k压缩完成: {output_file.name} ({final_size_mb:.1f}MB)")
-                
-                # 清理临时文件
-                if temp_64k_file.exists():
-                    temp_64k_file.unlink()
-                
-                return True
+                if compressed_size_mb <= GROQ_MAX_FILE_MB:
+                    break
+                if not quiet and bitrate != bitrates[-1]:
+                    print(f"⚠️  {bitrate}k 压缩后仍超过{GROQ_MAX_FILE_MB}MB ({compressed_size_mb:.1f}MB)，降低码率重试...")
+            
+            if not quiet:
+                print(f"✅ {bitrate}k压缩完成: {output_file.name} ({compressed_size_mb:.1f}MB)")
+            return True
             
         except subprocess.CalledProcessError as e:
             # 尝试解码stderr以获取更详细的错误信息
@@ -785,17 +640,17 @@ class ApplePodcastExplorer:
             print(f"❌ 压缩失败: {error_msg}")
             print(f"   输入文件: {input_file}")
             print(f"   输出文件: {output_file}")
-            # 清理临时文件
-            if 'temp_64k_file' in locals() and temp_64k_file.exists():
-                temp_64k_file.unlink()
+            # 删除不完整的输出
+            if output_file.exists():
+                output_file.unlink()
             return False
         except Exception as e:
             print(f"❌ 压缩出错: {e}")
             print(f"   输入文件: {input_file}")
             print(f"   输出文件: {output_file}")
-            # 清理临时文件
-            if 'temp_64k_file' in locals() and temp_64k_file.exists():
-                temp_64k_file.unlink()
+            # 删除不完整的输出
+            if output_file.exists():
+                output_file.unlink()
             return False
     
     def transcribe_with_groq(self, audio_file: Path, quiet: bool = False) -> dict:
@@ -816,13 +671,15 @@ class ApplePodcastExplorer:
             start_time = time.time()
             
             # 打开音频文件并转录
-            with open(audio_file, "rb") as file:
-                transcription = self.groq_client.audio.transcriptions.create(
-                    file=file,
-                    model="whisper-large-v3",
-                    response_format="verbose_json",
-                    temperature=0.0
-                )
+            throttle(GROQ_API_HOST)
+            with limits.network:
+                with open(audio_file, "rb") as file:
+                    transcription = self.groq_client.audio.transcriptions.create(
+                        file=file,
+                        model="whisper-large-v3",
+                        response_format="verbose_json",
+                        temperature=0.0
+                    )
             
             end_time = time.time()
             processing_time = end_time - start_time
@@ -849,9 +706,9 @@ class ApplePodcastExplorer:
             # print(f"❌ Groq转录失败: {e}")
             return None
     
-    def transcribe_with_mlx(self, audio_file: Path, quiet: bool = False) -> dict:
+    def transcribe_locally(self, audio_file: Path, quiet: bool = False) -> dict:
         """
-        使用MLX Whisper转录音频文件
+        使用本地Whisper后端（MLX、faster-whisper 或 openai-whisper）转录音频文件
         
         Args:
             audio_file: 音频文件路径
@@ -861,25 +718,18 @@ class ApplePodcastExplorer:
         """
         try:
             if not quiet:
-                print(f"🎯 MLX Whisper转录: {audio_file.name}")
-                print("🧠 使用模型: mlx-community/whisper-medium")
+                print(f"🎯 本地转录: {audio_file.name}")
+                print(f"🧠 使用模型: {LOCAL_BACKEND.label}")
             
             start_time = time.time()
             
-            # 在静默模式下隐藏 MLX Whisper 的输出
-            if quiet:
-                import contextlib
-                import io
-                with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
-                    result = mlx_whisper.transcribe(
-                        str(audio_file),
-                        path_or_hf_repo=self.whisper_model_name
-                    )
-            else:
-                result = mlx_whisper.transcribe(
-                    str(audio_file),
-                    path_or_hf_repo=self.whisper_model_name
-                )
+            with limits.cpu:
+                # 在静默模式下隐藏后端的输出
+                if quiet:
+                    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                        result = LOCAL_BACKEND.transcribe(audio_file)
+                else:
+                    result = LOCAL_BACKEND.transcribe(audio_file)
             
             end_time = time.time()
             processing_time = end_time - start_time
@@ -888,21 +738,85 @@ class ApplePodcastExplorer:
             speed_ratio = file_size_mb / processing_time * 60 if processing_time > 0 else 0
             
             if not quiet:
-                print(f"✅ MLX转录完成! 用时: {processing_time:.1f}秒")
+                print(f"✅ 本地转录完成! 用时: {processing_time:.1f}秒")
             
             return {
                 'text': result['text'],
-                'language': result.get('language', 'en'),
+                'language': result['language'],
                 'processing_time': processing_time,
                 'speed_ratio': speed_ratio,
-                'method': 'MLX Whisper medium'
+                'method': LOCAL_BACKEND.label
             }
             
         except Exception as e:
-            print(f"❌ MLX转录失败: {e}")
+            print(f"❌ 本地转录失败: {e}")
+            return None
+    
+    def split_audio_for_groq(self, audio_file: Path, quiet: bool = False) -> List[Path]:
+        """
+        在静音处把音频切分为小于Groq限制的片段
+        
+        Args:
+            audio_file: 音频文件路径
+        
+        Returns:
+            List[Path]: 按顺序排列的片段文件，切分失败时为空
+        """
+        chunk_dir = audio_file.parent / f"chunks_{audio_file.stem}"
+        try:
+            with limits.cpu:
+                chunk_files = split_audio(audio_file, chunk_dir)
+            if not quiet:
+                print(f"✂️  已在静音处切分为 {len(chunk_files)} 个片段")
+            return chunk_files
+        except Exception as e:
+            if not quiet:
+                print(f"⚠️  切分音频失败: {e}")
+            shutil.rmtree(chunk_dir, ignore_errors=True)
+            return []
+    
+    def transcribe_with_groq_chunked(self, audio_file: Path, quiet: bool = False, chunk_files: Optional[List[Path]] = None) -> dict:
+        """
+        将长音频按静音切分的片段并行提交Groq转录，按顺序拼接并去除重叠（无需有损压缩）
+        
+        Args:
+            audio_file: 音频文件路径
+            chunk_files: 流水线已切分好的片段（未提供时在此切分）
+        
+        Returns:
+            dict: 转录结果，任一片段失败时为None
+        """
+        if not chunk_files:
+            chunk_files = self.split_audio_for_groq(audio_file, quiet=quiet)
+        if not chunk_files:
             return None
+        
+        try:
+            start_time = time.time()
+            with ThreadPoolExecutor(max_workers=min(len(chunk_files), limits.network_workers)) as pool:
+                results = list(pool.map(lambda chunk: self.transcribe_with_groq(chunk, quiet=True), chunk_files))
+            if not all(results):
+                return None
+            
+            processing_time = time.time() - start_time
+            file_size_mb = self.get_file_size_mb(audio_file)
+            speed_ratio = file_size_mb / processing_time * 60 if processing_time > 0 else 0
+            
+            if not quiet:
+                print(f"✅ Groq分片转录完成! {len(chunk_files)} 个片段, 耗时: {processing_time:.1f}秒")
+            
+            return {
+                'text': merge_chunk_texts([result['text'] for result in results], chunk_overlaps(chunk_files)),
+                'language': results[0]['language'],
+                'processing_time': processing_time,
+                'speed_ratio': speed_ratio,
+                'method': f'Groq API whisper-large-v3 ({len(chunk_files)} chunks)'
+            }
+        finally:
+            # 无论转录是否成功都删除片段目录
+            shutil.rmtree(chunk_files[0].parent, ignore_errors=True)
     
-    def transcribe_audio_smart(self, audio_file: Path, episode_title: str, channel_name: str, episode_dir: Path, auto_transcribe: bool = False) -> bool:
+    def transcribe_audio_smart(self, audio_file: Path, episode_title: str, channel_name: str, episode_dir: Path, auto_transcribe: bool = False, chunk_files: Optional[List[Path]] = None) -> bool:
         """
         智能音频转录：根据文件大小选择最佳转录方式
         
@@ -911,6 +825,7 @@ class ApplePodcastExplorer:
             episode_title: 剧集标题
             channel_name: 频道名称
             episode_dir: 剧集文件夹路径
+            chunk_files: 流水线阶段已切分好的片段
         
         Returns:
             bool: 转录是否成功
@@ -949,81 +864,91 @@ class ApplePodcastExplorer:
             
             # 智能转录策略
             if file_size_mb <= groq_limit and GROQ_AVAILABLE:
-                # 情况1: 文件<25MB, 直接用Groq, 失败则MLX兜底
+                # 情况1: 文件<25MB, 直接用Groq, 失败则本地Whisper兜底
                 if not auto_transcribe:
                     print("✅ 文件大小在Groq限制内，使用极速转录")
                 transcript_result = self.transcribe_with_groq(audio_file, quiet=auto_transcribe)
                 
-                # Groq失败则MLX兜底
-                if not transcript_result and MLX_WHISPER_AVAILABLE:
+                # Groq失败则本地Whisper兜底
+                if not transcript_result and LOCAL_WHISPER_AVAILABLE:
                     if not auto_transcribe:
-                        print("🔄 Groq失败，切换本地MLX Whisper...")
-                    transcript_result = self.transcribe_with_mlx(audio_file, quiet=auto_transcribe)
+                        print("🔄 Groq失败，切换本地Whisper...")
+                    transcript_result = self.transcribe_locally(audio_file, quiet=auto_transcribe)
             
             elif file_size_mb > groq_limit:
                 # 情况2: 文件>25MB, 需压缩
-                if not auto_transcribe:
-                    print("⚠️  文件超出Groq限制，开始压缩...")
+                # 先尝试Groq分片转录，失败时才压缩
+                if GROQ_AVAILABLE:
+                    if not auto_transcribe:
+                        print("✂️  按静音切分并行分片转录...")
+                    transcript_result = self.transcribe_with_groq_chunked(audio_file, quiet=auto_transcribe, chunk_files=chunk_files)
                 
-                # 生成安全的压缩文件名
-                original_name = audio_file.stem
-                compressed_name = f"compressed_{original_name}"
-                extension = audio_file.suffix
+                # 回退到压缩
+                if not transcript_result:
+                    if not auto_transcribe:
+                        print("⚠️  文件超出Groq限制，开始压缩...")
                 
-                # 确保压缩文件名不超出限制
-                max_compressed_length = 255 - len(extension)
-                if len(compressed_name) > max_compressed_length:
-                    # 截断以适合
-                    truncated_name = compressed_name[:max_compressed_length]
-                    compressed_file = audio_file.parent / f"{truncated_name}{extension}"
-                else:
-                    compressed_file = audio_file.parent / f"{compressed_name}{extension}"
+                    # 生成安全的压缩文件名
+                    original_name = audio_file.stem
+                    compressed_name = f"compressed_{original_name}"
+                    extension = audio_file.suffix
                 
-                if self.compress_audio_file(audio_file, compressed_file, quiet=auto_transcribe):
-                    compressed_size = self.get_file_size_mb(compressed_file)
-                    final_size = compressed_size
-                    if not auto_transcribe:
-                        print(f"📊 压缩后大小: {compressed_size:.1f}MB")
-                    
-                    if compressed_size <= groq_limit and GROQ_AVAILABLE:
-                        # 情况2a: 压缩后在Groq限制内, 失败则MLX兜底
+                    # 确保压缩文件名不超出限制
+                    max_compressed_length = 255 - len(extension)
+                    if len(compressed_name) > max_compressed_length:
+                        # 截断以适合
+                        truncated_name = compressed_name[:max_compressed_length]
+                        compressed_file = audio_file.parent / f"{truncated_name}{extension}"
+                    else:
+                        compressed_file = audio_file.parent / f"{compressed_name}{extension}"
+                
+                    with limits.cpu:
+                        compressed_ok = self.compress_audio_file(audio_file, compressed_file, quiet=auto_transcribe)
+                    if compressed_ok:
+                        compressed_size = self.get_file_size_mb(compressed_file)
+                        final_size = compressed_size
                         if not auto_transcribe:
-                            print("✅ 压缩后在Groq限制内，使用极速转录")
-                        transcript_result = self.transcribe_with_groq(compressed_file, quiet=auto_transcribe)
+                            print(f"📊 压缩后大小: {compressed_size:.1f}MB")
+                    
+                        if compressed_size <= groq_limit and GROQ_AVAILABLE:
+                            # 情况2a: 压缩后在Groq限制内, 失败则本地Whisper兜底
+                            if not auto_transcribe:
+                                print("✅ 压缩后在Groq限制内，使用极速转录")
+                            transcript_result = self.transcribe_with_groq(compressed_file, quiet=auto_transcribe)
                         
-                        # Groq失败则MLX兜底
-                        if not transcript_result and MLX_WHISPER_AVAILABLE:
+                            # Groq失败则本地Whisper兜底
+                            if not transcript_result and LOCAL_WHISPER_AVAILABLE:
+                                if not auto_transcribe:
+                                    print("🔄 Groq失败，切换本地Whisper...")
+                                transcript_result = self.transcribe_locally(compressed_file, quiet=auto_transcribe)
+                        else:
+                            # 情况2b: 压缩后仍超限, 用本地Whisper
                             if not auto_transcribe:
-                                print("🔄 Groq失败，切换本地MLX Whisper...")
-                            transcript_result = self.transcribe_with_mlx(compressed_file, quiet=auto_transcribe)
+                                print("⚠️  压缩后仍超出限制，使用本地转录")
+                            if LOCAL_WHISPER_AVAILABLE:
+                                if auto_transcribe:
+                                    print("💻 本地转录...")
+                                transcript_result = self.transcribe_locally(compressed_file, quiet=auto_transcribe)
+                            else:
+                                if not auto_transcribe:
+                                    print("❌ 本地Whisper不可用，无法转录大文件")
+                                return False
                     else:
-                        # 情况2b: 压缩后仍超限, 用MLX
-                        if not auto_transcribe:
-                            print("⚠️  压缩后仍超出限制，使用MLX本地转录")
-                        if MLX_WHISPER_AVAILABLE:
-                            if auto_transcribe:
-                                print("💻 本地转录...")
-                            transcript_result = self.transcribe_with_mlx(compressed_file, quiet=auto_transcribe)
+                        # 压缩失败，尝试本地Whisper
+                        print("❌ 压缩失败，尝试本地转录")
+                        if LOCAL_WHISPER_AVAILABLE:
+                            transcript_result = self.transcribe_locally(audio_file)
                         else:
-                            if not auto_transcribe:
-                                print("❌ MLX Whisper不可用，无法转录大文件")
+                            print("❌ 本地Whisper不可用，转录失败")
                             return False
-                else:
-                    # 压缩失败，尝试MLX
-                    print("❌ 压缩失败，尝试本地MLX转录")
-                    if MLX_WHISPER_AVAILABLE:
-                        transcript_result = self.transcribe_with_mlx(audio_file)
-                    else:
-                        print("❌ MLX Whisper不可用，转录失败")
-                        return False
             
             else:
-                # 情况3: Groq不可用，用MLX
-                print("⚠️  Groq API不可用，使用本地MLX转录")
-                if MLX_WHISPER_AVAILABLE:
-                    transcript_result = self.transcribe_with_mlx(audio_file)
+                # 情况3: Groq不可用，用本地Whisper
+                print("⚠️  Groq API不可用，使用本地转录")
+                if LOCAL_WHISPER_AVAILABLE:
+                    transcript_result = self.transcribe_locally(audio_file)
                 else:
-                    print("❌ MLX Whisper不可用，转录失败")
+                    print("❌ 本地Whisper不可用，转录失败")
                     return False
             
             # 处理转录结果
@@ -1037,6 +962,7 @@ class ApplePodcastExplorer:
                 f.write(f"**频道:** {channel_name}\n\n")
                 f.write("---\n\n")
                 f.write(transcript_result['text'])
+            record_output(transcript_filepath)
             
             if not auto_transcribe:
                 print(f"✅ 转录完成: {episode_dir.name}/{transcript_filename}")
@@ -1152,9 +1078,9 @@ class ApplePodcastExplorer:
         else:
             print(f"\n🚀 开始智能转录{total_count}个文件...")
             if GROQ_AVAILABLE:
-                print("💡 将自动选择最佳转录方式: Groq API（极速）或MLX Whisper（本地）")
+                print("💡 将自动选择最佳转录方式: Groq API（极速）或本地Whisper")
             else:
-                print("💡 使用MLX Whisper本地转录")
+                print("💡 使用本地Whisper转录")
         
         successful_transcripts = []  # 存储成功转录的信息 (episode_title, channel_name, episode_dir)
         
@@ -1226,35 +1152,15 @@ class ApplePodcastExplorer:
                             print("⚠️  转录内容过短，跳过摘要生成")
                         continue
                     
-                    # 生成摘要
-                    summary = self.generate_summary(transcript_text, episode_title)
-                    if not summary:
-                        if not auto_transcribe:
-                            print("❌ 摘要生成失败")
-                        continue
-                    
-                    # 翻译为中文
-                    final_summary = summary
-                    if language_choice == 'ch':
-                        translated_summary = self.translate_to_chinese(summary)
-                        if translated_summary:
-                            final_summary = translated_summary
-                            if not auto_transcribe:
-                                print("✅ 摘要已翻译为中文")
-                        else:
-                            if not auto_transcribe:
-                                print("⚠️  翻译失败，使用英文摘要")
-                            language_choice = 'en'  # 回退英文
-                    
-                    # 保存摘要
-                    summary_path = self.save_summary(final_summary, episode_title, channel_name, language_choice, episode_dir)
+                    # 生成摘要，边生成边写入摘要文件
+                    summary_path = self.stream_summary(transcript_text, episode_title, channel_name, language_choice, episode_dir, quiet=auto_transcribe)
                     if summary_path:
                         if not auto_transcribe:
                             print(f"✅ 摘要已保存: {episode_dir.name}/summary.md")
                         summary_success_count += 1
                     else:
                         if not auto_transcribe:
-                            print("❌ 摘要保存失败")
+                            print("❌ 摘要生成失败")
                         
                 except Exception as e:
                     if not auto_transcribe:
@@ -1340,25 +1246,54 @@ class ApplePodcastExplorer:
         
         print("✅ 可视化完成")
 
-    def generate_summary(self, transcript: str, title: str) -> str:
+    def generate_text(self, prompt: str, template: str) -> Optional[str]:
         """
-        使用Gemini API生成摘要
+        通过磁盘响应缓存调用Gemini
+        
+        Args:
+            prompt: 提示文本
+            template: 提示模板版本，属于缓存键的一部分
+        
+        Returns:
+            str: 响应文本，响应格式异常时返回None
+        """
+        def request(prompt):
+            throttle(GEMINI_API_HOST)
+            with limits.llm:
+                return self.gemini_client.generate(prompt)
+        
+        return cached_generate(self.model_name, template, prompt, request)
+    
+    def stream_text(self, prompt: str, template: str) -> Iterator[str]:
+        """
+        通过磁盘响应缓存流式调用Gemini
+        
+        Args:
+            prompt: 提示文本
+            template: 提示模板版本，属于缓存键的一部分
+        
+        Returns:
+            Iterator[str]: 按到达顺序产出的响应文本块
+        """
+        def request(prompt):
+            throttle(GEMINI_API_HOST)
+            with limits.llm:
+                yield from self.gemini_client.generate_stream(prompt)
+        
+        return cached_stream(self.model_name, template, prompt, request)
+    
+    def summary_prompt(self, transcript: str, title: str) -> str:
+        """
+        构建单次请求的摘要提示
         
         Args:
             transcript: 转录文本
             title: 剧集标题
         
         Returns:
-            str: 生成的摘要，失败返回None
+            str: 提示文本
         """
-        if not self.gemini_client:
-            print("❌ Gemini API不可用，无法生成摘要")
-            return None
-        
-        try:
-            # print("✨ 正在生成摘要...")  # 隐藏详细信息
-            
-            prompt = f"""
+        return f"""
             Please provide a comprehensive summary and analysis of this podcast episode transcript.
             
             Episode Title: {title}
@@ -1375,22 +1310,62 @@ class ApplePodcastExplorer:
             转录文本:
             {transcript}
             """
+    
+    def generate_summary(self, transcript: str, title: str) -> str:
+        """
+        使用Gemini API生成摘要
+        
+        Args:
+            transcript: 转录文本
+            title: 剧集标题
+        
+        Returns:
+            str: 生成的摘要，失败返回None
+        """
+        if not self.gemini_client:
+            print("❌ Gemini API不可用，无法生成摘要")
+            return None
+        
+        try:
+            # 超出单次请求长度的转录分段摘要
+            if estimate_tokens(transcript) > SINGLE_PASS_MAX_TOKENS:
+                return self.generate_summary_map_reduce(transcript, title)
             
-            response = self.gemini_client.GenerativeModel(self.model_name).generate_content(prompt)
+            # print("✨ 正在生成摘要...")  # 隐藏详细信息
             
-            # 处理响应
-            if hasattr(response, 'text'):
-                return response.text
-            elif hasattr(response, 'candidates') and response.candidates:
-                return response.candidates[0].content.parts[0].text
-            else:
-                print("❌ Gemini API响应格式异常")
-                return None
+            prompt = self.summary_prompt(transcript, title)
+            
+            result = self.generate_text(prompt, TEMPLATE_SUMMARY)
+            if result:
+                return result
+            print("❌ Gemini API响应格式异常")
+            return None
                 
         except Exception as e:
             print(f"❌ 摘要生成失败: {e}")
             return None
     
+    def generate_summary_map_reduce(self, transcript: str, title: str) -> Optional[str]:
+        """
+        对超出单次请求长度的转录分段并发摘要，再归并为完整摘要
+        
+        Args:
+            transcript: 转录文本
+            title: 剧集标题
+        
+        Returns:
+            str: 生成的摘要（部分分段失败时不完整），失败返回None
+        """
+        def generate(prompt):
+            return self.generate_text(prompt, TEMPLATE_SUMMARY_SECTIONS)
+        
+        result = map_reduce_summary(generate, transcript, title, workers=limits.llm_workers)
+        if result['failed']:
+            print(f"⚠️  {len(result['failed'])}/{result['sections']} 段转录未能生成摘要，摘要不完整")
+        if result['summary'] and not result['reduced']:
+            print("⚠️  合并分段摘要失败，改为保存各段笔记")
+        return result['summary']
+    
     def translate_to_chinese(self, text: str) -> str:
         """
         翻译文本为中文
@@ -1410,27 +1385,70 @@ class ApplePodcastExplorer:
             
             prompt = f"Translate everything to Chinese accurately without missing anything:\n\n{text}"
             
-            response = self.gemini_client.GenerativeModel(self.model_name).generate_content(prompt)
-            
-            # 处理响应
-            if hasattr(response, 'text'):
-                return response.text
-            elif hasattr(response, 'candidates') and response.candidates:
-                return response.candidates[0].content.parts[0].text
-            else:
-                print("❌ Gemini API响应格式异常")
-                return None
+            result = self.generate_text(prompt, TEMPLATE_TRANSLATE)
+            if result:
+                return result
+            print("❌ Gemini API响应格式异常")
+            return None
                 
         except Exception as e:
             print(f"❌ 翻译失败: {e}")
             return None
     
+    def stream_summary(self, transcript: str, title: str, channel_name: str, language: str = "en",
+                       episode_dir: Path = None, quiet: bool = False) -> Optional[str]:
+        """
+        使用Gemini流式API生成并保存摘要：响应块到达后即追加到.partial文件，完成后重命名为摘要文件
+        
+        Args:
+            transcript: 转录文本
+            title: 剧集标题
+            channel_name: 频道名称
+            language: 语言标识；为'ch'时流式输出中文翻译
+            episode_dir: 剧集文件夹路径
+            quiet: 不打印首个token延迟
+        
+        Returns:
+            Optional[str]: 保存的文件路径，失败返回None
+        """
+        if not self.gemini_client:
+            print("❌ Gemini API不可用，无法生成摘要")
+            return None
+        
+        summary = None
+        if language == 'ch' or estimate_tokens(transcript) > SINGLE_PASS_MAX_TOKENS:
+            # 长转录走分段摘要，没有可流式输出的内容
+            summary = self.generate_summary(transcript, title)
+            if not summary:
+                return None
+            if language != 'ch':
+                return self.save_summary(summary, title, channel_name, language, episode_dir)
+            if not quiet:
+                print("🔄 正在翻译为中文...")
+            prompt = f"Translate everything to Chinese accurately without missing anything:\n\n{summary}"
+            template = TEMPLATE_TRANSLATE
+        else:
+            prompt = self.summary_prompt(transcript, title)
+            template = TEMPLATE_SUMMARY
+        
+        def report(seconds):
+            if not quiet:
+                print(f"⏱️  首个token用时 {seconds:.1f}秒")
+        
+        chunks = timed_chunks(self.stream_text(prompt, template), report)
+        summary_path = self.save_summary(chunks, title, channel_name, language, episode_dir)
+        if summary_path is None and summary:
+            if not quiet:
+                print("⚠️  翻译失败，使用英文摘要")
+            summary_path = self.save_summary(summary, title, channel_name, 'en', episode_dir)
+        return summary_path
+
     def save_summary(self, summary: str, title: str, channel_name: str, language: str = "en", episode_dir: Path = None) -> str:
         """
         保存摘要到文件
         
         Args:
-            summary: 摘要内容
+            summary: 摘要内容，或逐块写入文件的文本块迭代器
             title: 剧集标题
             channel_name: 频道名称
             language: 语言标识
@@ -1454,14 +1472,16 @@ class ApplePodcastExplorer:
                 summary_filename = self.ensure_summary_filename_length(safe_channel, safe_title)
                 summary_filepath = self.root_output_dir / summary_filename
             
-            with open(summary_filepath, 'w', encoding='utf-8') as f:
-                f.write(f"# 摘要: {title}\n\n" if language == "ch" else f"# Summary: {title}\n\n")
-                f.write(f"**频道:** {channel_name}\n\n" if language == "ch" else f"**Channel:** {channel_name}\n\n")
-                f.write(f"**摘要生成时间:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n" if language == "ch" else f"**Summary Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-                f.write(f"**语言:** {'中文' if language == 'ch' else 'English'}\n\n")
-                f.write("---\n\n")
-                f.write("## 摘要内容\n\n" if language == "ch" else "## Summary Content\n\n")
-                f.write(summary)
+            # 正文可以是文本块流：写入.partial文件，完成后重命名
+            header = []
+            header.append(f"# 摘要: {title}\n\n" if language == "ch" else f"# Summary: {title}\n\n")
+            header.append(f"**频道:** {channel_name}\n\n" if language == "ch" else f"**Channel:** {channel_name}\n\n")
+            header.append(f"**摘要生成时间:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n" if language == "ch" else f"**Summary Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+            header.append(f"**语言:** {'中文' if language == 'ch' else 'English'}\n\n")
+            header.append("---\n\n")
+            header.append("## 摘要内容\n\n" if language == "ch" else "## Summary Content\n\n")
+            write_stream(summary_filepath, ''.join(header), summary)
+            record_output(summary_filepath)
             
             return str(summary_filepath)
             
@@ -1537,77 +1557,164 @@ class ApplePodcastExplorer:
         """确保可视化文件名长度"""
         return self.ensure_output_filename_length("Visual_", safe_channel, safe_title, ".html")
 
-    def auto_process_latest_episode(self, podcast_name: str, progress_tracker=None) -> tuple[bool, str]:
+    def auto_process_latest_episode(self, podcast_name: str, progress_tracker=None, pipeline=None) -> tuple[bool, str]:
         """
         自动化处理播客最新剧集 - 无用户交互
         
         Args:
             podcast_name: 播客名称
             progress_tracker: 进度跟踪器（用于重复检查）
+            pipeline: 共享的分阶段流水线；传入时新剧集会被加入队列，而不是在当前线程中处理
             
         Returns:
-            tuple[bool, str]: (处理是否成功, episode标题)
+            tuple[bool, str]: (处理是否成功 / 是否已加入队列, episode标题)
         """
         try:
-            # 搜索频道（静默）
-            channels = self.search_podcast_channel(podcast_name, quiet=True)
-            if not channels:
-                return False, ""
-            
-            selected_channel = channels[0]  # 自动选择第一个匹配频道
-            if not selected_channel['feed_url']:
-                return False, ""
+            jobs, last_episode_title = self.collect_new_episodes(podcast_name, progress_tracker)
             
-            # 获取最新剧集（静默）
-            episodes = self.get_recent_episodes(selected_channel['feed_url'], 2, quiet=True)
-            if not episodes:
-                return False, ""
+            if pipeline is not None:
+                for job in jobs:
+                    pipeline.submit(job)
+                return len(jobs) > 0, last_episode_title
             
             # 循环处理所有episodes，从最新开始
-            processed_count = 0
-            last_episode_title = ""
-            
-            for i, episode in enumerate(episodes):
-                episode_title = episode['title']
-                last_episode_title = episode_title
-                
-                # 检查是否已处理过
-                if progress_tracker and progress_tracker.is_episode_processed(podcast_name, episode_title):
-                    # print(f"⏭️  {podcast_name} 剧集已处理过，跳过: {episode_title[:50]}...")
-                    continue
-                    
-                print(f"📥 处理新剧集: {episode_title[:50]}...")
-                
-                # 下载处理（静默下载过程）
-                success, episode_dir = self.download_episode(episode, i+1, selected_channel['name'], quiet=True)
-                if not success or not episode_dir:
-                    continue
-                
-                # 自动转录
-                audio_filepath = episode_dir / "audio.mp3"
-                if audio_filepath.exists():
-                    transcribe_success = self.transcribe_audio_smart(
-                        audio_filepath, episode_title, 
-                        selected_channel['name'], episode_dir, auto_transcribe=True
-                    )
-                    if transcribe_success:
-                        # 自动总结 - 模拟transcribe_downloaded_files的处理逻辑
-                        if self.gemini_client:
-                            # 使用与原始代码相同的summary生成逻辑
-                            self.auto_generate_summary_for_episode(
-                                episode_title, selected_channel['name'], episode_dir
-                            )
-                        
-                        # 标记为已处理
-                        if progress_tracker:
-                            progress_tracker.mark_episode_processed(podcast_name, episode_title)
-                        processed_count += 1
-            
+            processed_count = sum(1 for job in jobs if run_inline(job))
             return processed_count > 0, last_episode_title
             
         except Exception as e:
             return False, ""
     
+    def resolve_podcast_channel(self, podcast_name: str, refresh: bool = False) -> Optional[Dict]:
+        """
+        通过持久化的解析缓存将订阅名称解析为频道
+        
+        Args:
+            podcast_name: 播客名称（my_pod.md 条目）
+            refresh: 忽略缓存，重新搜索 iTunes
+        
+        Returns:
+            Optional[Dict]: 频道信息（collection_id, name, feed_url），未找到时为 None
+        """
+        if not refresh:
+            cached = self.channel_lookup.get(podcast_name)
+            if cached:
+                return {**cached, 'cached': True}
+        
+        channels = self.search_podcast_channel(podcast_name, quiet=True)
+        if not channels or not channels[0]['feed_url']:  # 自动选择第一个匹配频道
+            return None
+        return self.channel_lookup.put(podcast_name, channels[0])
+    
+    def collect_new_episodes(self, podcast_name: str, progress_tracker=None) -> tuple[List[Dict], str]:
+        """
+        查找尚未处理的最新剧集并为其创建流水线任务
+        
+        Args:
+            podcast_name: 播客名称
+            progress_tracker: 进度跟踪器（用于重复检查）
+            
+        Returns:
+            tuple[List[Dict], str]: (流水线任务, 最新剧集标题 - 搜索失败时为空)
+        """
+        # 从解析缓存获取频道，未命中时才搜索（静默）
+        selected_channel = self.resolve_podcast_channel(podcast_name)
+        if not selected_channel:
+            return [], ""
+        
+        # 获取最新剧集（静默）
+        episodes = self.get_recent_episodes(selected_channel['feed_url'], 2, quiet=True)
+        if not episodes and selected_channel.get('cached'):
+            # 订阅源可能已迁移，重新搜索一次
+            selected_channel = self.resolve_podcast_channel(podcast_name, refresh=True)
+            if selected_channel:
+                episodes = self.get_recent_episodes(selected_channel['feed_url'], 2, quiet=True)
+        if not episodes:
+            return [], ""
+        
+        jobs = []
+        last_episode_title = ""
+        for i, episode in enumerate(episodes):
+            episode_title = episode['title']
+            last_episode_title = episode_title
+            
+            # 检查是否已处理过
+            if progress_tracker and progress_tracker.is_episode_processed(podcast_name, episode_title, episode_key(episode)):
+                continue
+            
+            jobs.append({
+                'processor': self,
+                'source': podcast_name,
+                'title': episode_title,
+                'item_key': episode_key(episode),
+                'episode': episode,
+                'episode_num': i + 1,
+                'channel_name': selected_channel['name'],
+                'progress_tracker': progress_tracker,
+            })
+        
+        return jobs, last_episode_title
+    
+    def pipeline_download(self, job: Dict) -> Optional[Dict]:
+        """流水线阶段：下载剧集音频（静默）"""
+        print(f"📥 处理新剧集: {job['title'][:50]}...")
+        success, episode_dir = self.download_episode(job['episode'], job['episode_num'], job['channel_name'], quiet=True)
+        if not success or not episode_dir:
+            return None
+        
+        audio_filepath = episode_dir / "audio.mp3"
+        if not audio_filepath.exists():
+            return None
+        
+        job['episode_dir'] = episode_dir
+        job['audio_file'] = audio_filepath
+        return job
+    
+    def pipeline_compress(self, job: Dict) -> Optional[Dict]:
+        """流水线阶段：切分（或压缩）超过 Groq 限制的音频，使转录阶段可直接使用"""
+        audio_file = job['audio_file']
+        if not GROQ_AVAILABLE or self.get_file_size_mb(audio_file) <= 25:
+            return job
+        
+        # 在静音处切分以便并行分片转录，切分失败时才压缩
+        job['chunk_files'] = self.split_audio_for_groq(audio_file, quiet=True)
+        if job['chunk_files']:
+            return job
+        
+        compressed_file = audio_file.parent / f"compressed_{audio_file.stem}{audio_file.suffix}"
+        with limits.cpu:
+            compressed_ok = self.compress_audio_file(audio_file, compressed_file, quiet=True)
+        if compressed_ok:
+            job['source_audio'] = audio_file
+            job['audio_file'] = compressed_file
+        return job
+    
+    def pipeline_transcribe(self, job: Dict) -> Optional[Dict]:
+        """流水线阶段：转录音频"""
+        transcribe_success = self.transcribe_audio_smart(
+            job['audio_file'], job['title'],
+            job['channel_name'], job['episode_dir'], auto_transcribe=True,
+            chunk_files=job.get('chunk_files')
+        )
+        if not transcribe_success:
+            return None
+        
+        # 压缩副本由 transcribe_audio_smart 删除，这里同时删除原始音频
+        source_audio = job.get('source_audio')
+        if source_audio and source_audio.exists():
+            source_audio.unlink()
+        return job
+    
+    def pipeline_summarize(self, job: Dict) -> Optional[Dict]:
+        """流水线阶段：生成摘要并标记剧集已处理"""
+        # 自动总结 - 模拟transcribe_downloaded_files的处理逻辑
+        if self.gemini_client:
+            self.auto_generate_summary_for_episode(job['title'], job['channel_name'], job['episode_dir'])
+        
+        # 标记为已处理
+        if job['progress_tracker']:
+            job['progress_tracker'].mark_episode_processed(job['source'], job['title'], job['item_key'])
+        return job
+    
     def auto_generate_summary_for_episode(self, episode_title: str, channel_name: str, episode_dir: Path) -> bool:
         """
         为单个剧集自动生成总结（模拟transcribe_downloaded_files的逻辑）
@@ -1683,112 +1790,199 @@ class Podnet:
         self.searcher = YouTubeSearcher()
         self.extractor = TranscriptExtractor()
         self.summarizer = SummaryGenerator()
+        # 自动化的整批字幕在这里获取，不占用订阅发现的工作线程
+        self.caption_pool = ThreadPoolExecutor(max_workers=1)
     
     def search_youtube_podcast(self, podcast_name: str, num_episodes: int = 5) -> List[Dict]:
         """在YouTube上搜索播客剧集，使用频道视频页面"""
         return self.searcher.search_youtube_podcast(podcast_name, num_episodes)
     
-    def auto_process_channel_latest_video(self, channel_name: str, progress_tracker=None) -> tuple[bool, str]:
+    def auto_process_channel_latest_video(self, channel_name: str, progress_tracker=None, pipeline=None) -> tuple[bool, str]:
         """
         自动化处理频道最新视频 - 无用户交互
         
         Args:
             channel_name: 频道名称（不含@符号）
             progress_tracker: 进度跟踪器（用于重复检查）
+            pipeline: 共享的分阶段流水线；传入时新视频会被加入队列，而不是在当前线程中处理
             
         Returns:
-            tuple[bool, str]: (处理是否成功, 视频标题)
+            tuple[bool, str]: (处理是否成功 / 是否已加入队列, 视频标题)
         """
         try:
-            # 搜索频道最新视频
-            episodes = self.searcher.search_youtube_podcast(channel_name, num_episodes=2)
-            if not episodes:
-                return False, ""
+            jobs, last_video_title = self.collect_new_videos(channel_name, progress_tracker)
             
-            # 循环处理所有videos，从最新开始
-            processed_count = 0
-            last_video_title = ""
-            
-            for episode in episodes:
-                video_title = episode.get('title', 'Unknown')
-                last_video_title = video_title
-                
-                # 检查是否已处理过
-                if progress_tracker and progress_tracker.is_video_processed(channel_name, video_title):
-                    # print(f"⏭️  @{channel_name} 视频已处理过，跳过: {video_title[:50]}...")
-                    continue
-                    
-                video_url = episode.get('url', '')
-                if not video_url:
-                    continue
-                
-                # 提取视频ID
-                import re
-                video_id_match = re.search(r'(?:v=|/)([a-zA-Z0-9_-]{11})', video_url)
-                if not video_id_match:
-                    continue
-                
-                video_id = video_id_match.group(1)
-                
-                # 获取视频信息
-                video_info = self.searcher.get_video_info(video_id)
-                title = episode.get('title', video_info.get('title', 'Unknown'))
-                channel_name_from_video = video_info.get('channel_name', channel_name)
-                published_date = episode.get('published_date', 'Recent')
-                
-                print(f"📥 处理新视频: {title[:50]}...")
-                
-                # 创建episode目录
-                episode_dir = self.extractor.create_episode_folder(
-                    channel_name_from_video, 
-                    title, 
-                    published_date
-                )
-                
-                # 尝试提取转录
-                transcript = self.extractor.extract_youtube_transcript(
-                    video_id, 
-                    video_url, 
-                    title, 
-                    episode_dir=episode_dir
-                )
-                
-                if transcript:
-                    # 保存转录
-                    transcript_filename = self.extractor.save_transcript(
-                        transcript, 
-                        title, 
-                        channel_name_from_video, 
-                        published_date, 
-                        episode_dir
-                    )
-                    
-                    # 生成总结
-                    if self.summarizer.gemini_client:
-                        summary = self.summarizer.generate_summary(transcript, title)
-                        if summary:
-                            # 翻译总结为中文（自动化中文版）
-                            chinese_summary = self.summarizer.translate_to_chinese(summary)
-                            final_summary = chinese_summary if chinese_summary else summary
-                            
-                            self.summarizer.save_summary(
-                                final_summary, 
-                                title, 
-                                episode_dir, 
-                                channel_name_from_video, 
-                                episode_dir
-                            )
-                    
-                    # 标记为已处理
-                    if progress_tracker:
-                        progress_tracker.mark_video_processed(channel_name, video_title)
-                    processed_count += 1
+            if pipeline is not None:
+                for job in jobs:
+                    pipeline.submit(job)
+                return len(jobs) > 0, last_video_title
             
+            # 循环处理所有videos，从最新开始
+            processed_count = sum(1 for job in jobs if run_inline(job))
             return processed_count > 0, last_video_title
             
         except Exception as e:
             print(f"❌ 自动处理YouTube视频失败: {e}")
             return False, ""
+    
+    def collect_new_videos(self, channel_name: str, progress_tracker=None) -> tuple[List[Dict], str]:
+        """
+        查找频道尚未处理的最新视频并为其创建流水线任务
+        
+        Args:
+            channel_name: 频道名称（不含@符号）
+            progress_tracker: 进度跟踪器（用于重复检查）
+            
+        Returns:
+            tuple[List[Dict], str]: (流水线任务, 最新视频标题 - 搜索失败时为空)
+        """
+        # 搜索频道最新视频
+        episodes = self.searcher.search_youtube_podcast(channel_name, num_episodes=2)
+        if not episodes:
+            return [], ""
+        
+        jobs = []
+        last_video_title = ""
+        for episode in episodes:
+            video_title = episode.get('title', 'Unknown')
+            last_video_title = video_title
+            
+            video_url = episode.get('url', '')
+            if not video_url:
+                continue
+            
+            # 提取视频ID
+            video_id_match = re.search(r'(?:v=|/)([a-zA-Z0-9_-]{11})', video_url)
+            if not video_id_match:
+                continue
+            video_id = video_id_match.group(1)
+            
+            # 检查是否已处理过
+            if progress_tracker and progress_tracker.is_video_processed(channel_name, video_title, video_id):
+                continue
+            
+            jobs.append({
+                'processor': self,
+                'source': channel_name,
+                'title': video_title,
+                'episode': episode,
+                'video_id': video_id,
+                'video_url': video_url,
+                'progress_tracker': progress_tracker,
+            })
+        
+        # 在字幕执行器中获取整批字幕，发现线程立即释放；
+        # pipeline_download 等待结果，只为没有字幕的视频下载音频
+        if jobs:
+            captions = self.caption_pool.submit(self.extractor.fetch_captions_batch, jobs)
+            for job in jobs:
+                job['captions'] = captions
+        
+        return jobs, last_video_title
+    
+    def pipeline_download(self, job: Dict) -> Optional[Dict]:
+        """流水线阶段：获取字幕，没有字幕时下载音频"""
+        episode = job['episode']
+        
+        # 获取视频信息
+        video_info = self.searcher.get_video_info(job['video_id'])
+        title = episode.get('title', video_info.get('title', 'Unknown'))
+        job['display_title'] = title
+        job['channel_name'] = video_info.get('channel_name', job['source'])
+        job['published_date'] = episode.get('published_date', 'Recent')
+        
+        print(f"📥 处理新视频: {title[:50]}...")
+        
+        # 创建episode目录
+        job['episode_dir'] = self.extractor.create_episode_folder(
+            job['channel_name'], 
+            title, 
+            job['published_date']
+        )
+        
+        if job.get('captions') is not None:
+            # 频道整批字幕已在字幕执行器中获取；只有没有字幕的才下载音频
+            try:
+                job['transcript'] = job['captions'].result().get(job['video_id'])
+            except Exception:
+                job['transcript'] = None
+        else:
+            job['transcript'] = self.extractor.extract_youtube_transcript(
+                job['video_id'], 
+                job['video_url'], 
+                title, 
+                episode_dir=job['episode_dir'],
+                audio_fallback=False
+            )
+        if job['transcript']:
+            return job
+        
+        job['audio_file'] = self.extractor.download_youtube_audio(job['video_url'], title, job['episode_dir'])
+        return job if job['audio_file'] else None
+    
+    def pipeline_compress(self, job: Dict) -> Optional[Dict]:
+        """流水线阶段：切分（或压缩）超过 Groq 限制的已下载音频"""
+        audio_file = job.get('audio_file')
+        if job['transcript'] or not audio_file or self.extractor.get_file_size_mb(audio_file) <= 25:
+            return job
+        
+        if GROQ_AVAILABLE:
+            # 在静音处切分以便并行分片转录，切分失败时才压缩
+            job['chunk_files'] = self.extractor.split_audio_for_groq(audio_file)
+            if job['chunk_files']:
+                return job
+        
+        compressed_file = audio_file.parent / f"compressed_{audio_file.stem}{audio_file.suffix}"
+        with limits.cpu:
+            compressed_ok = self.extractor.compress_audio_file(audio_file, compressed_file)
+        if compressed_ok:
+            job['source_audio'] = audio_file
+            job['audio_file'] = compressed_file
+        return job
+    
+    def pipeline_transcribe(self, job: Dict) -> Optional[Dict]:
+        """流水线阶段：转录音频（无字幕时）并保存转录"""
+        if not job['transcript']:
+            job['transcript'] = self.extractor.transcribe_audio_smart(
+                job['audio_file'], job['display_title'], chunk_files=job.get('chunk_files')
+            )
+            source_audio = job.get('source_audio')
+            if source_audio and source_audio.exists():
+                source_audio.unlink()
+            if not job['transcript']:
+                return None
+        
+        # 保存转录
+        self.extractor.save_transcript(
+            job['transcript'], 
+            job['display_title'], 
+            job['channel_name'], 
+            job['published_date'], 
+            job['episode_dir']
+        )
+        return job
+    
+    def pipeline_summarize(self, job: Dict) -> Optional[Dict]:
+        """流水线阶段：生成总结并标记视频已处理"""
+        if self.summarizer.gemini_client:
+            summary = self.summarizer.generate_summary(job['transcript'], job['display_title'])
+            if summary:
+                # 翻译总结为中文（自动化中文版）
+                chinese_summary = self.summarizer.translate_to_chinese(summary)
+                final_summary = chinese_summary if chinese_summary else summary
+                
+                self.summarizer.save_summary(
+                    final_summary, 
+                    job['display_title'], 
+                    job['episode_dir'], 
+                    job['channel_name'], 
+                    job['episode_dir']
+                )
+        
+        # 标记为已处理
+        if job['progress_tracker']:
+            job['progress_tracker'].mark_video_processed(job['source'], job['title'], job['video_id'])
+        return job
 
     def run(self):
         """Main application loop for YouTube"""
@@ -2005,6 +2199,12 @@ class Podnet:
             # 中文版默认使用中文输出和翻译
             want_chinese = True
             
+            # 并发获取所有选中视频的字幕；没有字幕的直接进入音频回退
+            batch_captions = self.extractor.fetch_captions_batch([
+                episode for episode in selected_episodes
+                if episode['platform'] != 'script' and episode.get('video_id')
+            ])
+            
             # 处理每个节目
             for episode in selected_episodes:
                 print(f"\n🎥 正在处理: {episode['title']}")
@@ -2040,11 +2240,12 @@ class Podnet:
                         )
                         
                         print("⚡️ 极速转录...")
-                        transcript_content = self.extractor.extract_youtube_transcript(
+                        transcript_content = batch_captions.get(video_id) or self.extractor.extract_youtube_transcript(
                             video_id, 
                             episode.get('url'), 
                             episode['title'],
-                            episode_dir
+                            episode_dir,
+                            captions=video_id not in batch_captions
                         )
                         if transcript_content:
                             print("✅ 转录完成")
@@ -2103,36 +2304,28 @@ You can:
                     # Check if transcript has actual content (not just placeholder)
                     if len(transcript_content.strip()) > 100 and "Note: No transcript available" not in transcript_content:
                         print("🧠 开始总结...")
-                        summary = self.summarizer.generate_summary(transcript_content, episode['title'])
-                        if summary:
-                            # Translate summary to Chinese if requested
-                            final_summary = summary
-                            if want_chinese:
-                                translated_summary = self.summarizer.translate_to_chinese(summary)
-                                if translated_summary:
-                                    final_summary = translated_summary
-                                else:
-                                    print("⚠️  翻译失败，使用原始摘要")
+                        if episode['platform'] == 'script':
+                            # For script content, use default save method
+                            summary_path = self.summarizer.stream_summary(
+                                transcript_content, 
+                                episode['title'], 
+                                self.extractor.output_dir,
+                                translate=want_chinese
+                            )
+                        else:
+                            # For YouTube content, use new directory structure
+                            video_info = self.searcher.get_video_info(episode.get('video_id', ''))
+                            channel_name = video_info.get('channel_name', 'Unknown_Channel')
                             
-                            if episode['platform'] == 'script':
-                                # For script content, use default save method
-                                summary_path = self.summarizer.save_summary(
-                                    final_summary, 
-                                    episode['title'], 
-                                    self.extractor.output_dir
-                                )
-                            else:
-                                # For YouTube content, use new directory structure
-                                video_info = self.searcher.get_video_info(episode.get('video_id', ''))
-                                channel_name = video_info.get('channel_name', 'Unknown_Channel')
-                                
-                                summary_path = self.summarizer.save_summary(
-                                    final_summary, 
-                                    episode['title'], 
-                                    self.extractor.output_dir,
-                                    channel_name,
-                                    episode_dir
-                                )
+                            summary_path = self.summarizer.stream_summary(
+                                transcript_content, 
+                                episode['title'], 
+                                self.extractor.output_dir,
+                                channel_name,
+                                episode_dir,
+                                translate=want_chinese
+                            )
+                        if summary_path:
                             print("✅ 总结完成")
                             print()  # 空行
                         else:
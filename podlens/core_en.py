@@ -12,6 +12,8 @@ import sys
 import re
 import json
 import time
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 import subprocess
 import contextlib
 import io
@@ -20,10 +22,20 @@ import feedparser
 import urllib.parse
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
 from dotenv import load_dotenv
-from tqdm import tqdm
-from . import get_model_name
+from .concurrency import limits, throttle, GROQ_API_HOST, GEMINI_API_HOST
+from .pipeline import run_inline
+from .feed_cache import FeedCache, ChannelLookupCache
+from .storage import episode_key
+from .downloader import download_file
+from .audio import probe_duration, candidate_bitrates, encode_mp3, split_audio, merge_chunk_texts, chunk_overlaps, GROQ_MAX_FILE_MB
+from .transcription import get_local_backend
+from .summarizer import map_reduce_summary, estimate_tokens, SINGLE_PASS_MAX_TOKENS
+from .gemini import get_gemini_client
+from .streaming import write_stream, timed_chunks
+from .catalog import record_output
+from .llm_cache import cached_generate, cached_stream, TEMPLATE_SUMMARY, TEMPLATE_SUMMARY_SECTIONS, TEMPLATE_TRANSLATE
 
 # Enhanced .env loading function
 def load_env_robust():
@@ -57,15 +69,9 @@ except ImportError:
     GEMINI_AVAILABLE = False
     genai = None
 
-# Check MLX Whisper availability
-try:
-    import mlx_whisper
-    import mlx.core as mx
-    MLX_WHISPER_AVAILABLE = True
-    MLX_DEVICE = mx.default_device()
-except ImportError:
-    MLX_WHISPER_AVAILABLE = False
-    MLX_DEVICE = "Not Available"
+# Local Whisper transcription backend (MLX, faster-whisper or openai-whisper), model loaded once on first use
+LOCAL_BACKEND = get_local_backend()
+LOCAL_WHISPER_AVAILABLE = LOCAL_BACKEND is not None
 
 # YouTube transcript support
 try:
@@ -82,15 +88,8 @@ try:
 except ImportError:
     YT_DLP_AVAILABLE = False
 
-# Local Whisper for YouTube
-try:
-    import whisper
-    WHISPER_AVAILABLE = True
-except ImportError:
-    WHISPER_AVAILABLE = False
-
 # Check transcription functionality availability
-TRANSCRIPTION_AVAILABLE = MLX_WHISPER_AVAILABLE or GROQ_AVAILABLE
+TRANSCRIPTION_AVAILABLE = LOCAL_WHISPER_AVAILABLE or GROQ_AVAILABLE
 
 # Import YouTube components
 from .youtube_en import YouTubeSearcher, TranscriptExtractor, SummaryGenerator
@@ -111,14 +110,13 @@ class ApplePodcastExplorer:
             'Sec-Fetch-Mode': 'no-cors',
             'Sec-Fetch-Site': 'cross-site'
         })
+        self.feed_cache = FeedCache()  # Conditional-GET cache for RSS feeds
+        self.channel_lookup = ChannelLookupCache()  # Resolved iTunes channels for subscriptions
 
         # Create root output folder
         self.root_output_dir = Path("outputs")
         self.root_output_dir.mkdir(exist_ok=True)
 
-        # Initialize MLX Whisper model - always use medium model
-        self.whisper_model_name = 'mlx-community/whisper-medium'
-
         # Groq client initialization
         if GROQ_AVAILABLE:
             self.groq_client = Groq(api_key=GROQ_API_KEY)
@@ -129,9 +127,8 @@ class ApplePodcastExplorer:
         self.api_key = os.getenv('GEMINI_API_KEY')
         if GEMINI_AVAILABLE and self.api_key:
             try:
-                genai.configure(api_key=self.api_key, transport='rest')
-                self.gemini_client = genai
-                self.model_name = get_model_name()  # Get model name from .env
+                self.gemini_client = get_gemini_client()  # Shared per process, model name from .env
+                self.model_name = self.gemini_client.model_name
             except Exception as e:
                 print(f"⚠️  Gemini client initialization failed: {e}")
                 self.gemini_client = None
@@ -140,19 +137,15 @@ class ApplePodcastExplorer:
     
     def load_whisper_model(self):
         """
-        Set MLX Whisper model - always use medium model
+        Check the local Whisper backend - the model is loaded once on first use and shared
         """
-        if not MLX_WHISPER_AVAILABLE:
-            print("❌ MLX Whisper not available")
+        if not LOCAL_WHISPER_AVAILABLE:
+            print("❌ Local Whisper not available")
             return False
         
-        try:
-            print(f"📥 Setting MLX Whisper model: {self.whisper_model_name}")
-            print("ℹ️  The model file will be downloaded on first use, please wait patiently...")
-            return True
-        except Exception as e:
-            print(f"❌ Failed to set MLX Whisper model: {e}")
-            return False
+        print(f"📥 Local Whisper backend: {LOCAL_BACKEND.label}")
+        print("ℹ️  The model file will be downloaded on first use, please wait patiently...")
+        return True
     
     def search_podcast_channel(self, podcast_name: str, quiet: bool = False) -> List[Dict]:
         """
@@ -177,6 +170,7 @@ class ApplePodcastExplorer:
                 'limit': 10  # Get multiple matching podcast channels
             }
             
+            throttle(search_url)
             response = self.session.get(search_url, params=params)
             response.raise_for_status()
             data = response.json()
@@ -184,6 +178,7 @@ class ApplePodcastExplorer:
             channels = []
             for result in data.get('results', []):
                 channel = {
+                    'collection_id': result.get('collectionId'),
                     'name': result.get('collectionName', 'Unknown Channel'),
                     'artist': result.get('artistName', 'Unknown Author'),
                     'feed_url': result.get('feedUrl', ''),
@@ -215,52 +210,67 @@ class ApplePodcastExplorer:
             if not quiet:
                 print("Getting podcast episodes...")
             
-            feed = feedparser.parse(feed_url)
-            episodes = []
-            
-            for entry in feed.entries[:limit]:
-                # Extract audio URL
-                audio_url = None
-                for link in entry.get('links', []):
-                    if link.get('type', '').startswith('audio/'):
-                        audio_url = link.get('href')
-                        break
-                
-                # Alternative method to get audio URL
-                if not audio_url and hasattr(entry, 'enclosures'):
-                    for enclosure in entry.enclosures:
-                        if enclosure.type.startswith('audio/'):
-                            audio_url = enclosure.href
-                            break
-                
-                # Format publish date
-                published_date = 'Unknown Date'
-                if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                    published_date = datetime(*entry.published_parsed[:6]).strftime('%Y-%m-%d')
-                elif hasattr(entry, 'published'):
-                    published_date = entry.published
-                
-                # Get duration (if available)
-                duration = 'Unknown Duration'
-                if hasattr(entry, 'itunes_duration'):
-                    duration = entry.itunes_duration
-                
-                episode = {
-                    'title': entry.get('title', 'Unknown Title'),
-                    'audio_url': audio_url,
-                    'published_date': published_date,
-                    'duration': duration,
-                    'description': entry.get('summary', 'No description')[:200] + '...' if len(entry.get('summary', '')) > 200 else entry.get('summary', 'No description')
-                }
-                episodes.append(episode)
-            
-            return episodes
+            throttle(feed_url)
+            return self.feed_cache.fetch_episodes(self.session, feed_url, self.parse_feed_episodes, limit)
             
         except Exception as e:
             if not quiet:
                 print(f"Error getting episodes: {e}")
             return []
     
+    def parse_feed_episodes(self, content: bytes, limit: int) -> List[Dict]:
+        """
+        Parse episodes from RSS content (only called when the feed changed)
+        
+        Args:
+            content: RSS document
+            limit: Limit on the number of episodes returned
+        
+        Returns:
+            List[Dict]: List of episode information
+        """
+        feed = feedparser.parse(content)
+        episodes = []
+        
+        for entry in feed.entries[:limit]:
+            # Extract audio URL
+            audio_url = None
+            for link in entry.get('links', []):
+                if link.get('type', '').startswith('audio/'):
+                    audio_url = link.get('href')
+                    break
+        
+            # Alternative method to get audio URL
+            if not audio_url and hasattr(entry, 'enclosures'):
+                for enclosure in entry.enclosures:
+                    if enclosure.type.startswith('audio/'):
+                        audio_url = enclosure.href
+                        break
+        
+            # Format publish date
+            published_date = 'Unknown Date'
+            if hasattr(entry, 'published_parsed') and entry.published_parsed:
+                published_date = datetime(*entry.published_parsed[:6]).strftime('%Y-%m-%d')
+            elif hasattr(entry, 'published'):
+                published_date = entry.published
+        
+            # Get duration (if available)
+            duration = 'Unknown Duration'
+            if hasattr(entry, 'itunes_duration'):
+                duration = entry.itunes_duration
+        
+            episode = {
+                'title': entry.get('title', 'Unknown Title'),
+                'guid': entry.get('id'),
+                'audio_url': audio_url,
+                'published_date': published_date,
+                'duration': duration,
+                'description': entry.get('summary', 'No description')[:200] + '...' if len(entry.get('summary', '')) > 200 else entry.get('summary', 'No description')
+            }
+            episodes.append(episode)
+        
+        return episodes
+    
     def display_channels(self, channels: List[Dict]) -> int:
         """
         Display found channels and let the user choose
@@ -612,33 +622,13 @@ class ApplePodcastExplorer:
             # Download file with additional headers for podcast hosting services
             download_headers = {
                 'Referer': 'https://podcasts.apple.com/',
-                'Origin': 'https://podcasts.apple.com',
-                'Range': 'bytes=0-'  # Some servers require Range header
+                'Origin': 'https://podcasts.apple.com'
             }
-            response = self.session.get(episode['audio_url'], stream=True, headers=download_headers, timeout=30)
-            response.raise_for_status()
-            
-            # Get file size
-            total_size = int(response.headers.get('content-length', 0))
-            
-            # Download with progress bar
-            with open(filepath, 'wb') as f:
-                if total_size > 0 and not quiet:
-                    with tqdm(
-                        total=total_size, 
-                        unit='B', 
-                        unit_scale=True, 
-                        desc=f"Episode {episode_num}"
-                    ) as pbar:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            if chunk:
-                                f.write(chunk)
-                                pbar.update(len(chunk))
-                else:
-                    # If no file size info, just download, or in silent mode directly download
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
+            # Range requests resume an interrupted download from audio.mp3.part
+            throttle(episode['audio_url'])
+            with limits.network:
+                download_file(self.session, episode['audio_url'], filepath, headers=download_headers,
+                              desc=f"Episode {episode_num}", quiet=quiet)
             
             if not quiet:
                 print(f"✅ Download complete")
@@ -647,9 +637,7 @@ class ApplePodcastExplorer:
         except Exception as e:
             if not quiet:
                 print(f"❌ Failed to download episode {episode_num}: {e}")
-            # If download failed, delete possible incomplete file
-            if 'filepath' in locals() and filepath.exists():
-                filepath.unlink()
+            # Downloaded data stays in audio.mp3.part and is resumed on the next attempt
             return False, None
     
     def get_file_size_mb(self, filepath):
@@ -661,8 +649,8 @@ class ApplePodcastExplorer:
     
     def compress_audio_file(self, input_file: Path, output_file: Path, quiet: bool = False) -> bool:
         """
-        Smart four-level audio compression below Groq API limit
-        Compression strategy: 64k → 48k → 32k → 24k, checking 25MB limit at each level
+        Compress audio below the Groq API limit in a single ffmpeg pass
+        The duration is probed first and the highest bitrate (up to 64k) that fits 25MB is used directly
         
         Args:
             input_file: Input file path
@@ -684,160 +672,27 @@ class ApplePodcastExplorer:
                 print("🔧 Compressing...")
             else:
                 print(f"🔧 Compressing audio file: {input_file.name}")
-                
-                # Level 1 compression: 64k (priority on quality)
-                print("📊 Level 1 compression: 16KHz mono, 64kbps MP3")
-            
-            # Generate safe temporary filename, not exceeding 255 characters
-            original_name = output_file.stem  # Filename without extension
-            prefix = "temp_64k_"
-            extension = output_file.suffix
             
-            # Calculate maximum length for original filename part
-            max_name_length = 255 - len(prefix) - len(extension)
-            
-            # Truncate original filename if needed
-            if len(original_name) > max_name_length:
-                safe_name = original_name[:max_name_length]
-            else:
-                safe_name = original_name
-            
-            temp_64k_file = output_file.parent / f"{prefix}{safe_name}{extension}"
-            
-            cmd_64k = [
-                'ffmpeg',
-                '-i', str(input_file.resolve()),  # Use absolute path to avoid special character issues
-                '-ar', '16000',        # Downsample to 16KHz
-                '-ac', '1',            # Mono
-                '-b:a', '64k',         # 64kbps bitrate
-                '-y',                  # Overwrite output file
-                str(temp_64k_file.resolve())  # Use absolute path
-            ]
-            
-            # Run level 1 compression (use bytes mode to avoid encoding issues)
-            result = subprocess.run(
-                cmd_64k,
-                capture_output=True,
-                text=False,  # Use bytes mode to avoid UTF-8 decoding errors
-                check=True
-            )
-            
-            # Check file size after 64k compression
-            compressed_size_mb = self.get_file_size_mb(temp_64k_file)
+            # Pick the bitrate from the duration up front, the ladder is only used if ffprobe fails
+            duration = probe_duration(input_file)
+            bitrates = candidate_bitrates(duration)
             if not quiet:
-                print(f"📊 Size after 64k compression: {compressed_size_mb:.1f}MB")
+                if duration:
+                    print(f"📊 Duration {duration / 60:.1f} min → 16KHz mono, {bitrates[0]}kbps MP3")
+                else:
+                    print(f"⚠️  Could not read duration, trying {bitrates[0]}kbps first")
             
-            if compressed_size_mb <= 25:
-                # 64k compression meets requirements, use 64k result
-                temp_64k_file.rename(output_file)
-                if not quiet:
-                    print(f"✅ 64k compression complete: {output_file.name} ({compressed_size_mb:.1f}MB)")
-                return True
-            else:
-                # Still >25MB after 64k compression, proceed with level 2 48k compression
-                if not quiet:
-                    print(f"⚠️  Still exceeds 25MB after 64k, proceeding with level 2 48k compression...")
-                    print("📊 Level 2 compression: 16KHz mono, 48kbps MP3")
-                
-                cmd_48k = [
-                    'ffmpeg',
-                    '-i', str(input_file.resolve()),  # Use absolute path to avoid special character issues
-                    '-ar', '16000',        # Downsample to 16KHz
-                    '-ac', '1',            # Mono
-                    '-b:a', '48k',         # 48kbps bitrate
-                    '-y',                  # Overwrite output file
-                    str(output_file.resolve())  # Use absolute path
-                ]
-                
-                # Run level 2 compression (use bytes mode to avoid encoding issues)
-                result = subprocess.run(
-                    cmd_48k,
-                    capture_output=True,
-                    text=False,  # Use bytes mode to avoid UTF-8 decoding errors
-                    check=True
-                )
-
+            for bitrate in bitrates:
+                encode_mp3(input_file, output_file, bitrate)
                 compressed_size_mb = self.get_file_size_mb(output_file)
-                if not quiet:
-                    print(f"📊 Size after 48k compression: {compressed_size_mb:.1f}MB")
-
-                if compressed_size_mb <= 25:
-                    # 48k compression meets requirements
-                    if not quiet:
-                        print(f"✅ 48k compression complete: {output_file.name} ({compressed_size_mb:.1f}MB)")
-                    # Clean up temporary files
-                    if temp_64k_file.exists():
-                        temp_64k_file.unlink()
-                    return True
-                else:
-                    # Still >25MB after 48k compression, proceed with level 3 32k compression
-                    if not quiet:
-                        print(f"⚠️  Still exceeds 25MB after 48k, proceeding with level 3 32k compression...")
-                        print("📊 Level 3 compression: 16KHz mono, 32kbps MP3")
-
-                    cmd_32k = [
-                        'ffmpeg',
-                        '-i', str(input_file.resolve()),  # Use absolute path to avoid special character issues
-                        '-ar', '16000',        # Downsample to 16KHz
-                        '-ac', '1',            # Mono
-                        '-b:a', '32k',         # 32kbps bitrate
-                        '-y',                  # Overwrite output file
-                        str(output_file.resolve())  # Use absolute path
-                    ]
-
-                    # Run level 3 compression (use bytes mode to avoid encoding issues)
-                    result = subprocess.run(
-                        cmd_32k,
-                        capture_output=True,
-                        text=False,  # Use bytes mode to avoid UTF-8 decoding errors
-                        check=True
-                    )
-
-                    compressed_size_mb = self.get_file_size_mb(output_file)
-                    if not quiet:
-                        print(f"📊 Size after 32k compression: {compressed_size_mb:.1f}MB")
-
-                    if compressed_size_mb <= 25:
-                        # 32k compression meets requirements
-                        if not quiet:
-                            print(f"✅ 32k compression complete: {output_file.name} ({compressed_size_mb:.1f}MB)")
-                        # Clean up temporary files
-                        if temp_64k_file.exists():
-                            temp_64k_file.unlink()
-                        return True
-                    else:
-                        # Still >25MB after 32k compression, proceed with level 4 24k compression
-                        if not quiet:
-                            print(f"⚠️  Still exceeds 25MB after 32k, proceeding with level 4 24k compression...")
-                            print("📊 Level 4 compression: 16KHz mono, 24kbps MP3")
-
-                        cmd_24k = [
-                            'ffmpeg',
-                            '-i', str(input_file.resolve()),  # Use absolute path to avoid special character issues
-                            '-ar', '16000',        # Downsample to 16KHz
-                            '-ac', '1',            # Mono
-                            '-b:a', '24k',         # 24kbps bitrate
-                            '-y',                  # Overwrite output file
-                            str(output_file.resolve())  # Use absolute path
-                        ]
-
-                        # Run level 4 compression (use bytes mode to avoid encoding issues)
-                        result = subprocess.run(
-                            cmd_24k,
-                            capture_output=True,
-                            text=False,  # Use bytes mode to avoid UTF-8 decoding errors
-                    check=True
-                )
-                
-                final_size_mb = self.get_file_size_mb(output_file)
-                if not quiet:
-                            print(f"✅ 24k compression complete: {output_file.name} ({final_size_mb:.1f}MB)")
-                
-                # Clean up temporary files
-                if temp_64k_file.exists():
-                    temp_64k_file.unlink()
-                
-                return True
+                if compressed_size_mb <= GROQ_MAX_FILE_MB:
+                    break
+                if not quiet and bitrate != bitrates[-1]:
+                    print(f"⚠️  Still exceeds {GROQ_MAX_FILE_MB}MB at {bitrate}k ({compressed_size_mb:.1f}MB), retrying at a lower bitrate...")
+            
+            if not quiet:
+                print(f"✅ {bitrate}k compression complete: {output_file.name} ({compressed_size_mb:.1f}MB)")
+            return True
             
         except subprocess.CalledProcessError as e:
             # Try to decode stderr for more detailed error information
@@ -852,17 +707,17 @@ class ApplePodcastExplorer:
             print(f"❌ Compression failed: {error_msg}")
             print(f"   Input file: {input_file}")
             print(f"   Output file: {output_file}")
-            # Clean up temporary files
-            if 'temp_64k_file' in locals() and temp_64k_file.exists():
-                temp_64k_file.unlink()
+            # Remove incomplete output
+            if output_file.exists():
+                output_file.unlink()
             return False
         except Exception as e:
             print(f"❌ Compression error: {e}")
             print(f"   Input file: {input_file}")
             print(f"   Output file: {output_file}")
-            # Clean up temporary files
-            if 'temp_64k_file' in locals() and temp_64k_file.exists():
-                temp_64k_file.unlink()
+            # Remove incomplete output
+            if output_file.exists():
+                output_file.unlink()
             return False
     
     def transcribe_with_groq(self, audio_file: Path, quiet: bool = False) -> dict:
@@ -883,13 +738,15 @@ class ApplePodcastExplorer:
             start_time = time.time()
             
             # Open audio file and transcribe
-            with open(audio_file, "rb") as file:
-                transcription = self.groq_client.audio.transcriptions.create(
-                    file=file,
-                    model="whisper-large-v3",
-                    response_format="verbose_json",
-                    temperature=0.0
-                )
+            throttle(GROQ_API_HOST)
+            with limits.network:
+                with open(audio_file, "rb") as file:
+                    transcription = self.groq_client.audio.transcriptions.create(
+                        file=file,
+                        model="whisper-large-v3",
+                        response_format="verbose_json",
+                        temperature=0.0
+                    )
             
             end_time = time.time()
             processing_time = end_time - start_time
@@ -916,9 +773,9 @@ class ApplePodcastExplorer:
             # print(f"❌ Groq transcription failed: {e}")
             return None
     
-    def transcribe_with_mlx(self, audio_file: Path, quiet: bool = False) -> dict:
+    def transcribe_locally(self, audio_file: Path, quiet: bool = False) -> dict:
         """
-        Transcribe audio file using MLX Whisper
+        Transcribe audio file with the local Whisper backend (MLX, faster-whisper or openai-whisper)
         
         Args:
             audio_file: Audio file path
@@ -928,23 +785,18 @@ class ApplePodcastExplorer:
         """
         try:
             if not quiet:
-                print(f"🎯 MLX Whisper transcription: {audio_file.name}")
-                print("🧠 Using model: mlx-community/whisper-medium")
+                print(f"🎯 Local transcription: {audio_file.name}")
+                print(f"🧠 Using model: {LOCAL_BACKEND.label}")
             
             start_time = time.time()
             
-            # Hide MLX Whisper output in quiet mode
-            if quiet:
-                with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
-                    result = mlx_whisper.transcribe(
-                        str(audio_file),
-                        path_or_hf_repo=self.whisper_model_name
-                    )
-            else:
-                result = mlx_whisper.transcribe(
-                    str(audio_file),
-                    path_or_hf_repo=self.whisper_model_name
-                )
+            with limits.cpu:
+                # Hide backend output in quiet mode
+                if quiet:
+                    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                        result = LOCAL_BACKEND.transcribe(audio_file)
+                else:
+                    result = LOCAL_BACKEND.transcribe(audio_file)
             
             end_time = time.time()
             processing_time = end_time - start_time
@@ -953,21 +805,86 @@ class ApplePodcastExplorer:
             speed_ratio = file_size_mb / processing_time * 60 if processing_time > 0 else 0
             
             if not quiet:
-                print(f"✅ MLX transcription complete! Time: {processing_time:.1f}s")
+                print(f"✅ Local transcription complete! Time: {processing_time:.1f}s")
             
             return {
                 'text': result['text'],
-                'language': result.get('language', 'en'),
+                'language': result['language'],
                 'processing_time': processing_time,
                 'speed_ratio': speed_ratio,
-                'method': 'MLX Whisper medium'
+                'method': LOCAL_BACKEND.label
             }
             
         except Exception as e:
-            print(f"❌ MLX transcription failed: {e}")
+            print(f"❌ Local transcription failed: {e}")
             return None
     
-    def transcribe_audio_smart(self, audio_file: Path, episode_title: str, channel_name: str, episode_dir: Path, auto_transcribe: bool = False) -> bool:
+    def split_audio_for_groq(self, audio_file: Path, quiet: bool = False) -> List[Path]:
+        """
+        Split audio at silences into chunks below the Groq limit
+        
+        Args:
+            audio_file: Audio file path
+        
+        Returns:
+            List[Path]: Chunk files in order, empty if splitting failed
+        """
+        chunk_dir = audio_file.parent / f"chunks_{audio_file.stem}"
+        try:
+            with limits.cpu:
+                chunk_files = split_audio(audio_file, chunk_dir)
+            if not quiet:
+                print(f"✂️  Split at silences into {len(chunk_files)} chunks")
+            return chunk_files
+        except Exception as e:
+            if not quiet:
+                print(f"⚠️  Failed to split audio: {e}")
+            shutil.rmtree(chunk_dir, ignore_errors=True)
+            return []
+    
+    def transcribe_with_groq_chunked(self, audio_file: Path, quiet: bool = False, chunk_files: Optional[List[Path]] = None) -> dict:
+        """
+        Transcribe a long audio file as parallel Groq requests over silence-split chunks,
+        stitched back in order with the overlap removed (no lossy compression needed)
+        
+        Args:
+            audio_file: Audio file path
+            chunk_files: Chunks already split by the pipeline (split here if not given)
+        
+        Returns:
+            dict: Transcription result, None if any chunk failed
+        """
+        if not chunk_files:
+            chunk_files = self.split_audio_for_groq(audio_file, quiet=quiet)
+        if not chunk_files:
+            return None
+        
+        try:
+            start_time = time.time()
+            with ThreadPoolExecutor(max_workers=min(len(chunk_files), limits.network_workers)) as pool:
+                results = list(pool.map(lambda chunk: self.transcribe_with_groq(chunk, quiet=True), chunk_files))
+            if not all(results):
+                return None
+            
+            processing_time = time.time() - start_time
+            file_size_mb = self.get_file_size_mb(audio_file)
+            speed_ratio = file_size_mb / processing_time * 60 if processing_time > 0 else 0
+            
+            if not quiet:
+                print(f"✅ Groq chunked transcription complete! {len(chunk_files)} chunks, time: {processing_time:.1f}s")
+            
+            return {
+                'text': merge_chunk_texts([result['text'] for result in results], chunk_overlaps(chunk_files)),
+                'language': results[0]['language'],
+                'processing_time': processing_time,
+                'speed_ratio': speed_ratio,
+                'method': f'Groq API whisper-large-v3 ({len(chunk_files)} chunks)'
+            }
+        finally:
+            # Remove the chunk directory whether or not transcription succeeded
+            shutil.rmtree(chunk_files[0].parent, ignore_errors=True)
+    
+    def transcribe_audio_smart(self, audio_file: Path, episode_title: str, channel_name: str, episode_dir: Path, auto_transcribe: bool = False, chunk_files: Optional[List[Path]] = None) -> bool:
         """
         Smart audio transcription: choose the best transcription method based on file size
         
@@ -977,6 +894,7 @@ class ApplePodcastExplorer:
             channel_name: Channel name
             episode_dir: Episode folder path
             auto_transcribe: Whether to auto transcribe without user prompts
+            chunk_files: Chunks already split by the pipeline stage
         
         Returns:
             bool: Whether transcription was successful
@@ -1015,85 +933,95 @@ class ApplePodcastExplorer:
             
             # Smart transcription strategy
             if file_size_mb <= groq_limit and GROQ_AVAILABLE:
-                # Situation 1: File <25MB, directly use Groq, MLX as backup
+                # Situation 1: File <25MB, directly use Groq, local Whisper as backup
                 if not auto_transcribe:
                     print("✅ File size within Groq limit, using ultra-fast transcription")
                 transcript_result = self.transcribe_with_groq(audio_file, quiet=auto_transcribe)
                 
-                # MLX backup
-                if not transcript_result and MLX_WHISPER_AVAILABLE:
+                # local Whisper backup
+                if not transcript_result and LOCAL_WHISPER_AVAILABLE:
                     if not auto_transcribe:
-                        print("🔄 Groq failed, switching to local MLX Whisper...")
-                    transcript_result = self.transcribe_with_mlx(audio_file, quiet=auto_transcribe)
+                        print("🔄 Groq failed, switching to local Whisper...")
+                    transcript_result = self.transcribe_locally(audio_file, quiet=auto_transcribe)
             
             elif file_size_mb > groq_limit:
                 # Situation 2: File >25MB, needs compression
-                if not auto_transcribe:
-                    print("⚠️  File exceeds Groq limit, starting compression...")
+                # First try chunked Groq transcription, compress only if it fails
+                if GROQ_AVAILABLE:
+                    if not auto_transcribe:
+                        print("✂️  Transcribing in parallel chunks split at silences...")
+                    transcript_result = self.transcribe_with_groq_chunked(audio_file, quiet=auto_transcribe, chunk_files=chunk_files)
                 
-                # Generate safe compressed filename
-                original_name = audio_file.stem
-                compressed_name = f"compressed_{original_name}"
-                extension = audio_file.suffix
+                # Fall back to compression
+                if not transcript_result:
+                    if not auto_transcribe:
+                        print("⚠️  File exceeds Groq limit, starting compression...")
                 
-                # Ensure compressed filename doesn't exceed limit
-                max_compressed_length = 255 - len(extension)
-                if len(compressed_name) > max_compressed_length:
-                    # Truncate to fit
-                    truncated_name = compressed_name[:max_compressed_length]
-                    compressed_file = audio_file.parent / f"{truncated_name}{extension}"
-                else:
-                    compressed_file = audio_file.parent / f"{compressed_name}{extension}"
+                    # Generate safe compressed filename
+                    original_name = audio_file.stem
+                    compressed_name = f"compressed_{original_name}"
+                    extension = audio_file.suffix
                 
-                if self.compress_audio_file(audio_file, compressed_file, quiet=auto_transcribe):
-                    compressed_size = self.get_file_size_mb(compressed_file)
-                    final_size = compressed_size
-                    if not auto_transcribe:
-                        print(f"📊 Compressed size: {compressed_size:.1f}MB")
-                    
-                    if compressed_size <= groq_limit and GROQ_AVAILABLE:
-                        # Situation 2a: After compression within Groq limit, MLX as backup
+                    # Ensure compressed filename doesn't exceed limit
+                    max_compressed_length = 255 - len(extension)
+                    if len(compressed_name) > max_compressed_length:
+                        # Truncate to fit
+                        truncated_name = compressed_name[:max_compressed_length]
+                        compressed_file = audio_file.parent / f"{truncated_name}{extension}"
+                    else:
+                        compressed_file = audio_file.parent / f"{compressed_name}{extension}"
+                
+                    with limits.cpu:
+                        compressed_ok = self.compress_audio_file(audio_file, compressed_file, quiet=auto_transcribe)
+                    if compressed_ok:
+                        compressed_size = self.get_file_size_mb(compressed_file)
+                        final_size = compressed_size
                         if not auto_transcribe:
-                            print("✅ Compressed size within Groq limit, using ultra-fast transcription")
-                        transcript_result = self.transcribe_with_groq(compressed_file, quiet=auto_transcribe)
+                            print(f"📊 Compressed size: {compressed_size:.1f}MB")
+                    
+                        if compressed_size <= groq_limit and GROQ_AVAILABLE:
+                            # Situation 2a: After compression within Groq limit, local Whisper as backup
+                            if not auto_transcribe:
+                                print("✅ Compressed size within Groq limit, using ultra-fast transcription")
+                            transcript_result = self.transcribe_with_groq(compressed_file, quiet=auto_transcribe)
                         
-                        # Groq failed use MLX backup
-                        if not transcript_result and MLX_WHISPER_AVAILABLE:
+                            # Groq failed use local Whisper backup
+                            if not transcript_result and LOCAL_WHISPER_AVAILABLE:
+                                if not auto_transcribe:
+                                    print("🔄 Groq failed, switching to local Whisper...")
+                                transcript_result = self.transcribe_locally(compressed_file, quiet=auto_transcribe)
+                        else:
+                            # Situation 2b: Still exceeds limit after compression, use local Whisper
                             if not auto_transcribe:
-                                print("🔄 Groq failed, switching to local MLX Whisper...")
-                            transcript_result = self.transcribe_with_mlx(compressed_file, quiet=auto_transcribe)
+                                print("⚠️  Still exceeds limit after compression, using local transcription")
+                            if LOCAL_WHISPER_AVAILABLE:
+                                if auto_transcribe:
+                                    print("💻 Local transcription...")
+                                transcript_result = self.transcribe_locally(compressed_file, quiet=auto_transcribe)
+                            else:
+                                if not auto_transcribe:
+                                    print("❌ Local Whisper unavailable, cannot transcribe large file")
+                                return False
                     else:
-                        # Situation 2b: Still exceeds limit after compression, use MLX
+                        # Compression failed, try local Whisper
                         if not auto_transcribe:
-                            print("⚠️  Still exceeds limit after compression, using MLX local transcription")
-                        if MLX_WHISPER_AVAILABLE:
-                            if auto_transcribe:
-                                print("💻 Local transcription...")
-                            transcript_result = self.transcribe_with_mlx(compressed_file, quiet=auto_transcribe)
+                            print("❌ Compression failed, trying local transcription")
+                        if LOCAL_WHISPER_AVAILABLE:
+                            transcript_result = self.transcribe_locally(audio_file, quiet=auto_transcribe)
                         else:
                             if not auto_transcribe:
-                                print("❌ MLX Whisper unavailable, cannot transcribe large file")
+                                print("❌ Local Whisper unavailable, transcription failed")
                             return False
-                else:
-                    # Compression failed, try MLX
-                    if not auto_transcribe:
-                        print("❌ Compression failed, trying local MLX transcription")
-                    if MLX_WHISPER_AVAILABLE:
-                        transcript_result = self.transcribe_with_mlx(audio_file, quiet=auto_transcribe)
-                    else:
-                        if not auto_transcribe:
-                            print("❌ MLX Whisper unavailable, transcription failed")
-                        return False
             
             else:
-                # Situation 3: Groq unavailable, use MLX
+                # Situation 3: Groq unavailable, use local Whisper
                 if not auto_transcribe:
-                    print("⚠️  Groq API unavailable, using local MLX transcription")
-                if MLX_WHISPER_AVAILABLE:
-                    transcript_result = self.transcribe_with_mlx(audio_file, quiet=auto_transcribe)
+                    print("⚠️  Groq API unavailable, using local transcription")
+                if LOCAL_WHISPER_AVAILABLE:
+                    transcript_result = self.transcribe_locally(audio_file, quiet=auto_transcribe)
                 else:
                     if not auto_transcribe:
-                        print("❌ MLX Whisper unavailable, transcription failed")
+                        print("❌ Local Whisper unavailable, transcription failed")
                     return False
             
             # Process transcription result
@@ -1108,6 +1036,7 @@ class ApplePodcastExplorer:
                 f.write(f"**Channel:** {channel_name}\n\n")
                 f.write("---\n\n")
                 f.write(transcript_result['text'])
+            record_output(transcript_filepath)
             
             if not auto_transcribe:
                 print(f"✅ Transcription complete: {episode_dir.name}/{transcript_filename}")
@@ -1217,9 +1146,9 @@ class ApplePodcastExplorer:
         else:
             print(f"\n🚀 Starting smart transcription of {total_count} files...")
             if GROQ_AVAILABLE:
-                print("💡 Will automatically choose the best transcription method: Groq API (ultra-fast) or MLX Whisper (local)")
+                print("💡 Will automatically choose the best transcription method: Groq API (ultra-fast) or local Whisper")
             else:
-                print("💡 Using MLX Whisper local transcription")
+                print("💡 Using local Whisper transcription")
         
         successful_transcripts = []  # Store successful transcription info (episode_title, channel_name, episode_dir)
         
@@ -1291,25 +1220,15 @@ class ApplePodcastExplorer:
                             print("⚠️  Transcript content too short, skipping summary generation")
                         continue
                     
-                    # Generate summary
-                    summary = self.generate_summary(transcript_text, episode_title)
-                    if not summary:
-                        if not auto_transcribe:
-                            print("❌ Summary generation failed")
-                        continue
-                    
-                    # Use English summary (no translation needed)
-                    final_summary = summary
-                    
-                    # Save summary
-                    summary_path = self.save_summary(final_summary, episode_title, channel_name, language_choice, episode_dir)
+                    # Generate summary, streamed into the summary file as it arrives
+                    summary_path = self.stream_summary(transcript_text, episode_title, channel_name, language_choice, episode_dir, quiet=auto_transcribe)
                     if summary_path:
                         if not auto_transcribe:
                             print(f"✅ Summary saved: {episode_dir.name}/summary.md")
                         summary_success_count += 1
                     else:
                         if not auto_transcribe:
-                            print("❌ Summary save failed")
+                            print("❌ Summary generation failed")
                         
                 except Exception as e:
                     if not auto_transcribe:
@@ -1394,25 +1313,54 @@ class ApplePodcastExplorer:
         
         print("✅ Visualization complete")
 
-    def generate_summary(self, transcript: str, title: str) -> str:
+    def generate_text(self, prompt: str, template: str) -> Optional[str]:
         """
-        Generate summary using Gemini API
+        Call Gemini through the on-disk response cache
+        
+        Args:
+            prompt: Prompt text
+            template: Prompt template version, part of the cache key
+        
+        Returns:
+            str: Response text, None if the response format is abnormal
+        """
+        def request(prompt):
+            throttle(GEMINI_API_HOST)
+            with limits.llm:
+                return self.gemini_client.generate(prompt)
+        
+        return cached_generate(self.model_name, template, prompt, request)
+    
+    def stream_text(self, prompt: str, template: str) -> Iterator[str]:
+        """
+        Stream a Gemini response through the on-disk response cache
+        
+        Args:
+            prompt: Prompt text
+            template: Prompt template version, part of the cache key
+        
+        Returns:
+            Iterator[str]: Response text chunks as they arrive
+        """
+        def request(prompt):
+            throttle(GEMINI_API_HOST)
+            with limits.llm:
+                yield from self.gemini_client.generate_stream(prompt)
+        
+        return cached_stream(self.model_name, template, prompt, request)
+    
+    def summary_prompt(self, transcript: str, title: str) -> str:
+        """
+        Build the single-request summary prompt
         
         Args:
             transcript: Transcript text
             title: Episode title
         
         Returns:
-            str: Generated summary, None if failed
+            str: Prompt text
         """
-        if not self.gemini_client:
-            print("❌ Gemini API not available, cannot generate summary")
-            return None
-        
-        try:
-            # print("✨ Generating summary...")  # 隐藏详细信息
-            
-            prompt = f"""
+        return f"""
             Please provide a comprehensive summary and analysis of this podcast episode transcript.
             
             Episode Title: {title}
@@ -1429,22 +1377,62 @@ class ApplePodcastExplorer:
             Transcript:
             {transcript}
             """
+    
+    def generate_summary(self, transcript: str, title: str) -> str:
+        """
+        Generate summary using Gemini API
+        
+        Args:
+            transcript: Transcript text
+            title: Episode title
+        
+        Returns:
+            str: Generated summary, None if failed
+        """
+        if not self.gemini_client:
+            print("❌ Gemini API not available, cannot generate summary")
+            return None
+        
+        try:
+            # Transcripts too long for one request are summarized section by section
+            if estimate_tokens(transcript) > SINGLE_PASS_MAX_TOKENS:
+                return self.generate_summary_map_reduce(transcript, title)
             
-            response = self.gemini_client.GenerativeModel(self.model_name).generate_content(prompt)
+            # print("✨ Generating summary...")  # 隐藏详细信息
             
-            # Handle the response properly
-            if hasattr(response, 'text'):
-                return response.text
-            elif hasattr(response, 'candidates') and response.candidates:
-                return response.candidates[0].content.parts[0].text
-            else:
-                print("❌ Gemini API response format abnormal")
-                return None
+            prompt = self.summary_prompt(transcript, title)
+            
+            result = self.generate_text(prompt, TEMPLATE_SUMMARY)
+            if result:
+                return result
+            print("❌ Gemini API response format abnormal")
+            return None
                 
         except Exception as e:
             print(f"❌ Summary generation failed: {e}")
             return None
     
+    def generate_summary_map_reduce(self, transcript: str, title: str) -> Optional[str]:
+        """
+        Summarize a transcript too long for one request: sections concurrently, then a reduce step
+        
+        Args:
+            transcript: Transcript text
+            title: Episode title
+        
+        Returns:
+            str: Generated summary (partial if some sections failed), None if failed
+        """
+        def generate(prompt):
+            return self.generate_text(prompt, TEMPLATE_SUMMARY_SECTIONS)
+        
+        result = map_reduce_summary(generate, transcript, title, workers=limits.llm_workers)
+        if result['failed']:
+            print(f"⚠️  {len(result['failed'])}/{result['sections']} transcript sections could not be summarized, summary is partial")
+        if result['summary'] and not result['reduced']:
+            print("⚠️  Combining section summaries failed, saving the section notes instead")
+        return result['summary']
+    
     def translate_to_chinese(self, text: str) -> str:
         """
         Translate text to Chinese
@@ -1464,27 +1452,71 @@ class ApplePodcastExplorer:
             
             prompt = f"Translate everything to Chinese accurately without missing anything:\n\n{text}"
             
-            response = self.gemini_client.GenerativeModel(self.model_name).generate_content(prompt)
-            
-            # Handle the response properly
-            if hasattr(response, 'text'):
-                return response.text
-            elif hasattr(response, 'candidates') and response.candidates:
-                return response.candidates[0].content.parts[0].text
-            else:
-                print("❌ Gemini API response format abnormal")
-                return None
+            result = self.generate_text(prompt, TEMPLATE_TRANSLATE)
+            if result:
+                return result
+            print("❌ Gemini API response format abnormal")
+            return None
                 
         except Exception as e:
             print(f"❌ Translation failed: {e}")
             return None
 
+    def stream_summary(self, transcript: str, episode_title: str, channel_name: str, language: str,
+                       episode_dir: Path = None, quiet: bool = False) -> Optional[str]:
+        """
+        Generate and save the summary with Gemini's streaming API: chunks are appended to a
+        .partial file as they arrive and it is renamed to the summary file once complete
+        
+        Args:
+            transcript: Transcript text
+            episode_title: Episode title
+            channel_name: Channel name
+            language: Language preference; for 'ch' the Chinese translation is streamed
+            episode_dir: Episode folder path
+            quiet: Don't print the time to first token
+        
+        Returns:
+            Optional[str]: Path to saved summary file, None if failed
+        """
+        if not self.gemini_client:
+            print("❌ Gemini API not available, cannot generate summary")
+            return None
+        
+        summary = None
+        if language == 'ch' or estimate_tokens(transcript) > SINGLE_PASS_MAX_TOKENS:
+            # Long transcripts go through the map-reduce path, which has nothing to stream
+            summary = self.generate_summary(transcript, episode_title)
+            if not summary:
+                return None
+            if language != 'ch':
+                return self.save_summary(summary, episode_title, channel_name, language, episode_dir)
+            if not quiet:
+                print("🔄 Translating to Chinese...")
+            prompt = f"Translate everything to Chinese accurately without missing anything:\n\n{summary}"
+            template = TEMPLATE_TRANSLATE
+        else:
+            prompt = self.summary_prompt(transcript, episode_title)
+            template = TEMPLATE_SUMMARY
+        
+        def report(seconds):
+            if not quiet:
+                print(f"⏱️  First token after {seconds:.1f}s")
+        
+        chunks = timed_chunks(self.stream_text(prompt, template), report)
+        summary_path = self.save_summary(chunks, episode_title, channel_name, language, episode_dir)
+        if summary_path is None and summary:
+            if not quiet:
+                print("⚠️  Translation failed, using English summary")
+            summary_path = self.save_summary(summary, episode_title, channel_name, 'en', episode_dir)
+        return summary_path
+
     def save_summary(self, summary: str, episode_title: str, channel_name: str, language: str, episode_dir: Path = None) -> Optional[str]:
         """
         Save summary to file
         
         Args:
-            summary: Generated summary
+            summary: Generated summary, or an iterable of text chunks to stream into the file
             episode_title: Episode title
             channel_name: Channel name
             language: Language preference
@@ -1508,14 +1540,16 @@ class ApplePodcastExplorer:
                 summary_filename = self.ensure_summary_filename_length(safe_channel, safe_title)
                 summary_filepath = self.root_output_dir / summary_filename
             
-            with open(summary_filepath, 'w', encoding='utf-8') as f:
-                f.write(f"# Summary: {episode_title}\n\n" if language == "en" else f"# 摘要: {episode_title}\n\n")
-                f.write(f"**Channel:** {channel_name}\n\n" if language == "en" else f"**频道:** {channel_name}\n\n")
-                f.write(f"**Summary Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n" if language == "en" else f"**摘要生成时间:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-                f.write(f"**Language:** {'English' if language == 'en' else 'Chinese'}\n\n")
-                f.write("---\n\n")
-                f.write("## Summary Content\n\n" if language == "en" else "## 摘要内容\n\n")
-                f.write(summary)
+            # The body may be a stream of chunks: written to a .partial file, renamed once complete
+            header = []
+            header.append(f"# Summary: {episode_title}\n\n" if language == "en" else f"# 摘要: {episode_title}\n\n")
+            header.append(f"**Channel:** {channel_name}\n\n" if language == "en" else f"**频道:** {channel_name}\n\n")
+            header.append(f"**Summary Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n" if language == "en" else f"**摘要生成时间:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+            header.append(f"**Language:** {'English' if language == 'en' else 'Chinese'}\n\n")
+            header.append("---\n\n")
+            header.append("## Summary Content\n\n" if language == "en" else "## 摘要内容\n\n")
+            write_stream(summary_filepath, ''.join(header), summary)
+            record_output(summary_filepath)
             
             return str(summary_filepath)
             
@@ -1523,77 +1557,165 @@ class ApplePodcastExplorer:
             print(f"❌ Failed to save summary: {e}")
             return None
 
-    def auto_process_latest_episode(self, podcast_name: str, progress_tracker=None) -> tuple[bool, str]:
+    def auto_process_latest_episode(self, podcast_name: str, progress_tracker=None, pipeline=None) -> tuple[bool, str]:
         """
         Automated processing of latest podcast episode - no user interaction
         
         Args:
             podcast_name: Podcast name
             progress_tracker: Progress tracker (for duplicate checking)
+            pipeline: Shared staged pipeline; when given, new episodes are queued
+                      instead of being processed in this thread
             
         Returns:
-            tuple[bool, str]: (Whether processing was successful, episode title)
+            tuple[bool, str]: (Whether processing was successful / episodes were queued, episode title)
         """
         try:
-            # Search channel (silent)
-            channels = self.search_podcast_channel(podcast_name, quiet=True)
-            if not channels:
-                return False, ""
-            
-            selected_channel = channels[0]  # Automatically select first matching channel
-            if not selected_channel['feed_url']:
-                return False, ""
+            jobs, last_episode_title = self.collect_new_episodes(podcast_name, progress_tracker)
             
-            # Get latest episode (silent)
-            episodes = self.get_recent_episodes(selected_channel['feed_url'], 2, quiet=True)
-            if not episodes:
-                return False, ""
+            if pipeline is not None:
+                for job in jobs:
+                    pipeline.submit(job)
+                return len(jobs) > 0, last_episode_title
             
             # Process all episodes in a loop, starting from newest
-            processed_count = 0
-            last_episode_title = ""
-            
-            for i, episode in enumerate(episodes):
-                episode_title = episode['title']
-                last_episode_title = episode_title
-                
-                # Check if already processed
-                if progress_tracker and progress_tracker.is_episode_processed(podcast_name, episode_title):
-                    # print(f"⏭️  {podcast_name} episode already processed, skipping: {episode_title[:50]}...")
-                    continue
-                    
-                print(f"📥 Processing new episode: {episode_title[:50]}...")
-                
-                # Download processing (silent download process)
-                success, episode_dir = self.download_episode(episode, i+1, selected_channel['name'], quiet=True)
-                if not success or not episode_dir:
-                    continue
-                
-                # Auto transcribe
-                audio_filepath = episode_dir / "audio.mp3"
-                if audio_filepath.exists():
-                    transcribe_success = self.transcribe_audio_smart(
-                        audio_filepath, episode_title, 
-                        selected_channel['name'], episode_dir, auto_transcribe=True
-                    )
-                    if transcribe_success:
-                        # Auto summary - simulate transcribe_downloaded_files processing logic
-                        if self.gemini_client:
-                            # Use same summary generation logic as original code
-                            self.auto_generate_summary_for_episode(
-                                episode_title, selected_channel['name'], episode_dir
-                            )
-                        
-                        # Mark as processed
-                        if progress_tracker:
-                            progress_tracker.mark_episode_processed(podcast_name, episode_title)
-                        processed_count += 1
-            
+            processed_count = sum(1 for job in jobs if run_inline(job))
             return processed_count > 0, last_episode_title
             
         except Exception as e:
             return False, ""
     
+    def resolve_podcast_channel(self, podcast_name: str, refresh: bool = False) -> Optional[Dict]:
+        """
+        Resolve a subscription name to its channel, using the persisted lookup cache
+        
+        Args:
+            podcast_name: Podcast name (my_pod.md entry)
+            refresh: Ignore the cached entry and search iTunes again
+        
+        Returns:
+            Optional[Dict]: Channel information (collection_id, name, feed_url), None if not found
+        """
+        if not refresh:
+            cached = self.channel_lookup.get(podcast_name)
+            if cached:
+                return {**cached, 'cached': True}
+        
+        channels = self.search_podcast_channel(podcast_name, quiet=True)
+        if not channels or not channels[0]['feed_url']:  # Automatically select first matching channel
+            return None
+        return self.channel_lookup.put(podcast_name, channels[0])
+    
+    def collect_new_episodes(self, podcast_name: str, progress_tracker=None) -> tuple[List[Dict], str]:
+        """
+        Find the latest episodes that have not been processed yet and build pipeline jobs for them
+        
+        Args:
+            podcast_name: Podcast name
+            progress_tracker: Progress tracker (for duplicate checking)
+            
+        Returns:
+            tuple[List[Dict], str]: (Pipeline jobs, latest episode title - empty if search failed)
+        """
+        # Resolve channel from the lookup cache, searching only on a miss (silent)
+        selected_channel = self.resolve_podcast_channel(podcast_name)
+        if not selected_channel:
+            return [], ""
+        
+        # Get latest episode (silent)
+        episodes = self.get_recent_episodes(selected_channel['feed_url'], 2, quiet=True)
+        if not episodes and selected_channel.get('cached'):
+            # The feed may have moved, search again once
+            selected_channel = self.resolve_podcast_channel(podcast_name, refresh=True)
+            if selected_channel:
+                episodes = self.get_recent_episodes(selected_channel['feed_url'], 2, quiet=True)
+        if not episodes:
+            return [], ""
+        
+        jobs = []
+        last_episode_title = ""
+        for i, episode in enumerate(episodes):
+            episode_title = episode['title']
+            last_episode_title = episode_title
+            
+            # Check if already processed
+            if progress_tracker and progress_tracker.is_episode_processed(podcast_name, episode_title, episode_key(episode)):
+                continue
+            
+            jobs.append({
+                'processor': self,
+                'source': podcast_name,
+                'title': episode_title,
+                'item_key': episode_key(episode),
+                'episode': episode,
+                'episode_num': i + 1,
+                'channel_name': selected_channel['name'],
+                'progress_tracker': progress_tracker,
+            })
+        
+        return jobs, last_episode_title
+    
+    def pipeline_download(self, job: Dict) -> Optional[Dict]:
+        """Pipeline stage: download episode audio (silent)"""
+        print(f"📥 Processing new episode: {job['title'][:50]}...")
+        success, episode_dir = self.download_episode(job['episode'], job['episode_num'], job['channel_name'], quiet=True)
+        if not success or not episode_dir:
+            return None
+        
+        audio_filepath = episode_dir / "audio.mp3"
+        if not audio_filepath.exists():
+            return None
+        
+        job['episode_dir'] = episode_dir
+        job['audio_file'] = audio_filepath
+        return job
+    
+    def pipeline_compress(self, job: Dict) -> Optional[Dict]:
+        """Pipeline stage: split (or compress) audio above the Groq limit so transcription can use it directly"""
+        audio_file = job['audio_file']
+        if not GROQ_AVAILABLE or self.get_file_size_mb(audio_file) <= 25:
+            return job
+        
+        # Split at silences for parallel chunked transcription, compress only if splitting fails
+        job['chunk_files'] = self.split_audio_for_groq(audio_file, quiet=True)
+        if job['chunk_files']:
+            return job
+        
+        compressed_file = audio_file.parent / f"compressed_{audio_file.stem}{audio_file.suffix}"
+        with limits.cpu:
+            compressed_ok = self.compress_audio_file(audio_file, compressed_file, quiet=True)
+        if compressed_ok:
+            job['source_audio'] = audio_file
+            job['audio_file'] = compressed_file
+        return job
+    
+    def pipeline_transcribe(self, job: Dict) -> Optional[Dict]:
+        """Pipeline stage: transcribe audio"""
+        transcribe_success = self.transcribe_audio_smart(
+            job['audio_file'], job['title'],
+            job['channel_name'], job['episode_dir'], auto_transcribe=True,
+            chunk_files=job.get('chunk_files')
+        )
+        if not transcribe_success:
+            return None
+        
+        # The compressed copy is removed by transcribe_audio_smart, remove the original as well
+        source_audio = job.get('source_audio')
+        if source_audio and source_audio.exists():
+            source_audio.unlink()
+        return job
+    
+    def pipeline_summarize(self, job: Dict) -> Optional[Dict]:
+        """Pipeline stage: generate summary and mark episode as processed"""
+        # Auto summary - simulate transcribe_downloaded_files processing logic
+        if self.gemini_client:
+            self.auto_generate_summary_for_episode(job['title'], job['channel_name'], job['episode_dir'])
+        
+        # Mark as processed
+        if job['progress_tracker']:
+            job['progress_tracker'].mark_episode_processed(job['source'], job['title'], job['item_key'])
+        return job
+    
     def auto_generate_summary_for_episode(self, episode_title: str, channel_name: str, episode_dir: Path) -> bool:
         """
         Automatically generate summary for single episode (simulate transcribe_downloaded_files logic)
@@ -1662,110 +1784,198 @@ class Podnet:
         self.searcher = YouTubeSearcher()
         self.extractor = TranscriptExtractor()
         self.summarizer = SummaryGenerator()
+        # Caption batches for automation run here, outside the subscription discovery workers
+        self.caption_pool = ThreadPoolExecutor(max_workers=1)
     
     def search_youtube_podcast(self, podcast_name: str, num_episodes: int = 5) -> List[Dict]:
         """Search for podcast episodes on YouTube using channel videos page"""
         return self.searcher.search_youtube_podcast(podcast_name, num_episodes)
     
-    def auto_process_channel_latest_video(self, channel_name: str, progress_tracker=None) -> tuple[bool, str]:
+    def auto_process_channel_latest_video(self, channel_name: str, progress_tracker=None, pipeline=None) -> tuple[bool, str]:
         """
         Automated processing of channel's latest video - no user interaction
         
         Args:
             channel_name: Channel name (without @ symbol)
             progress_tracker: Progress tracker (for duplicate checking)
+            pipeline: Shared staged pipeline; when given, new videos are queued
+                      instead of being processed in this thread
             
         Returns:
-            tuple[bool, str]: (Whether processing was successful, video title)
+            tuple[bool, str]: (Whether processing was successful / videos were queued, video title)
         """
         try:
-            # Search for channel's latest video
-            episodes = self.searcher.search_youtube_podcast(channel_name, num_episodes=2)
-            if not episodes:
-                return False, ""
+            jobs, last_video_title = self.collect_new_videos(channel_name, progress_tracker)
             
-            # Process all videos in a loop, starting from newest
-            processed_count = 0
-            last_video_title = ""
-            
-            for episode in episodes:
-                video_title = episode.get('title', 'Unknown')
-                last_video_title = video_title
-                
-                # Check if already processed
-                if progress_tracker and progress_tracker.is_video_processed(channel_name, video_title):
-                    # print(f"⏭️  @{channel_name} video already processed, skipping: {video_title[:50]}...")
-                    continue
-                    
-                video_url = episode.get('url', '')
-                if not video_url:
-                    continue
-                
-                # Extract video ID
-                import re
-                video_id_match = re.search(r'(?:v=|/)([a-zA-Z0-9_-]{11})', video_url)
-                if not video_id_match:
-                    continue
-                
-                video_id = video_id_match.group(1)
-                
-                # Get video info
-                video_info = self.searcher.get_video_info(video_id)
-                title = episode.get('title', video_info.get('title', 'Unknown'))
-                channel_name_from_video = video_info.get('channel_name', channel_name)
-                published_date = episode.get('published_date', 'Recent')
-                
-                print(f"📥 Processing new video: {title[:50]}...")
-                
-                # Create episode directory
-                episode_dir = self.extractor.create_episode_folder(
-                    channel_name_from_video, 
-                    title, 
-                    published_date
-                )
-                
-                # Try to extract transcript
-                transcript = self.extractor.extract_youtube_transcript(
-                    video_id, 
-                    video_url, 
-                    title, 
-                    episode_dir=episode_dir
-                )
-                
-                if transcript:
-                    # Save transcript
-                    transcript_filename = self.extractor.save_transcript(
-                        transcript, 
-                        title, 
-                        channel_name_from_video, 
-                        published_date, 
-                        episode_dir
-                    )
-                    
-                    # Generate summary
-                    if self.summarizer.gemini_client:
-                        summary = self.summarizer.generate_summary(transcript, title)
-                        if summary:
-                            # For English version, no translation needed (default English summary)
-                            final_summary = summary
-                            
-                            self.summarizer.save_summary(
-                                final_summary, 
-                                title, 
-                                episode_dir, 
-                                channel_name_from_video, 
-                                episode_dir
-                            )
-                    
-                    # Mark as processed
-                    if progress_tracker:
-                        progress_tracker.mark_video_processed(channel_name, video_title)
-                    processed_count += 1
+            if pipeline is not None:
+                for job in jobs:
+                    pipeline.submit(job)
+                return len(jobs) > 0, last_video_title
             
+            # Process all videos in a loop, starting from newest
+            processed_count = sum(1 for job in jobs if run_inline(job))
             return processed_count > 0, last_video_title
             
         except Exception as e:
             return False, ""
+    
+    def collect_new_videos(self, channel_name: str, progress_tracker=None) -> tuple[List[Dict], str]:
+        """
+        Find the channel's latest videos that have not been processed yet and build pipeline jobs for them
+        
+        Args:
+            channel_name: Channel name (without @ symbol)
+            progress_tracker: Progress tracker (for duplicate checking)
+            
+        Returns:
+            tuple[List[Dict], str]: (Pipeline jobs, latest video title - empty if search failed)
+        """
+        # Search for channel's latest video
+        episodes = self.searcher.search_youtube_podcast(channel_name, num_episodes=2)
+        if not episodes:
+            return [], ""
+        
+        jobs = []
+        last_video_title = ""
+        for episode in episodes:
+            video_title = episode.get('title', 'Unknown')
+            last_video_title = video_title
+            
+            video_url = episode.get('url', '')
+            if not video_url:
+                continue
+            
+            # Extract video ID
+            video_id_match = re.search(r'(?:v=|/)([a-zA-Z0-9_-]{11})', video_url)
+            if not video_id_match:
+                continue
+            video_id = video_id_match.group(1)
+            
+            # Check if already processed
+            if progress_tracker and progress_tracker.is_video_processed(channel_name, video_title, video_id):
+                continue
+            
+            jobs.append({
+                'processor': self,
+                'source': channel_name,
+                'title': video_title,
+                'episode': episode,
+                'video_id': video_id,
+                'video_url': video_url,
+                'progress_tracker': progress_tracker,
+            })
+        
+        # Fetch the batch's captions on the caption executor, so the discovery slot is released at once;
+        # pipeline_download waits for the result and only downloads audio for the misses
+        if jobs:
+            captions = self.caption_pool.submit(self.extractor.fetch_captions_batch, jobs)
+            for job in jobs:
+                job['captions'] = captions
+        
+        return jobs, last_video_title
+    
+    def pipeline_download(self, job: Dict) -> Optional[Dict]:
+        """Pipeline stage: fetch captions, or download the audio when there are none"""
+        episode = job['episode']
+        
+        # Get video info
+        video_info = self.searcher.get_video_info(job['video_id'])
+        title = episode.get('title', video_info.get('title', 'Unknown'))
+        job['display_title'] = title
+        job['channel_name'] = video_info.get('channel_name', job['source'])
+        job['published_date'] = episode.get('published_date', 'Recent')
+        
+        print(f"📥 Processing new video: {title[:50]}...")
+        
+        # Create episode directory
+        job['episode_dir'] = self.extractor.create_episode_folder(
+            job['channel_name'], 
+            title, 
+            job['published_date']
+        )
+        
+        if job.get('captions') is not None:
+            # Captions for the channel's batch were fetched on the caption executor; only misses download audio
+            try:
+                job['transcript'] = job['captions'].result().get(job['video_id'])
+            except Exception:
+                job['transcript'] = None
+        else:
+            job['transcript'] = self.extractor.extract_youtube_transcript(
+                job['video_id'], 
+                job['video_url'], 
+                title, 
+                episode_dir=job['episode_dir'],
+                audio_fallback=False
+            )
+        if job['transcript']:
+            return job
+        
+        job['audio_file'] = self.extractor.download_youtube_audio(job['video_url'], title, job['episode_dir'])
+        return job if job['audio_file'] else None
+    
+    def pipeline_compress(self, job: Dict) -> Optional[Dict]:
+        """Pipeline stage: split (or compress) downloaded audio above the Groq limit"""
+        audio_file = job.get('audio_file')
+        if job['transcript'] or not audio_file or self.extractor.get_file_size_mb(audio_file) <= 25:
+            return job
+        
+        if GROQ_AVAILABLE:
+            # Split at silences for parallel chunked transcription, compress only if splitting fails
+            job['chunk_files'] = self.extractor.split_audio_for_groq(audio_file)
+            if job['chunk_files']:
+                return job
+        
+        compressed_file = audio_file.parent / f"compressed_{audio_file.stem}{audio_file.suffix}"
+        with limits.cpu:
+            compressed_ok = self.extractor.compress_audio_file(audio_file, compressed_file)
+        if compressed_ok:
+            job['source_audio'] = audio_file
+            job['audio_file'] = compressed_file
+        return job
+    
+    def pipeline_transcribe(self, job: Dict) -> Optional[Dict]:
+        """Pipeline stage: transcribe audio (when no captions) and save the transcript"""
+        if not job['transcript']:
+            job['transcript'] = self.extractor.transcribe_audio_smart(
+                job['audio_file'], job['display_title'], chunk_files=job.get('chunk_files')
+            )
+            source_audio = job.get('source_audio')
+            if source_audio and source_audio.exists():
+                source_audio.unlink()
+            if not job['transcript']:
+                return None
+        
+        # Save transcript
+        self.extractor.save_transcript(
+            job['transcript'], 
+            job['display_title'], 
+            job['channel_name'], 
+            job['published_date'], 
+            job['episode_dir']
+        )
+        return job
+    
+    def pipeline_summarize(self, job: Dict) -> Optional[Dict]:
+        """Pipeline stage: generate summary and mark video as processed"""
+        if self.summarizer.gemini_client:
+            summary = self.summarizer.generate_summary(job['transcript'], job['display_title'])
+            if summary:
+                # For English version, no translation needed (default English summary)
+                final_summary = summary
+                
+                self.summarizer.save_summary(
+                    final_summary, 
+                    job['display_title'], 
+                    job['episode_dir'], 
+                    job['channel_name'], 
+                    job['episode_dir']
+                )
+        
+        # Mark as processed
+        if job['progress_tracker']:
+            job['progress_tracker'].mark_video_processed(job['source'], job['title'], job['video_id'])
+        return job
 
     def run(self):
         """Main application loop for YouTube"""
@@ -1982,6 +2192,12 @@ class Podnet:
             # 英文版默认使用英文输出，不进行翻译
             want_chinese = False
             
+            # Fetch captions for all selected videos concurrently; misses go straight to the audio fallback
+            batch_captions = self.extractor.fetch_captions_batch([
+                episode for episode in selected_episodes
+                if episode['platform'] != 'script' and episode.get('video_id')
+            ])
+            
             # 处理每个节目
             for episode in selected_episodes:
                 print(f"\n🎥 Processing: {episode['title']}")
@@ -2017,11 +2233,12 @@ class Podnet:
                         )
                         
                         print("⚡️ Ultra-fast transcription...")
-                        transcript_content = self.extractor.extract_youtube_transcript(
+                        transcript_content = batch_captions.get(video_id) or self.extractor.extract_youtube_transcript(
                             video_id, 
                             episode.get('url'), 
                             episode['title'],
-                            episode_dir
+                            episode_dir,
+                            captions=video_id not in batch_captions
                         )
                         if transcript_content:
                             print("✅ Transcription complete")
@@ -2080,30 +2297,26 @@ You can:
                     # Check if transcript has actual content (not just placeholder)
                     if len(transcript_content.strip()) > 100 and "Note: No transcript available" not in transcript_content:
                         print("🧠 Generating summary...")
-                        summary = self.summarizer.generate_summary(transcript_content, episode['title'])
-                        if summary:
-                            # For English version, use English summary directly
-                            final_summary = summary
+                        if episode['platform'] == 'script':
+                            # For script content, use default save method
+                            summary_path = self.summarizer.stream_summary(
+                                transcript_content, 
+                                episode['title'], 
+                                self.extractor.output_dir
+                            )
+                        else:
+                            # For YouTube content, use new directory structure
+                            video_info = self.searcher.get_video_info(episode.get('video_id', ''))
+                            channel_name = video_info.get('channel_name', 'Unknown_Channel')
                             
-                            if episode['platform'] == 'script':
-                                # For script content, use default save method
-                                summary_path = self.summarizer.save_summary(
-                                    final_summary, 
-                                    episode['title'], 
-                                    self.extractor.output_dir
-                                )
-                            else:
-                                # For YouTube content, use new directory structure
-                                video_info = self.searcher.get_video_info(episode.get('video_id', ''))
-                                channel_name = video_info.get('channel_name', 'Unknown_Channel')
-                                
-                                summary_path = self.summarizer.save_summary(
-                                    final_summary, 
-                                    episode['title'], 
-                                    self.extractor.output_dir,
-                                    channel_name,
-                                    episode_dir
-                                )
+                            summary_path = self.summarizer.stream_summary(
+                                transcript_content, 
+                                episode['title'], 
+                                self.extractor.output_dir,
+                                channel_name,
+                                episode_dir
+                            )
+                        if summary_path:
                             print("✅ Summary complete")
                             print()  # 空行
                         else:
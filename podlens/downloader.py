@@ -0,0 +1,210 @@
+"""
+可续传的音频下载引擎 / Resumable audio download engine
+
+数据先写入 ``<文件名>.part``，中断后用 Range 请求从已下载的位置继续；服务器支持
+Range 且文件较大时拆分为多个并行字节段（每段各自的 .partN 文件，同样可续传）。
+完成后校验大小与 content-length 一致，再原子重命名为目标文件。
+Data is written to ``<name>.part`` and an interrupted download continues from
+where it stopped with a Range request. When the server supports ranges and the
+file is large, it is split into parallel byte-range segments (each with its own
+resumable .partN file). The final size is checked against content-length before
+the file is atomically renamed into place.
+"""
+
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from tqdm import tqdm
+
+
+CHUNK_SIZE = 1024 * 1024                 # 1 MiB 读写缓冲 / read/write buffer
+DEFAULT_SEGMENTS = 4                     # 并行字节段数量 / Parallel byte-range segments
+SEGMENT_MIN_SIZE = 32 * 1024 * 1024      # 小于此大小不拆分 / Files below this size are not split
+
+_CONTENT_RANGE = re.compile(r'bytes\s+(?:(\d+)-\d+|\*)/(\d+|\*)')
+
+
+class DownloadError(Exception):
+    """下载不完整或服务器响应异常 / Incomplete download or unexpected server response"""
+
+
+def _part_path(dest: Path, index: Optional[int] = None) -> Path:
+    suffix = '.part' if index is None else f'.part{index}'
+    return dest.with_name(dest.name + suffix)
+
+
+def _parse_content_range(value: str) -> Tuple[Optional[int], Optional[int]]:
+    """返回 (起始字节, 总大小) / Return (first byte, total size)"""
+    match = _CONTENT_RANGE.match(value or '')
+    if not match:
+        return None, None
+    start = int(match.group(1)) if match.group(1) else None
+    total = None if match.group(2) == '*' else int(match.group(2))
+    return start, total
+
+
+def _write_stream(response, file_obj, pbar, pbar_lock):
+    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+        if chunk:
+            file_obj.write(chunk)
+            if pbar is not None:
+                with pbar_lock:
+                    pbar.update(len(chunk))
+
+
+def _download_segment(session, url, headers, part: Path, start: int, end: int, timeout, pbar, pbar_lock):
+    """下载（或续传）[start, end] 字节段 / Download (or resume) the [start, end] byte segment"""
+    expected = end - start + 1
+    done = part.stat().st_size if part.exists() else 0
+    if done > expected:
+        part.unlink()
+        done = 0
+    if done == expected:
+        return
+    response = session.get(url, stream=True, timeout=timeout,
+                           headers={**headers, 'Range': f'bytes={start + done}-{end}'})
+    with response:
+        response.raise_for_status()
+        if response.status_code != 206:
+            raise DownloadError(f"server ignored range request for segment {start}-{end}")
+        with open(part, 'ab') as f:
+            _write_stream(response, f, pbar, pbar_lock)
+    if part.stat().st_size != expected:
+        raise DownloadError(f"segment {start}-{end} incomplete: {part.stat().st_size}/{expected} bytes")
+
+
+def download_file(session, url: str, dest: Path, headers: Optional[Dict] = None, desc: Optional[str] = None,
+                  quiet: bool = False, segments: int = DEFAULT_SEGMENTS, timeout: int = 30) -> int:
+    """
+    下载 url 到 dest，支持断点续传与并行分段
+    Download url to dest with resume support and parallel segments
+
+    Args:
+        session: requests.Session
+        url: 音频地址 / Audio URL
+        dest: 目标文件 / Destination file
+        headers: 额外请求头 / Extra request headers
+        desc: 进度条标题 / Progress bar label
+        quiet: 不显示进度条 / Hide the progress bar
+        segments: 最大并行字节段数，1 表示单连接 / Max parallel segments, 1 for a single connection
+        timeout: 连接/读取超时（秒）/ Connect/read timeout (seconds)
+
+    Returns:
+        int: 文件大小（字节）/ File size in bytes
+
+    Raises:
+        DownloadError: 大小校验失败；已下载部分会保留以便续传
+                       Size check failed; downloaded data is kept for resuming
+    """
+    return _download(session, url, dest, dict(headers or {}), desc, quiet, segments, timeout)
+
+
+def _download(session, url: str, dest: Path, headers: Dict, desc: Optional[str], quiet: bool, segments: int,
+              timeout: int, restarted: bool = False, plain: bool = False) -> int:
+    """
+    download_file 的实现；restarted 表示已重新开始过一次（不再重试），plain 表示不发送 Range 的单连接下载
+    Implementation of download_file; restarted means it already started over once
+    (no further retries), plain means a single stream without a Range header
+    """
+    part = _part_path(dest)
+    segment_parts = sorted(dest.parent.glob(dest.name + '.part[0-9]*'))
+    offset = part.stat().st_size if part.exists() and not segment_parts and not plain else 0
+
+    def start_over(reason: str, plain_stream: bool = False) -> int:
+        # 丢弃 .part 只重新开始一次 / Drop .part and start over at most once
+        if restarted:
+            raise DownloadError(reason)
+        if part.exists():
+            part.unlink()
+        return _download(session, url, dest, headers, desc, quiet, segments, timeout,
+                         restarted=True, plain=plain or plain_stream)
+
+    # 探测请求：同时作为单连接下载的响应 / Probe request, doubles as the single-stream response
+    request_headers = headers if plain else {**headers, 'Range': f'bytes={offset}-'}
+    response = session.get(url, stream=True, timeout=timeout, headers=request_headers)
+    with response:
+        if response.status_code == 416 and offset:
+            # 请求的起点超出文件末尾：.part 已完整 / Range starts past the end: .part is already complete
+            _, total = _parse_content_range(response.headers.get('Content-Range', ''))
+            if total == offset:
+                os.replace(part, dest)
+                return offset
+            response.close()
+            return start_over(f"range request rejected at byte {offset}")
+        response.raise_for_status()
+
+        if response.status_code == 206 and not plain:
+            start, total = _parse_content_range(response.headers.get('Content-Range', ''))
+            if start is None:
+                # 206 但 Content-Range 缺失或无法解析：按不支持 Range 处理，改用普通单连接下载
+                # 206 without a parseable Content-Range: treat ranges as unsupported and use one plain stream
+                response.close()
+                return start_over("206 response without a valid Content-Range", plain_stream=True)
+            supports_ranges = True
+        else:
+            # 服务器忽略 Range，从头开始 / Server ignored the range, start over
+            start = offset = 0
+            total = int(response.headers.get('content-length', 0)) or None
+            supports_ranges = not plain and response.headers.get('Accept-Ranges', '').lower() == 'bytes'
+        if start != offset:
+            # 服务器返回了其他区间，丢弃 .part 重新下载 / Server sent another range, drop .part and start over
+            response.close()
+            return start_over(f"server sent a range starting at {start} instead of {offset}")
+
+        use_segments = (
+            supports_ranges and total and segments > 1
+            and (segment_parts or (offset == 0 and total >= SEGMENT_MIN_SIZE))
+        )
+
+        pbar = None
+        pbar_lock = threading.Lock()
+        if not quiet:
+            pbar = tqdm(total=total, initial=offset, unit='B', unit_scale=True, desc=desc)
+        try:
+            if not use_segments:
+                for stale in segment_parts:
+                    stale.unlink()
+                with open(part, 'ab' if offset else 'wb') as f:
+                    _write_stream(response, f, pbar, pbar_lock)
+        finally:
+            if pbar is not None and not use_segments:
+                pbar.close()
+
+    if use_segments:
+        segment_size = -(-total // segments)
+        ranges = [(i, s, min(s + segment_size, total) - 1) for i, s in enumerate(range(0, total, segment_size))]
+        if part.exists():
+            part.unlink()
+        if pbar is not None:
+            pbar.update(sum(_part_path(dest, i).stat().st_size for i, _, _ in ranges if _part_path(dest, i).exists()))
+        try:
+            with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+                futures = [
+                    pool.submit(_download_segment, session, url, headers, _part_path(dest, i), s, e, timeout, pbar, pbar_lock)
+                    for i, s, e in ranges
+                ]
+                for future in futures:
+                    future.result()
+        finally:
+            if pbar is not None:
+                pbar.close()
+        with open(part, 'wb') as out:
+            for i, _, _ in ranges:
+                with open(_part_path(dest, i), 'rb') as segment:
+                    while True:
+                        data = segment.read(CHUNK_SIZE)
+                        if not data:
+                            break
+                        out.write(data)
+        for i, _, _ in ranges:
+            _part_path(dest, i).unlink()
+
+    size = part.stat().st_size
+    if total and size != total:
+        raise DownloadError(f"incomplete download: {size}/{total} bytes")
+    os.replace(part, dest)
+    return size
@@ -5,18 +5,19 @@ PodLens Email Service - 核心邮件通知服务
 """
 
 import os
-import smtplib
 import subprocess
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
 from pathlib import Path
-import google.generativeai as genai
 from dotenv import load_dotenv
 import re
 import json
 from typing import List, Dict, Optional
-from . import get_model_name
+from .gemini import get_gemini_client
+from .llm_cache import cached_generate, TEMPLATE_DIGEST
+from .catalog import get_catalog, KIND_SUMMARY
+from .mailer import SMTPTransport
 
 # 加载环境变量
 load_dotenv()
@@ -24,14 +25,6 @@ load_dotenv()
 # 硬编码的Gmail配置 - 专用邮件账户
 PODLENS_EMAIL = "podlensnews@gmail.com"
 PODLENS_APP_PASSWORD = "nlkz yzfs ontl qnte"
-GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
-
-# 配置Gemini
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY, transport='rest')
-    model = genai.GenerativeModel(get_model_name())  # 从 .env 获取模型名称
-else:
-    model = None
 
 class EmailService:
     """PodLens邮件服务核心类"""
@@ -128,54 +121,27 @@ class EmailService:
         return True
     
     def scan_todays_summaries(self) -> List[Dict]:
-        """扫描今天创建的所有summary文件"""
+        """从输出目录索引中查找今天写入的所有summary文件"""
         today = datetime.now().strftime('%Y-%m-%d')
-        outputs_dir = Path('outputs')
         summaries = []
-        
-        if not outputs_dir.exists():
-            return summaries
-        
-        # 遍历所有频道
-        for channel_dir in outputs_dir.iterdir():
-            if not channel_dir.is_dir():
+        catalog = get_catalog()
+        # 补录未经 record_output 写入的summary
+        catalog.backfill()
+        
+        for entry in catalog.query(kind=KIND_SUMMARY, day=today):
+            file = entry['path']
+            # 只取仍在磁盘上的剧集摘要（outputs/<频道>/<日期>/<剧集>/）
+            if not entry['channel'] or not file.exists():
                 continue
-            
-            # 遍历日期目录
-            for date_dir in channel_dir.iterdir():
-                if not date_dir.is_dir():
-                    continue
-                
-                # 检查是否是今天的日期
-                if date_dir.name == today or self._check_if_created_today(date_dir):
-                    # 遍历episode目录
-                    for episode_dir in date_dir.iterdir():
-                        if not episode_dir.is_dir():
-                            continue
-                        
-                        # 查找summary文件
-                        for file in episode_dir.iterdir():
-                            if file.name.startswith('Summary_') and file.name.endswith('.md'):
-                                if self._check_if_created_today(file):
-                                    summaries.append({
-                                        'channel': channel_dir.name,
-                                        'episode': episode_dir.name,
-                                        'file_path': file,
-                                        'file_name': file.name
-                                    })
+            summaries.append({
+                'channel': entry['channel'],
+                'episode': entry['episode'],
+                'file_path': file,
+                'file_name': file.name
+            })
         
         return summaries
     
-    def _check_if_created_today(self, file_path: Path) -> bool:
-        """检查文件是否是今天创建的"""
-        try:
-            stat = file_path.stat()
-            file_date = datetime.fromtimestamp(stat.st_ctime).strftime('%Y-%m-%d')
-            today = datetime.now().strftime('%Y-%m-%d')
-            return file_date == today
-        except:
-            return False
-    
     def _read_summary_content(self, file_path: Path) -> str:
         """读取summary文件内容"""
         try:
@@ -234,7 +200,8 @@ class EmailService:
         if not summaries:
             return "今日暂无新内容处理。"
         
-        if not model:
+        client = get_gemini_client()
+        if not client:
             return f"今日处理了{len(summaries)}个节目，但AI摘要功能未配置。"
         
         # 准备prompt
@@ -271,8 +238,7 @@ class EmailService:
 """
         
         try:
-            response = model.generate_content(prompt)
-            return response.text
+            return cached_generate(client.model_name, TEMPLATE_DIGEST, prompt, client.generate)
         except Exception as e:
             print(f"❌ Gemini API调用失败: {e}")
             return f"今日处理了{len(summaries)}个节目，但AI摘要生成失败。"
@@ -413,27 +379,32 @@ class EmailService:
 """
         return html_content
     
-    def send_email(self, recipient_email: str, html_content: str, summaries: List[Dict]) -> bool:
+    def build_message(self, recipient_email: str, subject: str, html_content: str) -> MIMEMultipart:
+        """构建HTML邮件"""
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = PODLENS_EMAIL
+        msg['To'] = recipient_email
+        msg.attach(MIMEText(html_content, 'html', 'utf-8'))
+        return msg
+    
+    def open_transport(self) -> SMTPTransport:
+        """打开SMTP传输（主机/端口取自 SMTP_HOST/SMTP_PORT），同一批邮件复用一条连接"""
+        return SMTPTransport(PODLENS_EMAIL, PODLENS_APP_PASSWORD)
+    
+    def send_email(self, recipient_email: str, html_content: str, summaries: List[Dict],
+                   transport: Optional[SMTPTransport] = None) -> bool:
         """发送邮件"""
         today = datetime.now().strftime('%Y年%m月%d日')
         subject = f"🎧 PodLens日报 - {today} ({len(summaries)}个新内容)"
         
         try:
-            # 创建邮件对象
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = PODLENS_EMAIL
-            msg['To'] = recipient_email
-            
-            # 添加HTML内容
-            html_part = MIMEText(html_content, 'html', 'utf-8')
-            msg.attach(html_part)
-            
-            # 连接Gmail SMTP服务器并发送邮件
-            with smtplib.SMTP('smtp.gmail.com', 587) as server:
-                server.starttls()
-                server.login(PODLENS_EMAIL, PODLENS_APP_PASSWORD)
-                server.send_message(msg)
+            msg = self.build_message(recipient_email, subject, html_content)
+            if transport is not None:
+                transport.send(msg)
+            else:
+                with self.open_transport() as transport:
+                    transport.send(msg)
             
             return True
             
@@ -460,13 +431,16 @@ class EmailService:
         # 创建HTML邮件
         html_content = self.create_html_email(digest_content, summaries)
         
-        # 发送邮件
-        success = self.send_email(recipient_email, html_content, summaries)
-        
-        if success:
-            print(f"✅ 邮件发送成功！收件人: {recipient_email}")
-        else:
-            print(f"❌ 邮件发送失败！收件人: {recipient_email}")
+        # 通过同一条SMTP连接发送给每个收件人（逗号分隔）
+        recipients = [r.strip() for r in recipient_email.split(',') if r.strip()]
+        success = True
+        with self.open_transport() as transport:
+            for recipient in recipients:
+                if self.send_email(recipient, html_content, summaries, transport=transport):
+                    print(f"✅ 邮件发送成功！收件人: {recipient}")
+                else:
+                    print(f"❌ 邮件发送失败！收件人: {recipient}")
+                    success = False
         
         return success
     
@@ -498,18 +472,9 @@ class EmailService:
 """
         
         try:
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = f"🧪 PodLens邮件服务测试 - {today}"
-            msg['From'] = PODLENS_EMAIL
-            msg['To'] = recipient_email
-            
-            html_part = MIMEText(test_html, 'html', 'utf-8')
-            msg.attach(html_part)
-            
-            with smtplib.SMTP('smtp.gmail.com', 587) as server:
-                server.starttls()
-                server.login(PODLENS_EMAIL, PODLENS_APP_PASSWORD)
-                server.send_message(msg)
+            msg = self.build_message(recipient_email, f"🧪 PodLens邮件服务测试 - {today}", test_html)
+            with self.open_transport() as transport:
+                transport.send(msg)
             
             print(f"✅ 测试邮件发送成功！")
             return True
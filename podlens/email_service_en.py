@@ -5,18 +5,19 @@ Integrates Gmail SMTP, AI Summary Generation and Automation Management
 """
 
 import os
-import smtplib
 import subprocess
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
 from pathlib import Path
-import google.generativeai as genai
 from dotenv import load_dotenv
 import re
 import json
 from typing import List, Dict, Optional
-from . import get_model_name
+from .gemini import get_gemini_client
+from .llm_cache import cached_generate, TEMPLATE_DIGEST
+from .catalog import get_catalog, KIND_SUMMARY
+from .mailer import SMTPTransport
 
 # Load environment variables
 load_dotenv()
@@ -24,14 +25,6 @@ load_dotenv()
 # Hardcoded Gmail configuration - dedicated email account
 PODLENS_EMAIL = "podlensnews@gmail.com"
 PODLENS_APP_PASSWORD = "nlkz yzfs ontl qnte"
-GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
-
-# Configure Gemini
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY, transport='rest')
-    model = genai.GenerativeModel(get_model_name())  # Get model name from .env
-else:
-    model = None
 
 class EmailService:
     """PodLens Email Service Core Class"""
@@ -128,54 +121,27 @@ class EmailService:
         return True
     
     def scan_todays_summaries(self) -> List[Dict]:
-        """Scan all summary files created today"""
+        """Look up all summary files written today in the outputs catalog"""
         today = datetime.now().strftime('%Y-%m-%d')
-        outputs_dir = Path('outputs')
         summaries = []
-        
-        if not outputs_dir.exists():
-            return summaries
-        
-        # Iterate through all channels
-        for channel_dir in outputs_dir.iterdir():
-            if not channel_dir.is_dir():
+        catalog = get_catalog()
+        # Pick up summaries written without record_output
+        catalog.backfill()
+        
+        for entry in catalog.query(kind=KIND_SUMMARY, day=today):
+            file = entry['path']
+            # Only episode summaries (outputs/<channel>/<date>/<episode>/) that are still on disk
+            if not entry['channel'] or not file.exists():
                 continue
-            
-            # Iterate through date directories
-            for date_dir in channel_dir.iterdir():
-                if not date_dir.is_dir():
-                    continue
-                
-                # Check if it's today's date
-                if date_dir.name == today or self._check_if_created_today(date_dir):
-                    # Iterate through episode directories
-                    for episode_dir in date_dir.iterdir():
-                        if not episode_dir.is_dir():
-                            continue
-                        
-                        # Look for summary files
-                        for file in episode_dir.iterdir():
-                            if file.name.startswith('Summary_') and file.name.endswith('.md'):
-                                if self._check_if_created_today(file):
-                                    summaries.append({
-                                        'channel': channel_dir.name,
-                                        'episode': episode_dir.name,
-                                        'file_path': file,
-                                        'file_name': file.name
-                                    })
+            summaries.append({
+                'channel': entry['channel'],
+                'episode': entry['episode'],
+                'file_path': file,
+                'file_name': file.name
+            })
         
         return summaries
     
-    def _check_if_created_today(self, file_path: Path) -> bool:
-        """Check if file was created today"""
-        try:
-            stat = file_path.stat()
-            file_date = datetime.fromtimestamp(stat.st_ctime).strftime('%Y-%m-%d')
-            today = datetime.now().strftime('%Y-%m-%d')
-            return file_date == today
-        except:
-            return False
-    
     def _read_summary_content(self, file_path: Path) -> str:
         """Read summary file content"""
         try:
@@ -234,7 +200,8 @@ class EmailService:
         if not summaries:
             return "No new content processed today."
         
-        if not model:
+        client = get_gemini_client()
+        if not client:
             return f"Processed {len(summaries)} episodes today, but AI summary feature is not configured."
         
         # Prepare prompt
@@ -271,8 +238,7 @@ Please generate the daily content with proper markdown formatting:
 """
         
         try:
-            response = model.generate_content(prompt)
-            return response.text
+            return cached_generate(client.model_name, TEMPLATE_DIGEST, prompt, client.generate)
         except Exception as e:
             print(f"❌ Gemini API call failed: {e}")
             return f"Processed {len(summaries)} episodes today, but AI summary generation failed."
@@ -413,27 +379,32 @@ Please generate the daily content with proper markdown formatting:
 """
         return html_content
     
-    def send_email(self, recipient_email: str, html_content: str, summaries: List[Dict]) -> bool:
+    def build_message(self, recipient_email: str, subject: str, html_content: str) -> MIMEMultipart:
+        """Build an HTML email message"""
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = PODLENS_EMAIL
+        msg['To'] = recipient_email
+        msg.attach(MIMEText(html_content, 'html', 'utf-8'))
+        return msg
+    
+    def open_transport(self) -> SMTPTransport:
+        """Open an SMTP transport (host/port from SMTP_HOST/SMTP_PORT) that reuses one connection per batch"""
+        return SMTPTransport(PODLENS_EMAIL, PODLENS_APP_PASSWORD)
+    
+    def send_email(self, recipient_email: str, html_content: str, summaries: List[Dict],
+                   transport: Optional[SMTPTransport] = None) -> bool:
         """Send email"""
         today = datetime.now().strftime('%B %d, %Y')
         subject = f"🎧 PodLens Daily Digest - {today} ({len(summaries)} new content(s))"
         
         try:
-            # Create email object
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = PODLENS_EMAIL
-            msg['To'] = recipient_email
-            
-            # Add HTML content
-            html_part = MIMEText(html_content, 'html', 'utf-8')
-            msg.attach(html_part)
-            
-            # Connect to Gmail SMTP server and send email
-            with smtplib.SMTP('smtp.gmail.com', 587) as server:
-                server.starttls()
-                server.login(PODLENS_EMAIL, PODLENS_APP_PASSWORD)
-                server.send_message(msg)
+            msg = self.build_message(recipient_email, subject, html_content)
+            if transport is not None:
+                transport.send(msg)
+            else:
+                with self.open_transport() as transport:
+                    transport.send(msg)
             
             return True
             
@@ -460,13 +431,16 @@ Please generate the daily content with proper markdown formatting:
         # Create HTML email
         html_content = self.create_html_email(digest_content, summaries)
         
-        # Send email
-        success = self.send_email(recipient_email, html_content, summaries)
-        
-        if success:
-            print(f"✅ Email sent successfully! Recipient: {recipient_email}")
-        else:
-            print(f"❌ Email sending failed! Recipient: {recipient_email}")
+        # Send email to every recipient (comma-separated) over one SMTP connection
+        recipients = [r.strip() for r in recipient_email.split(',') if r.strip()]
+        success = True
+        with self.open_transport() as transport:
+            for recipient in recipients:
+                if self.send_email(recipient, html_content, summaries, transport=transport):
+                    print(f"✅ Email sent successfully! Recipient: {recipient}")
+                else:
+                    print(f"❌ Email sending failed! Recipient: {recipient}")
+                    success = False
         
         return success
     
@@ -498,18 +472,9 @@ Please generate the daily content with proper markdown formatting:
 """
         
         try:
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = f"🧪 PodLens Email Service Test - {today}"
-            msg['From'] = PODLENS_EMAIL
-            msg['To'] = recipient_email
-            
-            html_part = MIMEText(test_html, 'html', 'utf-8')
-            msg.attach(html_part)
-            
-            with smtplib.SMTP('smtp.gmail.com', 587) as server:
-                server.starttls()
-                server.login(PODLENS_EMAIL, PODLENS_APP_PASSWORD)
-                server.send_message(msg)
+            msg = self.build_message(recipient_email, f"🧪 PodLens Email Service Test - {today}", test_html)
+            with self.open_transport() as transport:
+                transport.send(msg)
             
             print(f"✅ Test email sent successfully!")
             return True
@@ -0,0 +1,262 @@
+"""
+RSS 订阅源缓存 / RSS feed caches
+
+为每个订阅源保存 ETag、Last-Modified 与内容哈希，轮询时发送 If-None-Match /
+If-Modified-Since；服务器返回 304 或内容未变化时直接复用上次解析出的剧集列表。
+订阅源条目只在内存中更新，每次检查结束时由 flush()（以及进程退出时）写入一次，
+每轮的磁盘 I/O 不随订阅数量增长。
+Stores each feed's ETag, Last-Modified and content hash, sends If-None-Match /
+If-Modified-Since when polling, and reuses the previously parsed episode list
+on a 304 response or when the body is unchanged.
+Feed entries are updated in memory and written once per check by flush()
+(and at process exit), so a cycle's disk I/O does not grow with the number of
+subscriptions.
+
+频道解析缓存把 my_pod.md 中的名称映射到 iTunes collection ID 与 RSS 地址，避免每次检查都调用搜索接口。
+The channel lookup cache maps my_pod.md names to their iTunes collection ID and
+feed URL, so checks do not hit the search API every cycle.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+
+FEED_CACHE_FILE = Path('.podlens/feed_cache.json')
+
+# 每个订阅源缓存的剧集数量 / Episodes kept per feed
+CACHED_EPISODES = 20
+
+# 缓存的剧集字段变化时递增，旧缓存会被丢弃 / Bump when cached episode fields change, old caches are dropped
+FEED_CACHE_VERSION = '1.1'
+
+
+def write_json_atomic(path: Path, data: Dict, indent: Optional[int] = 2):
+    """
+    先写临时文件再替换，进程中断时不会留下半个 JSON 文件；写入失败时打印警告
+    Write to a temporary file and replace, so an interrupted process never leaves half a JSON file;
+    a failed write prints a warning
+    """
+    try:
+        path.parent.mkdir(exist_ok=True)
+        tmp_file = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent)
+        os.replace(tmp_file, path)
+    except Exception as e:
+        print(f"⚠️  写入失败 / Failed to write {path}: {e}")
+
+
+def _empty_stats() -> Dict:
+    return {
+        'requests': 0,
+        'not_modified': 0,       # 304 响应 / 304 responses
+        'unchanged': 0,          # 200 但内容哈希相同 / 200 with identical content hash
+        'bytes_downloaded': 0,
+        'bytes_saved': 0,
+    }
+
+
+class FeedCache:
+    """按订阅源 URL 保存校验信息与解析结果 / Validators and parsed episodes keyed by feed URL"""
+
+    def __init__(self, cache_file: Path = FEED_CACHE_FILE):
+        self.cache_file = cache_file
+        self.lock = threading.Lock()
+        self.cache = self.load_cache()
+        self.dirty = False
+        atexit.register(self.flush)
+
+    def load_cache(self) -> Dict:
+        """加载缓存，文件不存在或格式错误时返回空结构 / Load cache, empty structure if missing or invalid"""
+        try:
+            if self.cache_file.exists():
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    cache_data = json.load(f)
+                if isinstance(cache_data, dict) and 'feeds' in cache_data:
+                    if cache_data.get('version') != FEED_CACHE_VERSION:
+                        cache_data['feeds'] = {}
+                        cache_data['version'] = FEED_CACHE_VERSION
+                    cache_data['stats'] = {**_empty_stats(), **cache_data.get('stats', {})}
+                    return cache_data
+        except Exception:
+            pass
+        return {
+            'feeds': {},  # {feed_url: {etag, last_modified, content_hash, size, total_entries, episodes}}
+            'stats': _empty_stats(),
+            'last_updated': datetime.now().isoformat(),
+            'version': FEED_CACHE_VERSION
+        }
+
+    def save_cache(self):
+        """原子写入缓存文件（调用方持有锁）/ Write the cache file atomically (caller holds the lock)"""
+        self.cache['last_updated'] = datetime.now().isoformat()
+        write_json_atomic(self.cache_file, self.cache)
+        self.dirty = False
+
+    def flush(self):
+        """有未保存的修改时写入缓存，每次检查结束时调用 / Write the cache if it has unsaved changes; called at the end of each check"""
+        with self.lock:
+            if self.dirty:
+                self.save_cache()
+
+    def fetch_episodes(self, session, feed_url: str, parse: Callable[[bytes, int], List[Dict]], limit: int = 10) -> List[Dict]:
+        """
+        条件请求订阅源并返回剧集；仅在内容变化时调用 parse
+        Fetch a feed conditionally and return its episodes; parse is only called when the content changed
+
+        Args:
+            session: requests.Session
+            feed_url: RSS 订阅地址 / RSS feed URL
+            parse: parse(content, max_episodes) -> 剧集列表 / episode list
+            limit: 返回的剧集数量 / Number of episodes to return
+
+        Returns:
+            List[Dict]: 剧集信息列表 / Episode information list
+        """
+        with self.lock:
+            entry = self.cache['feeds'].get(feed_url)
+        # 缓存的剧集不够用时无条件重新获取 / Refetch unconditionally if the cached list is too short
+        usable = entry is not None and (
+            len(entry['episodes']) >= limit or entry['total_entries'] <= len(entry['episodes'])
+        )
+
+        headers = {}
+        if usable:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = session.get(feed_url, headers=headers, timeout=30)
+
+        if response.status_code == 304 and usable:
+            with self.lock:
+                stats = self.cache['stats']
+                stats['requests'] += 1
+                stats['not_modified'] += 1
+                stats['bytes_saved'] += entry['size']
+                self.dirty = True
+            return entry['episodes'][:limit]
+
+        response.raise_for_status()
+        content = response.content
+        content_hash = hashlib.sha256(content).hexdigest()
+        unchanged = usable and entry['content_hash'] == content_hash
+
+        if unchanged:
+            episodes = entry['episodes']
+            total_entries = entry['total_entries']
+        else:
+            episodes = parse(content, max(limit, CACHED_EPISODES))
+            total_entries = len(episodes)
+            if total_entries >= max(limit, CACHED_EPISODES):
+                # 列表被截断，真实条目数未知 / Truncated list, real entry count unknown
+                total_entries += 1
+
+        with self.lock:
+            stats = self.cache['stats']
+            stats['requests'] += 1
+            stats['bytes_downloaded'] += len(content)
+            if unchanged:
+                stats['unchanged'] += 1
+            self.cache['feeds'][feed_url] = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'content_hash': content_hash,
+                'size': len(content),
+                'total_entries': total_entries,
+                'episodes': episodes,
+            }
+            self.dirty = True
+        return episodes[:limit]
+
+    def stats(self) -> Dict:
+        """缓存命中统计 / Cache hit statistics"""
+        with self.lock:
+            stats = dict(self.cache['stats'])
+        hits = stats['not_modified'] + stats['unchanged']
+        stats['hits'] = hits
+        stats['hit_rate'] = hits / stats['requests'] if stats['requests'] else 0.0
+        return stats
+
+
+CHANNEL_LOOKUP_FILE = Path('.podlens/channel_lookup.json')
+
+# 已解析频道的默认有效期（天）/ Default lifetime of a resolved channel (days)
+DEFAULT_LOOKUP_TTL_DAYS = 7.0
+
+
+class ChannelLookupCache:
+    """
+    my_pod.md 条目 → iTunes 频道（collection ID 与 RSS 地址）的持久化映射
+    Persistent mapping from my_pod.md entries to iTunes channels (collection ID and feed URL)
+    """
+
+    def __init__(self, cache_file: Path = CHANNEL_LOOKUP_FILE, ttl_days: float = DEFAULT_LOOKUP_TTL_DAYS):
+        self.cache_file = cache_file
+        self.ttl_days = ttl_days
+        self.lock = threading.Lock()
+        self.cache = self.load_cache()
+
+    def load_cache(self) -> Dict:
+        """加载缓存，文件不存在或格式错误时返回空结构 / Load cache, empty structure if missing or invalid"""
+        try:
+            if self.cache_file.exists():
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    cache_data = json.load(f)
+                if isinstance(cache_data, dict) and 'channels' in cache_data:
+                    return cache_data
+        except Exception:
+            pass
+        return {
+            'channels': {},  # {podcast_name: {collection_id, name, feed_url, resolved_at}}
+            'last_updated': datetime.now().isoformat(),
+            'version': '1.0'
+        }
+
+    def save_cache(self):
+        """原子写入缓存文件 / Write the cache file atomically"""
+        self.cache['last_updated'] = datetime.now().isoformat()
+        write_json_atomic(self.cache_file, self.cache)
+
+    def get(self, podcast_name: str) -> Optional[Dict]:
+        """返回未过期的解析结果 / Return the resolved channel if it has not expired"""
+        with self.lock:
+            entry = self.cache['channels'].get(podcast_name)
+        if not entry:
+            return None
+        try:
+            age = datetime.now() - datetime.fromisoformat(entry['resolved_at'])
+        except (KeyError, ValueError):
+            return None
+        if age.total_seconds() > self.ttl_days * 86400:
+            return None
+        return entry
+
+    def put(self, podcast_name: str, channel: Dict) -> Dict:
+        """保存搜索结果中选中的频道 / Store the channel selected from search results"""
+        entry = {
+            'collection_id': channel.get('collection_id'),
+            'name': channel['name'],
+            'feed_url': channel['feed_url'],
+            'resolved_at': datetime.now().isoformat(),
+        }
+        with self.lock:
+            self.cache['channels'][podcast_name] = entry
+            self.save_cache()
+        return entry
+
+    def invalidate(self, podcast_name: Optional[str] = None):
+        """删除单个或全部解析结果 / Drop one resolved channel, or all of them"""
+        with self.lock:
+            if podcast_name is None:
+                self.cache['channels'] = {}
+            else:
+                self.cache['channels'].pop(podcast_name, None)
+            self.save_cache()
@@ -0,0 +1,103 @@
+"""
+共享 Gemini 客户端 / Shared Gemini client
+
+原先每个构造函数（以及每次生成可视化故事）都会重新执行 genai.configure，这会丢弃已建立的
+HTTP 连接；每次请求又新建一个 GenerativeModel。这里每个进程只配置一次、只创建一个模型对象，
+REST 传输的 keep-alive 连接在批量运行中被复用，并为每个请求设置超时。
+Every constructor (and every visual story) used to re-run genai.configure, which
+drops the established HTTP connections, and every request built a new
+GenerativeModel. The client is now configured once per process with a single
+model object, so the REST transport's keep-alive connections are reused across a
+batch run, and every request carries a timeout.
+
+通过 .env 配置 / Configured through .env:
+    GEMINI_API_KEY  API 密钥 / API key
+    MODEL           模型名称 / Model name
+    GEMINI_TIMEOUT  单次请求超时（秒），默认 600 / Per-request timeout in seconds, default 600
+"""
+
+import os
+import threading
+from typing import Iterator, Optional
+
+try:
+    import google.generativeai as genai
+except ImportError:
+    genai = None
+
+from . import get_model_name
+
+
+DEFAULT_TIMEOUT = 600
+
+
+def response_text(response) -> Optional[str]:
+    """取出 Gemini 响应的文本，格式异常时返回 None / Text of a Gemini response, None if the format is unexpected"""
+    if hasattr(response, 'text'):
+        return response.text
+    if hasattr(response, 'candidates') and response.candidates:
+        return response.candidates[0].content.parts[0].text
+    return None
+
+
+class GeminiClient:
+    """配置一次、复用同一模型对象与连接的 Gemini 客户端 / Gemini client configured once, reusing one model object and its connections"""
+
+    def __init__(self, api_key: str, model_name: str, timeout: float = DEFAULT_TIMEOUT):
+        genai.configure(api_key=api_key, transport='rest')
+        self.model_name = model_name
+        self.timeout = timeout
+        self.model = genai.GenerativeModel(model_name)
+
+    def generate(self, prompt: str) -> Optional[str]:
+        """
+        生成文本，超时或 API 错误时抛出异常
+        Generate text; raises on timeout or API errors
+
+        Returns:
+            str: 响应文本，格式异常时为 None / Response text, None if the format is unexpected
+        """
+        response = self.model.generate_content(prompt, request_options={'timeout': self.timeout})
+        return response_text(response)
+
+    def generate_stream(self, prompt: str) -> Iterator[str]:
+        """
+        使用流式 API 生成文本，逐块产出；超时或 API 错误时抛出异常
+        Generate text with the streaming API, yielding chunks as they arrive; raises on timeout or API errors
+        """
+        response = self.model.generate_content(prompt, stream=True, request_options={'timeout': self.timeout})
+        for chunk in response:
+            try:
+                text = chunk.text
+            except ValueError:
+                # 不含文本的块（如仅有结束原因）/ Chunk without text parts (e.g. only a finish reason)
+                continue
+            if text:
+                yield text
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_gemini_client() -> Optional[GeminiClient]:
+    """
+    返回进程级共享的 Gemini 客户端，首次调用时创建；未安装 SDK 或未配置 GEMINI_API_KEY 时返回 None
+    Return the process-wide Gemini client, created on first call; None if the SDK
+    is missing or GEMINI_API_KEY is not set
+
+    Raises:
+        ValueError: 未配置 MODEL / MODEL is not configured
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            api_key = os.getenv('GEMINI_API_KEY')
+            if genai is None or not api_key:
+                return None
+            try:
+                timeout = float(os.getenv('GEMINI_TIMEOUT', DEFAULT_TIMEOUT))
+            except ValueError:
+                timeout = DEFAULT_TIMEOUT
+            _client = GeminiClient(api_key, get_model_name(), timeout)
+        return _client
@@ -0,0 +1,195 @@
+"""
+LLM 响应缓存 / LLM response cache
+
+摘要、翻译、每日摘要与可视化故事原先每次都重新调用 Gemini，即使输入完全相同；
+崩溃后重跑或删除摘要文件后都要再付费。这里按 (模型名, 提示模板版本, 提示文本)
+的哈希把响应保存在 SQLite 中，总大小超过上限时按最近使用时间淘汰（LRU）。
+重新处理未变化的剧集不会产生任何 API 调用。``--no-cache`` 可跳过缓存。
+Summaries, translations, daily digests and visual stories used to call Gemini
+again every time, even for identical input, so a re-run after a crash or after
+deleting a summary file paid again. Responses are stored in SQLite keyed by a
+hash of (model name, prompt template version, prompt text), and the least
+recently used entries are evicted once the total size exceeds a cap.
+Re-processing an unchanged episode makes no API calls. ``--no-cache`` bypasses it.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+
+LLM_CACHE_FILE = Path('.podlens/llm_cache.db')
+
+# 缓存总大小上限 / Total size cap
+DEFAULT_MAX_MB = 200
+
+# 提示模板版本：修改模板或响应处理时递增，旧条目自然失效
+# Prompt template versions: bump when a template or its response handling changes, old entries stop matching
+TEMPLATE_SUMMARY = 'summary/1'
+TEMPLATE_SUMMARY_SECTIONS = 'summary-map-reduce/1'
+TEMPLATE_TRANSLATE = 'translate/1'
+TEMPLATE_DIGEST = 'daily-digest/1'
+TEMPLATE_VISUAL = 'visual-story/1'
+
+
+def cache_key(model_name: str, template: str, prompt: str) -> str:
+    """(模型名, 模板版本, 提示文本) 的 SHA-256 / SHA-256 of (model name, template version, prompt text)"""
+    return hashlib.sha256(json.dumps([model_name, template, prompt], ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+class LLMCache:
+    """按内容寻址、大小受限的 LRU 响应缓存 / Content-addressed, size-bounded LRU response cache"""
+
+    def __init__(self, db_file: Path = LLM_CACHE_FILE, max_mb: float = DEFAULT_MAX_MB):
+        self.db_file = db_file
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self.db_file.parent.mkdir(exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_file), timeout=30, check_same_thread=False)
+        with self.lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " template TEXT NOT NULL,"
+                " response TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+            self.conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        """返回缓存的响应并刷新其最近使用时间 / Return the cached response and refresh its last-used time"""
+        if not self.enabled:
+            return None
+        with self.lock:
+            row = self.conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+        return row[0]
+
+    def put(self, key: str, template: str, response: str):
+        """保存响应，超出大小上限时淘汰最久未用的条目 / Store a response, evicting least recently used entries above the cap"""
+        if not self.enabled:
+            return
+        size = len(response.encode('utf-8'))
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, template, response, size, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, template, response, size, time.time()),
+            )
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self):
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        stale = []
+        for key, size in self.conn.execute("SELECT key, size FROM responses ORDER BY last_used"):
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self.conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+    def clear(self):
+        """清空缓存 / Drop every cached response"""
+        with self.lock:
+            self.conn.execute("DELETE FROM responses")
+            self.conn.commit()
+
+    def stats(self) -> Dict:
+        """条目数、总大小与本进程的命中统计 / Entry count, total size and this process's hit statistics"""
+        with self.lock:
+            entries, total = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'entries': entries,
+            'size_mb': total / 1024 / 1024,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+_cache = None
+_cache_enabled = True
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache:
+    """进程级共享的缓存，首次使用时打开 / Process-wide shared cache, opened on first use"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache()
+            _cache.enabled = _cache_enabled
+        return _cache
+
+
+def disable_llm_cache():
+    """本进程跳过缓存（--no-cache）/ Bypass the cache for this process (--no-cache)"""
+    global _cache_enabled
+    with _cache_lock:
+        _cache_enabled = False
+        if _cache is not None:
+            _cache.enabled = False
+
+
+def cached_generate(model_name: str, template: str, prompt: str,
+                    generate: Callable[[str], Optional[str]]) -> Optional[str]:
+    """
+    先查缓存，未命中时调用 generate(prompt) 并保存非空结果
+    Look up the cache first; on a miss call generate(prompt) and store a non-empty result
+    """
+    if not _cache_enabled:
+        return generate(prompt)
+    cache = get_llm_cache()
+    key = cache_key(model_name, template, prompt)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    response = generate(prompt)
+    if response:
+        cache.put(key, template, response)
+    return response
+
+
+def cached_stream(model_name: str, template: str, prompt: str,
+                  stream: Callable[[str], Iterable[str]]) -> Iterator[str]:
+    """
+    cached_generate 的流式版本：命中时一次产出缓存的响应；未命中时逐块产出 stream(prompt)，
+    完整结束后保存非空结果
+    Streaming counterpart of cached_generate: a hit yields the cached response at
+    once; a miss yields stream(prompt) chunk by chunk and stores a non-empty result
+    once the stream completes
+    """
+    if not _cache_enabled:
+        yield from stream(prompt)
+        return
+    cache = get_llm_cache()
+    key = cache_key(model_name, template, prompt)
+    cached = cache.get(key)
+    if cached is not None:
+        yield cached
+        return
+    parts = []
+    for chunk in stream(prompt):
+        parts.append(chunk)
+        yield chunk
+    response = ''.join(parts)
+    if response:
+        cache.put(key, template, response)
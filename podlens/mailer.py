@@ -0,0 +1,132 @@
+"""
+邮件传输 / Mail transport
+
+send_email 与 test_email_service 原先每封邮件都新建 smtplib.SMTP('smtp.gmail.com', 587)
+连接、执行 STARTTLS 并登录。SMTPTransport 在一个批次内保持一条已认证的连接，
+遇到临时错误（断线、4xx 响应、网络错误）时重连并重试；SMTP 主机与端口可配置。
+send_email and test_email_service used to open a new
+smtplib.SMTP('smtp.gmail.com', 587) connection, run STARTTLS and log in for every
+message. SMTPTransport keeps one authenticated connection per batch, reconnects
+and retries on transient errors (disconnects, 4xx replies, network errors), and
+the SMTP host and port are configurable.
+
+通过 .env 配置 / Configured through .env:
+    SMTP_HOST       默认 smtp.gmail.com / Default smtp.gmail.com
+    SMTP_PORT       默认 587 / Default 587
+    SMTP_STARTTLS   默认 true / Default true
+
+本地测试投递吞吐量 / Testing delivery throughput locally:
+    python -m aiosmtpd -n -l localhost:8025
+    SMTP_HOST=localhost SMTP_PORT=8025 SMTP_STARTTLS=false
+服务器不提供 AUTH 时跳过登录 / Login is skipped when the server offers no AUTH
+"""
+
+import os
+import smtplib
+import time
+from email.message import Message
+from typing import Optional
+
+
+DEFAULT_SMTP_HOST = 'smtp.gmail.com'
+DEFAULT_SMTP_PORT = 587
+DEFAULT_TIMEOUT = 30
+MAX_RETRIES = 3
+
+
+def is_transient(error: Exception) -> bool:
+    """
+    是否为值得重连重试的临时错误 / Whether an error is transient and worth reconnecting for
+
+    注意 smtplib.SMTPException 是 OSError 的子类，必须先判断 SMTP 错误
+    Note smtplib.SMTPException subclasses OSError, so SMTP errors are checked first
+    """
+    if isinstance(error, smtplib.SMTPAuthenticationError):
+        return False
+    if isinstance(error, smtplib.SMTPServerDisconnected):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPException):
+        return False
+    return isinstance(error, OSError)
+
+
+class SMTPTransport:
+    """
+    在一个批次内复用一条已认证连接的 SMTP 传输，用作上下文管理器
+    SMTP transport reusing one authenticated connection per batch; use as a context manager
+
+    用法 Usage: ``with SMTPTransport(user, password) as transport: transport.send(msg)``
+    """
+
+    def __init__(self, username: str, password: str, host: Optional[str] = None, port: Optional[int] = None,
+                 starttls: Optional[bool] = None, timeout: float = DEFAULT_TIMEOUT, max_retries: int = MAX_RETRIES):
+        self.username = username
+        self.password = password
+        self.host = host or os.getenv('SMTP_HOST') or DEFAULT_SMTP_HOST
+        try:
+            self.port = int(port or os.getenv('SMTP_PORT') or DEFAULT_SMTP_PORT)
+        except ValueError:
+            self.port = DEFAULT_SMTP_PORT
+        if starttls is None:
+            starttls = os.getenv('SMTP_STARTTLS', 'true').lower() in ('true', '1', 'yes')
+        self.starttls = starttls
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.server = None
+        self.sent = 0
+
+    def _connect(self):
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            server.ehlo()
+            if self.starttls:
+                server.starttls()
+                server.ehlo()
+            if self.username and server.has_extn('auth'):
+                server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        self.server = server
+
+    def send(self, msg: Message):
+        """
+        发送一封邮件，必要时建立连接；临时错误时重连并按退避重试
+        Send one message, connecting if needed; reconnects and retries with backoff on transient errors
+
+        Raises:
+            smtplib.SMTPException / OSError: 永久错误或重试用尽 / Permanent error or retries exhausted
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                if self.server is None:
+                    self._connect()
+                self.server.send_message(msg)
+                self.sent += 1
+                return
+            except Exception as e:
+                self.close()
+                if not is_transient(e) or attempt == self.max_retries:
+                    raise
+                time.sleep(min(30, 2 ** attempt))
+
+    def close(self):
+        """关闭连接（可重复调用）/ Close the connection (safe to call repeatedly)"""
+        if self.server is None:
+            return
+        try:
+            self.server.quit()
+        except Exception:
+            self.server.close()
+        self.server = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
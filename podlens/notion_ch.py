@@ -1,29 +1,45 @@
 import os
-import requests
+import sys
 import json
+import requests
 import time
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import re
 from tqdm import tqdm
 from datetime import datetime
 
+from .notion_api import NotionClient, ListingIncomplete, NOTION_WORKERS
+from .feed_cache import write_json_atomic
+from .notion_manifest import SyncManifest, content_hash, files_mtime
+from .catalog import get_catalog, KIND_SUMMARY
+
+# 未保存的缓存改动最多每隔这么久（秒）写入一次，运行结束时总会写入
+CACHE_FLUSH_SECONDS = 30
+
 class NotionMarkdownUploader:
     def __init__(self, token, root_page_id):
         self.token = token
         self.root_page_id = root_page_id
-        # 修正：必须提供版本号
-        self.headers = {
-            'Authorization': f'Bearer {token}',
-            'Content-Type': 'application/json',
-            'Notion-Version': '2022-06-28',  # 必需的版本号
-        }
-        self.base_url = 'https://api.notion.com/v1'
+        # 带连接池、令牌桶限速和Retry-After处理的会话，由上传线程共享
+        self.client = NotionClient(token)
         self.uploaded_files = set()  # 记录已上传的文件
         self.progress_bar = None  # 进度条引用
         
         # 添加缓存机制
         self.cache_file = Path('.podlens/notion_cache.json')
         self.cache = self.load_cache()
+        self.cache_lock = threading.RLock()
+        self.cache_dirty = False
+        self.cache_flushed_at = time.monotonic()
+        self.stopping = threading.Event()
+        self.child_index = {}  # 本次运行的内存索引: {parent_id: {title: page_id}}
+        
+        # 同步清单：每个已上传内容文件夹的 (相对路径, 修改时间, 内容哈希, 页面ID)
+        self.manifest = SyncManifest()
+        self.sync_root = None
         
     def load_cache(self):
         """加载本地缓存"""
@@ -49,18 +65,25 @@ class NotionMarkdownUploader:
             }
     
     def save_cache(self):
-        """保存缓存到文件"""
-        try:
-            # 确保目录存在
-            self.cache_file.parent.mkdir(exist_ok=True)
-            
-            # 更新时间戳
+        """立即写入缓存文件（原子替换，紧凑JSON）"""
+        with self.cache_lock:
             self.cache['last_updated'] = datetime.now().isoformat()
-            
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cache, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"⚠️  保存缓存失败: {e}")
+            write_json_atomic(self.cache_file, self.cache, indent=None)
+            self.cache_dirty = False
+            self.cache_flushed_at = time.monotonic()
+    
+    def mark_cache_dirty(self):
+        """记录缓存改动；最多每CACHE_FLUSH_SECONDS写入一次，其余由flush_cache写入"""
+        with self.cache_lock:
+            self.cache_dirty = True
+            if time.monotonic() - self.cache_flushed_at >= CACHE_FLUSH_SECONDS:
+                self.save_cache()
+    
+    def flush_cache(self):
+        """缓存有未保存的改动时写入"""
+        with self.cache_lock:
+            if self.cache_dirty:
+                self.save_cache()
     
     def get_cached_page_id(self, parent_id, title):
         """从缓存中获取页面ID"""
@@ -69,99 +92,119 @@ class NotionMarkdownUploader:
     
     def cache_page_info(self, parent_id, title, page_id):
         """缓存页面信息"""
-        if parent_id not in self.cache['pages']:
-            self.cache['pages'][parent_id] = {}
-        self.cache['pages'][parent_id][title] = page_id
-        self.save_cache()
+        with self.cache_lock:
+            if parent_id not in self.cache['pages']:
+                self.cache['pages'][parent_id] = {}
+            self.cache['pages'][parent_id][title] = page_id
+            if parent_id in self.child_index:
+                self.child_index[parent_id][title] = page_id
+            self.mark_cache_dirty()
     
-    def get_existing_pages(self, parent_id):
-        """获取父页面下的所有子页面"""
-        response = requests.get(
-            f'{self.base_url}/blocks/{parent_id}/children',
-            headers=self.headers
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            existing_titles = []
-            # 同时更新缓存
-            parent_cache = {}
+    def forget_page_info(self, parent_id, title):
+        """从缓存中移除页面（例如页面已归档）"""
+        with self.cache_lock:
+            self.cache['pages'].get(parent_id, {}).pop(title, None)
+            self.child_index.get(parent_id, {}).pop(title, None)
+            self.mark_cache_dirty()
+    
+    def get_child_index(self, parent_id):
+        """
+        父页面下子页面的 标题 -> 页面ID 映射，沿next_cursor读取所有分页结果；
+        每次运行每个父页面只请求一次并缓存在内存中。
+        中途请求失败时返回 None：不完整的列表不会被当作全部子页面
+        """
+        with self.cache_lock:
+            index = self.child_index.get(parent_id)
+        if index is not None:
+            return index
+        
+        index = {}
+        params = {'page_size': 100}
+        while True:
+            try:
+                response = self.client.get(
+                    f'/blocks/{parent_id}/children',
+                    params=params
+                )
+            except requests.RequestException:
+                return None
+            if response.status_code != 200:
+                # 列表不完整：不缓存，也不覆盖磁盘缓存
+                return None
+            try:
+                data = response.json()
+            except ValueError:
+                return None
             for block in data.get('results', []):
                 if block.get('type') == 'child_page':
                     title = block.get('child_page', {}).get('title', '')
                     page_id = block.get('id', '')
-                    existing_titles.append(title)
                     if title and page_id:
-                        parent_cache[title] = page_id
-            
-            # 更新缓存
-            if parent_cache:
-                self.cache['pages'][parent_id] = parent_cache
-                self.save_cache()
-            
-            return existing_titles
-        return []
+                        index[title] = page_id
+            if not data.get('has_more') or not data.get('next_cursor'):
+                break
+            params = {'page_size': 100, 'start_cursor': data['next_cursor']}
+        
+        # 同时更新缓存
+        with self.cache_lock:
+            self.child_index[parent_id] = index
+            if index:
+                self.cache['pages'][parent_id] = dict(index)
+                self.mark_cache_dirty()
+        return index
+    
+    def get_existing_pages(self, parent_id):
+        """获取父页面下的所有子页面"""
+        return list(self.get_child_index(parent_id) or {})
         
     def page_exists(self, parent_id, title):
         """检查页面是否已存在 - 使用缓存优化"""
-        # 先检查缓存
-        cached_page_id = self.get_cached_page_id(parent_id, title)
-        if cached_page_id:
-            return True
-        
-        # 缓存中没有，调用API并更新缓存
-        existing_pages = self.get_existing_pages(parent_id)
-        return title in existing_pages
+        return self.get_page_id_by_title(parent_id, title) is not None
     
     def get_page_id_by_title(self, parent_id, title):
-        """根据标题获取页面ID - 使用缓存优化"""
+        """
+        根据标题获取页面ID - 使用缓存优化
+        无法完整列出父页面的子页面时抛出 ListingIncomplete
+        """
         # 先检查缓存
         cached_page_id = self.get_cached_page_id(parent_id, title)
         if cached_page_id:
             return cached_page_id
         
-        # 缓存中没有，调用API
-        response = requests.get(
-            f'{self.base_url}/blocks/{parent_id}/children',
-            headers=self.headers
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            for block in data.get('results', []):
-                if block.get('type') == 'child_page':
-                    page_title = block.get('child_page', {}).get('title', '')
-                    page_id = block.get('id', '')
-                    if page_title == title:
-                        # 更新缓存
-                        self.cache_page_info(parent_id, page_title, page_id)
-                        return page_id
-        return None
+        # 缓存中没有，从父页面的子页面索引中查找（每次运行每个父页面只列举一次）
+        index = self.get_child_index(parent_id)
+        if index is None:
+            raise ListingIncomplete(parent_id)
+        return index.get(title)
     
     def count_summary_files(self, folder_path):
         """计算所有summary文件的数量"""
-        total_files = 0
-        folder_path = Path(folder_path)
-        
-        if not folder_path.exists():
-            return 0
-            
-        # 遍历三层结构：来源/日期/内容文件夹
-        for source_folder in folder_path.iterdir():
-            if not source_folder.is_dir():
+        return sum(
+            len(summary_files)
+            for date_folders in self.summary_tree(folder_path).values()
+            for content_folders in date_folders.values()
+            for summary_files in content_folders.values()
+        )
+    
+    def summary_tree(self, folder_path):
+        """
+        folder_path/<来源>/<日期>/<内容>/ 下的summary文件，从输出目录索引中查找而不遍历目录：
+        {来源文件夹: {日期文件夹: {内容文件夹: [summary文件]}}}
+        """
+        folder_path = Path(folder_path).resolve()
+        catalog = get_catalog()
+        catalog.backfill(folder_path)
+        tree = {}
+        for entry in catalog.query(kind=KIND_SUMMARY, under=folder_path):
+            summary_file = entry['path']
+            content_folder = summary_file.parent
+            date_folder = content_folder.parent
+            source_folder = date_folder.parent
+            if summary_file.suffix != '.md' or source_folder.parent != folder_path or not summary_file.exists():
                 continue
-            for date_folder in source_folder.iterdir():
-                if not date_folder.is_dir():
-                    continue
-                for content_folder in date_folder.iterdir():
-                    if not content_folder.is_dir():
-                        continue
-                    # 统计summary文件
-                    summary_files = [f for f in content_folder.glob("*.md") if f.name.lower().startswith("summary")]
-                    total_files += len(summary_files)
-        
-        return total_files
-        
+            tree.setdefault(source_folder, {}).setdefault(date_folder, {}).setdefault(content_folder, []).append(summary_file)
+        return tree
+    
     def markdown_to_blocks(self, markdown_content):
         """将markdown内容转换为Notion blocks"""
         blocks = []
@@ -426,9 +469,8 @@ class NotionMarkdownUploader:
             "children": content_blocks[:100]  # Notion API限制每次最多100个blocks
         }
         
-        response = requests.post(
-            f'{self.base_url}/pages',
-            headers=self.headers,
+        response = self.client.post(
+            '/pages',
             json=data
         )
         
@@ -442,7 +484,13 @@ class NotionMarkdownUploader:
             # 如果有超过100个blocks，需要分批添加
             if len(content_blocks) > 100:
                 remaining_blocks = content_blocks[100:]
-                self.add_blocks_to_page(page_id, remaining_blocks)
+                if not self.add_blocks_to_page(page_id, remaining_blocks):
+                    # 其余内容未能添加：归档该页面，下次运行时重新创建
+                    response = self.client.delete(f'/blocks/{page_id}')
+                    if response.status_code != 200:
+                        print(f"归档不完整页面失败: {response.status_code}, {response.text}")
+                    self.forget_page_info(parent_id, title)
+                    return None
             
             return page_id
         else:
@@ -450,7 +498,7 @@ class NotionMarkdownUploader:
             return None
     
     def add_blocks_to_page(self, page_id, blocks):
-        """向页面添加更多blocks"""
+        """向页面添加更多blocks；返回是否所有批次都已添加"""
         batch_size = 100
         for i in range(0, len(blocks), batch_size):
             batch = blocks[i:i + batch_size]
@@ -458,16 +506,15 @@ class NotionMarkdownUploader:
                 "children": batch
             }
             
-            response = requests.patch(
-                f'{self.base_url}/blocks/{page_id}/children',
-                headers=self.headers,
+            response = self.client.patch(
+                f'/blocks/{page_id}/children',
                 json=data
             )
             
             if response.status_code != 200:
                 print(f"添加blocks失败: {response.status_code}, {response.text}")
-            
-            time.sleep(0.3)  # 避免API限制
+                return False
+        return True
     
     def upload_folder(self, folder_path, parent_page_id=None):
         """递归上传文件夹，针对您的三层结构优化"""
@@ -475,44 +522,51 @@ class NotionMarkdownUploader:
             parent_page_id = self.root_page_id
             
         folder_path = Path(folder_path)
+        self.sync_root = folder_path.resolve()
         
         if not folder_path.exists():
             if self.progress_bar:
                 self.progress_bar.write(f"❌ 文件夹不存在: {folder_path}")
             return
         
-        # 处理您的三层结构：来源/日期/内容文件夹
-        for source_folder in folder_path.iterdir():
-            if not source_folder.is_dir():
-                continue
-            
-            # 检查来源页面是否已存在
-            if self.page_exists(parent_page_id, source_folder.name):
-                # 获取已存在页面的ID
-                source_page_id = self.get_page_id_by_title(parent_page_id, source_folder.name)
-            else:
-                # 为来源创建页面（如 AI_Engineer, Bloomberg_Live等）
-                paragraph_blocks = self.create_paragraph_block(f"来源分类: {source_folder.name}")
-                source_page_id = self.create_page(
-                    source_folder.name, 
-                    parent_page_id, 
-                    paragraph_blocks
-                )
-            
-            if not source_page_id:
-                continue
-                
-            time.sleep(0.3)
+        # 处理您的三层结构：来源/日期/内容文件夹，取自输出目录索引
+        date_tasks = []
+        for source_folder, date_folders in self.summary_tree(folder_path).items():
+            source_page_id = None
             
             # 处理日期文件夹
-            for date_folder in source_folder.iterdir():
-                if not date_folder.is_dir():
+            for date_folder, content_summaries in date_folders.items():
+                # 只有自上次同步以来新增或修改的内容文件夹才需要调用Notion
+                content_folders = [(folder, sorted(summary_files)) for folder, summary_files in content_summaries.items() if self.needs_sync(folder, summary_files)]
+                if not content_folders:
                     continue
                 
-                # 检查日期页面是否已存在
-                if self.page_exists(source_page_id, date_folder.name):
+                if source_page_id is None:
+                    try:
+                        # 检查来源页面是否已存在
+                        source_page_id = self.get_page_id_by_title(parent_page_id, source_folder.name)
+                    except ListingIncomplete:
+                        # 根页面的子页面未能完整列出：跳过，避免创建重复页面
+                        break
+                    if not source_page_id:
+                        # 为来源创建页面（如 AI_Engineer, Bloomberg_Live等）
+                        paragraph_blocks = self.create_paragraph_block(f"来源分类: {source_folder.name}")
+                        source_page_id = self.create_page(
+                            source_folder.name, 
+                            parent_page_id, 
+                            paragraph_blocks
+                        )
+                    
+                    if not source_page_id:
+                        break
+                
+                try:
+                    # 检查日期页面是否已存在
                     date_page_id = self.get_page_id_by_title(source_page_id, date_folder.name)
-                else:
+                except ListingIncomplete:
+                    # 来源页面的子页面未能完整列出：跳过，避免创建重复页面
+                    continue
+                if not date_page_id:
                     # 为日期创建页面
                     date_paragraph_blocks = self.create_paragraph_block(f"日期: {date_folder.name}")
                     date_page_id = self.create_page(
@@ -523,16 +577,89 @@ class NotionMarkdownUploader:
                 
                 if not date_page_id:
                     continue
-                    
-                time.sleep(0.3)
                 
-                # 处理内容文件夹
-                for content_folder in date_folder.iterdir():
-                    if not content_folder.is_dir():
-                        continue
-                    
-                    # 直接处理该文件夹中的markdown文件，用文件夹名作为页面标题
-                    self.process_markdown_files_simplified(content_folder, date_page_id)
+                # 内容页面按日期页面排队，遍历完成后再上传
+                date_tasks.append((date_page_id, content_folders))
+        
+        # 不同日期页面下的页面并发上传；同一日期页面内保持原有顺序
+        def upload_date(task):
+            date_page_id, content_folders = task
+            for content_folder, summary_files in content_folders:
+                if self.stopping.is_set():
+                    return
+                # 直接处理该文件夹中的markdown文件，用文件夹名作为页面标题
+                self.process_markdown_files_simplified(content_folder, date_page_id, summary_files)
+        
+        with ThreadPoolExecutor(max_workers=NOTION_WORKERS) as pool:
+            try:
+                list(pool.map(upload_date, date_tasks))
+            except BaseException:
+                # 中断时跳过排队中的日期页面，以便尽快写入缓存
+                self.stopping.set()
+                raise
+    
+    def summary_files(self, folder_path):
+        """内容文件夹中的summary markdown文件"""
+        return sorted(f for f in folder_path.glob("*.md") if f.name.lower().startswith("summary"))
+    
+    def manifest_key(self, folder_path):
+        """内容文件夹的清单键：相对于同步的outputs文件夹的路径"""
+        return folder_path.relative_to(self.sync_root).as_posix()
+    
+    def needs_sync(self, folder_path, summary_files):
+        """内容文件夹自上次上传以来是否新增或修改（跳过的文件夹计为已完成）"""
+        if self.manifest.is_unchanged(self.manifest_key(folder_path), self.root_page_id, files_mtime(summary_files)):
+            if self.progress_bar:
+                self.progress_bar.update(len(summary_files))
+            return False
+        return True
+    
+    def list_block_ids(self, page_id):
+        """页面所有顶层block的ID，读取失败时返回None"""
+        block_ids = []
+        params = {'page_size': 100}
+        while True:
+            response = self.client.get(
+                f'/blocks/{page_id}/children',
+                params=params
+            )
+            if response.status_code != 200:
+                print(f"读取页面内容失败: {response.status_code}, {response.text}")
+                return None
+            data = response.json()
+            block_ids.extend(block['id'] for block in data.get('results', []))
+            if not data.get('has_more') or not data.get('next_cursor'):
+                return block_ids
+            params = {'page_size': 100, 'start_cursor': data['next_cursor']}
+    
+    def delete_blocks(self, block_ids):
+        """删除blocks；返回是否全部删除"""
+        for block_id in block_ids:
+            response = self.client.delete(f'/blocks/{block_id}')
+            if response.status_code != 200:
+                print(f"删除block失败: {response.status_code}, {response.text}")
+                return False
+        return True
+    
+    def replace_page_content(self, page_id, content_blocks):
+        """
+        替换已有页面的blocks：先追加新的，再删除旧的。
+        只有新内容全部写入且旧blocks全部删除时才返回True；
+        返回False时下次运行会重新读取页面并从当前状态重试
+        """
+        old_block_ids = self.list_block_ids(page_id)
+        if old_block_ids is None:
+            return False
+        
+        if not self.add_blocks_to_page(page_id, content_blocks):
+            # 回滚已部分追加的内容，旧内容保持不变
+            current_ids = self.list_block_ids(page_id)
+            if current_ids is not None:
+                old_ids = set(old_block_ids)
+                self.delete_blocks([block_id for block_id in current_ids if block_id not in old_ids])
+            return False
+        
+        return self.delete_blocks(old_block_ids)
     
     def process_markdown_files(self, folder_path, parent_page_id):
         """处理文件夹中的markdown文件（只处理summary开头的文件）"""
@@ -572,32 +699,25 @@ class NotionMarkdownUploader:
                         self.progress_bar.set_description(f"❌ {title[:30]}...")
                     self.progress_bar.update(1)
                 
-                time.sleep(0.3)  # 避免API限制
-                
             except Exception as e:
                 # 更新进度条（错误的文件）
                 if self.progress_bar:
                     self.progress_bar.set_description(f"❌ 错误: {file_path.name[:25]}...")
                     self.progress_bar.update(1)
     
-    def process_markdown_files_simplified(self, folder_path, parent_page_id):
+    def process_markdown_files_simplified(self, folder_path, parent_page_id, summary_files=None):
         """简化版：直接用文件夹名作为页面标题，包含summary内容"""
-        # 只处理summary开头的markdown文件
-        summary_files = [f for f in folder_path.glob("*.md") if f.name.lower().startswith("summary")]
+        # 判断是否需要同步与写入清单使用同一份文件列表
+        if summary_files is None:
+            summary_files = self.summary_files(folder_path)
         
         if not summary_files:
             return
         
         # 用文件夹名作为页面标题
         page_title = folder_path.name
-        
-        # 检查页面是否已存在
-        if self.page_exists(parent_page_id, page_title):
-            # 更新进度条（跳过的文件）
-            if self.progress_bar:
-                self.progress_bar.set_description(f"跳过: {page_title[:30]}...")
-                self.progress_bar.update(len(summary_files))  # 跳过所有文件
-            return
+        manifest_key = self.manifest_key(folder_path)
+        mtime = files_mtime(summary_files)
         
         # 处理所有summary文件的内容（通常只有一个）
         all_content = []
@@ -620,21 +740,46 @@ class NotionMarkdownUploader:
                 self.progress_bar.update(len(summary_files))
             return
         
-        # 转换markdown为blocks
-        blocks = self.markdown_to_blocks(combined_content)
+        digest = content_hash(combined_content)
+        entry = self.manifest.get(manifest_key, self.root_page_id)
+        
+        if entry and entry.get('hash') == digest:
+            # 文件被修改但内容未变：只刷新清单中的修改时间
+            page_id = entry['page_id']
+            action = "跳过:"
+        elif entry and entry.get('page_id'):
+            # 自上次上传以来内容有变化：原地更新页面
+            blocks = self.markdown_to_blocks(combined_content)
+            page_id = entry['page_id'] if self.replace_page_content(entry['page_id'], blocks) else None
+            action = "已更新:"
+        else:
+            try:
+                # 在清单出现之前已上传：沿用已有页面
+                page_id = self.get_page_id_by_title(parent_page_id, page_title)
+                action = "跳过:"
+            except ListingIncomplete:
+                # 页面是否存在未知：不创建重复页面，下次运行再试
+                page_id = None
+                action = "❌"
+            else:
+                if not page_id:
+                    # 转换markdown为blocks
+                    blocks = self.markdown_to_blocks(combined_content)
+                    
+                    # 创建页面
+                    page_id = self.create_page(page_title, parent_page_id, blocks)
+                    action = "✅"
         
-        # 创建页面
-        page_id = self.create_page(page_title, parent_page_id, blocks)
+        if page_id:
+            self.manifest.record(manifest_key, self.root_page_id, mtime, digest, page_id)
         
         # 更新进度条
         if self.progress_bar:
             if page_id:
-                self.progress_bar.set_description(f"✅ {page_title[:30]}...")
+                self.progress_bar.set_description(f"{action} {page_title[:30]}...")
             else:
                 self.progress_bar.set_description(f"❌ {page_title[:30]}...")
             self.progress_bar.update(len(summary_files))
-        
-        time.sleep(0.3)  # 避免API限制
 
 def load_notion_settings():
     """从.podlens/setting读取Notion配置"""
@@ -695,6 +840,8 @@ def main():
     cached_pages = sum(len(pages) for pages in uploader.cache['pages'].values())
     if cached_pages > 0:
         print(f"💾 已缓存 {cached_pages} 个页面信息，将显著加速检查过程")
+    if len(uploader.manifest) > 0:
+        print(f"📋 同步清单中已有 {len(uploader.manifest)} 个文件夹，只上传新增或修改的摘要")
     
     # 计算总文件数
     total_files = uploader.count_summary_files(markdown_folder)
@@ -703,10 +850,22 @@ def main():
         print("❌ 未找到任何summary文件")
         return
     
+    # SIGTERM与Ctrl+C一样经由下面的finally退出，已缓存的页面ID不会丢失
+    handler_installed = threading.current_thread() is threading.main_thread()
+    if handler_installed:
+        previous_handler = signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+    
     # 第二行输出 - 创建进度条
-    with tqdm(total=total_files, desc="准备中...", unit="文件") as progress_bar:
-        uploader.progress_bar = progress_bar
-        uploader.upload_folder(markdown_folder)
+    try:
+        with tqdm(total=total_files, desc="准备中...", unit="文件") as progress_bar:
+            uploader.progress_bar = progress_bar
+            uploader.upload_folder(markdown_folder)
+    finally:
+        uploader.flush_cache()
+        uploader.manifest.save()
+        if handler_installed:
+            # 恢复调用方的处理函数：main() 也会在长期运行的自动化进程中调用
+            signal.signal(signal.SIGTERM, previous_handler if previous_handler is not None else signal.SIG_DFL)
     
     # 第三行输出
     print("✅ 导入成功!")
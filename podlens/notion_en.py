@@ -1,29 +1,45 @@
 import os
-import requests
+import sys
 import json
+import requests
 import time
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import re
 from tqdm import tqdm
 from datetime import datetime
 
+from .notion_api import NotionClient, ListingIncomplete, NOTION_WORKERS
+from .feed_cache import write_json_atomic
+from .notion_manifest import SyncManifest, content_hash, files_mtime
+from .catalog import get_catalog, KIND_SUMMARY
+
+# Unsaved cache changes are written at most this often (seconds), and always at the end of a run
+CACHE_FLUSH_SECONDS = 30
+
 class NotionMarkdownUploader:
     def __init__(self, token, root_page_id):
         self.token = token
         self.root_page_id = root_page_id
-        # Fix: version number must be provided
-        self.headers = {
-            'Authorization': f'Bearer {token}',
-            'Content-Type': 'application/json',
-            'Notion-Version': '2022-06-28',  # Required version number
-        }
-        self.base_url = 'https://api.notion.com/v1'
+        # Pooled session with a token-bucket limiter and Retry-After handling, shared by upload threads
+        self.client = NotionClient(token)
         self.uploaded_files = set()  # Record uploaded files
         self.progress_bar = None  # Progress bar reference
         
         # Add caching mechanism
         self.cache_file = Path('.podlens/notion_cache.json')
         self.cache = self.load_cache()
+        self.cache_lock = threading.RLock()
+        self.cache_dirty = False
+        self.cache_flushed_at = time.monotonic()
+        self.stopping = threading.Event()
+        self.child_index = {}  # Per-run memo: {parent_id: {title: page_id}}
+        
+        # Sync manifest: (relative path, mtime, content hash, page ID) of every uploaded content folder
+        self.manifest = SyncManifest()
+        self.sync_root = None
         
     def load_cache(self):
         """Load local cache"""
@@ -49,18 +65,25 @@ class NotionMarkdownUploader:
             }
     
     def save_cache(self):
-        """Save cache to file"""
-        try:
-            # Ensure directory exists
-            self.cache_file.parent.mkdir(exist_ok=True)
-            
-            # Update timestamp
+        """Write the cache to disk now (atomic replace, compact JSON)"""
+        with self.cache_lock:
             self.cache['last_updated'] = datetime.now().isoformat()
-            
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cache, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"⚠️  Failed to save cache: {e}")
+            write_json_atomic(self.cache_file, self.cache, indent=None)
+            self.cache_dirty = False
+            self.cache_flushed_at = time.monotonic()
+    
+    def mark_cache_dirty(self):
+        """Record a cache change; written every CACHE_FLUSH_SECONDS at most and by flush_cache"""
+        with self.cache_lock:
+            self.cache_dirty = True
+            if time.monotonic() - self.cache_flushed_at >= CACHE_FLUSH_SECONDS:
+                self.save_cache()
+    
+    def flush_cache(self):
+        """Write the cache if it has unsaved changes"""
+        with self.cache_lock:
+            if self.cache_dirty:
+                self.save_cache()
     
     def get_cached_page_id(self, parent_id, title):
         """Get page ID from cache"""
@@ -69,99 +92,119 @@ class NotionMarkdownUploader:
     
     def cache_page_info(self, parent_id, title, page_id):
         """Cache page information"""
-        if parent_id not in self.cache['pages']:
-            self.cache['pages'][parent_id] = {}
-        self.cache['pages'][parent_id][title] = page_id
-        self.save_cache()
+        with self.cache_lock:
+            if parent_id not in self.cache['pages']:
+                self.cache['pages'][parent_id] = {}
+            self.cache['pages'][parent_id][title] = page_id
+            if parent_id in self.child_index:
+                self.child_index[parent_id][title] = page_id
+            self.mark_cache_dirty()
     
-    def get_existing_pages(self, parent_id):
-        """Get all child pages under the parent page"""
-        response = requests.get(
-            f'{self.base_url}/blocks/{parent_id}/children',
-            headers=self.headers
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            existing_titles = []
-            # Update cache at the same time
-            parent_cache = {}
+    def forget_page_info(self, parent_id, title):
+        """Drop a page from the cache (e.g. after it was archived)"""
+        with self.cache_lock:
+            self.cache['pages'].get(parent_id, {}).pop(title, None)
+            self.child_index.get(parent_id, {}).pop(title, None)
+            self.mark_cache_dirty()
+    
+    def get_child_index(self, parent_id):
+        """
+        Map of child page title -> page ID under the parent page, following next_cursor
+        through every page of results; fetched once per parent per run and memoized.
+        Returns None when a request fails partway: a partial listing is never used as the full set
+        """
+        with self.cache_lock:
+            index = self.child_index.get(parent_id)
+        if index is not None:
+            return index
+        
+        index = {}
+        params = {'page_size': 100}
+        while True:
+            try:
+                response = self.client.get(
+                    f'/blocks/{parent_id}/children',
+                    params=params
+                )
+            except requests.RequestException:
+                return None
+            if response.status_code != 200:
+                # Incomplete listing: don't memoize it or overwrite the disk cache
+                return None
+            try:
+                data = response.json()
+            except ValueError:
+                return None
             for block in data.get('results', []):
                 if block.get('type') == 'child_page':
                     title = block.get('child_page', {}).get('title', '')
                     page_id = block.get('id', '')
-                    existing_titles.append(title)
                     if title and page_id:
-                        parent_cache[title] = page_id
-            
-            # Update cache
-            if parent_cache:
-                self.cache['pages'][parent_id] = parent_cache
-                self.save_cache()
-            
-            return existing_titles
-        return []
+                        index[title] = page_id
+            if not data.get('has_more') or not data.get('next_cursor'):
+                break
+            params = {'page_size': 100, 'start_cursor': data['next_cursor']}
+        
+        # Update cache at the same time
+        with self.cache_lock:
+            self.child_index[parent_id] = index
+            if index:
+                self.cache['pages'][parent_id] = dict(index)
+                self.mark_cache_dirty()
+        return index
+    
+    def get_existing_pages(self, parent_id):
+        """Get all child pages under the parent page"""
+        return list(self.get_child_index(parent_id) or {})
         
     def page_exists(self, parent_id, title):
         """Check if page already exists - optimized with cache"""
-        # Check cache first
-        cached_page_id = self.get_cached_page_id(parent_id, title)
-        if cached_page_id:
-            return True
-        
-        # Not in cache, call API and update cache
-        existing_pages = self.get_existing_pages(parent_id)
-        return title in existing_pages
+        return self.get_page_id_by_title(parent_id, title) is not None
     
     def get_page_id_by_title(self, parent_id, title):
-        """Get page ID by title - optimized with cache"""
+        """
+        Get page ID by title - optimized with cache
+        Raises ListingIncomplete when the parent's children could not all be listed
+        """
         # Check cache first
         cached_page_id = self.get_cached_page_id(parent_id, title)
         if cached_page_id:
             return cached_page_id
         
-        # Not in cache, call API
-        response = requests.get(
-            f'{self.base_url}/blocks/{parent_id}/children',
-            headers=self.headers
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            for block in data.get('results', []):
-                if block.get('type') == 'child_page':
-                    page_title = block.get('child_page', {}).get('title', '')
-                    page_id = block.get('id', '')
-                    if page_title == title:
-                        # Update cache
-                        self.cache_page_info(parent_id, page_title, page_id)
-                        return page_id
-        return None
+        # Not in cache, look it up in the parent's child index (one listing per parent per run)
+        index = self.get_child_index(parent_id)
+        if index is None:
+            raise ListingIncomplete(parent_id)
+        return index.get(title)
     
     def count_summary_files(self, folder_path):
         """Count the number of all summary files"""
-        total_files = 0
-        folder_path = Path(folder_path)
-        
-        if not folder_path.exists():
-            return 0
-            
-        # Traverse three-layer structure: source/date/content folder
-        for source_folder in folder_path.iterdir():
-            if not source_folder.is_dir():
+        return sum(
+            len(summary_files)
+            for date_folders in self.summary_tree(folder_path).values()
+            for content_folders in date_folders.values()
+            for summary_files in content_folders.values()
+        )
+    
+    def summary_tree(self, folder_path):
+        """
+        Summary files under folder_path/<source>/<date>/<content>/, looked up in the outputs catalog
+        instead of walking the tree: {source_folder: {date_folder: {content_folder: [summary files]}}}
+        """
+        folder_path = Path(folder_path).resolve()
+        catalog = get_catalog()
+        catalog.backfill(folder_path)
+        tree = {}
+        for entry in catalog.query(kind=KIND_SUMMARY, under=folder_path):
+            summary_file = entry['path']
+            content_folder = summary_file.parent
+            date_folder = content_folder.parent
+            source_folder = date_folder.parent
+            if summary_file.suffix != '.md' or source_folder.parent != folder_path or not summary_file.exists():
                 continue
-            for date_folder in source_folder.iterdir():
-                if not date_folder.is_dir():
-                    continue
-                for content_folder in date_folder.iterdir():
-                    if not content_folder.is_dir():
-                        continue
-                    # Count summary files
-                    summary_files = [f for f in content_folder.glob("*.md") if f.name.lower().startswith("summary")]
-                    total_files += len(summary_files)
-        
-        return total_files
-        
+            tree.setdefault(source_folder, {}).setdefault(date_folder, {}).setdefault(content_folder, []).append(summary_file)
+        return tree
+    
     def markdown_to_blocks(self, markdown_content):
         """Convert markdown content to Notion blocks"""
         blocks = []
@@ -426,9 +469,8 @@ class NotionMarkdownUploader:
             "children": content_blocks[:100]  # Notion API limits to 100 blocks per request
         }
         
-        response = requests.post(
-            f'{self.base_url}/pages',
-            headers=self.headers,
+        response = self.client.post(
+            '/pages',
             json=data
         )
         
@@ -442,7 +484,13 @@ class NotionMarkdownUploader:
             # If there are more than 100 blocks, need to add them in batches
             if len(content_blocks) > 100:
                 remaining_blocks = content_blocks[100:]
-                self.add_blocks_to_page(page_id, remaining_blocks)
+                if not self.add_blocks_to_page(page_id, remaining_blocks):
+                    # The rest of the content never arrived: archive the page so the next run creates it again
+                    response = self.client.delete(f'/blocks/{page_id}')
+                    if response.status_code != 200:
+                        print(f"Failed to archive incomplete page: {response.status_code}, {response.text}")
+                    self.forget_page_info(parent_id, title)
+                    return None
             
             return page_id
         else:
@@ -450,7 +498,7 @@ class NotionMarkdownUploader:
             return None
     
     def add_blocks_to_page(self, page_id, blocks):
-        """Add more blocks to page"""
+        """Add more blocks to page; returns whether every batch was added"""
         batch_size = 100
         for i in range(0, len(blocks), batch_size):
             batch = blocks[i:i + batch_size]
@@ -458,16 +506,15 @@ class NotionMarkdownUploader:
                 "children": batch
             }
             
-            response = requests.patch(
-                f'{self.base_url}/blocks/{page_id}/children',
-                headers=self.headers,
+            response = self.client.patch(
+                f'/blocks/{page_id}/children',
                 json=data
             )
             
             if response.status_code != 200:
                 print(f"Failed to add blocks: {response.status_code}, {response.text}")
-            
-            time.sleep(0.3)  # Avoid API rate limiting
+                return False
+        return True
     
     def upload_folder(self, folder_path, parent_page_id=None):
         """Recursively upload folder, optimized for your three-layer structure"""
@@ -475,44 +522,51 @@ class NotionMarkdownUploader:
             parent_page_id = self.root_page_id
             
         folder_path = Path(folder_path)
+        self.sync_root = folder_path.resolve()
         
         if not folder_path.exists():
             if self.progress_bar:
                 self.progress_bar.write(f"❌ Folder does not exist: {folder_path}")
             return
         
-        # Handle your three-layer structure: source/date/content folder
-        for source_folder in folder_path.iterdir():
-            if not source_folder.is_dir():
-                continue
-            
-            # Check if source page already exists
-            if self.page_exists(parent_page_id, source_folder.name):
-                # Get existing page ID
-                source_page_id = self.get_page_id_by_title(parent_page_id, source_folder.name)
-            else:
-                # Create page for source (e.g., AI_Engineer, Bloomberg_Live, etc.)
-                paragraph_blocks = self.create_paragraph_block(f"Source category: {source_folder.name}")
-                source_page_id = self.create_page(
-                    source_folder.name, 
-                    parent_page_id, 
-                    paragraph_blocks
-                )
-            
-            if not source_page_id:
-                continue
-                
-            time.sleep(0.3)
+        # Handle your three-layer structure: source/date/content folder, as indexed by the outputs catalog
+        date_tasks = []
+        for source_folder, date_folders in self.summary_tree(folder_path).items():
+            source_page_id = None
             
             # Handle date folders
-            for date_folder in source_folder.iterdir():
-                if not date_folder.is_dir():
+            for date_folder, content_summaries in date_folders.items():
+                # Only content folders that are new or changed since the last sync need Notion calls
+                content_folders = [(folder, sorted(summary_files)) for folder, summary_files in content_summaries.items() if self.needs_sync(folder, summary_files)]
+                if not content_folders:
                     continue
                 
-                # Check if date page already exists
-                if self.page_exists(source_page_id, date_folder.name):
+                if source_page_id is None:
+                    try:
+                        # Check if source page already exists
+                        source_page_id = self.get_page_id_by_title(parent_page_id, source_folder.name)
+                    except ListingIncomplete:
+                        # Children of the root page could not all be listed: skip rather than create a duplicate
+                        break
+                    if not source_page_id:
+                        # Create page for source (e.g., AI_Engineer, Bloomberg_Live, etc.)
+                        paragraph_blocks = self.create_paragraph_block(f"Source category: {source_folder.name}")
+                        source_page_id = self.create_page(
+                            source_folder.name, 
+                            parent_page_id, 
+                            paragraph_blocks
+                        )
+                    
+                    if not source_page_id:
+                        break
+                
+                try:
+                    # Check if date page already exists
                     date_page_id = self.get_page_id_by_title(source_page_id, date_folder.name)
-                else:
+                except ListingIncomplete:
+                    # Children of the source page could not all be listed: skip rather than create a duplicate
+                    continue
+                if not date_page_id:
                     # Create page for date
                     date_paragraph_blocks = self.create_paragraph_block(f"Date: {date_folder.name}")
                     date_page_id = self.create_page(
@@ -523,16 +577,89 @@ class NotionMarkdownUploader:
                 
                 if not date_page_id:
                     continue
-                    
-                time.sleep(0.3)
                 
-                # Handle content folders
-                for content_folder in date_folder.iterdir():
-                    if not content_folder.is_dir():
-                        continue
-                    
-                    # Directly process markdown files in this folder, using folder name as page title
-                    self.process_markdown_files_simplified(content_folder, date_page_id)
+                # Content pages are queued per date page and uploaded after the walk
+                date_tasks.append((date_page_id, content_folders))
+        
+        # Pages under different date pages upload concurrently; within one date page they keep their order
+        def upload_date(task):
+            date_page_id, content_folders = task
+            for content_folder, summary_files in content_folders:
+                if self.stopping.is_set():
+                    return
+                # Directly process markdown files in this folder, using folder name as page title
+                self.process_markdown_files_simplified(content_folder, date_page_id, summary_files)
+        
+        with ThreadPoolExecutor(max_workers=NOTION_WORKERS) as pool:
+            try:
+                list(pool.map(upload_date, date_tasks))
+            except BaseException:
+                # On interruption queued date pages are skipped, so the cache can be flushed promptly
+                self.stopping.set()
+                raise
+    
+    def summary_files(self, folder_path):
+        """Summary markdown files in a content folder"""
+        return sorted(f for f in folder_path.glob("*.md") if f.name.lower().startswith("summary"))
+    
+    def manifest_key(self, folder_path):
+        """Manifest key of a content folder: its path relative to the synced outputs folder"""
+        return folder_path.relative_to(self.sync_root).as_posix()
+    
+    def needs_sync(self, folder_path, summary_files):
+        """Whether a content folder is new or modified since its last upload (skipped folders are counted as done)"""
+        if self.manifest.is_unchanged(self.manifest_key(folder_path), self.root_page_id, files_mtime(summary_files)):
+            if self.progress_bar:
+                self.progress_bar.update(len(summary_files))
+            return False
+        return True
+    
+    def list_block_ids(self, page_id):
+        """IDs of all top-level blocks of a page, or None when the listing failed"""
+        block_ids = []
+        params = {'page_size': 100}
+        while True:
+            response = self.client.get(
+                f'/blocks/{page_id}/children',
+                params=params
+            )
+            if response.status_code != 200:
+                print(f"Failed to read page content: {response.status_code}, {response.text}")
+                return None
+            data = response.json()
+            block_ids.extend(block['id'] for block in data.get('results', []))
+            if not data.get('has_more') or not data.get('next_cursor'):
+                return block_ids
+            params = {'page_size': 100, 'start_cursor': data['next_cursor']}
+    
+    def delete_blocks(self, block_ids):
+        """Delete blocks; returns whether every one was deleted"""
+        for block_id in block_ids:
+            response = self.client.delete(f'/blocks/{block_id}')
+            if response.status_code != 200:
+                print(f"Failed to delete block: {response.status_code}, {response.text}")
+                return False
+        return True
+    
+    def replace_page_content(self, page_id, content_blocks):
+        """
+        Replace the blocks of an existing page: append the new ones first, then delete the old ones.
+        Returns True only when the whole new content arrived and every old block is gone;
+        on False the next run lists the page again and retries from whatever state it is in
+        """
+        old_block_ids = self.list_block_ids(page_id)
+        if old_block_ids is None:
+            return False
+        
+        if not self.add_blocks_to_page(page_id, content_blocks):
+            # Roll back the partly appended content; the old content is still intact
+            current_ids = self.list_block_ids(page_id)
+            if current_ids is not None:
+                old_ids = set(old_block_ids)
+                self.delete_blocks([block_id for block_id in current_ids if block_id not in old_ids])
+            return False
+        
+        return self.delete_blocks(old_block_ids)
     
     def process_markdown_files(self, folder_path, parent_page_id):
         """Process markdown files in folder (only files starting with summary)"""
@@ -572,32 +699,25 @@ class NotionMarkdownUploader:
                         self.progress_bar.set_description(f"❌ {title[:30]}...")
                     self.progress_bar.update(1)
                 
-                time.sleep(0.3)  # Avoid API rate limiting
-                
             except Exception as e:
                 # Update progress bar (error files)
                 if self.progress_bar:
                     self.progress_bar.set_description(f"❌ Error: {file_path.name[:25]}...")
                     self.progress_bar.update(1)
     
-    def process_markdown_files_simplified(self, folder_path, parent_page_id):
+    def process_markdown_files_simplified(self, folder_path, parent_page_id, summary_files=None):
         """Simplified version: use folder name as page title, include summary content"""
-        # Only process markdown files starting with summary
-        summary_files = [f for f in folder_path.glob("*.md") if f.name.lower().startswith("summary")]
+        # The same file list decides whether to sync and is recorded in the manifest
+        if summary_files is None:
+            summary_files = self.summary_files(folder_path)
         
         if not summary_files:
             return
         
         # Use folder name as page title
         page_title = folder_path.name
-        
-        # Check if page already exists
-        if self.page_exists(parent_page_id, page_title):
-            # Update progress bar (skipped files)
-            if self.progress_bar:
-                self.progress_bar.set_description(f"Skip: {page_title[:30]}...")
-                self.progress_bar.update(len(summary_files))  # Skip all files
-            return
+        manifest_key = self.manifest_key(folder_path)
+        mtime = files_mtime(summary_files)
         
         # Process all summary file content (usually only one)
         all_content = []
@@ -620,21 +740,46 @@ class NotionMarkdownUploader:
                 self.progress_bar.update(len(summary_files))
             return
         
-        # Convert markdown to blocks
-        blocks = self.markdown_to_blocks(combined_content)
+        digest = content_hash(combined_content)
+        entry = self.manifest.get(manifest_key, self.root_page_id)
+        
+        if entry and entry.get('hash') == digest:
+            # Touched but unchanged: only the manifest mtime is refreshed
+            page_id = entry['page_id']
+            action = "Skip:"
+        elif entry and entry.get('page_id'):
+            # Changed since the last upload: update the page in place
+            blocks = self.markdown_to_blocks(combined_content)
+            page_id = entry['page_id'] if self.replace_page_content(entry['page_id'], blocks) else None
+            action = "Updated:"
+        else:
+            try:
+                # Uploaded before the manifest existed: adopt the existing page
+                page_id = self.get_page_id_by_title(parent_page_id, page_title)
+                action = "Skip:"
+            except ListingIncomplete:
+                # Whether the page exists is unknown: don't create a duplicate, retry next run
+                page_id = None
+                action = "❌"
+            else:
+                if not page_id:
+                    # Convert markdown to blocks
+                    blocks = self.markdown_to_blocks(combined_content)
+                    
+                    # Create page
+                    page_id = self.create_page(page_title, parent_page_id, blocks)
+                    action = "✅"
         
-        # Create page
-        page_id = self.create_page(page_title, parent_page_id, blocks)
+        if page_id:
+            self.manifest.record(manifest_key, self.root_page_id, mtime, digest, page_id)
         
         # Update progress bar
         if self.progress_bar:
             if page_id:
-                self.progress_bar.set_description(f"✅ {page_title[:30]}...")
+                self.progress_bar.set_description(f"{action} {page_title[:30]}...")
             else:
                 self.progress_bar.set_description(f"❌ {page_title[:30]}...")
             self.progress_bar.update(len(summary_files))
-        
-        time.sleep(0.3)  # Avoid API rate limiting
 
 def load_notion_settings():
     """Load Notion configuration from .podlens/setting"""
@@ -695,6 +840,8 @@ def main():
     cached_pages = sum(len(pages) for pages in uploader.cache['pages'].values())
     if cached_pages > 0:
         print(f"💾 Cached {cached_pages} page information, will significantly speed up the checking process")
+    if len(uploader.manifest) > 0:
+        print(f"📋 {len(uploader.manifest)} folders in the sync manifest, only new or changed summaries will be uploaded")
     
     # Calculate total files
     total_files = uploader.count_summary_files(markdown_folder)
@@ -703,10 +850,22 @@ def main():
         print("❌ No summary files found")
         return
     
+    # SIGTERM exits through the finally block below, like Ctrl+C, so cached page IDs are not lost
+    handler_installed = threading.current_thread() is threading.main_thread()
+    if handler_installed:
+        previous_handler = signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+    
     # Second line output - create progress bar
-    with tqdm(total=total_files, desc="Preparing...", unit="files") as progress_bar:
-        uploader.progress_bar = progress_bar
-        uploader.upload_folder(markdown_folder)
+    try:
+        with tqdm(total=total_files, desc="Preparing...", unit="files") as progress_bar:
+            uploader.progress_bar = progress_bar
+            uploader.upload_folder(markdown_folder)
+    finally:
+        uploader.flush_cache()
+        uploader.manifest.save()
+        if handler_installed:
+            # Restore the caller's handler: main() also runs inside the long-lived automation process
+            signal.signal(signal.SIGTERM, previous_handler if previous_handler is not None else signal.SIG_DFL)
     
     # Third line output
     print("✅ Import successful!")
@@ -0,0 +1,98 @@
+"""
+Notion 同步清单 / Notion sync manifest
+
+upload_folder 原先每次运行都遍历整个 outputs/ 目录，并为每个来源、日期和内容文件夹
+调用 page_exists。清单为每个已上传的内容文件夹记录 (相对路径, 修改时间, 内容哈希,
+Notion 页面 ID)：修改时间未变的文件夹不读取、不请求 API；内容变化的文件夹原地更新
+对应页面，而不是像以前那样跳过。同步开销随新内容增长，而不是随全部历史增长。
+upload_folder used to walk the whole outputs/ tree on every run and call
+page_exists for every source, date and content folder. The manifest records
+(relative path, mtime, content hash, Notion page ID) for every uploaded content
+folder: folders whose mtime is unchanged are neither read nor sent to the API,
+and folders whose content changed get their page updated in place instead of
+being skipped. Sync cost scales with new content, not with total history.
+"""
+
+import hashlib
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .feed_cache import write_json_atomic
+
+
+NOTION_MANIFEST_FILE = Path('.podlens/notion_manifest.json')
+
+
+def content_hash(text: str) -> str:
+    """内容的 SHA-256 / SHA-256 of the content"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def files_mtime(files: List[Path]) -> float:
+    """一组文件中最新的修改时间 / Latest modification time among the files"""
+    return max((f.stat().st_mtime for f in files), default=0.0)
+
+
+class SyncManifest:
+    """已上传内容文件夹的清单 / Manifest of uploaded content folders"""
+
+    def __init__(self, manifest_file: Path = NOTION_MANIFEST_FILE):
+        self.manifest_file = manifest_file
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.data = self._load()
+
+    def _load(self) -> Dict:
+        try:
+            if self.manifest_file.exists():
+                with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict) and isinstance(data.get('entries'), dict):
+                    return data
+        except Exception:
+            pass
+        return {
+            'entries': {},  # {相对路径 / relative path: {'mtime', 'hash', 'page_id', 'root_page_id'}}
+            'last_updated': datetime.now().isoformat(),
+            'version': '1.0',
+        }
+
+    def get(self, key: str, root_page_id: str) -> Optional[Dict]:
+        """
+        返回某文件夹上传到该根页面时的记录 / Return a folder's entry for uploads under this root page
+        """
+        entry = self.data['entries'].get(key)
+        if entry and entry.get('root_page_id') == root_page_id:
+            return entry
+        return None
+
+    def is_unchanged(self, key: str, root_page_id: str, mtime: float) -> bool:
+        """修改时间与上次上传时相同 / The mtime matches the last upload"""
+        entry = self.get(key, root_page_id)
+        return bool(entry) and entry.get('mtime') == mtime
+
+    def record(self, key: str, root_page_id: str, mtime: float, digest: str, page_id: str):
+        """记录一次上传（或确认内容未变）/ Record an upload (or that the content is unchanged)"""
+        with self.lock:
+            self.data['entries'][key] = {
+                'mtime': mtime,
+                'hash': digest,
+                'page_id': page_id,
+                'root_page_id': root_page_id,
+            }
+            self.dirty = True
+
+    def save(self):
+        """有改动时原子写入清单 / Atomically write the manifest if it changed"""
+        with self.lock:
+            if not self.dirty:
+                return
+            self.data['last_updated'] = datetime.now().isoformat()
+            write_json_atomic(self.manifest_file, self.data, indent=None)
+            self.dirty = False
+
+    def __len__(self) -> int:
+        return len(self.data['entries'])
@@ -0,0 +1,148 @@
+"""
+分阶段处理流水线 / Staged processing pipeline
+
+下载 → 压缩 → 转录 → 摘要，每个阶段有独立的工作线程，阶段之间用有界队列连接以提供背压。
+苹果播客与 YouTube 自动化路径共用同一个引擎：任务字典中的 ``processor`` 对象实现
+``pipeline_<stage>(job)`` 方法，返回任务本身表示进入下一阶段，返回 None 表示结束。
+
+Download → compress → transcribe → summarize. Every stage has its own worker
+threads and stages are connected by bounded queues, which provides backpressure.
+The Apple Podcast and YouTube automation paths share this engine: the
+``processor`` object in each job dict implements ``pipeline_<stage>(job)``,
+returning the job to pass it on, or None to stop processing it.
+"""
+
+import queue
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+STAGES = ('download', 'compress', 'transcribe', 'summarize')
+
+# 默认每阶段并发数 / Default workers per stage
+DEFAULT_STAGE_WORKERS = {
+    'download': 3,
+    'compress': 2,
+    'transcribe': 2,
+    'summarize': 2,
+}
+DEFAULT_QUEUE_SIZE = 2
+
+_STOP = object()
+
+
+def run_stage(stage: str, job: Dict) -> Optional[Dict]:
+    """调用任务处理器上的阶段方法 / Call the stage method on the job's processor"""
+    return getattr(job['processor'], f'pipeline_{stage}')(job)
+
+
+def run_inline(job: Dict) -> bool:
+    """
+    在当前线程中顺序执行所有阶段（无流水线时的回退）
+    Run every stage sequentially in the calling thread (fallback without a pipeline)
+    """
+    for stage in STAGES:
+        try:
+            job = run_stage(stage, job)
+        except Exception as e:
+            job['error'] = f"{stage}: {e}"
+            return False
+        if not job:
+            return False
+    return True
+
+
+class Pipeline:
+    """
+    基于队列的分阶段流水线 / Queue-based staged pipeline
+
+    Args:
+        stages: [(阶段名 stage name, 处理函数 handler, 工作线程数 workers)]
+        queue_size: 每个阶段输入队列的容量，满时 submit() 与上游阶段阻塞
+                    Capacity of each stage's input queue; submit() and upstream stages block when full
+    """
+
+    def __init__(self, stages: List[Tuple[str, Callable[[Dict], Optional[Dict]], int]], queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.stages = stages
+        self.queues = [queue.Queue(maxsize=max(1, queue_size)) for _ in stages]
+        self.threads = []
+        self.completed = []
+        self.failed = []
+        self._lock = threading.Lock()
+        self._started = False
+
+    def start(self):
+        """启动所有阶段的工作线程 / Start worker threads for every stage"""
+        if self._started:
+            return
+        self._started = True
+        for index, (name, handler, workers) in enumerate(self.stages):
+            stage_threads = []
+            for n in range(max(1, workers)):
+                thread = threading.Thread(
+                    target=self._worker, args=(index,), name=f"pipeline-{name}-{n}", daemon=True
+                )
+                thread.start()
+                stage_threads.append(thread)
+            self.threads.append(stage_threads)
+
+    def _worker(self, index: int):
+        name, handler, _ = self.stages[index]
+        in_queue = self.queues[index]
+        is_last = index == len(self.stages) - 1
+        while True:
+            job = in_queue.get()
+            if job is _STOP:
+                break
+            try:
+                result = handler(job)
+            except Exception as e:
+                job['error'] = f"{name}: {e}"
+                result = None
+            if not result:
+                with self._lock:
+                    self.failed.append(job)
+            elif is_last:
+                with self._lock:
+                    self.completed.append(result)
+            else:
+                # 下游队列满时阻塞，形成背压 / Blocks when downstream is full (backpressure)
+                self.queues[index + 1].put(result)
+
+    def submit(self, job: Dict):
+        """提交任务；第一阶段队列已满时阻塞 / Submit a job; blocks while the first stage is full"""
+        self.start()
+        self.queues[0].put(job)
+
+    def close(self):
+        """
+        等待所有已提交任务流经全部阶段后停止工作线程
+        Wait for every submitted job to drain through all stages, then stop the workers
+        """
+        self.start()
+        for index, stage_threads in enumerate(self.threads):
+            for _ in stage_threads:
+                self.queues[index].put(_STOP)
+            for thread in stage_threads:
+                thread.join()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def build_media_pipeline(settings: Optional[Dict] = None) -> Pipeline:
+    """
+    按 .podlens/setting 中的每阶段并发设置构建下载→压缩→转录→摘要流水线
+    Build the download → compress → transcribe → summarize pipeline using the
+    per-stage concurrency from .podlens/setting
+    """
+    settings = settings or {}
+    stages = []
+    for stage in STAGES:
+        workers = settings.get(f'{stage}_workers', DEFAULT_STAGE_WORKERS[stage])
+        stages.append((stage, lambda job, stage=stage: run_stage(stage, job), workers))
+    return Pipeline(stages, queue_size=settings.get('pipeline_queue_size', DEFAULT_QUEUE_SIZE))
@@ -0,0 +1,131 @@
+"""
+已处理条目存储 / Processed-item store
+
+自动化进度原先以标题列表保存在 .podlens/status.json 中，每次标记都要重写整个文件，
+查询也是线性扫描。这里改用 SQLite：(类型, 来源, 条目键) 为主键，查询走索引，
+每次标记是一条独立提交的 INSERT，多线程与多进程下都是原子的。
+Automation progress used to be title lists inside .podlens/status.json, rewritten
+in full on every mark and scanned linearly on every check. This store uses SQLite
+instead: (kind, source, item key) is the primary key so lookups use the index,
+and every mark is a single committed INSERT, atomic across threads and processes.
+"""
+
+import json
+import shutil
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+
+PROCESSED_DB_FILE = Path('.podlens/processed.db')
+
+# 条目类型，对应 status.json 中的旧键 / Item kinds, matching the legacy status.json keys
+KIND_PODCAST = 'podcasts'
+KIND_YOUTUBE = 'youtube'
+
+
+def episode_key(episode: Dict) -> str:
+    """
+    剧集的稳定去重键：RSS guid，其次是音频地址，最后才是标题
+    Stable dedup key for an episode: RSS guid, then enclosure URL, then title
+    """
+    return episode.get('guid') or episode.get('audio_url') or episode['title']
+
+
+class ProcessedStore:
+    """SQLite 已处理条目存储 / SQLite-backed processed-item store"""
+
+    def __init__(self, db_file: Path = PROCESSED_DB_FILE):
+        self.db_file = db_file
+        self.db_file.parent.mkdir(exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_file), timeout=30, check_same_thread=False)
+        with self.lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS processed ("
+                " kind TEXT NOT NULL,"
+                " source TEXT NOT NULL,"
+                " item_key TEXT NOT NULL,"
+                " title TEXT,"
+                " processed_at TEXT NOT NULL,"
+                " PRIMARY KEY (kind, source, item_key))"
+            )
+            self.conn.commit()
+
+    def contains(self, kind: str, source: str, item_key: str, legacy_title: Optional[str] = None) -> bool:
+        """
+        条目是否已处理；legacy_title 还会匹配迁移自 status.json、以标题为键的旧记录
+        Whether the item has been processed; legacy_title also matches old
+        title-keyed records migrated from status.json
+        """
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT 1 FROM processed WHERE kind = ? AND source = ?"
+                " AND (item_key = ? OR (item_key = title AND title = ?))",
+                (kind, source, item_key, legacy_title),
+            ).fetchone()
+        return row is not None
+
+    def add(self, kind: str, source: str, item_key: str, title: Optional[str] = None):
+        """标记条目已处理（重复标记无副作用）/ Mark an item processed (idempotent)"""
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO processed (kind, source, item_key, title, processed_at) VALUES (?, ?, ?, ?, ?)",
+                (kind, source, item_key, title or item_key, datetime.now().isoformat()),
+            )
+            self.conn.commit()
+
+    def count(self, kind: str) -> int:
+        """某类已处理条目的数量 / Number of processed items of a kind"""
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM processed WHERE kind = ?", (kind,)).fetchone()[0]
+
+    def import_legacy_status(self, status: Dict) -> int:
+        """
+        导入旧 status.json 中的标题列表 / Import the title lists from a legacy status.json
+
+        Returns:
+            int: 导入的条目数 / Number of imported items
+        """
+        rows = []
+        now = datetime.now().isoformat()
+        for kind in (KIND_PODCAST, KIND_YOUTUBE):
+            for source, titles in (status.get(kind) or {}).items():
+                for title in titles:
+                    rows.append((kind, source, title, title, now))
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO processed (kind, source, item_key, title, processed_at) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self.conn.commit()
+        return len(rows)
+
+
+def migrate_status_file(status_file: Path, store: ProcessedStore) -> int:
+    """
+    一次性迁移：把 status.json 中的已处理列表导入 SQLite，备份原文件并只保留运行信息
+    One-time migration: import the processed lists from status.json into SQLite,
+    back up the original file and keep only the run metadata in it
+
+    Returns:
+        int: 迁移的条目数，无需迁移时为 0 / Number of migrated items, 0 if nothing to migrate
+    """
+    if not status_file.exists():
+        return 0
+    with open(status_file, 'r', encoding='utf-8') as f:
+        status = json.load(f)
+    if KIND_PODCAST not in status and KIND_YOUTUBE not in status:
+        return 0
+
+    migrated = store.import_legacy_status(status)
+    shutil.copy2(status_file, status_file.with_suffix('.json.bak'))
+    run_info = {key: value for key, value in status.items() if key not in (KIND_PODCAST, KIND_YOUTUBE)}
+    tmp_file = status_file.with_suffix('.json.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(run_info, f, ensure_ascii=False, indent=2)
+    tmp_file.replace(status_file)
+    return migrated
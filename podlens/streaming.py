@@ -0,0 +1,78 @@
+"""
+流式写入摘要文件 / Streaming summary files
+
+generate_summary 原先要等 Gemini 返回完整文本后，save_summary 才一次性写入文件；长摘要
+在这段时间里没有任何输出，中途失败则什么都不留下。这里把响应逐块追加到
+``<摘要文件>.partial`` 并立即 flush，完成后原子地重命名为最终文件；失败时保留
+.partial 以便查看已收到的内容，最终文件要么完整、要么不存在。
+generate_summary used to wait for Gemini's complete text before save_summary
+wrote the file in one go, so a long summary showed nothing until the end and a
+failure midway left nothing behind. Responses are now appended chunk by chunk to
+``<summary file>.partial`` and flushed immediately, then atomically renamed to the
+final file on completion; on failure the .partial is kept so what arrived can be
+inspected, and the final file is either complete or absent.
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Union
+
+
+PARTIAL_SUFFIX = '.partial'
+
+
+def partial_path(path: Path) -> Path:
+    """写入过程中使用的临时文件路径 / Path of the file written while streaming"""
+    return path.with_name(path.name + PARTIAL_SUFFIX)
+
+
+def timed_chunks(chunks: Iterable[str], on_first_chunk: Callable[[float], None]) -> Iterator[str]:
+    """
+    原样产出各块，并在第一块到达时以耗时（秒）调用 on_first_chunk（首个 token 延迟）
+    Yield the chunks unchanged, calling on_first_chunk with the elapsed seconds
+    when the first one arrives (time to first token)
+    """
+    start = time.monotonic()
+    first = True
+    for chunk in chunks:
+        if first:
+            on_first_chunk(time.monotonic() - start)
+            first = False
+        yield chunk
+
+
+def write_stream(path: Path, header: str, chunks: Union[str, Iterable[str]]) -> str:
+    """
+    写入 header 和各块到 .partial 文件，完成后原子重命名为 path
+    Write the header and the chunks to the .partial file, then atomically rename it to path
+
+    Args:
+        path: 最终文件路径 / Final file path
+        header: 文件头 / File header
+        chunks: 完整文本或文本块的可迭代对象 / Complete text or an iterable of text chunks
+
+    Returns:
+        str: 写入的正文（不含 header）/ Body written, without the header
+
+    Raises:
+        ValueError: 响应为空（不创建最终文件）/ The response was empty (no final file is created)
+        Exception: 流中断时原样抛出，.partial 保留 / Stream errors propagate, the .partial is kept
+    """
+    if isinstance(chunks, str):
+        chunks = [chunks]
+    partial = partial_path(path)
+    parts = []
+    with open(partial, 'w', encoding='utf-8') as f:
+        f.write(header)
+        f.flush()
+        for chunk in chunks:
+            f.write(chunk)
+            f.flush()
+            parts.append(chunk)
+    body = ''.join(parts)
+    if not body.strip():
+        partial.unlink()
+        raise ValueError("empty response")
+    os.replace(partial, path)
+    return body
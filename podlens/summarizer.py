@@ -0,0 +1,187 @@
+"""
+长转录的分层摘要 / Hierarchical summarization for long transcripts
+
+三小时的访谈放进一个提示词是一次巨大、缓慢且时常失败的请求。超过单次上限的转录
+先按 token 上限切分为若干段（在段落或句子边界处），各段并发生成笔记，再由一次
+reduce 请求整理为原有的 7 部分摘要格式。某段失败时仍返回其余部分的结果。
+A three-hour interview in one prompt is one huge, slow request that sometimes
+fails outright. Transcripts above the single-request limit are split into
+token-bounded sections (at paragraph or sentence boundaries), each section is
+summarized concurrently, and a reduce request turns the section notes into the
+existing 7-part summary format. When a section fails the rest is still returned.
+"""
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+
+# 不超过此大小的转录仍用单次请求 / Transcripts up to this size still use a single request
+SINGLE_PASS_MAX_TOKENS = 24000
+
+# 每段的 token 上限 / Token budget per section
+SECTION_TOKENS = 12000
+
+# reduce 输入仍过长时最多再归并的层数 / Max extra levels when the reduce input is still too long
+MAX_COLLAPSE_LEVELS = 3
+
+SUMMARY_POINTS = """1. Main topics outline (in sequence)
+2. Comprehensive and detailed summary on each section sequentially
+3. Key insights and takeaways
+4. Important quotes or statements
+5. key terminology/jargon explanation
+6. Overall themes, and the logic of the opinions expressed in the podcast
+7. Critical thinking and analysis for this podcast, reasoning from first principles"""
+
+SECTION_PROMPT = """
+You are reading part {index} of {total} of a podcast episode transcript.
+
+Episode Title: {title}
+
+Write detailed notes on this part only, in the order things are said:
+- Topics discussed and the arguments made for each
+- Key insights and takeaways
+- Important quotes or statements, verbatim
+- Terminology or jargon that is used
+
+Transcript (part {index} of {total}):
+{text}
+"""
+
+REDUCE_PROMPT = """
+Please provide a comprehensive summary and analysis of this podcast episode.
+The transcript was too long for one request, so it is given below as notes on
+consecutive parts of the episode, in order.{missing}
+
+Episode Title: {title}
+
+Include:
+{points}
+
+Notes:
+{notes}
+"""
+
+MISSING_NOTE = "\nNotes for part(s) {parts} are missing; do not invent their content."
+
+_CJK = re.compile(r'[\u3040-\u30ff\u3400-\u9fff\uac00-\ud7af\uf900-\ufaff]')
+_SENTENCE_END = re.compile(r'(?<=[.!?。！？])\s*')
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    粗略估算 token 数：中日韩字符约 1 个 token，其余约 4 个字符 1 个 token
+    Rough token estimate: about one token per CJK character and per 4 other characters
+    """
+    cjk = len(_CJK.findall(text))
+    return cjk + (len(text) - cjk) // 4
+
+
+def _pieces(text: str, max_tokens: int) -> List[str]:
+    """按段落、句子、最后按长度拆成不超过 max_tokens 的片段 / Split into pieces of at most max_tokens by paragraph, sentence, then length"""
+    pieces = []
+    for paragraph in text.split('\n'):
+        if estimate_tokens(paragraph) <= max_tokens:
+            pieces.append(paragraph)
+            continue
+        for sentence in _SENTENCE_END.split(paragraph):
+            while estimate_tokens(sentence) > max_tokens:
+                # 没有句子边界：按字符数硬切 / No sentence boundary: cut hard by length
+                cut = max(1, len(sentence) * max_tokens // estimate_tokens(sentence))
+                pieces.append(sentence[:cut])
+                sentence = sentence[cut:]
+            pieces.append(sentence)
+    return [piece for piece in pieces if piece.strip()]
+
+
+def split_sections(text: str, max_tokens: int = SECTION_TOKENS) -> List[str]:
+    """
+    在段落或句子边界处把文本切分为不超过 max_tokens 的段
+    Split text into sections of at most max_tokens at paragraph or sentence boundaries
+    """
+    sections = []
+    current = []
+    current_tokens = 0
+    for piece in _pieces(text, max_tokens):
+        tokens = estimate_tokens(piece) + 1
+        if current and current_tokens + tokens > max_tokens:
+            sections.append('\n'.join(current))
+            current = []
+            current_tokens = 0
+        current.append(piece)
+        current_tokens += tokens
+    if current:
+        sections.append('\n'.join(current))
+    return sections
+
+
+def _summarize_sections(generate: Callable[[str], Optional[str]], sections: List[str], title: str,
+                        workers: int) -> List[Optional[str]]:
+    def summarize(index: int) -> Optional[str]:
+        prompt = SECTION_PROMPT.format(index=index + 1, total=len(sections), title=title, text=sections[index])
+        try:
+            return generate(prompt) or None
+        except Exception:
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(sections)))) as pool:
+        return list(pool.map(summarize, range(len(sections))))
+
+
+def _join_notes(notes: List[Optional[str]]) -> str:
+    return '\n\n'.join(
+        f"[Part {index + 1} of {len(notes)}]\n{note}" for index, note in enumerate(notes) if note
+    )
+
+
+def map_reduce_summary(generate: Callable[[str], Optional[str]], transcript: str, title: str,
+                       section_tokens: int = SECTION_TOKENS, workers: int = 2) -> Dict:
+    """
+    分段并发摘要后归并为 7 部分摘要
+    Summarize sections concurrently, then reduce them into the 7-part summary
+
+    Args:
+        generate: generate(prompt) -> 文本 / text；可抛出异常 / may raise
+        transcript: 转录文本 / Transcript text
+        title: 剧集标题 / Episode title
+        section_tokens: 每段 token 上限 / Token budget per section
+        workers: 并发请求数 / Concurrent requests
+
+    Returns:
+        Dict: {
+            'summary': 摘要；reduce 失败时为各段笔记，全部失败时为 None
+                       Summary; the section notes if the reduce step failed, None if every section failed
+            'sections': 段数 / Number of sections
+            'failed': 失败的段号（从 1 开始）/ Failed section numbers (1-based)
+            'reduced': reduce 是否成功 / Whether the reduce step succeeded
+        }
+    """
+    sections = split_sections(transcript, section_tokens)
+    notes = _summarize_sections(generate, sections, title, workers)
+    failed = [index + 1 for index, note in enumerate(notes) if not note]
+    result = {'summary': None, 'sections': len(sections), 'failed': failed, 'reduced': False}
+    if len(failed) == len(sections):
+        return result
+
+    combined = _join_notes(notes)
+    # 笔记仍超出单次上限时逐层归并 / Collapse level by level while the notes are still too long
+    for _ in range(MAX_COLLAPSE_LEVELS):
+        if estimate_tokens(combined) <= SINGLE_PASS_MAX_TOKENS:
+            break
+        collapsed = _summarize_sections(generate, split_sections(combined, section_tokens), title, workers)
+        if not all(collapsed):
+            break
+        combined = _join_notes(collapsed)
+
+    missing = MISSING_NOTE.format(parts=', '.join(map(str, failed))) if failed else ''
+    prompt = REDUCE_PROMPT.format(missing=missing, title=title, points=SUMMARY_POINTS, notes=combined)
+    try:
+        summary = generate(prompt)
+    except Exception:
+        summary = None
+
+    if summary:
+        result.update(summary=summary, reduced=True)
+    else:
+        result['summary'] = combined
+    return result
@@ -0,0 +1,183 @@
+"""
+本地转录后端 / Local transcription backends
+
+Groq 不可用或被限速时的离线转录。原先只支持 mlx_whisper（仅限 Apple Silicon），
+这里抽象为可插拔的后端：MLX、faster-whisper（CTranslate2 int8，CPU 上最快）与
+openai-whisper（可控制线程数）。模型在首次使用时加载一次，之后所有剧集共用。
+Offline transcription for when Groq is unavailable or rate-limited. The local
+path used to be hard-wired to mlx_whisper, which only runs on Apple Silicon;
+backends are now pluggable: MLX, faster-whisper (CTranslate2 int8, fastest on
+CPU) and openai-whisper (with thread control). The model is loaded once on
+first use and shared by every episode.
+
+通过 .env 配置 / Configured through .env:
+    TRANSCRIBE_BACKEND = auto | mlx | faster-whisper | whisper   (默认 auto / default auto)
+    WHISPER_MODEL      = 模型名称，默认 medium / model name, default medium
+    WHISPER_THREADS    = CPU 线程数，0 为全部核心 / CPU threads, 0 for all cores
+"""
+
+import importlib.util
+import os
+import platform
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+DEFAULT_BACKEND = 'auto'
+DEFAULT_CPU_MODEL = 'medium'
+DEFAULT_COMPUTE_TYPE = 'int8'
+
+# MLX 使用 Hugging Face 上转换好的模型 / MLX uses converted models from Hugging Face
+MLX_MODEL_REPO = 'mlx-community/whisper-{model}'
+
+
+def _module_available(module: str) -> bool:
+    try:
+        return importlib.util.find_spec(module) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def _cpu_threads() -> int:
+    try:
+        threads = int(os.getenv('WHISPER_THREADS', '0'))
+    except ValueError:
+        threads = 0
+    return threads if threads > 0 else (os.cpu_count() or 1)
+
+
+class TranscriptionBackend:
+    """
+    本地转录后端基类：模型懒加载一次，推理串行执行
+    Base class for local backends: the model is loaded lazily once and inference is serialized
+    """
+
+    name = ''
+    module = ''
+
+    def __init__(self, model: str = DEFAULT_CPU_MODEL):
+        self.model = model
+        self._loaded = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def available(cls) -> bool:
+        """依赖是否已安装 / Whether the dependency is installed"""
+        return _module_available(cls.module)
+
+    @property
+    def label(self) -> str:
+        """用于结果 'method' 字段的名称 / Name used for the result's 'method' field"""
+        return f"{self.name} {self.model}"
+
+    def _load(self):
+        raise NotImplementedError
+
+    def _transcribe(self, model, audio_file: str) -> Dict:
+        raise NotImplementedError
+
+    def transcribe(self, audio_file: Path) -> Dict:
+        """
+        转录音频文件 / Transcribe an audio file
+
+        Returns:
+            Dict: {'text': 转录文本 / transcript, 'language': 语言代码 / language code}
+        """
+        with self._lock:
+            if self._loaded is None:
+                self._loaded = self._load()
+            return self._transcribe(self._loaded, str(audio_file))
+
+
+class MLXBackend(TranscriptionBackend):
+    """Apple Silicon 上的 mlx_whisper / mlx_whisper on Apple Silicon"""
+
+    name = 'MLX Whisper'
+    module = 'mlx_whisper'
+
+    def _load(self):
+        # mlx_whisper 按仓库名在进程内缓存模型 / mlx_whisper caches the model per repo in-process
+        import mlx_whisper
+        return mlx_whisper
+
+    def _transcribe(self, model, audio_file: str) -> Dict:
+        result = model.transcribe(audio_file, path_or_hf_repo=MLX_MODEL_REPO.format(model=self.model))
+        return {'text': result['text'], 'language': result.get('language', 'en')}
+
+
+class FasterWhisperBackend(TranscriptionBackend):
+    """faster-whisper（CTranslate2）CPU int8 推理 / faster-whisper (CTranslate2) int8 inference on CPU"""
+
+    name = 'faster-whisper'
+    module = 'faster_whisper'
+
+    def _load(self):
+        from faster_whisper import WhisperModel
+        return WhisperModel(self.model, device='cpu', compute_type=DEFAULT_COMPUTE_TYPE, cpu_threads=_cpu_threads())
+
+    def _transcribe(self, model, audio_file: str) -> Dict:
+        segments, info = model.transcribe(audio_file, beam_size=5, vad_filter=True)
+        text = ''.join(segment.text for segment in segments).strip()
+        return {'text': text, 'language': info.language}
+
+
+class OpenAIWhisperBackend(TranscriptionBackend):
+    """openai-whisper（PyTorch）CPU 推理 / openai-whisper (PyTorch) inference on CPU"""
+
+    name = 'Whisper'
+    module = 'whisper'
+
+    def _load(self):
+        import torch
+        import whisper
+        torch.set_num_threads(_cpu_threads())
+        return whisper.load_model(self.model, device='cpu')
+
+    def _transcribe(self, model, audio_file: str) -> Dict:
+        # CPU 不支持 fp16 / fp16 is not supported on CPU
+        result = model.transcribe(audio_file, fp16=False)
+        return {'text': result['text'].strip(), 'language': result.get('language', 'en')}
+
+
+BACKENDS = {
+    'mlx': MLXBackend,
+    'faster-whisper': FasterWhisperBackend,
+    'whisper': OpenAIWhisperBackend,
+}
+
+
+def _auto_order() -> List[str]:
+    """自动选择顺序：Apple Silicon 优先 MLX / Auto selection order: MLX first on Apple Silicon"""
+    if platform.system() == 'Darwin' and platform.machine() == 'arm64':
+        return ['mlx', 'faster-whisper', 'whisper']
+    return ['faster-whisper', 'whisper', 'mlx']
+
+
+_backend = None
+_backend_resolved = False
+_backend_lock = threading.Lock()
+
+
+def get_local_backend() -> Optional[TranscriptionBackend]:
+    """
+    返回进程级共享的本地转录后端，没有可用后端时返回 None
+    Return the process-wide local transcription backend, None if none is available
+    """
+    global _backend, _backend_resolved
+    with _backend_lock:
+        if not _backend_resolved:
+            choice = os.getenv('TRANSCRIBE_BACKEND', DEFAULT_BACKEND).strip().lower()
+            model = os.getenv('WHISPER_MODEL', DEFAULT_CPU_MODEL).strip()
+            names = [choice] if choice in BACKENDS else _auto_order()
+            for name in names:
+                if BACKENDS[name].available():
+                    _backend = BACKENDS[name](model)
+                    break
+            _backend_resolved = True
+        return _backend
+
+
+def local_backend_available() -> bool:
+    """是否有可用的本地转录后端 / Whether a local transcription backend is available"""
+    return get_local_backend() is not None
@@ -0,0 +1,148 @@
+"""
+YouTube 视频元数据缓存 / YouTube video metadata cache
+
+get_video_info 和 get_video_title 原先各自请求一次 watch 页面并用正则提取信息；
+自动处理频道时，即使刚获取的频道页面已经带有标题，也会为每个视频再请求一次。
+这里按 video_id 缓存标题、频道名和时长（进程内共享并持久化到磁盘，带有效期）：
+频道列表和搜索结果中已有的信息直接写入缓存，watch 页面每个视频最多请求一次。
+过期条目在加载和保存时删除；修改最多每 VIDEO_CACHE_FLUSH_SECONDS 秒写入一次，
+运行结束时由 flush() 写入。
+get_video_info and get_video_title each used to GET the watch page and regex
+the HTML, and automatic channel processing did so for every video even though
+the channel page it had just fetched already carried the title. Title, channel
+name and duration are now cached by video_id (shared in-process and persisted
+to disk, with a TTL): metadata already present in channel listings and search
+results goes straight into the cache, so a watch page is fetched at most once
+per video. Expired entries are dropped on load and save, and changes are written
+at most every VIDEO_CACHE_FLUSH_SECONDS and by flush() at the end of a run.
+"""
+
+import atexit
+import json
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from .feed_cache import write_json_atomic
+
+
+VIDEO_CACHE_FILE = Path('.podlens/video_info.json')
+
+# 视频元数据的默认有效期（天）/ Default lifetime of cached video metadata (days)
+DEFAULT_VIDEO_TTL_DAYS = 30.0
+
+# 有未保存修改时两次写入之间的最短间隔（秒）/ Minimum interval between writes while there are unsaved changes (seconds)
+VIDEO_CACHE_FLUSH_SECONDS = 30
+
+# 缓存的字段；占位值不会覆盖已知信息 / Cached fields; placeholder values never overwrite known ones
+VIDEO_FIELDS = ('title', 'channel_name', 'duration')
+PLACEHOLDERS = {'', 'Unknown Title', 'Unknown Channel', 'YouTube Video'}
+
+
+class VideoInfoCache:
+    """video_id → 视频元数据的持久化缓存 / Persistent cache of video metadata keyed by video_id"""
+
+    def __init__(self, cache_file: Path = VIDEO_CACHE_FILE, ttl_days: float = DEFAULT_VIDEO_TTL_DAYS):
+        self.cache_file = cache_file
+        self.ttl_days = ttl_days
+        self.lock = threading.Lock()
+        self.cache = self.load_cache()
+        self.dirty = False
+        self.flushed_at = time.monotonic()
+
+    def load_cache(self) -> Dict:
+        """加载缓存，文件不存在或格式错误时返回空结构 / Load cache, empty structure if missing or invalid"""
+        try:
+            if self.cache_file.exists():
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    cache_data = json.load(f)
+                if isinstance(cache_data, dict) and 'videos' in cache_data:
+                    self._prune(cache_data)
+                    return cache_data
+        except Exception:
+            pass
+        return {
+            'videos': {},  # {video_id: {title, channel_name, duration, updated_at}}
+            'last_updated': datetime.now().isoformat(),
+            'version': '1.0'
+        }
+
+    def _prune(self, cache_data: Dict):
+        """删除过期条目 / Drop expired entries"""
+        videos = cache_data['videos']
+        for video_id in [video_id for video_id, entry in videos.items() if not self._is_fresh(entry)]:
+            del videos[video_id]
+
+    def save_cache(self):
+        """删除过期条目并原子写入缓存文件（调用方持有锁）/ Drop expired entries and write the cache file atomically (caller holds the lock)"""
+        self._prune(self.cache)
+        self.cache['last_updated'] = datetime.now().isoformat()
+        write_json_atomic(self.cache_file, self.cache, indent=None)
+        self.dirty = False
+        self.flushed_at = time.monotonic()
+
+    def _mark_dirty(self):
+        """记录修改；最多每 VIDEO_CACHE_FLUSH_SECONDS 秒写入一次 / Record a change; written every VIDEO_CACHE_FLUSH_SECONDS at most"""
+        self.dirty = True
+        if time.monotonic() - self.flushed_at >= VIDEO_CACHE_FLUSH_SECONDS:
+            self.save_cache()
+
+    def flush(self):
+        """有未保存的修改时写入缓存 / Write the cache if it has unsaved changes"""
+        with self.lock:
+            if self.dirty:
+                self.save_cache()
+
+    def get(self, video_id: str) -> Optional[Dict]:
+        """返回未过期的元数据 / Return the video's metadata if it has not expired"""
+        with self.lock:
+            entry = self.cache['videos'].get(video_id)
+        if not isinstance(entry, dict) or not self._is_fresh(entry):
+            return None
+        return entry
+
+    def _is_fresh(self, entry: Dict) -> bool:
+        try:
+            age = datetime.now() - datetime.fromisoformat(entry['updated_at'])
+        except (KeyError, TypeError, ValueError):
+            return False
+        return age.total_seconds() <= self.ttl_days * 86400
+
+    def _merge(self, video_id: str, info: Dict) -> bool:
+        known = {field: info[field] for field in VIDEO_FIELDS if info.get(field) and info[field] not in PLACEHOLDERS}
+        if not video_id or not known:
+            return False
+        entry = self.cache['videos'].get(video_id, {})
+        if all(entry.get(field) == value for field, value in known.items()) and self._is_fresh(entry):
+            return False
+        self.cache['videos'][video_id] = {**entry, **known, 'updated_at': datetime.now().isoformat()}
+        return True
+
+    def put(self, video_id: str, info: Dict):
+        """合并一个视频的已知字段 / Merge the known fields of one video"""
+        with self.lock:
+            if self._merge(video_id, info):
+                self._mark_dirty()
+
+    def put_many(self, videos: Iterable[Dict]):
+        """合并频道列表或搜索结果中的视频（含 video_id）/ Merge videos (with video_id) from a listing"""
+        with self.lock:
+            changed = [self._merge(video.get('video_id', ''), video) for video in videos]
+            if any(changed):
+                self._mark_dirty()
+
+
+_video_cache = None
+_video_cache_lock = threading.Lock()
+
+
+def get_video_cache() -> VideoInfoCache:
+    """进程级共享的视频元数据缓存，进程退出时写入未保存的修改 / Process-wide video metadata cache, unsaved changes are written at exit"""
+    global _video_cache
+    with _video_cache_lock:
+        if _video_cache is None:
+            _video_cache = VideoInfoCache()
+            atexit.register(_video_cache.flush)
+        return _video_cache
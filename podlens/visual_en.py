@@ -4,10 +4,11 @@ Visual Story Generator - Direct HTML Generation using Gemini AI (English Version
 """
 
 import os
-import google.generativeai as genai
 from dotenv import load_dotenv
 from pathlib import Path
-from . import get_model_name
+from .gemini import get_gemini_client
+from .llm_cache import cached_generate, TEMPLATE_VISUAL
+from .catalog import record_output
 
 # Enhanced .env loading function
 def load_env_robust():
@@ -44,8 +45,7 @@ def generate_visual_story(input_file: str, output_file: str = None) -> bool:
             print("❌ GEMINI_API_KEY not found in environment variables")
             return False
         
-        genai.configure(api_key=api_key, transport='rest')
-        client = genai
+        client = get_gemini_client()
         
         # Check if input file exists
         input_path = Path(input_file)
@@ -296,14 +296,8 @@ below are the content, tell this story beautifully:
 
 {content}"""
         
-        response = client.GenerativeModel(get_model_name()).generate_content(prompt)
-        
-        # Handle the response properly
-        if hasattr(response, 'text'):
-            html_content = response.text
-        elif hasattr(response, 'candidates') and response.candidates:
-            html_content = response.candidates[0].content.parts[0].text
-        else:
+        html_content = cached_generate(client.model_name, TEMPLATE_VISUAL, prompt, client.generate)
+        if not html_content:
             print("❌ Gemini API response format abnormal")
             return False
         
@@ -324,6 +318,7 @@ below are the content, tell this story beautifully:
         # Save HTML file
         with open(output_file, 'w', encoding='utf-8') as f:
             f.write(html_content)
+        record_output(output_file)
         
         # print(f"💾 Interactive HTML saved to: {output_file}")  # Simplified output
         # print(f"🌐 Open {output_file} in your web browser to view the story!")  # Simplified output
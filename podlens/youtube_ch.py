@@ -8,16 +8,30 @@ warnings.filterwarnings('ignore', category=FutureWarning, module='whisper')
 
 import requests
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
 import os
 from pathlib import Path
 import re
 import time
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 import subprocess
 from dotenv import load_dotenv
-import google.generativeai as genai
 import urllib.parse
-from . import get_model_name
+from .audio import (
+    probe_duration, candidate_bitrates, encode_mp3, split_audio, merge_chunk_texts, chunk_overlaps, GROQ_MAX_FILE_MB,
+    ytdlp_transcription_opts, ytdlp_extract_audio_args,
+)
+from .transcription import get_local_backend
+from .summarizer import map_reduce_summary, estimate_tokens, SINGLE_PASS_MAX_TOKENS
+from .gemini import get_gemini_client
+from .streaming import write_stream, timed_chunks
+from .catalog import record_output
+from .youtube_page import parse_videos
+from .captions import fetch_captions
+from .video_cache import get_video_cache
+from .llm_cache import cached_generate, cached_stream, TEMPLATE_SUMMARY, TEMPLATE_SUMMARY_SECTIONS, TEMPLATE_TRANSLATE
+from .concurrency import limits, throttle, GROQ_API_HOST, GEMINI_API_HOST
 
 # Enhanced .env loading function
 def load_env_robust():
@@ -36,17 +50,9 @@ def load_env_robust():
 # Load .env file with robust search
 load_env_robust()
 
-# Whisper 转录支持
-try:
-    import mlx_whisper
-    import mlx.core as mx
-    MLX_WHISPER_AVAILABLE = True
-    # 检查 MLX 设备可用性
-    MLX_DEVICE = mx.default_device()
-    # print(f"🎯 MLX Whisper 可用，使用设备: {MLX_DEVICE}")
-except ImportError:
-    MLX_WHISPER_AVAILABLE = False
-    # print("⚠️  MLX Whisper 不可用")
+# 本地 Whisper 转录后端（MLX、faster-whisper 或 openai-whisper），模型首次使用时加载一次
+LOCAL_BACKEND = get_local_backend()
+LOCAL_WHISPER_AVAILABLE = LOCAL_BACKEND is not None
 
 # Groq API 极速转录
 try:
@@ -68,7 +74,7 @@ except ImportError:
     GEMINI_AVAILABLE = False
 
 # 检查转录功能可用性
-TRANSCRIPTION_AVAILABLE = MLX_WHISPER_AVAILABLE or GROQ_AVAILABLE
+TRANSCRIPTION_AVAILABLE = LOCAL_WHISPER_AVAILABLE or GROQ_AVAILABLE
 
 # YouTube 转录提取
 try:
@@ -81,18 +87,12 @@ except ImportError:
 # YouTube 音频下载备用方案
 try:
     import yt_dlp
+    from yt_dlp.postprocessor import FFmpegExtractAudioPP
     YT_DLP_AVAILABLE = True
 except ImportError:
     YT_DLP_AVAILABLE = False
     print("⚠️  未安装 yt-dlp，YouTube 音频下载备用方案不可用")
 
-# 本地 Whisper 免费音频转录（用于 YouTube）
-try:
-    import whisper
-    WHISPER_AVAILABLE = True
-except ImportError:
-    WHISPER_AVAILABLE = False
-
 
 # YouTube classes
 class YouTubeSearcher:
@@ -103,6 +103,7 @@ class YouTubeSearcher:
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
         })
+        self.video_cache = get_video_cache()
     
     def _fix_encoding(self, text: str) -> str:
         """
@@ -142,24 +143,9 @@ class YouTubeSearcher:
     
     def get_video_title(self, video_id: str) -> str:
         """Get video title from video ID"""
-        try:
-            video_url = f"https://www.youtube.com/watch?v={video_id}"
-            response = self.session.get(video_url, timeout=10)
-            response.raise_for_status()
-            
-            # Extract title from page
-            import re
-            title_match = re.search(r'"title":"([^"]+)"', response.text)
-            if title_match:
-                title = title_match.group(1)
-                # Use intelligent encoding fix
-                title = self._fix_encoding(title)
-                return title
-            else:
-                return "YouTube Video"
-        except Exception as e:
-            print(f"无法获取视频标题: {e}")
-            return "YouTube Video"
+        # 一次watch页面请求同时为get_video_info填充缓存
+        title = self.get_video_info(video_id)['title']
+        return title if title != "Unknown Title" else "YouTube Video"
 
     def get_video_info(self, video_id: str) -> Dict:
         """
@@ -171,8 +157,19 @@ class YouTubeSearcher:
         Returns:
             Dict: 包含标题、频道名称、发布时间的字典
         """
+        # 复用缓存中的元数据（频道列表、之前获取的watch页面）
+        cached = self.video_cache.get(video_id)
+        if cached and cached.get('title') and cached.get('channel_name'):
+            return {
+                'title': cached['title'],
+                'channel_name': cached['channel_name'],
+                'published_date': "Recent",
+                'video_id': video_id
+            }
+        
         try:
             video_url = f"https://www.youtube.com/watch?v={video_id}"
+            throttle(video_url)
             response = self.session.get(video_url, timeout=10)
             response.raise_for_status()
             
@@ -206,6 +203,9 @@ class YouTubeSearcher:
             # 提取发布时间 - 这里我们从页面上得到的通常是相对时间
             published_date = "Recent"
             
+            # 缓存供后续调用和下次运行使用
+            self.video_cache.put(video_id, {'title': title, 'channel_name': channel_name})
+            
             return {
                 'title': title,
                 'channel_name': channel_name,
@@ -222,6 +222,17 @@ class YouTubeSearcher:
                 'video_id': video_id
             }
     
+    def _episode(self, video: Dict) -> Dict:
+        """Episode dict from a parsed video renderer"""
+        return {
+            'title': video['title'],
+            'video_id': video['video_id'],
+            'url': f"https://www.youtube.com/watch?v={video['video_id']}",
+            'published_date': video['published_date'],
+            'duration': video['duration'],
+            'platform': 'youtube'
+        }
+    
     def search_youtube_podcast(self, podcast_name: str, num_episodes: int = 5) -> List[Dict]:
         """Search for podcast episodes on YouTube using channel videos page"""
         try:
@@ -232,113 +243,27 @@ class YouTubeSearcher:
             # Try the channel videos page first
             channel_url = f"https://www.youtube.com/@{channel_name}/videos"
             
+            throttle(channel_url)
             response = self.session.get(channel_url, timeout=10)
             response.raise_for_status()
             
-            import re
-            
-            # Find all video IDs - YouTube orders them by recency on the channel page
-            all_video_ids = re.findall(r'"videoId":"([a-zA-Z0-9_-]{11})"', response.text)
-            
-            videos = []
-            seen_ids = set()
-            
-            # Just take the first N unique video IDs (most recent)
-            for video_id in all_video_ids:
-                if video_id in seen_ids:
-                    continue
-                
-                seen_ids.add(video_id)
-                
-                # Try to find title and date for this video
-                video_id_pattern = f'"videoId":"{video_id}"'
-                start_pos = response.text.find(video_id_pattern)
-                
-                title = "Unknown Title"
-                date = "Recent"
-                
-                if start_pos != -1:
-                    # Look for title and date within a reasonable range of this video ID
-                    search_start = max(0, start_pos - 500)
-                    search_end = min(len(response.text), start_pos + 1500)
-                    section = response.text[search_start:search_end]
-                    
-                    # Find title and date in this section
-                    title_match = re.search(r'"title":\s*{"runs":\s*\[{"text":"([^"]+)"', section)
-                    date_match = re.search(r'"publishedTimeText":\s*{"simpleText":"([^"]+)"', section)
-                    
-                    if title_match:
-                        title = title_match.group(1)
-                    if date_match:
-                        date = date_match.group(1)
-                
-                videos.append({
-                    'title': title.strip(),
-                    'video_id': video_id,
-                    'url': f"https://www.youtube.com/watch?v={video_id}",
-                    'published_date': date.strip(),
-                    'platform': 'youtube'
-                })
-                
-                # Stop when we have enough videos
-                if len(videos) >= num_episodes:
-                    break
+            # Parse ytInitialData once - YouTube orders videos by recency on the channel page
+            videos = parse_videos(response.text, limit=num_episodes)
+            self.video_cache.put_many(videos)
             
             # If we got videos from the channel, return them
             if videos:
-                return videos
+                return [self._episode(video) for video in videos]
             
             # Fallback: if channel approach didn't work, try general search
             search_url = f"https://www.youtube.com/results?search_query={urllib.parse.quote(podcast_name)}"
+            throttle(search_url)
             response = self.session.get(search_url, timeout=10)
             response.raise_for_status()
             
-            # Use the same approach for search results
-            all_video_ids = re.findall(r'"videoId":"([a-zA-Z0-9_-]{11})"', response.text)
-            
-            videos = []
-            seen_ids = set()
-            
-            for video_id in all_video_ids:
-                if video_id in seen_ids:
-                    continue
-                
-                seen_ids.add(video_id)
-                
-                # Try to find title and date for this video
-                video_id_pattern = f'"videoId":"{video_id}"'
-                start_pos = response.text.find(video_id_pattern)
-                
-                title = "Unknown Title"
-                date = "Recent"
-                
-                if start_pos != -1:
-                    # Look for title and date within a reasonable range of this video ID
-                    search_start = max(0, start_pos - 500)
-                    search_end = min(len(response.text), start_pos + 1500)
-                    section = response.text[search_start:search_end]
-                    
-                    # Find title and date in this section
-                    title_match = re.search(r'"title":\s*{"runs":\s*\[{"text":"([^"]+)"', section)
-                    date_match = re.search(r'"publishedTimeText":\s*{"simpleText":"([^"]+)"', section)
-                    
-                    if title_match:
-                        title = title_match.group(1)
-                    if date_match:
-                        date = date_match.group(1)
-                
-                videos.append({
-                    'title': title.strip(),
-                    'video_id': video_id,
-                    'url': f"https://www.youtube.com/watch?v={video_id}",
-                    'published_date': date.strip(),
-                    'platform': 'youtube'
-                })
-                
-                if len(videos) >= num_episodes:
-                    break
-            
-            return videos
+            videos = parse_videos(response.text, limit=num_episodes)
+            self.video_cache.put_many(videos)
+            return [self._episode(video) for video in videos]
             
         except Exception as e:
             print(f"YouTube搜索失败: {e}")
@@ -358,17 +283,6 @@ class TranscriptExtractor:
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
         })
         
-        # Initialize local Whisper model (preferred free option)
-        self.whisper_model = None
-        if WHISPER_AVAILABLE:
-            try:
-                self.whisper_model = whisper.load_model("base")
-            except Exception as e:
-                pass
-        
-        # Initialize MLX Whisper model name (copied from Apple section)
-        self.whisper_model_name = 'mlx-community/whisper-medium'
-        
         # Groq client initialization (copied from Apple section)
         if GROQ_AVAILABLE:
             self.groq_client = Groq(api_key=GROQ_API_KEY)
@@ -524,24 +438,17 @@ class TranscriptExtractor:
             if audio_filepath.exists():
                 return audio_filepath
             
-            ydl_opts = {
-                'format': 'bestaudio/best',
-                'outtmpl': str(download_dir / f"youtube_{safe_title}.%(ext)s"),
-                'extractaudio': True,
-                'audioformat': 'mp3',
-                'audioquality': '192',
-                'postprocessors': [{
-                    'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'mp3',
-                    'preferredquality': '192',
-                }],
-                'quiet': True,          # Reduce output
-                'no_warnings': True,    # Suppress warnings
-                'noprogress': True,     # Suppress download progress
-            }
+            # Transcription profile: smallest audio-only format, converted once to 16KHz mono MP3 sized for Groq
+            ydl_opts = ytdlp_transcription_opts(str(download_dir / f"youtube_{safe_title}.%(ext)s"))
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([video_url])
+            with limits.network:
+                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                    info = ydl.extract_info(video_url, download=False)
+                    ydl.add_post_processor(
+                        FFmpegExtractAudioPP(ydl, **ytdlp_extract_audio_args(info.get('duration'))),
+                        when='post_process'
+                    )
+                    ydl.process_ie_result(info, download=True)
             
             return audio_filepath
             
@@ -550,8 +457,8 @@ class TranscriptExtractor:
             return None
     
     def compress_audio_file(self, input_file: Path, output_file: Path) -> bool:
-        """智能两级压缩音频文件至Groq API限制以下 (从Apple模块复制)
-        首选64k保证质量，如果仍>25MB则降至48k"""
+        """单次 ffmpeg 编码将音频压缩至Groq API限制以下 (与Apple模块相同)
+        先读取时长，直接使用能满足25MB限制的最高码率（不超过64k）"""
         try:
             # 检查输入文件是否存在
             if not input_file.exists():
@@ -563,72 +470,18 @@ class TranscriptExtractor:
             
             print("🔧 正在压缩...")
             
-            # 生成安全的临时文件名，不超过255字符
-            original_name = output_file.stem  # 不含扩展名的文件名
-            prefix = "temp_64k_"
-            extension = output_file.suffix
-            
-            # 计算原文件名部分的最大长度
-            max_name_length = 255 - len(prefix) - len(extension)
-            
-            # 如果需要，截断原文件名
-            if len(original_name) > max_name_length:
-                safe_name = original_name[:max_name_length]
-            else:
-                safe_name = original_name
-            
-            temp_64k_file = output_file.parent / f"{prefix}{safe_name}{extension}"
-            
-            cmd_64k = [
-                'ffmpeg',
-                '-i', str(input_file.resolve()),  # 使用绝对路径避免特殊字符问题
-                '-ar', '16000',
-                '-ac', '1',
-                '-b:a', '64k',
-                '-y',
-                str(temp_64k_file.resolve())  # 使用绝对路径
-            ]
-            
-            # 运行第一级压缩（使用bytes模式避免编码问题）
-            result = subprocess.run(
-                cmd_64k,
-                capture_output=True,
-                text=False,  # 使用bytes模式避免UTF-8解码错误
-                check=True
-            )
+            # 根据时长预先确定码率，仅在 ffprobe 失败时逐级尝试
+            duration = probe_duration(input_file)
+            bitrates = candidate_bitrates(duration)
             
-            # 检查64k压缩后的文件大小
-            compressed_size_mb = self.get_file_size_mb(temp_64k_file)
+            for bitrate in bitrates:
+                encode_mp3(input_file, output_file, bitrate)
+                compressed_size_mb = self.get_file_size_mb(output_file)
+                if compressed_size_mb <= GROQ_MAX_FILE_MB:
+                    break
             
-            if compressed_size_mb <= 25:
-                # 64k压缩满足要求，使用64k结果
-                temp_64k_file.rename(output_file)
-                return True
-            else:
-                # 64k压缩后仍>25MB，进行第二级48k压缩
-                cmd_48k = [
-                    'ffmpeg',
-                    '-i', str(input_file.resolve()),  # 使用绝对路径避免特殊字符问题
-                    '-ar', '16000',
-                    '-ac', '1',
-                    '-b:a', '48k',
-                    '-y',
-                    str(output_file.resolve())  # 使用绝对路径
-                ]
-                
-                # 运行第二级压缩（使用bytes模式避免编码问题）
-                result = subprocess.run(
-                    cmd_48k,
-                    capture_output=True,
-                    text=False,  # 使用bytes模式避免UTF-8解码错误
-                    check=True
-                )
-                
-                # 清理临时文件
-                if temp_64k_file.exists():
-                    temp_64k_file.unlink()
-                
-                return True
+            print(f"✅ {bitrate}k压缩完成: {output_file.name} ({compressed_size_mb:.1f}MB)")
+            return True
             
         except subprocess.CalledProcessError as e:
             # 尝试解码stderr以获取更详细的错误信息
@@ -643,17 +496,17 @@ class TranscriptExtractor:
             print(f"❌ 压缩失败: {error_msg}")
             print(f"   输入文件: {input_file}")
             print(f"   输出文件: {output_file}")
-            # 清理临时文件
-            if 'temp_64k_file' in locals() and temp_64k_file.exists():
-                temp_64k_file.unlink()
+            # 删除不完整的输出
+            if output_file.exists():
+                output_file.unlink()
             return False
         except Exception as e:
             print(f"❌ 压缩出错: {e}")
             print(f"   输入文件: {input_file}")
             print(f"   输出文件: {output_file}")
-            # 清理临时文件
-            if 'temp_64k_file' in locals() and temp_64k_file.exists():
-                temp_64k_file.unlink()
+            # 删除不完整的输出
+            if output_file.exists():
+                output_file.unlink()
             return False
     
     def transcribe_with_groq(self, audio_file: Path) -> dict:
@@ -661,13 +514,15 @@ class TranscriptExtractor:
         try:
             start_time = time.time()
             
-            with open(audio_file, "rb") as file:
-                transcription = self.groq_client.audio.transcriptions.create(
-                    file=file,
-                    model="whisper-large-v3",
-                    response_format="verbose_json",
-                    temperature=0.0
-                )
+            throttle(GROQ_API_HOST)
+            with limits.network:
+                with open(audio_file, "rb") as file:
+                    transcription = self.groq_client.audio.transcriptions.create(
+                        file=file,
+                        model="whisper-large-v3",
+                        response_format="verbose_json",
+                        temperature=0.0
+                    )
             
             end_time = time.time()
             processing_time = end_time - start_time
@@ -690,17 +545,15 @@ class TranscriptExtractor:
             # print(f"❌ Groq转录失败: {e}")
             return None
     
-    def transcribe_with_mlx(self, audio_file: Path) -> dict:
-        """Transcribe audio file using MLX Whisper (copied from Apple section)"""
+    def transcribe_locally(self, audio_file: Path) -> dict:
+        """Transcribe audio file with the local Whisper backend (copied from Apple section)"""
         try:
             print("💻 本地转录...")
             
             start_time = time.time()
             
-            result = mlx_whisper.transcribe(
-                str(audio_file),
-                path_or_hf_repo=self.whisper_model_name
-            )
+            with limits.cpu:
+                result = LOCAL_BACKEND.transcribe(audio_file)
             
             end_time = time.time()
             processing_time = end_time - start_time
@@ -710,14 +563,14 @@ class TranscriptExtractor:
             
             return {
                 'text': result['text'],
-                'language': result.get('language', 'en'),
+                'language': result['language'],
                 'processing_time': processing_time,
                 'speed_ratio': speed_ratio,
-                'method': 'MLX Whisper medium'
+                'method': LOCAL_BACKEND.label
             }
             
         except Exception as e:
-            print(f"❌ MLX转录失败: {e}")
+            print(f"❌ 本地转录失败: {e}")
             return None
     
     def detect_chinese_content(self, text):
@@ -842,9 +695,70 @@ class TranscriptExtractor:
         
         return None, None, None, "未找到可用字幕"
 
-    def transcribe_audio_smart(self, audio_file: Path, title: str) -> Optional[str]:
+    def split_audio_for_groq(self, audio_file: Path) -> List[Path]:
+        """
+        在静音处把音频切分为小于Groq限制的片段
+        
+        Args:
+            audio_file: 音频文件路径
+        
+        Returns:
+            List[Path]: 按顺序排列的片段文件，切分失败时为空
+        """
+        chunk_dir = audio_file.parent / f"chunks_{audio_file.stem}"
+        try:
+            with limits.cpu:
+                chunk_files = split_audio(audio_file, chunk_dir)
+            print(f"✂️  已在静音处切分为 {len(chunk_files)} 个片段")
+            return chunk_files
+        except Exception as e:
+            print(f"⚠️  切分音频失败: {e}")
+            shutil.rmtree(chunk_dir, ignore_errors=True)
+            return []
+    
+    def transcribe_with_groq_chunked(self, audio_file: Path, chunk_files: Optional[List[Path]] = None) -> dict:
+        """
+        将长音频按静音切分的片段并行提交Groq转录，按顺序拼接并去除重叠（无需有损压缩）
+        
+        Args:
+            audio_file: 音频文件路径
+            chunk_files: 流水线已切分好的片段（未提供时在此切分）
+        
+        Returns:
+            dict: 转录结果，任一片段失败时为None
+        """
+        if not chunk_files:
+            chunk_files = self.split_audio_for_groq(audio_file)
+        if not chunk_files:
+            return None
+        
+        try:
+            start_time = time.time()
+            with ThreadPoolExecutor(max_workers=min(len(chunk_files), limits.network_workers)) as pool:
+                results = list(pool.map(lambda chunk: self.transcribe_with_groq(chunk), chunk_files))
+            if not all(results):
+                return None
+            
+            processing_time = time.time() - start_time
+            file_size_mb = self.get_file_size_mb(audio_file)
+            speed_ratio = file_size_mb / processing_time * 60 if processing_time > 0 else 0
+            
+            print(f"✅ Groq分片转录完成! {len(chunk_files)} 个片段, 耗时: {processing_time:.1f}秒")
+            
+            return {
+                'text': merge_chunk_texts([result['text'] for result in results], chunk_overlaps(chunk_files)),
+                'language': results[0]['language'],
+                'processing_time': processing_time,
+                'speed_ratio': speed_ratio,
+                'method': f'Groq API whisper-large-v3 ({len(chunk_files)} chunks)'
+            }
+        finally:
+            # 无论转录是否成功都删除片段目录
+            shutil.rmtree(chunk_files[0].parent, ignore_errors=True)
+    
+    def transcribe_audio_smart(self, audio_file: Path, title: str, chunk_files: Optional[List[Path]] = None) -> Optional[str]:
         """Smart audio transcription: choose best method based on file size (copied and simplified from Apple section)"""
-        if not (GROQ_AVAILABLE or MLX_WHISPER_AVAILABLE):
+        if not (GROQ_AVAILABLE or LOCAL_WHISPER_AVAILABLE):
             print("❌ 没有可用的转录服务")
             return None
         
@@ -858,61 +772,69 @@ class TranscriptExtractor:
             
             # Smart transcription strategy
             if file_size_mb <= groq_limit and GROQ_AVAILABLE:
-                # Case 1: File < 25MB, use Groq directly with MLX fallback
+                # Case 1: File < 25MB, use Groq directly with local Whisper fallback
                 transcript_result = self.transcribe_with_groq(audio_file)
                 
-                # Fallback to MLX if Groq fails
-                if not transcript_result and MLX_WHISPER_AVAILABLE:
-                    transcript_result = self.transcribe_with_mlx(audio_file)
+                # Fallback to local Whisper if Groq fails
+                if not transcript_result and LOCAL_WHISPER_AVAILABLE:
+                    transcript_result = self.transcribe_locally(audio_file)
             
             elif file_size_mb > groq_limit:
                 # Case 2: File > 25MB, need compression
+                # 先尝试Groq分片转录，失败时才压缩
+                if GROQ_AVAILABLE:
+                    transcript_result = self.transcribe_with_groq_chunked(audio_file, chunk_files=chunk_files)
                 
-                # 生成安全的压缩文件名
-                original_name = audio_file.stem
-                compressed_name = f"compressed_{original_name}"
-                extension = audio_file.suffix
+                # 回退到压缩
+                if not transcript_result:
                 
-                # 确保压缩文件名不超出限制
-                max_compressed_length = 255 - len(extension)
-                if len(compressed_name) > max_compressed_length:
-                    # 截断以适合
-                    truncated_name = compressed_name[:max_compressed_length]
-                    compressed_file = audio_file.parent / f"{truncated_name}{extension}"
-                else:
-                    compressed_file = audio_file.parent / f"{compressed_name}{extension}"
+                    # 生成安全的压缩文件名
+                    original_name = audio_file.stem
+                    compressed_name = f"compressed_{original_name}"
+                    extension = audio_file.suffix
                 
-                if self.compress_audio_file(audio_file, compressed_file):
-                    compressed_size = self.get_file_size_mb(compressed_file)
+                    # 确保压缩文件名不超出限制
+                    max_compressed_length = 255 - len(extension)
+                    if len(compressed_name) > max_compressed_length:
+                        # 截断以适合
+                        truncated_name = compressed_name[:max_compressed_length]
+                        compressed_file = audio_file.parent / f"{truncated_name}{extension}"
+                    else:
+                        compressed_file = audio_file.parent / f"{compressed_name}{extension}"
+                
+                    with limits.cpu:
+                        compressed_ok = self.compress_audio_file(audio_file, compressed_file)
+                    if compressed_ok:
+                        compressed_size = self.get_file_size_mb(compressed_file)
                     
-                    if compressed_size <= groq_limit and GROQ_AVAILABLE:
-                        # Case 2a: After compression, within Groq limit with MLX fallback
-                        transcript_result = self.transcribe_with_groq(compressed_file)
+                        if compressed_size <= groq_limit and GROQ_AVAILABLE:
+                            # Case 2a: After compression, within Groq limit with local Whisper fallback
+                            transcript_result = self.transcribe_with_groq(compressed_file)
                         
-                        # Fallback to MLX if Groq fails
-                        if not transcript_result and MLX_WHISPER_AVAILABLE:
-                            transcript_result = self.transcribe_with_mlx(compressed_file)
+                            # Fallback to local Whisper if Groq fails
+                            if not transcript_result and LOCAL_WHISPER_AVAILABLE:
+                                transcript_result = self.transcribe_locally(compressed_file)
+                        else:
+                            # Case 2b: Still over limit, use local Whisper
+                            if LOCAL_WHISPER_AVAILABLE:
+                                transcript_result = self.transcribe_locally(compressed_file)
+                            else:
+                                print("❌ 未检测到本地Whisper，无法转录大文件")
+                                return None
                     else:
-                        # Case 2b: Still over limit, use MLX
-                        if MLX_WHISPER_AVAILABLE:
-                            transcript_result = self.transcribe_with_mlx(compressed_file)
+                        # Compression failed, try local Whisper
+                        if LOCAL_WHISPER_AVAILABLE:
+                            transcript_result = self.transcribe_locally(audio_file)
                         else:
-                            print("❌ 未检测到MLX Whisper，无法转录大文件")
+                            print("❌ 未检测到本地Whisper，转录失败")
                             return None
-                else:
-                    # Compression failed, try MLX
-                    if MLX_WHISPER_AVAILABLE:
-                        transcript_result = self.transcribe_with_mlx(audio_file)
-                    else:
-                        print("❌ 未检测到MLX Whisper，转录失败")
-                        return None
             
             else:
-                # Case 3: Groq not available, use MLX
-                if MLX_WHISPER_AVAILABLE:
-                    transcript_result = self.transcribe_with_mlx(audio_file)
+                # Case 3: Groq not available, use local Whisper
+                if LOCAL_WHISPER_AVAILABLE:
+                    transcript_result = self.transcribe_locally(audio_file)
                 else:
-                    print("❌ 未检测到MLX Whisper，转录失败")
+                    print("❌ 未检测到本地Whisper，转录失败")
                     return None
             
             # Handle transcription result
@@ -938,10 +860,10 @@ class TranscriptExtractor:
             print(f"❌ 转录流程失败: {e}")
             return None
     
-    def extract_youtube_transcript(self, video_id: str, video_url: str = None, title: str = "Unknown", episode_dir: Path = None) -> Optional[str]:
-        """Extract transcript from YouTube video, with audio download fallback"""
+    def extract_youtube_transcript(self, video_id: str, video_url: str = None, title: str = "Unknown", episode_dir: Path = None, audio_fallback: bool = True, captions: bool = True) -> Optional[str]:
+        """Extract transcript from YouTube video, with audio download fallback (disable with audio_fallback=False); captions=False skips straight to the fallback"""
         if not YOUTUBE_TRANSCRIPT_AVAILABLE:
-            if video_url and YT_DLP_AVAILABLE:
+            if audio_fallback and video_url and YT_DLP_AVAILABLE:
                 return self.audio_download_fallback(video_url, title, episode_dir)
             return None
         
@@ -949,104 +871,58 @@ class TranscriptExtractor:
             # Clean the video ID - remove any extra characters
             clean_video_id = video_id.strip()
             if len(clean_video_id) != 11:
-                if video_url and YT_DLP_AVAILABLE:
+                if audio_fallback and video_url and YT_DLP_AVAILABLE:
                     return self.audio_download_fallback(video_url, title, episode_dir)
                 return None
             
-            # Enhanced retry mechanism with smart language selection
-            max_retries = 20
-            for attempt in range(max_retries):
-                try:
-                    if attempt > 0:
-                        import time
-                        time.sleep(2)  # Wait 2 seconds between retries
-                    
-                    # List available transcripts
-                    transcript_list = YouTubeTranscriptApi.list_transcripts(clean_video_id)
-                    
-                    available_transcripts = []
-                    for transcript in transcript_list:
-                        available_transcripts.append({
-                            'transcript': transcript,
-                            'language_code': transcript.language_code,
-                            'language_name': transcript.language,
-                            'is_generated': transcript.is_generated,
-                            'is_translatable': transcript.is_translatable
-                        })
-                    
-                    if not available_transcripts:
-                        continue
-                    
-                    # Smart language selection - automatically choose best transcript
-                    selected_transcript, selected_lang, is_generated, reason = self.smart_language_selection(
-                        available_transcripts, title, ""
-                    )
-                    
-                    if not selected_transcript:
-                        continue
-                    
-                    # Fetch the selected transcript
-                    try:
-                        transcript_data = selected_transcript.fetch()
-                        
-                        if not transcript_data:
-                            # If selected transcript fails, try others
-                            for trans_info in available_transcripts:
-                                if trans_info['transcript'] == selected_transcript:
-                                    continue
-                                try:
-                                    transcript_data = trans_info['transcript'].fetch()
-                                    if transcript_data:
-                                        break
-                                except Exception as e:
-                                    continue
-                        
-                        if not transcript_data:
-                            continue
-                        
-                        # Extract text - handle different possible formats
-                        text_parts = []
-                        for entry in transcript_data:
-                            if hasattr(entry, 'text'):
-                                # FetchedTranscriptSnippet objects
-                                text_parts.append(entry.text)
-                            elif isinstance(entry, dict) and 'text' in entry:
-                                # Dictionary format
-                                text_parts.append(entry['text'])
-                            elif hasattr(entry, '__dict__') and 'text' in entry.__dict__:
-                                # Object with text attribute
-                                text_parts.append(entry.__dict__['text'])
-                        
-                        if text_parts:
-                            full_text = " ".join(text_parts).strip()
-                            if full_text:
-                                return full_text
-                        
-                    except Exception as e3:
-                        pass
-                    
-                except Exception as e2:
-                    error_msg = str(e2)
-                    
-                    # Check for specific error types
-                    if "no element found" in error_msg.lower():
-                        continue
-                    elif "not available" in error_msg.lower() or "disabled" in error_msg.lower():
-                        break  # No point retrying
-                    else:
-                        continue
+            # Permanent errors give up at once, transient ones back off within a time budget
+            full_text = None
+            if captions:
+                full_text = fetch_captions(
+                    YouTubeTranscriptApi,
+                    clean_video_id,
+                    lambda available: self.smart_language_selection(available, title, "")[0]
+                )
+            if full_text:
+                return full_text
             
             # Fallback to audio download if transcript extraction failed
-            if video_url and YT_DLP_AVAILABLE:
+            if audio_fallback and video_url and YT_DLP_AVAILABLE:
                 return self.audio_download_fallback(video_url, title, episode_dir)
             else:
                 return None
             
         except Exception as e:
-            if video_url and YT_DLP_AVAILABLE:
+            if audio_fallback and video_url and YT_DLP_AVAILABLE:
                 return self.audio_download_fallback(video_url, title, episode_dir)
             return None
     
+    def fetch_captions_batch(self, videos: List[Dict]) -> Dict[str, Optional[str]]:
+        """
+        并发获取多个视频的字幕，并发数受网络工作线程上限限制
+        
+        Args:
+            videos: 包含 'video_id' 和 'title' 的字典列表
+            
+        Returns:
+            Dict[str, Optional[str]]: 每个视频ID对应的字幕文本，未获取到的为 None（交给音频回退处理）
+        """
+        if not videos:
+            return {}
+        if not YOUTUBE_TRANSCRIPT_AVAILABLE:
+            return {video['video_id']: None for video in videos}
+        
+        def fetch(video):
+            return fetch_captions(
+                YouTubeTranscriptApi,
+                video['video_id'].strip(),
+                lambda available: self.smart_language_selection(available, video.get('title', ''), "")[0]
+            )
+        
+        with ThreadPoolExecutor(max_workers=min(len(videos), limits.network_workers)) as pool:
+            texts = list(pool.map(fetch, videos))
+        return {video['video_id']: text for video, text in zip(videos, texts)}
+    
     def audio_download_fallback(self, video_url: str, title: str, episode_dir: Path = None) -> Optional[str]:
         """Audio download and transcription fallback solution"""
         
@@ -1098,6 +974,7 @@ class TranscriptExtractor:
             f.write(f"**生成时间:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
             f.write("---\n\n")
             f.write(transcript)
+        record_output(transcript_path)
         
         return str(transcript_path)
 
@@ -1156,22 +1033,34 @@ class SummaryGenerator:
 
         if GEMINI_AVAILABLE and self.api_key:
             try:
-                genai.configure(api_key=self.api_key, transport='rest')
-                self.gemini_client = genai
-                self.model_name = get_model_name()  # 从 .env 获取模型名称
+                self.gemini_client = get_gemini_client()  # 进程内共享，模型名称来自 .env
+                self.model_name = self.gemini_client.model_name
             except Exception as e:
                 self.gemini_client = None
         else:
             self.gemini_client = None
     
-    def generate_summary(self, transcript: str, title: str) -> Optional[str]:
-        """Generate summary from transcript using new Gemini API"""
-        if not self.gemini_client:
-            print("Gemini API不可用或API密钥未配置")
-            return None
-        
-        try:
-            prompt = f"""
+    def generate_text(self, prompt: str, template: str) -> Optional[str]:
+        """Call Gemini through the on-disk response cache"""
+        def request(prompt):
+            throttle(GEMINI_API_HOST)
+            with limits.llm:
+                return self.gemini_client.generate(prompt)
+        
+        return cached_generate(self.model_name, template, prompt, request)
+    
+    def stream_text(self, prompt: str, template: str) -> Iterator[str]:
+        """Stream a Gemini response through the on-disk response cache"""
+        def request(prompt):
+            throttle(GEMINI_API_HOST)
+            with limits.llm:
+                yield from self.gemini_client.generate_stream(prompt)
+        
+        return cached_stream(self.model_name, template, prompt, request)
+    
+    def summary_prompt(self, transcript: str, title: str) -> str:
+        """Build the single-request summary prompt"""
+        return f"""
             Please provide a comprehensive summary of this podcast episode transcript.
             
             Episode Title: {title}
@@ -1188,22 +1077,42 @@ class SummaryGenerator:
             Transcript:
             {transcript}
             """
+    
+    def generate_summary(self, transcript: str, title: str) -> Optional[str]:
+        """Generate summary from transcript using new Gemini API"""
+        if not self.gemini_client:
+            print("Gemini API不可用或API密钥未配置")
+            return None
+        
+        try:
+            # Transcripts too long for one request are summarized section by section
+            if estimate_tokens(transcript) > SINGLE_PASS_MAX_TOKENS:
+                return self.generate_summary_map_reduce(transcript, title)
             
-            response = self.gemini_client.GenerativeModel(self.model_name).generate_content(prompt)
+            prompt = self.summary_prompt(transcript, title)
             
-            # Handle the response properly
-            if hasattr(response, 'text'):
-                return response.text
-            elif hasattr(response, 'candidates') and response.candidates:
-                return response.candidates[0].content.parts[0].text
-            else:
-                print("Gemini API响应格式异常")
-                return None
+            result = self.generate_text(prompt, TEMPLATE_SUMMARY)
+            if result:
+                return result
+            print("Gemini API响应格式异常")
+            return None
             
         except Exception as e:
             print(f"生成摘要出错: {e}")
             return None
     
+    def generate_summary_map_reduce(self, transcript: str, title: str) -> Optional[str]:
+        """Summarize a transcript too long for one request: sections concurrently, then a reduce step"""
+        def generate(prompt):
+            return self.generate_text(prompt, TEMPLATE_SUMMARY_SECTIONS)
+        
+        result = map_reduce_summary(generate, transcript, title, workers=limits.llm_workers)
+        if result['failed']:
+            print(f"⚠️  {len(result['failed'])}/{result['sections']} 段转录未能生成摘要，摘要不完整")
+        if result['summary'] and not result['reduced']:
+            print("⚠️  合并分段摘要失败，改为保存各段笔记")
+        return result['summary']
+    
     def translate_to_chinese(self, text: str) -> Optional[str]:
         """Translate text to Chinese using Gemini API"""
         if not self.gemini_client:
@@ -1213,16 +1122,11 @@ class SummaryGenerator:
         try:
             prompt = f"Translate everything to Chinese accurately without missing anything:\n\n{text}"
             
-            response = self.gemini_client.GenerativeModel(self.model_name).generate_content(prompt)
-            
-            # Handle the response properly
-            if hasattr(response, 'text'):
-                return response.text
-            elif hasattr(response, 'candidates') and response.candidates:
-                return response.candidates[0].content.parts[0].text
-            else:
-                print("Gemini API响应格式异常")
-                return None
+            result = self.generate_text(prompt, TEMPLATE_TRANSLATE)
+            if result:
+                return result
+            print("Gemini API响应格式异常")
+            return None
             
         except Exception as e:
             print(f"翻译为中文出错: {e}")
@@ -1253,12 +1157,47 @@ class SummaryGenerator:
             truncated_title = safe_title[:max_content_length]
             return f"{prefix}{truncated_title}{extension}"
     
+    def stream_summary(self, transcript: str, title: str, output_dir: Path, channel_name: str = None,
+                       episode_dir: Path = None, translate: bool = False) -> Optional[str]:
+        """
+        Generate and save the summary with Gemini's streaming API (the Chinese translation when
+        translate is set); chunks go to a .partial file that is renamed once complete
+        """
+        if not self.gemini_client:
+            print("Gemini API不可用或API密钥未配置")
+            return None
+        
+        summary = None
+        if translate or estimate_tokens(transcript) > SINGLE_PASS_MAX_TOKENS:
+            # Long transcripts go through the map-reduce path, which has nothing to stream
+            summary = self.generate_summary(transcript, title)
+            if not summary:
+                return None
+            if not translate:
+                return self.save_summary(summary, title, output_dir, channel_name, episode_dir)
+            prompt = f"Translate everything to Chinese accurately without missing anything:\n\n{summary}"
+            template = TEMPLATE_TRANSLATE
+        else:
+            prompt = self.summary_prompt(transcript, title)
+            template = TEMPLATE_SUMMARY
+        
+        chunks = timed_chunks(self.stream_text(prompt, template),
+                              lambda seconds: print(f"⏱️  首个token用时 {seconds:.1f}秒"))
+        try:
+            return self.save_summary(chunks, title, output_dir, channel_name, episode_dir)
+        except Exception as e:
+            if not summary:
+                print(f"生成摘要出错: {e}")
+                return None
+            print("⚠️  翻译失败，使用原始摘要")
+            return self.save_summary(summary, title, output_dir, channel_name, episode_dir)
+    
     def save_summary(self, summary: str, title: str, output_dir: Path, channel_name: str = None, episode_dir: Path = None) -> str:
         """
         保存摘要到文件（支持新的目录结构）
         
         Args:
-            summary: 摘要内容
+            summary: 摘要内容，或逐块写入文件的文本块迭代器
             title: 视频标题
             output_dir: 输出目录（兼容性参数）
             channel_name: 频道名称（用于新目录结构）
@@ -1294,11 +1233,13 @@ class SummaryGenerator:
             safe_title = self.sanitize_filename(title)
             summary_path = output_dir / self.ensure_summary_filename_length(safe_title)
         
-        with open(summary_path, 'w', encoding='utf-8') as f:
-            f.write(f"# Summary: {title}\n\n")
-            f.write(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-            f.write("---\n\n")
-            f.write(summary)
+        # The body may be a stream of chunks: written to a .partial file, renamed once complete
+        header = []
+        header.append(f"# Summary: {title}\n\n")
+        header.append(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        header.append("---\n\n")
+        write_stream(summary_path, ''.join(header), summary)
+        record_output(summary_path)
         
         return str(summary_path)
 
@@ -1526,6 +1467,12 @@ class Podnet:
             # 中文版默认使用中文输出和翻译
             want_chinese = True
             
+            # 并发获取所有选中视频的字幕；没有字幕的直接进入音频回退
+            batch_captions = self.extractor.fetch_captions_batch([
+                episode for episode in selected_episodes
+                if episode['platform'] != 'script' and episode.get('video_id')
+            ])
+            
             # 处理每个节目
             for episode in selected_episodes:
                 print(f"\n🎥 正在处理: {episode['title']}")
@@ -1561,11 +1508,12 @@ class Podnet:
                         )
                         
                         print("⚡️ 极速转录...")
-                        transcript_content = self.extractor.extract_youtube_transcript(
+                        transcript_content = batch_captions.get(video_id) or self.extractor.extract_youtube_transcript(
                             video_id, 
                             episode.get('url'), 
                             episode['title'],
-                            episode_dir
+                            episode_dir,
+                            captions=video_id not in batch_captions
                         )
                         if transcript_content:
                             print("✅ 转录完成")
@@ -1624,36 +1572,28 @@ You can:
                     # Check if transcript has actual content (not just placeholder)
                     if len(transcript_content.strip()) > 100 and "Note: No transcript available" not in transcript_content:
                         print("🧠 开始总结...")
-                        summary = self.summarizer.generate_summary(transcript_content, episode['title'])
-                        if summary:
-                            # Translate summary to Chinese if requested
-                            final_summary = summary
-                            if want_chinese:
-                                translated_summary = self.summarizer.translate_to_chinese(summary)
-                                if translated_summary:
-                                    final_summary = translated_summary
-                                else:
-                                    print("⚠️  翻译失败，使用原始摘要")
+                        if episode['platform'] == 'script':
+                            # For script content, use default save method
+                            summary_path = self.summarizer.stream_summary(
+                                transcript_content, 
+                                episode['title'], 
+                                self.extractor.output_dir,
+                                translate=want_chinese
+                            )
+                        else:
+                            # For YouTube content, use new directory structure
+                            video_info = self.searcher.get_video_info(episode.get('video_id', ''))
+                            channel_name = video_info.get('channel_name', 'Unknown_Channel')
                             
-                            if episode['platform'] == 'script':
-                                # For script content, use default save method
-                                summary_path = self.summarizer.save_summary(
-                                    final_summary, 
-                                    episode['title'], 
-                                    self.extractor.output_dir
-                                )
-                            else:
-                                # For YouTube content, use new directory structure
-                                video_info = self.searcher.get_video_info(episode.get('video_id', ''))
-                                channel_name = video_info.get('channel_name', 'Unknown_Channel')
-                                
-                                summary_path = self.summarizer.save_summary(
-                                    final_summary, 
-                                    episode['title'], 
-                                    self.extractor.output_dir,
-                                    channel_name,
-                                    episode_dir
-                                )
+                            summary_path = self.summarizer.stream_summary(
+                                transcript_content, 
+                                episode['title'], 
+                                self.extractor.output_dir,
+                                channel_name,
+                                episode_dir,
+                                translate=want_chinese
+                            )
+                        if summary_path:
                             print("✅ 总结完成")
                             print()  # 空行
                         else:
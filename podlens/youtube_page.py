@@ -0,0 +1,132 @@
+"""
+YouTube 页面解析 / YouTube page parsing
+
+search_youtube_podcast 原先在整个频道页面（通常超过 1 MB）上用 re.findall 找出所有
+videoId，再为每个 ID 调用 response.text.find、截取约 2000 字符的窗口并运行两次正则；
+窗口内出现相邻视频的标题时会取错标题。这里只提取一次页面内嵌的 ytInitialData JSON，
+按文档顺序遍历其中的视频渲染器，一次线性遍历得到 ID、标题、发布时间、时长和频道名——
+每个字段都来自同一个渲染器对象（频道页面的频道名取自页面元数据）。
+search_youtube_podcast used to run re.findall for every videoId over the whole
+channel page (often more than 1 MB), then call response.text.find for each ID,
+slice a ~2000-character window and run two more regexes on it; a neighbouring
+video's title inside the window could be picked up instead. The embedded
+ytInitialData JSON is now extracted once and its video renderers are walked in
+document order, so one linear pass yields ID, title, published time, duration
+and channel name, every field taken from the same renderer object (on a channel
+page the channel name comes from the page metadata).
+"""
+
+import json
+import re
+from typing import Dict, Iterator, List, Optional
+
+
+_INITIAL_DATA_RE = re.compile(r'(?:var\s+ytInitialData|window\["ytInitialData"\])\s*=\s*')
+
+# 频道视频页、搜索结果和相关视频中使用的视频渲染器
+# Video renderers used on channel video pages, search results and related videos
+VIDEO_RENDERERS = ('videoRenderer', 'gridVideoRenderer', 'compactVideoRenderer')
+
+
+def extract_initial_data(html: str) -> Optional[Dict]:
+    """
+    从页面中提取 ytInitialData 对象，找不到或无法解析时返回 None
+    Extract the ytInitialData object from a page; None when it is missing or unparsable
+    """
+    match = _INITIAL_DATA_RE.search(html)
+    if not match:
+        return None
+    try:
+        data, _ = json.JSONDecoder().raw_decode(html, match.end())
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def text_of(node) -> str:
+    """取 {'simpleText': ...} 或 {'runs': [{'text': ...}]} 中的文本 / Text of a simpleText or runs node"""
+    if not isinstance(node, dict):
+        return ''
+    if 'simpleText' in node:
+        return node['simpleText']
+    return ''.join(run.get('text', '') for run in node.get('runs', []) if isinstance(run, dict))
+
+
+def iter_video_renderers(data) -> Iterator[Dict]:
+    """
+    按文档顺序产出所有视频渲染器（迭代实现，不受嵌套深度限制）
+    Yield every video renderer in document order (iterative, so nesting depth does not matter)
+    """
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            children = []
+            for key, value in node.items():
+                if key in VIDEO_RENDERERS and isinstance(value, dict) and value.get('videoId'):
+                    yield value
+                else:
+                    children.append(value)
+            stack.extend(reversed(children))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+
+
+def _duration(renderer: Dict) -> str:
+    duration = text_of(renderer.get('lengthText'))
+    if duration:
+        return duration
+    for overlay in renderer.get('thumbnailOverlays', []):
+        status = overlay.get('thumbnailOverlayTimeStatusRenderer') if isinstance(overlay, dict) else None
+        if status:
+            return text_of(status.get('text'))
+    return ''
+
+
+def _channel_name(renderer: Dict, page_channel: str) -> str:
+    for key in ('ownerText', 'shortBylineText', 'longBylineText'):
+        name = text_of(renderer.get(key)).strip()
+        if name:
+            return name
+    return page_channel
+
+
+def parse_videos(html: str, limit: Optional[int] = None) -> List[Dict]:
+    """
+    解析页面中的视频列表（去重并保持页面顺序）
+    Parse the videos listed on a page, de-duplicated and in page order
+
+    Args:
+        html: 频道视频页或搜索结果页 / Channel videos page or search results page
+        limit: 最多返回的视频数 / Maximum number of videos to return
+
+    Returns:
+        List[Dict]: {'video_id', 'title', 'published_date', 'duration', 'channel_name'}；
+            缺失的标题为 "Unknown Title"，发布时间为 "Recent"，时长和频道名为空字符串
+            Missing titles are "Unknown Title", published time "Recent", duration and channel name ''
+    """
+    data = extract_initial_data(html)
+    if data is None:
+        return []
+    # 频道页面的渲染器不带频道名，取页面元数据中的标题
+    # Renderers on a channel page carry no channel name, so use the page metadata title
+    metadata = data.get('metadata')
+    channel = metadata.get('channelMetadataRenderer') if isinstance(metadata, dict) else None
+    page_channel = channel.get('title', '').strip() if isinstance(channel, dict) else ''
+    videos = []
+    seen_ids = set()
+    for renderer in iter_video_renderers(data):
+        video_id = renderer['videoId']
+        if video_id in seen_ids:
+            continue
+        seen_ids.add(video_id)
+        videos.append({
+            'video_id': video_id,
+            'title': text_of(renderer.get('title')).strip() or "Unknown Title",
+            'published_date': text_of(renderer.get('publishedTimeText')).strip() or "Recent",
+            'duration': _duration(renderer).strip(),
+            'channel_name': _channel_name(renderer, page_channel),
+        })
+        if limit is not None and len(videos) >= limit:
+            break
+    return videos